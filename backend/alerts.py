@@ -0,0 +1,233 @@
+"""
+Alert queue
+Posts that cross the alert thresholds get a row in the alerts table from a
+trigger at insert time, with a stable id, severity and acknowledgement
+state. The highest-ranked open alerts are also kept in a bounded in-memory
+heap (TopAlerts) so /api/alerts can answer without touching the database.
+"""
+
+import heapq
+import os
+from typing import Iterable, List, Optional, Tuple
+
+# Open alerts held in memory; /api/alerts can serve up to this many
+ALERT_QUEUE_SIZE = int(os.getenv('ALERT_QUEUE_SIZE', '100'))
+
+ALERT_COLUMNS = ('id, post_id, alert_type, severity, description, priority_score, '
+                 'misinformation_risk, timestamp, acknowledged_at')
+
+
+def _alert_values(row: str) -> str:
+    """Alert columns computed from a posts row (`row` is 'NEW.' or '')"""
+    misinformation = f"{row}misinformation_risk > 0.5"
+    return f'''
+           {row}id,
+           CASE WHEN {misinformation} THEN 'misinformation' ELSE 'high_priority' END,
+           CASE WHEN {misinformation}
+                THEN CASE WHEN {row}misinformation_risk > 0.7 THEN 'high' ELSE 'medium' END
+                ELSE CASE WHEN {row}priority_score > 0.8 THEN 'high' ELSE 'medium' END END,
+           CASE WHEN {misinformation}
+                THEN 'Potential misinformation detected in post by '
+                ELSE 'High priority community concern: ' END || substr({row}content, 1, 50) || '...',
+           IFNULL({row}priority_score, 0), IFNULL({row}misinformation_risk, 0),
+           IFNULL({row}timestamp, CURRENT_TIMESTAMP)'''
+
+
+def _alert_condition(row: str) -> str:
+    return f"({row}misinformation_risk > 0.3 OR {row}priority_score > 0.7)"
+
+
+_INSERT_COLUMNS = '''
+    INSERT INTO alerts (post_id, alert_type, severity, description, priority_score,
+                        misinformation_risk, timestamp)'''
+
+_UPSERT_NEW = f'''{_INSERT_COLUMNS}
+        SELECT {_alert_values('NEW.')}
+        WHERE {_alert_condition('NEW.')}
+        ON CONFLICT (post_id) DO UPDATE SET
+            alert_type = excluded.alert_type,
+            severity = excluded.severity,
+            description = excluded.description,
+            priority_score = excluded.priority_score,
+            misinformation_risk = excluded.misinformation_risk,
+            timestamp = excluded.timestamp;
+'''
+
+ALERT_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS alerts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        post_id INTEGER NOT NULL UNIQUE,
+        alert_type TEXT NOT NULL,
+        severity TEXT NOT NULL,
+        description TEXT NOT NULL,
+        priority_score REAL NOT NULL,
+        misinformation_risk REAL NOT NULL,
+        timestamp DATETIME NOT NULL,
+        acknowledged_at DATETIME
+    )
+    ''',
+    # Open alerts in queue order, for reloading the top of the queue
+    '''
+    CREATE INDEX IF NOT EXISTS idx_alerts_open_rank
+    ON alerts(priority_score DESC, misinformation_risk DESC, id DESC)
+    WHERE acknowledged_at IS NULL
+    ''',
+    # Paging through acknowledged alerts, newest first; open ones are most
+    # alerts, so paging them walks the primary key
+    'CREATE INDEX IF NOT EXISTS idx_alerts_acknowledged ON alerts(id) WHERE acknowledged_at IS NOT NULL',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS alerts_post_insert AFTER INSERT ON posts
+    WHEN {_alert_condition('NEW.')}
+    BEGIN{_UPSERT_NEW}    END
+    ''',
+    # Rescored posts gain, update or lose (if not yet acknowledged) their alert
+    f'''
+    CREATE TRIGGER IF NOT EXISTS alerts_post_update
+    AFTER UPDATE OF content, timestamp, misinformation_risk, priority_score ON posts
+    BEGIN{_UPSERT_NEW}
+        DELETE FROM alerts
+        WHERE post_id = NEW.id AND acknowledged_at IS NULL AND NOT {_alert_condition('NEW.')};
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS alerts_post_delete AFTER DELETE ON posts
+    BEGIN
+        DELETE FROM alerts WHERE post_id = OLD.id;
+    END
+    ''',
+    # Acknowledging changes what /api/alerts and the dashboard return
+    '''
+    CREATE TRIGGER IF NOT EXISTS alerts_acknowledge AFTER UPDATE OF acknowledged_at ON alerts
+    BEGIN
+        UPDATE write_version SET version = version + 1 WHERE id = 0;
+    END
+    ''',
+]
+
+BACKFILL_SQL = f'''{_INSERT_COLUMNS}
+    SELECT {_alert_values('')}
+    FROM posts
+    WHERE {_alert_condition('')}
+    ORDER BY id
+'''
+
+
+def create_alerts(cursor) -> int:
+    """Create the alerts table and triggers, and raise alerts for existing posts"""
+    for statement in ALERT_SCHEMA:
+        cursor.execute(statement)
+    cursor.execute(BACKFILL_SQL)
+    return cursor.rowcount
+
+
+def read_top_alerts(cursor, limit: int) -> List[tuple]:
+    """The `limit` highest-ranked open alerts"""
+    cursor.execute(f'''
+        SELECT {ALERT_COLUMNS}
+        FROM alerts
+        WHERE acknowledged_at IS NULL
+        ORDER BY priority_score DESC, misinformation_risk DESC, id DESC
+        LIMIT ?
+    ''', (limit,))
+    return cursor.fetchall()
+
+
+def read_alert(cursor, alert_id: int) -> Optional[tuple]:
+    cursor.execute(f"SELECT {ALERT_COLUMNS} FROM alerts WHERE id = ?", (alert_id,))
+    return cursor.fetchone()
+
+
+def read_alerts_for_posts(cursor, first_post_id: int, last_post_id: int) -> List[tuple]:
+    """Alerts raised for the posts with ids in [first_post_id, last_post_id]"""
+    cursor.execute(f'''
+        SELECT {ALERT_COLUMNS}
+        FROM alerts
+        WHERE post_id BETWEEN ? AND ?
+        ORDER BY post_id
+    ''', (first_post_id, last_post_id))
+    return cursor.fetchall()
+
+
+def read_alert_page(cursor, limit: int, before_id: Optional[int] = None,
+                    acknowledged: Optional[bool] = None, severity: Optional[str] = None) -> List[tuple]:
+    """Alerts newest first, starting below `before_id`"""
+    clauses, params = [], []
+    if acknowledged is not None:
+        clauses.append("acknowledged_at IS NOT NULL" if acknowledged else "acknowledged_at IS NULL")
+    if severity is not None:
+        clauses.append("severity = ?")
+        params.append(severity)
+    if before_id is not None:
+        clauses.append("id < ?")
+        params.append(before_id)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    cursor.execute(f'''
+        SELECT {ALERT_COLUMNS}
+        FROM alerts
+        {where}
+        ORDER BY id DESC
+        LIMIT ?
+    ''', (*params, limit))
+    return cursor.fetchall()
+
+
+def _rank(alert: tuple) -> tuple:
+    # (priority_score, misinformation_risk, id), highest first
+    return (alert[5], alert[6], alert[0])
+
+
+class TopAlerts:
+    """The `size` highest-ranked open alerts as of one write version
+
+    Writes made by this process are applied in place when the heap is
+    current for the version they started from; anything else (another
+    worker's writes, out of order completions) leaves it stale until the
+    next load.
+    """
+
+    def __init__(self, size: int = ALERT_QUEUE_SIZE):
+        self.size = size
+        self.version: Optional[int] = None
+        self._heap: List[Tuple[tuple, tuple]] = []
+        # Every open alert not in the heap ranks below this; None when the
+        # heap holds them all
+        self._floor: Optional[tuple] = None
+        # Heap contents highest first, until the next change
+        self._ranked: Optional[List[tuple]] = None
+
+    def load(self, version: int, alerts: List[tuple]):
+        self._heap = [(_rank(alert), alert) for alert in alerts]
+        heapq.heapify(self._heap)
+        self._floor = self._heap[0][0] if len(alerts) >= self.size else None
+        self._ranked = None
+        self.version = version
+
+    def can_serve(self, version: int, limit: int) -> bool:
+        return version == self.version and (limit <= len(self._heap) or self._floor is None)
+
+    def apply(self, before: int, after: int, added: Iterable[tuple] = (), removed: Iterable[int] = ()):
+        """Record a write that moved the database from version `before` to `after`"""
+        if self.version != before:
+            self.version = None
+            return
+        for alert in added:
+            item = (_rank(alert), alert)
+            if self._floor is not None and item[0] < self._floor:
+                # Ranks among the alerts that are not held
+                continue
+            heapq.heappush(self._heap, item)
+            if len(self._heap) > self.size:
+                heapq.heappop(self._heap)
+                self._floor = self._heap[0][0]
+        removed = set(removed)
+        if removed:
+            self._heap = [item for item in self._heap if item[1][0] not in removed]
+            heapq.heapify(self._heap)
+        self._ranked = None
+        self.version = after
+
+    def top(self, limit: int) -> List[tuple]:
+        if self._ranked is None:
+            self._ranked = [alert for _, alert in sorted(self._heap, reverse=True)]
+        return self._ranked[:limit]
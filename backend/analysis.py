@@ -0,0 +1,162 @@
+"""
+Text analysis for the CommunityPulse API
+Sentiment, misinformation and priority scoring. Kept free of web and
+database imports so it can be loaded cheaply in analysis worker processes.
+"""
+
+import hashlib
+import json
+from importlib.metadata import version
+from typing import List
+
+from keyword_matcher import get_matcher
+from metrics import stage
+
+# Sentiment engine picked by SENTIMENT_ENGINE (see sentiment.py). Building it
+# imports NumPy and loads the VADER lexicon, so it happens on first use or in
+# warm_up() rather than on import.
+sentiment_engine = None
+
+# Misinformation and urgency keywords (see keywords.json)
+scoring_matcher = get_matcher('scoring')
+
+# Bump when the scoring rules below change so cached results are dropped
+SCORING_VERSION = 1
+
+_warmed = False
+
+
+def get_sentiment_engine():
+    global sentiment_engine
+    if sentiment_engine is None:
+        from sentiment import make_engine
+        sentiment_engine = make_engine()
+    return sentiment_engine
+
+def sentiment_result(scores: dict) -> dict:
+    """Label VADER-style polarity scores"""
+    if scores['compound'] >= 0.05:
+        label = 'positive'
+    elif scores['compound'] <= -0.05:
+        label = 'negative'
+    else:
+        label = 'neutral'
+
+    return {
+        'score': scores['compound'],
+        'label': label,
+        'positive': scores['pos'],
+        'negative': scores['neg'],
+        'neutral': scores['neu']
+    }
+
+def analyze_sentiment(text: str) -> dict:
+    """Analyze sentiment of text using the sentiment engine"""
+    with stage('sentiment'):
+        return sentiment_result(get_sentiment_engine().score_batch([text])[0])
+
+def detect_misinformation(text: str) -> float:
+    """Simple misinformation detection based on keywords and patterns"""
+    risk_score = 0.0
+    scan = scoring_matcher.scan(text)
+
+    # Check for excessive caps (shouting)
+    if scan.caps_ratio > 0.3:
+        risk_score += 0.2
+
+    # Check for misinformation keywords
+    for keyword in scan.hits['misinformation']:
+        risk_score += 0.3
+
+    # Check for excessive exclamation marks
+    if scan.exclamations > 3:
+        risk_score += 0.1
+
+    # Check for urgency indicators
+    if scan.distinct('urgency') > 2:
+        risk_score += 0.1
+
+    return min(risk_score, 1.0)
+
+def calculate_priority_score(sentiment_score: float, misinformation_risk: float, content_length: int) -> float:
+    """Calculate priority score for post ranking"""
+    # Base score from sentiment (negative posts are higher priority)
+    base_score = (1 - sentiment_score) * 0.4
+
+    # Misinformation risk adds to priority
+    risk_score = misinformation_risk * 0.4
+
+    # Length factor (longer posts might be more important)
+    length_score = min(content_length / 500, 1.0) * 0.2
+
+    return base_score + risk_score + length_score
+
+def score_post(text: str, sentiment: dict) -> dict:
+    """Misinformation and priority scoring for a text whose sentiment is known"""
+    misinformation_risk = detect_misinformation(text)
+    priority_score = calculate_priority_score(
+        sentiment['score'],
+        misinformation_risk,
+        len(text)
+    )
+
+    return {
+        'sentiment': sentiment,
+        'misinformation_risk': misinformation_risk,
+        'priority_score': priority_score
+    }
+
+def analyze_post(text: str) -> dict:
+    """Run sentiment, misinformation and priority scoring in one call"""
+    return score_post(text, analyze_sentiment(text))
+
+def analyze_batch(texts: List[str]) -> List[dict]:
+    """Analyze a list of texts in one call, preserving order
+
+    Amortizes the worker round trip over the whole chunk instead of paying
+    it once per post, and scores sentiment for the chunk in one engine call.
+    """
+    with stage('sentiment', len(texts)):
+        sentiments = [sentiment_result(score) for score in get_sentiment_engine().score_batch(texts)]
+    with stage('misinformation', len(texts)):
+        risks = [detect_misinformation(text) for text in texts]
+    return [
+        {
+            'sentiment': sentiment,
+            'misinformation_risk': risk,
+            'priority_score': calculate_priority_score(sentiment['score'], risk, len(text))
+        }
+        for text, sentiment, risk in zip(texts, sentiments, risks)
+    ]
+
+def warm_up():
+    """Build the sentiment engine and fill its lazily built state
+
+    The server lifespan calls this before starting analysis processes, and
+    gunicorn.conf.py calls it in the master before forking, so workers share
+    the lexicon, token codes and keyword matcher copy-on-write. Later calls
+    do nothing.
+    """
+    global _warmed
+    if _warmed:
+        return
+    get_sentiment_engine().warm_up()
+    analyze_batch([
+        "The new pool hours are great! Everyone seems to be enjoying the extended time.",
+        "URGENT: someone said the water is contaminated, share this now!!!",
+    ] * 8)
+    _warmed = True
+
+def scoring_fingerprint() -> str:
+    """Identifies everything that determines analysis results
+
+    Covers SCORING_VERSION, the loaded keyword lists and the VADER release,
+    so cached results from an older configuration are never served. The
+    engines score identically, so switching SENTIMENT_ENGINE keeps the cache.
+    """
+    config = {
+        'version': SCORING_VERSION,
+        'keywords': scoring_matcher.families,
+        'vader': version('vaderSentiment')
+    }
+    return hashlib.blake2b(json.dumps(config, sort_keys=True).encode('utf-8'), digest_size=8).hexdigest()
@@ -0,0 +1,177 @@
+"""
+Content-hash cache for analysis results
+Reposts, chain messages and copy-pasted alerts skip VADER. Entries are keyed
+by a hash of the whitespace-normalized text and only live as long as the
+scoring fingerprint they were computed with.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+ANALYSIS_CACHE_SIZE = int(os.getenv('ANALYSIS_CACHE_SIZE', '10000'))
+ANALYSIS_CACHE_TTL = float(os.getenv('ANALYSIS_CACHE_TTL', '86400'))
+ANALYSIS_CACHE_DB = os.getenv('ANALYSIS_CACHE_DB', '')
+FLUSH_SIZE = 256
+
+
+def content_key(text: str) -> str:
+    """Hash of the text with runs of whitespace collapsed
+
+    VADER tokenizes on whitespace, so posts that only differ in spacing or
+    line breaks share an entry.
+    """
+    normalized = ' '.join(text.split())
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class AnalysisCache:
+    """LRU cache of {'sentiment'} results
+
+    Lookups and inserts happen on the event loop and never touch disk. With
+    a path, new entries are written to a SQLite table in batches (flush())
+    and the most recent ones are loaded back on startup (load()), so the
+    cache survives restarts. Rows from another scoring fingerprint are
+    deleted on load.
+    """
+
+    def __init__(self, fingerprint: str, max_size: int = ANALYSIS_CACHE_SIZE,
+                 ttl: float = ANALYSIS_CACHE_TTL, path: str = ANALYSIS_CACHE_DB):
+        self.fingerprint = fingerprint
+        self.max_size = max_size
+        self.ttl = ttl
+        self.path = path
+        self._entries = OrderedDict()
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._conn = None
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _expires_at(self, stored_at: float) -> float:
+        return stored_at + self.ttl if self.ttl > 0 else float('inf')
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: dict):
+        if not self.enabled:
+            return
+
+        stored_at = time.time()
+        self._remember(key, self._expires_at(stored_at), value)
+        if self.path:
+            with self._pending_lock:
+                self._pending.append((key, self.fingerprint, json.dumps(value), stored_at))
+
+    def _remember(self, key: str, expires_at: float, value: dict):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    # Persistence (blocking, run on the DB thread pool or at startup)
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    key TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_analysis_cache_stored_at ON analysis_cache(stored_at)')
+        return self._conn
+
+    def load(self) -> int:
+        """Drop stale rows and warm memory with the newest fresh ones"""
+        if not (self.enabled and self.path):
+            return 0
+
+        oldest = time.time() - self.ttl if self.ttl > 0 else 0
+        with self._disk_lock:
+            conn = self._connection()
+            with conn:
+                conn.execute('DELETE FROM analysis_cache WHERE fingerprint != ? OR stored_at < ?',
+                             (self.fingerprint, oldest))
+            rows = conn.execute(
+                'SELECT key, value, stored_at FROM analysis_cache ORDER BY stored_at DESC LIMIT ?',
+                (self.max_size,)
+            ).fetchall()
+
+        for key, value, stored_at in reversed(rows):
+            self._remember(key, self._expires_at(stored_at), json.loads(value))
+        return len(rows)
+
+    def flush(self) -> int:
+        """Write entries added since the last flush to disk"""
+        with self._pending_lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+
+        with self._disk_lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany('INSERT OR REPLACE INTO analysis_cache VALUES (?, ?, ?, ?)', rows)
+                if self.ttl > 0:
+                    conn.execute('DELETE FROM analysis_cache WHERE stored_at < ?', (time.time() - self.ttl,))
+        return len(rows)
+
+    def close(self):
+        if self.path:
+            self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'ttl_seconds': self.ttl,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'persistent': bool(self.path),
+            'fingerprint': self.fingerprint
+        }
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Alert Queue Benchmark
+Seeds migrated databases of increasing size and compares the rows one
+GET /api/alerts costs to fetch: the old query ranking risky posts, reloading
+the top of the alerts table, and serving from the in-memory queue (plus the
+write version read that checks it is current). Also reports what the alert
+triggers add to bulk ingest.
+
+Usage: python benchmarks/bench_alerts.py [--rows 100000,1000000] [--repeat 200]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_storage import percentile
+from migrations import migrate
+from test_query_plans import SEED_SQL
+
+# GET /api/alerts before the alerts table, with the partial index it used
+POSTS_ALERT_INDEX = '''
+    CREATE INDEX IF NOT EXISTS idx_posts_risky
+    ON posts(priority_score DESC, misinformation_risk DESC)
+    WHERE misinformation_risk > 0.3 OR priority_score > 0.7
+'''
+POSTS_ALERT_SQL = '''
+    SELECT id, content, misinformation_risk, priority_score, timestamp
+    FROM posts
+    WHERE misinformation_risk > 0.3 OR priority_score > 0.7
+    ORDER BY priority_score DESC, misinformation_risk DESC
+    LIMIT 10
+'''
+
+
+def seed(path: str, rows: int):
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    conn.execute(SEED_SQL, (rows,))
+    conn.execute(POSTS_ALERT_INDEX)
+    conn.commit()
+    conn.close()
+
+
+def timed(fn, repeat):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies
+
+
+def ingest_rate(path: str, rows: int, triggers: bool) -> float:
+    """Posts/sec for executemany chunks of 1000, with or without the alert triggers"""
+    conn = sqlite3.connect(path)
+    if not triggers:
+        for name in ('alerts_post_insert', 'alerts_post_update', 'alerts_post_delete'):
+            conn.execute(f'DROP TRIGGER {name}')
+    from main import BULK_INSERT_SQL
+    batch = [
+        (f"Ingest benchmark post {i}", f"user{i % 500}", None, -0.2, 'negative',
+         0.6 if i % 10 == 0 else 0.1, 'security', (i % 100) / 100.0)
+        for i in range(1000)
+    ]
+    start = time.perf_counter()
+    for _ in range(rows // len(batch)):
+        conn.executemany(BULK_INSERT_SQL, batch)
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse alert queue benchmark')
+    parser.add_argument('--rows', default='100000,1000000', help='comma separated post counts')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--ingest', type=int, default=100000)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.rows.split(',')]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {}
+        for rows in sizes:
+            paths[rows] = os.path.join(tmp, f'bench_{rows}.db')
+            print(f"🌱 Seeding {rows:,} posts...")
+            seed(paths[rows], rows)
+
+        os.environ['DATABASE_URL'] = f'sqlite:///{paths[sizes[0]]}'
+        from alerts import TopAlerts
+        from main import read_top_alerts_snapshot
+        from write_version import read_write_version
+
+        print(f"\n📊 One GET /api/alerts (p50 / p99 of {args.repeat})")
+        print(f"  {'posts':>10}  {'alerts':>9}  {'posts query':>19}  {'queue reload':>19}  {'in-memory queue':>19}")
+        for rows in sizes:
+            conn = sqlite3.connect(paths[rows])
+            cursor = conn.cursor()
+            alerts = cursor.execute('SELECT COUNT(*) FROM alerts').fetchone()[0]
+            queue = TopAlerts()
+            queue.load(*read_top_alerts_snapshot(cursor))
+
+            def from_queue():
+                # Version check, then the top 10 rows straight from the heap
+                if queue.can_serve(read_write_version(cursor), 10):
+                    return queue.top(10)
+
+            results = [
+                timed(lambda: cursor.execute(POSTS_ALERT_SQL).fetchall(), args.repeat),
+                timed(lambda: queue.load(*read_top_alerts_snapshot(cursor)), args.repeat),
+                timed(from_queue, args.repeat),
+            ]
+            cells = [f"{percentile(l, 50) * 1000:7.3f} / {percentile(l, 99) * 1000:7.3f} ms" for l in results]
+            print(f"  {rows:>10,}  {alerts:>9,}  {cells[0]:>19}  {cells[1]:>19}  {cells[2]:>19}")
+            conn.close()
+
+        print(f"\n🚀 Ingesting {args.ingest:,} posts (10% misinformation, 30% high priority)...")
+        with_triggers = ingest_rate(paths[sizes[0]], args.ingest, True)
+        without_triggers = ingest_rate(paths[sizes[0]], args.ingest, False)
+        print("\n📊 Ingest")
+        print(f"  with alert triggers       {with_triggers:12,.0f} posts/sec")
+        print(f"  without alert triggers    {without_triggers:12,.0f} posts/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Batch Analysis Benchmark
+Compares posts/sec of sequential POST /api/analyze calls against one
+POST /api/analyze/batch request (JSON and NDJSON) over the NextDoor corpus.
+
+Usage:
+    uvicorn main:app --port 8000 &
+    python benchmarks/bench_batch_analysis.py --posts 5000
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+
+import httpx
+
+CORPUS_GLOB = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..',
+    'data_collection', 'data', 'nextdoor', '*.json'
+)
+
+
+def load_corpus(posts: int):
+    """Repeat the generated NextDoor posts until `posts` items are available"""
+    texts = []
+    for path in sorted(glob.glob(CORPUS_GLOB)):
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.extend(post['content'] for post in json.load(f))
+    if not texts:
+        raise SystemExit("No NextDoor corpus found, run data_collection/nextdoor_generator.py first")
+    return [{'content': texts[i % len(texts)], 'author': 'Benchmark'} for i in range(posts)]
+
+
+def bench_sequential(client: httpx.Client, items):
+    start = time.perf_counter()
+    for item in items:
+        client.post('/api/analyze', json=item).raise_for_status()
+    return len(items) / (time.perf_counter() - start)
+
+
+def bench_batch(client: httpx.Client, items):
+    start = time.perf_counter()
+    response = client.post('/api/analyze/batch', json=items)
+    response.raise_for_status()
+    assert len(response.json()) == len(items)
+    return len(items) / (time.perf_counter() - start)
+
+
+def bench_ndjson(client: httpx.Client, items):
+    body = b''.join(json.dumps(item).encode('utf-8') + b'\n' for item in items)
+    start = time.perf_counter()
+    with client.stream('POST', '/api/analyze/batch', content=body,
+                       headers={'Content-Type': 'application/x-ndjson'}) as response:
+        response.raise_for_status()
+        lines = sum(1 for line in response.iter_lines() if line)
+    assert lines == len(items)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse batch analysis benchmark')
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--posts', type=int, default=5000)
+    parser.add_argument('--sequential-posts', type=int, default=500,
+                        help='Single-post calls to time (extrapolated to posts/sec)')
+    args = parser.parse_args()
+
+    items = load_corpus(args.posts)
+    with httpx.Client(base_url=args.url, timeout=300) as client:
+        print(f"🚀 Batch analysis benchmark: {args.posts:,} posts against {args.url}")
+        sequential = bench_sequential(client, items[:args.sequential_posts])
+        batch = bench_batch(client, items)
+        ndjson = bench_ndjson(client, items)
+
+    print("\n📊 Results (posts/sec)")
+    print(f"  sequential /api/analyze   {sequential:10.0f}")
+    print(f"  JSON /api/analyze/batch   {batch:10.0f}  ({batch / sequential:.1f}x)")
+    print(f"  NDJSON /api/analyze/batch {ndjson:10.0f}  ({ndjson / sequential:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
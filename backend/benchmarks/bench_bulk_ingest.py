@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Bulk Ingest Benchmark
+Compares posts/sec of one-at-a-time POST /api/posts against a streamed
+NDJSON POST /api/posts/bulk, and projects the time to ingest 1M posts.
+
+Usage:
+    uvicorn main:app --port 8000 &
+    python benchmarks/bench_bulk_ingest.py --posts 50000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_batch_analysis import load_corpus
+
+CATEGORIES = ['general', 'maintenance', 'security', 'amenities', 'noise']
+
+
+def make_posts(count: int):
+    posts = load_corpus(count)
+    for i, post in enumerate(posts):
+        post['category'] = CATEGORIES[i % len(CATEGORIES)]
+    return posts
+
+
+def bench_single(client: httpx.Client, posts):
+    start = time.perf_counter()
+    for post in posts:
+        client.post('/api/posts', json=post).raise_for_status()
+    return len(posts) / (time.perf_counter() - start)
+
+
+def bench_bulk(client: httpx.Client, posts):
+    def body():
+        for post in posts:
+            yield json.dumps(post).encode('utf-8') + b'\n'
+
+    start = time.perf_counter()
+    ingested = failed = 0
+    with client.stream('POST', '/api/posts/bulk', content=body(),
+                       headers={'Content-Type': 'application/x-ndjson'}) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line:
+                if 'id' in json.loads(line):
+                    ingested += 1
+                else:
+                    failed += 1
+    elapsed = time.perf_counter() - start
+    return ingested / elapsed, failed
+
+
+def format_duration(seconds: float) -> str:
+    if seconds < 120:
+        return f"{seconds:.0f} s"
+    if seconds < 7200:
+        return f"{seconds / 60:.1f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse bulk ingest benchmark')
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--posts', type=int, default=50000)
+    parser.add_argument('--single-posts', type=int, default=500,
+                        help='Single POST /api/posts calls to time')
+    args = parser.parse_args()
+
+    posts = make_posts(args.posts)
+    with httpx.Client(base_url=args.url, timeout=600) as client:
+        print(f"🚀 Bulk ingest benchmark: {args.posts:,} posts against {args.url}")
+        single = bench_single(client, posts[:args.single_posts])
+        bulk, failed = bench_bulk(client, posts)
+
+    print("\n📊 Results")
+    print(f"  POST /api/posts        {single:10.0f} posts/sec  (1M posts in {format_duration(1e6 / single)})")
+    print(f"  POST /api/posts/bulk   {bulk:10.0f} posts/sec  (1M posts in {format_duration(1e6 / bulk)}, "
+          f"{bulk / single:.1f}x, {failed} failed)")
+
+
+if __name__ == "__main__":
+    main()
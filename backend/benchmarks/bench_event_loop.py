@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Event Loop Isolation Load Test
+Measures /api/analyze latency on its own and again while other clients
+hammer the (slow) /api/dashboard endpoint. If handlers block the event loop,
+the dashboard load shows up directly in analyze latency.
+
+Usage:
+    uvicorn main:app --port 8000 &
+    python benchmarks/bench_event_loop.py --seed 200000 --db community_pulse.db
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_storage import INSERT_SQL, percentile, random_post
+
+ANALYZE_BODY = {
+    "content": "URGENT: the parking garage gate is broken again and nobody is fixing it!",
+    "author": "Load Test"
+}
+
+
+def seed(db_path: str, rows: int):
+    """Append synthetic posts so the dashboard queries have real work to do"""
+    conn = sqlite3.connect(db_path)
+    conn.executemany(INSERT_SQL, (random_post(i) for i in range(rows)))
+    conn.commit()
+    conn.close()
+    print(f"🌱 Seeded {rows:,} posts into {db_path}")
+
+
+async def analyze_client(client: httpx.AsyncClient, deadline: float, latencies: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.post("/api/analyze", json=ANALYZE_BODY)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+
+async def dashboard_client(client: httpx.AsyncClient, deadline: float, counter: list):
+    while time.perf_counter() < deadline:
+        response = await client.get("/api/dashboard")
+        response.raise_for_status()
+        counter.append(1)
+
+
+async def run_phase(url: str, duration: float, analyze_clients: int, dashboard_clients: int):
+    limits = httpx.Limits(max_connections=analyze_clients + dashboard_clients)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+        latencies, dashboards = [], []
+        tasks = [analyze_client(client, deadline, latencies) for _ in range(analyze_clients)]
+        tasks += [dashboard_client(client, deadline, dashboards) for _ in range(dashboard_clients)]
+        await asyncio.gather(*tasks)
+
+    latencies.sort()
+    return {
+        'analyze_requests': len(latencies),
+        'dashboard_requests': len(dashboards),
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def print_phase(name, result):
+    print(f"  {name:<28} analyze p50={result['p50_ms']:8.2f} ms  p99={result['p99_ms']:8.2f} ms  "
+          f"({result['analyze_requests']} analyze, {result['dashboard_requests']} dashboard)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse event loop isolation test')
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per phase')
+    parser.add_argument('--analyze-clients', type=int, default=10)
+    parser.add_argument('--dashboard-clients', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0, help='Posts to insert before testing')
+    parser.add_argument('--db', default='community_pulse.db', help='Database used by --seed')
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.db, args.seed)
+
+    print(f"🚀 Event loop isolation test against {args.url}")
+    idle = await run_phase(args.url, args.duration, args.analyze_clients, 0)
+    loaded = await run_phase(args.url, args.duration, args.analyze_clients, args.dashboard_clients)
+
+    print("\n📊 Results")
+    print_phase('analyze only', idle)
+    print_phase(f'with {args.dashboard_clients} dashboard clients', loaded)
+    if idle['p99_ms']:
+        print(f"  p99 inflation: {loaded['p99_ms'] / idle['p99_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher Micro-benchmark
+Single-core throughput of the shared keyword matcher against the per-keyword
+scans it replaced, for both the API risk score and the data pipeline
+indicators, over the generated NextDoor corpus. Also checks both produce
+identical results.
+
+Usage:
+    python benchmarks/bench_keyword_matcher.py --posts 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_batch_analysis import load_corpus
+from keyword_matcher import get_matcher, load_keyword_config
+
+import analysis
+
+CONFIG = load_keyword_config()
+
+
+def legacy_detect_misinformation(text):
+    """detect_misinformation before the shared matcher"""
+    risk_score = 0.0
+    caps_ratio = sum(1 for c in text if c.isupper()) / len(text) if text else 0
+    if caps_ratio > 0.3:
+        risk_score += 0.2
+    text_lower = text.lower()
+    for keyword in CONFIG['scoring']['misinformation']:
+        if keyword in text_lower:
+            risk_score += 0.3
+    if text.count('!') > 3:
+        risk_score += 0.1
+    if sum(1 for word in CONFIG['scoring']['urgency'] if word in text_lower) > 2:
+        risk_score += 0.1
+    return min(risk_score, 1.0)
+
+
+def legacy_indicators(text):
+    """DataProcessor.detect_misinformation_indicators before the shared matcher"""
+    indicators = {'urgency_words': 0, 'conspiracy_words': 0, 'authority_challenge': 0,
+                  'excessive_caps': 0, 'exclamation_overuse': 0}
+    text_lower = text.lower()
+    for family, words in CONFIG['indicators'].items():
+        for word in words:
+            indicators[family] += text_lower.count(word)
+    if len(text) > 0:
+        caps_ratio = sum(1 for c in text if c.isupper()) / len(text)
+        indicators['excessive_caps'] = 1 if caps_ratio > 0.3 else 0
+    exclamation_ratio = text.count('!') / len(text) if len(text) > 0 else 0
+    indicators['exclamation_overuse'] = 1 if exclamation_ratio > 0.05 else 0
+    return indicators
+
+
+def shared_indicators(text, matcher=get_matcher('indicators')):
+    scan = matcher.scan(text)
+    indicators = {family: scan.occurrences(family) for family in CONFIG['indicators']}
+    indicators['excessive_caps'] = 1 if scan.caps_ratio > 0.3 else 0
+    indicators['exclamation_overuse'] = 1 if scan.length and scan.exclamations / scan.length > 0.05 else 0
+    return indicators
+
+
+def throughput(fn, texts, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse keyword matcher benchmark')
+    parser.add_argument('--posts', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--join', type=int, default=10,
+                        help='Posts concatenated per text for the long-text run')
+    args = parser.parse_args()
+
+    short = [item['content'] for item in load_corpus(args.posts)]
+    long = [' '.join(short[i:i + args.join]) for i in range(0, len(short), args.join)]
+
+    cases = [
+        ('risk score', legacy_detect_misinformation, analysis.detect_misinformation),
+        ('pipeline indicators', legacy_indicators, shared_indicators),
+    ]
+
+    print(f"🚀 Keyword matcher benchmark: {len(short):,} NextDoor posts, 1 core")
+    for name, legacy, shared in cases:
+        mismatches = sum(legacy(t) != shared(t) for t in short + long)
+        if mismatches:
+            raise SystemExit(f"❌ {name}: {mismatches} texts scored differently")
+
+    print("\n📊 Results (texts/sec per core)")
+    for label, texts in (('posts', short), (f'{args.join}-post texts', long)):
+        for name, legacy, shared in cases:
+            before = throughput(legacy, texts, args.repeat)
+            after = throughput(shared, texts, args.repeat)
+            print(f"  {name:<20} {label:<15} before {before:10.0f}  after {after:10.0f}  ({after / before:.1f}x)")
+    print("✅ Identical results on every text")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Load Test and Regression Benchmark
+Seeds a database with NextDoorGenerator posts at a chosen scale (10k, 1m, 10m
+or a number), starts the API on a copy of it, drives every endpoint with a
+weighted read/write mix from a fixed number of concurrent httpx clients
+(plus a few /api/stream subscribers), and writes throughput and latency
+percentiles, overall and per endpoint, as JSON.
+
+If a baseline exists for the same scale and mix it is compared with the run,
+and the script exits 1 when throughput drops or latency rises by more than
+--tolerance. Record a baseline on the machine that gates deploys with
+--save-baseline and commit it under benchmarks/baselines/.
+
+Seeded databases are kept (--seed-dir) and reused by later runs; each run
+works on a fresh copy so its writes never change the next run's data.
+
+Usage:
+    python benchmarks/bench_load.py --scale 10k --duration 30
+    python benchmarks/bench_load.py --scale 1m --server gunicorn --workers 4 --save-baseline
+    python benchmarks/bench_load.py --url http://staging:8000 --scale 1m --mix read-heavy
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data_collection'))
+
+from bench_storage import percentile
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.join(BENCHMARKS, '..')
+
+SCALES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+
+# Distinct generated posts; larger scales repeat them with new timestamps
+CORPUS_SIZE = 20_000
+SEED_CHUNK_SIZE = 50_000
+# Seeded timestamps are spread over this many days
+SEED_DAYS = 365
+BATCH_SIZE = 50
+
+# Relative request weights for the "mixed" profile
+READ_WEIGHTS = {
+    'GET /api/posts': 20,
+    'GET /api/posts (cursor)': 10,
+    'GET /api/dashboard': 12,
+    'GET /api/analytics': 8,
+    'GET /api/alerts': 8,
+    'GET /api/health': 5,
+    'GET /api/alerts/history': 4,
+    'GET /': 1,
+    'GET /api/cache/stats': 1,
+    'GET /api/cache/responses': 1,
+    'GET /metrics': 1,
+}
+WRITE_WEIGHTS = {
+    'POST /api/posts': 12,
+    'POST /api/analyze': 8,
+    'POST /api/sentiment-analysis': 3,
+    'POST /api/posts/bulk': 2,
+    'POST /api/analyze/batch': 2,
+    'POST /api/alerts/{alert_id}/acknowledge': 2,
+}
+# Multiplier applied to the write weights
+MIXES = {'read-heavy': 0.25, 'mixed': 1.0, 'write-heavy': 3.0}
+
+
+def scale_posts(scale: str) -> int:
+    return SCALES[scale.lower()] if scale.lower() in SCALES else int(scale)
+
+
+def generate_corpus(size: int, seed: int) -> list:
+    """NextDoorGenerator posts, reproducible for a seed"""
+    from nextdoor_generator import NextDoorGenerator
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return NextDoorGenerator().generate_dataset(size)
+
+
+# Seeding
+def seed_database(path: str, posts: int, seed: int):
+    """Create `path` with `posts` analyzed posts spread over SEED_DAYS
+
+    The corpus is analyzed once and cycled through, so seeding 10M posts
+    costs one analysis pass over CORPUS_SIZE texts plus the inserts (and the
+    rollup and alert triggers they fire).
+    """
+    from analysis import analyze_batch
+    from main import BULK_INSERT_SQL
+    from migrations import migrate
+
+    corpus = generate_corpus(min(posts, CORPUS_SIZE), seed)
+    analyses = analyze_batch([post['content'] for post in corpus])
+    templates = [
+        (post['content'], post['author'], analysis['sentiment']['score'], analysis['sentiment']['label'],
+         analysis['misinformation_risk'], post['category'], analysis['priority_score'])
+        for post, analysis in zip(corpus, analyses)
+    ]
+
+    partial = path + '.partial'
+    if os.path.exists(partial):
+        os.remove(partial)
+    conn = sqlite3.connect(partial)
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+    migrate(conn)
+
+    now = datetime.now().replace(microsecond=0)
+    step = timedelta(days=SEED_DAYS) / posts
+    start = time.perf_counter()
+    for first in range(0, posts, SEED_CHUNK_SIZE):
+        rows = []
+        for i in range(first, min(first + SEED_CHUNK_SIZE, posts)):
+            content, author, score, label, risk, category, priority = templates[i % len(templates)]
+            # Oldest first, so ids follow timestamps as they do in production
+            timestamp = (now - step * (posts - i)).strftime('%Y-%m-%d %H:%M:%S')
+            rows.append((content, author, timestamp, score, label, risk, category, priority))
+        conn.executemany(BULK_INSERT_SQL, rows)
+        conn.commit()
+        done = first + len(rows)
+        print(f"  {done:,}/{posts:,} posts ({done / (time.perf_counter() - start):,.0f}/s)", end='\r')
+    print()
+    conn.execute('ANALYZE')
+    conn.commit()
+    conn.close()
+    os.replace(partial, path)
+
+
+def seeded_database(args) -> str:
+    os.makedirs(args.seed_dir, exist_ok=True)
+    path = os.path.join(args.seed_dir, f'load-{args.posts}-seed{args.seed}.db')
+    if os.path.exists(path) and not args.reseed:
+        print(f"🗄️  Reusing {path}")
+    else:
+        print(f"🗄️  Seeding {args.posts:,} posts into {path}...")
+        seed_database(path, args.posts, args.seed)
+    return path
+
+
+# Server
+def start_server(args, database: str, workdir: str) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=database)
+    if args.server == 'gunicorn':
+        env.update(PYTHONPATH=BACKEND, WEB_CONCURRENCY=str(args.workers), BIND=f'127.0.0.1:{args.port}')
+        command = [sys.executable, '-m', 'gunicorn', '-c', os.path.join(BACKEND, 'gunicorn.conf.py'), 'main:app']
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'main:app', '--app-dir', os.path.abspath(BACKEND),
+                   '--port', str(args.port), '--log-level', 'warning']
+    return subprocess.Popen(command, cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_ready(url: str, server: subprocess.Popen, timeout: float = 120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("Server exited during startup")
+        try:
+            if httpx.get(f'{url}/api/health', timeout=5).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server did not become ready within {timeout}s")
+
+
+# Workload
+class Workload:
+    """Picks and sends requests; one instance is shared by every client"""
+
+    def __init__(self, corpus: list, mix: str, seed: int):
+        self.corpus = corpus
+        self.weights = dict(READ_WEIGHTS)
+        self.weights.update({name: weight * MIXES[mix] for name, weight in WRITE_WEIGHTS.items()})
+        self.names = list(self.weights)
+        self.rng = random.Random(seed)
+        self.alert_ids = []
+        self.sent = 0
+
+    def pick(self) -> str:
+        return self.rng.choices(self.names, weights=[self.weights[name] for name in self.names])[0]
+
+    def post(self) -> dict:
+        post = self.rng.choice(self.corpus)
+        return {'content': post['content'], 'author': post['author'], 'category': post['category']}
+
+    def texts(self, count: int) -> list:
+        return [post['content'] for post in self.rng.sample(self.corpus, min(count, len(self.corpus)))]
+
+    async def send(self, client: httpx.AsyncClient, name: str, state: dict) -> httpx.Response:
+        self.sent += 1
+        if name == 'GET /api/posts':
+            return await client.get('/api/posts', params={'limit': 20, 'offset': self.rng.randrange(0, 1000)})
+        if name == 'GET /api/posts (cursor)':
+            # Each client pages forward through one category and starts over at the end
+            params = {'limit': 20}
+            if state.get('cursor'):
+                params['cursor'] = state['cursor']
+            else:
+                params['category'] = self.rng.choice(self.corpus)['category']
+            response = await client.get('/api/posts', params=params)
+            state['cursor'] = response.headers.get('X-Next-Cursor')
+            return response
+        if name == 'GET /api/alerts':
+            response = await client.get('/api/alerts')
+            if response.status_code == 200:
+                self.alert_ids = [alert['id'] for alert in response.json()]
+            return response
+        if name == 'POST /api/posts':
+            return await client.post('/api/posts', json=self.post())
+        if name == 'POST /api/posts/bulk':
+            return await client.post('/api/posts/bulk', json=[self.post() for _ in range(BATCH_SIZE)])
+        if name == 'POST /api/analyze':
+            return await client.post('/api/analyze', json={'content': self.rng.choice(self.corpus)['content']})
+        if name == 'POST /api/analyze/batch':
+            return await client.post('/api/analyze/batch', json=[{'content': text} for text in self.texts(BATCH_SIZE)])
+        if name == 'POST /api/sentiment-analysis':
+            return await client.post('/api/sentiment-analysis', json={'content': self.rng.choice(self.corpus)['content']})
+        if name == 'POST /api/alerts/{alert_id}/acknowledge':
+            # Acknowledging an unknown or already acknowledged alert is a
+            # valid request too, so fall back to the lowest id
+            alert_id = self.alert_ids.pop() if self.alert_ids else 1
+            return await client.post(f'/api/alerts/{alert_id}/acknowledge')
+        method, path = name.split(' ', 1)
+        return await client.request(method, path)
+
+
+async def stream_subscriber(url: str, counts: dict):
+    """Hold an /api/stream connection open, counting the events it receives"""
+    async with httpx.AsyncClient(base_url=url, timeout=None) as client:
+        async with client.stream('GET', '/api/stream') as response:
+            async for line in response.aiter_lines():
+                if line.startswith('event:'):
+                    counts['events'] += 1
+
+
+async def drive(url: str, workload: Workload, args) -> dict:
+    """Run warmup then the measured phase; returns latencies and errors per endpoint"""
+    latencies = {name: [] for name in workload.names}
+    errors = {name: 0 for name in workload.names}
+    stream = {'events': 0}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    subscribers = [asyncio.ensure_future(stream_subscriber(url, stream)) for _ in range(args.stream_clients)]
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        measuring = False
+
+        async def loop(deadline):
+            state = {}
+            while time.perf_counter() < deadline:
+                name = workload.pick()
+                start = time.perf_counter()
+                try:
+                    response = await workload.send(client, name, state)
+                    failed = response.status_code >= 500 or (
+                        response.status_code >= 400 and name != 'POST /api/alerts/{alert_id}/acknowledge')
+                except httpx.HTTPError:
+                    failed = True
+                if measuring:
+                    latencies[name].append(time.perf_counter() - start)
+                    errors[name] += failed
+
+        if args.warmup:
+            await asyncio.gather(*(loop(time.perf_counter() + args.warmup) for _ in range(args.concurrency)))
+        measuring = True
+        stream['events'] = 0
+        start = time.perf_counter()
+        await asyncio.gather(*(loop(start + args.duration) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    for subscriber in subscribers:
+        subscriber.cancel()
+    await asyncio.gather(*subscribers, return_exceptions=True)
+    return {'latencies': latencies, 'errors': errors, 'elapsed': elapsed, 'stream_events': stream['events']}
+
+
+# Reporting
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    if not latencies:
+        return {'requests': 0, 'errors': 0, 'throughput': 0.0}
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput': round(len(latencies) / elapsed, 2),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+        **{f'p{q}_ms': round(percentile(latencies, q) * 1000, 3) for q in (50, 90, 95, 99)},
+        'max_ms': round(latencies[-1] * 1000, 3),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def build_report(run: dict, args) -> dict:
+    everything = [latency for values in run['latencies'].values() for latency in values]
+    return {
+        'config': {
+            'scale': args.scale, 'posts': args.posts, 'mix': args.mix, 'concurrency': args.concurrency,
+            'duration': args.duration, 'stream_clients': args.stream_clients,
+            'server': 'external' if args.url else args.server,
+            'workers': args.workers if args.server == 'gunicorn' and not args.url else 1,
+            'seed': args.seed,
+        },
+        'environment': {
+            'revision': git_revision(), 'python': platform.python_version(),
+            'platform': platform.platform(), 'cpus': os.cpu_count(),
+            'started': datetime.now().isoformat(timespec='seconds'),
+        },
+        'overall': summarize(everything, sum(run['errors'].values()), run['elapsed']),
+        'endpoints': {
+            name: summarize(run['latencies'][name], run['errors'][name], run['elapsed'])
+            for name in run['latencies'] if run['latencies'][name]
+        },
+        'stream_events': run['stream_events'],
+    }
+
+
+def print_report(report: dict):
+    overall = report['overall']
+    print(f"\n📊 {overall['requests']:,} requests, {overall['throughput']:,.1f} req/s, "
+          f"{overall['errors']:,} errors")
+    print(f"  {'endpoint':<42} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, stats in [('overall', overall)] + sorted(report['endpoints'].items()):
+        print(f"  {name:<42} {stats['throughput']:>8,.1f} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} "
+              f"{stats['p99_ms']:>8.2f} {stats['errors']:>7,}")
+    print(f"  /api/stream events delivered: {report['stream_events']:,}")
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """Regressions of `report` against `baseline`, as printable lines"""
+    regressions = []
+
+    def check(label, current, previous, keys, min_requests):
+        if current.get('requests', 0) < min_requests or previous.get('requests', 0) < min_requests:
+            return
+        for key in keys:
+            before, after = previous[key], current[key]
+            if not before:
+                continue
+            change = after / before - 1
+            worse = change < -tolerance if key == 'throughput' else change > tolerance
+            if worse:
+                regressions.append(f"{label} {key}: {before:,.2f} → {after:,.2f} ({change:+.0%})")
+        if current['errors'] > previous['errors'] * (current['requests'] / previous['requests']) + 1:
+            regressions.append(f"{label} errors: {previous['errors']:,} → {current['errors']:,}")
+
+    check('overall', report['overall'], baseline['overall'], ('throughput', 'p50_ms', 'p95_ms', 'p99_ms'), 1)
+    # Per endpoint request counts follow the mix, so only latency is compared,
+    # and only where there are enough samples for p95 to mean something
+    for name, stats in report['endpoints'].items():
+        if name in baseline['endpoints']:
+            check(name, stats, baseline['endpoints'][name], ('p50_ms', 'p95_ms'), 100)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse load test and regression benchmark')
+    parser.add_argument('--scale', default='10k', help=f"posts to seed: {', '.join(SCALES)} or a number")
+    parser.add_argument('--mix', choices=list(MIXES), default='mixed')
+    parser.add_argument('--concurrency', type=int, default=32, help='concurrent clients, each sending one request at a time')
+    parser.add_argument('--duration', type=float, default=30, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='unmeasured seconds before the measurement')
+    parser.add_argument('--stream-clients', type=int, default=4, help='/api/stream connections held open')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--server', choices=['uvicorn', 'gunicorn'], default='uvicorn')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='gunicorn workers')
+    parser.add_argument('--port', type=int, default=8768)
+    parser.add_argument('--url', help='load an already running server instead (it must be seeded)')
+    parser.add_argument('--seed-dir', default=os.path.join(tempfile.gettempdir(), 'communitypulse-load'),
+                        help='where seeded databases are kept between runs')
+    parser.add_argument('--reseed', action='store_true', help='seed again even if a seeded database exists')
+    parser.add_argument('--seed-only', action='store_true', help='seed the database and exit')
+    parser.add_argument('--output', help='JSON report path (default: results/load-<scale>-<mix>.json)')
+    parser.add_argument('--baseline', help='baseline to compare with (default: baselines/load-<scale>-<mix>.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='allowed throughput drop or latency rise before the run fails')
+    args = parser.parse_args()
+
+    args.posts = scale_posts(args.scale)
+    name = f'load-{args.scale}-{args.mix}.json'
+    output = args.output or os.path.join(BENCHMARKS, 'results', name)
+    baseline_path = args.baseline or os.path.join(BENCHMARKS, 'baselines', name)
+
+    workdir = tempfile.mkdtemp(prefix='bench_load_')
+    server = None
+    try:
+        url = args.url
+        if not url:
+            seeded = seeded_database(args)
+            if args.seed_only:
+                return 0
+            database = os.path.join(workdir, 'bench_load.db')
+            shutil.copyfile(seeded, database)
+            url = f'http://127.0.0.1:{args.port}'
+            server = start_server(args, database, workdir)
+            wait_ready(url, server)
+
+        workload = Workload(generate_corpus(min(args.posts, CORPUS_SIZE), args.seed + 1), args.mix, args.seed)
+        print(f"🚀 {args.mix} load on {args.posts:,} posts: {args.concurrency} clients, "
+              f"{args.stream_clients} stream subscribers, {args.warmup:.0f}s warmup + {args.duration:.0f}s")
+        run = asyncio.run(drive(url, workload, args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = build_report(run, args)
+    print_report(report)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Report written to {output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+        shutil.copyfile(output, baseline_path)
+        print(f"💾 Saved as baseline {baseline_path}")
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print(f"ℹ️  No baseline at {baseline_path}; record one with --save-baseline")
+        return 0
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    if baseline['config'] != report['config']:
+        print(f"⚠️  Baseline {baseline_path} was recorded with a different configuration, not comparing")
+        print(f"  baseline: {baseline['config']}\n  this run: {report['config']}")
+        return 1
+
+    regressions = compare(report, baseline, args.tolerance)
+    print(f"\n📈 Against baseline {baseline['environment']['revision']} "
+          f"({baseline['overall']['throughput']:,.1f} req/s), tolerance {args.tolerance:.0%}")
+    for line in regressions:
+        print(f"❌ {line}")
+    if regressions:
+        return 1
+    print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
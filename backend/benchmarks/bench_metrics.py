@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Metrics Overhead Benchmark
+Measures what the metrics subsystem costs, first per operation in-process
+(counter increment, histogram observation, stage timer, timed SQLite cursor,
+request middleware), then end to end: the same uvicorn server is started
+with METRICS_ENABLED=0 and =1, alternately, and driven by closed-loop httpx
+clients with a mix of GET /api/posts, GET /api/analytics and POST
+/api/analyze (the response cache is off so every request does its work).
+
+Usage: python benchmarks/bench_metrics.py [--duration 10] [--rounds 3]
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_storage import percentile
+from metrics import Counter, Histogram, MetricsMiddleware, Registry, TimedConnection, stage
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+WORDS = ['pool', 'park', 'noise', 'parking', 'trash', 'great', 'terrible', 'urgent',
+         'neighbors', 'lights', 'water', 'community', 'meeting', 'broken', 'thanks']
+
+
+def per_call(fn, number):
+    """Best-of-5 nanoseconds per call of `fn`"""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e9
+
+
+def micro(number):
+    registry = Registry()
+    counter = Counter('bench_total', 'Benchmark counter', ('route',), registry=registry)
+    histogram = Histogram('bench_seconds', 'Benchmark histogram', ('route',), registry=registry)
+
+    def timed_block():
+        with stage('bench'):
+            pass
+
+    results = {
+        'counter inc': per_call(lambda: counter.labels('/api/posts').inc(), number),
+        'histogram observe': per_call(lambda: histogram.labels('/api/posts').observe(0.0042), number),
+        'stage timer': per_call(timed_block, number),
+    }
+
+    # The same point query through a plain and a timed connection
+    rows = [(i, f'post {i}') for i in range(1000)]
+    queries = {}
+    for name, factory in (('plain', sqlite3.Connection), ('timed', TimedConnection)):
+        conn = sqlite3.connect(':memory:', factory=factory)
+        conn.execute('CREATE TABLE posts (id INTEGER PRIMARY KEY, content TEXT)')
+        conn.executemany('INSERT INTO posts VALUES (?, ?)', rows)
+        cursor = conn.cursor()
+        queries[name] = per_call(
+            lambda: cursor.execute('SELECT content FROM posts WHERE id = ?', (42,)).fetchone(), number)
+    results['SQLite point query'] = queries['plain']
+    results['  + statement timing'] = queries['timed'] - queries['plain']
+
+    # A bare ASGI app with and without the middleware in front
+    async def app(scope, receive, send):
+        await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b'{}'})
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        pass
+
+    scope = {'type': 'http', 'method': 'GET', 'path': '/api/posts', 'app': None}
+    middleware = MetricsMiddleware(app)
+
+    async def requests(handler, count):
+        start = time.perf_counter()
+        for _ in range(count):
+            await handler(dict(scope), receive, send)
+        return time.perf_counter() - start
+
+    loop = asyncio.new_event_loop()
+    try:
+        bare = min(loop.run_until_complete(requests(app, number)) for _ in range(5))
+        wrapped = min(loop.run_until_complete(requests(middleware, number)) for _ in range(5))
+    finally:
+        loop.close()
+    results['request middleware'] = (wrapped - bare) / number * 1e9
+    return results
+
+
+async def drive(url, connections, duration, seed):
+    latencies = []
+    async with httpx.AsyncClient(base_url=url, timeout=60,
+                                 limits=httpx.Limits(max_connections=connections)) as client:
+        deadline = time.perf_counter() + duration
+
+        async def loop(slot):
+            sent = 0
+            while time.perf_counter() < deadline:
+                sent += 1
+                start = time.perf_counter()
+                kind = (slot + sent) % 4
+                if kind == 0:
+                    # Unique text so the analysis cache never answers
+                    words = ' '.join(WORDS[(slot + sent + i) % len(WORDS)] for i in range(12))
+                    response = await client.post('/api/analyze', json={'content': f"{words} {seed}-{slot}-{sent}"})
+                elif kind == 1:
+                    response = await client.get('/api/analytics')
+                else:
+                    response = await client.get('/api/posts', params={'limit': 50, 'offset': sent % 200})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(loop(slot) for slot in range(connections)))
+    latencies.sort()
+    return latencies
+
+
+def run_server(enabled, args, seed):
+    workdir = tempfile.mkdtemp(prefix='bench_metrics_')
+    env = dict(os.environ,
+               DATABASE_URL=os.path.join(workdir, 'bench_metrics.db'),
+               METRICS_ENABLED='1' if enabled else '0',
+               RESPONSE_CACHE_BACKEND='none')
+    try:
+        subprocess.run([sys.executable, os.path.join(BACKEND, 'manage.py'), 'seed-demo'],
+                       cwd=workdir, env=env, stdout=subprocess.DEVNULL, check=True)
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'main:app', '--app-dir', os.path.abspath(BACKEND),
+             '--port', str(args.port), '--log-level', 'warning'],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        url = f'http://127.0.0.1:{args.port}'
+        try:
+            deadline = time.time() + 60
+            while True:
+                try:
+                    if httpx.get(f'{url}/api/health', timeout=5).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.time() > deadline:
+                    raise RuntimeError("Server did not start within 60s")
+                time.sleep(0.1)
+            # Warm up caches and connections before measuring
+            asyncio.run(drive(url, args.connections, 1, seed))
+            latencies = asyncio.run(drive(url, args.connections, args.duration, seed))
+            return len(latencies) / args.duration, latencies
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse metrics overhead benchmark')
+    parser.add_argument('--number', type=int, default=100000, help='calls per micro-benchmark')
+    parser.add_argument('--duration', type=float, default=10, help='seconds of load per server run')
+    parser.add_argument('--rounds', type=int, default=3, help='runs per setting, alternating')
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--port', type=int, default=8767)
+    parser.add_argument('--skip-server', action='store_true', help='only run the in-process measurements')
+    args = parser.parse_args()
+
+    print(f"🚀 Timing metric operations ({args.number:,} calls each)...")
+    print("\n📊 Cost per operation")
+    for name, ns in micro(args.number).items():
+        print(f"  {name:<22} {ns:>8,.0f} ns")
+
+    if args.skip_server:
+        return
+
+    print(f"\n🚀 Driving the API with metrics off and on, {args.rounds}x{args.duration:.0f}s each "
+          f"({args.connections} connections)...")
+    samples = {False: [], True: []}
+    for round_number in range(args.rounds):
+        # Swap the order every round so drift on the machine hits both settings
+        for enabled in ((False, True) if round_number % 2 == 0 else (True, False)):
+            rate, latencies = run_server(enabled, args, round_number)
+            samples[enabled].append((rate, percentile(latencies, 50), percentile(latencies, 99)))
+            print(f"  round {round_number + 1} metrics {'on ' if enabled else 'off'}: {rate:,.0f} req/s")
+
+    print(f"\n📊 Median over {args.rounds} rounds")
+    print(f"  {'':<12} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    medians = {}
+    for enabled in (False, True):
+        rate, p50, p99 = (statistics.median(column) for column in zip(*samples[enabled]))
+        medians[enabled] = rate
+        print(f"  {'metrics on' if enabled else 'metrics off':<12} {rate:>9,.0f} {p50 * 1000:>8.2f} {p99 * 1000:>8.2f}")
+    print(f"  Throughput overhead: {(1 - medians[True] / medians[False]):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Posts Pagination Benchmark
+Seeds a migrated database (5M posts by default), then compares the cost of
+fetching one /api/posts page with LIMIT/OFFSET against a (timestamp, id)
+cursor at increasing depths, and walks the whole table page by page with
+cursors to show the per-page latency stays flat from the first page to the last.
+
+Usage: python benchmarks/bench_pagination.py [--rows 5000000] [--page-size 100]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_storage import percentile
+from migrations import migrate
+from test_query_plans import SEED_SQL
+
+
+def seed(path: str, rows: int):
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    conn.execute(SEED_SQL, (rows,))
+    conn.commit()
+    conn.close()
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse posts pagination benchmark')
+    parser.add_argument('--rows', type=int, default=5000000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        print(f"🌱 Seeding {args.rows:,} posts...")
+        start = time.perf_counter()
+        seed(path, args.rows)
+        print(f"   done in {time.perf_counter() - start:.1f} s")
+
+        # The endpoint's own query code, pointed at the seeded database
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+        from main import decode_cursor, encode_cursor, read_posts_page
+
+        conn = sqlite3.connect(path)
+        cursor = conn.cursor()
+        size = args.page_size
+
+        depths = [d for d in (0, 10000, 100000, 1000000, 4000000) if d < args.rows]
+        print(f"\n📊 One page of {size} at depth (best of {args.repeat})")
+        print(f"  {'depth':>10}  {'offset':>12}  {'cursor':>12}")
+        for depth in depths:
+            offset_time = best_of(lambda: read_posts_page(cursor, size, depth), args.repeat)
+            # Cursor that a client paging from the top would hold at this depth
+            if depth:
+                boundary = read_posts_page(cursor, 1, depth - 1)[0][0]
+                page = decode_cursor(encode_cursor(boundary, 'next'))
+            else:
+                page = None
+            cursor_time = best_of(lambda: read_posts_page(cursor, size, 0, page), args.repeat)
+            print(f"  {depth:>10,}  {offset_time * 1000:9.2f} ms  {cursor_time * 1000:9.2f} ms")
+
+        print(f"\n🚀 Walking all {args.rows:,} posts with cursors...")
+        latencies = []
+        seen = 0
+        page = None
+        start = time.perf_counter()
+        while True:
+            page_start = time.perf_counter()
+            posts, next_cursor, _ = read_posts_page(cursor, size, 0, page)
+            latencies.append(time.perf_counter() - page_start)
+            seen += len(posts)
+            if not next_cursor:
+                break
+            page = decode_cursor(next_cursor)
+        elapsed = time.perf_counter() - start
+        conn.close()
+
+    tenth = max(1, len(latencies) // 10)
+    first = sum(latencies[:tenth]) / tenth
+    last = sum(latencies[-tenth:]) / tenth
+    latencies.sort()
+    print("\n📊 Cursor walk")
+    print(f"  posts seen                {seen:>12,}")
+    print(f"  pages                     {len(latencies):>12,}  ({len(latencies) / elapsed:,.0f} pages/sec)")
+    print(f"  p50 / p99 per page        {percentile(latencies, 50) * 1000:9.2f} ms / "
+          f"{percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"  first / last 10% mean     {first * 1000:9.2f} ms / {last * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Live Update Fan-out Benchmark
+Runs the /api/stream broker in-process with thousands of idle subscribers,
+each parked in Broker.get() like an idle SSE connection, and reports the
+memory per subscriber, how long one published post takes to reach all of
+them, and how much a stalled client can buffer under a bulk ingest.
+
+Usage: python benchmarks/bench_pubsub.py [--subscribers 10000] [--rounds 20]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_storage import percentile
+from pubsub import Broker
+from rollups import merge_rollup_deltas, rollup_deltas
+
+
+def sse_message(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+def sample_post(i):
+    return {
+        'id': i,
+        'content': f"Benchmark post {i} about the community garden and parking",
+        'author': f"user{i % 500}",
+        'timestamp': '2024-01-07 14:30:00',
+        'sentiment_score': 0.4,
+        'sentiment_label': 'positive',
+        'misinformation_risk': 0.1,
+        'category': 'amenities',
+        'priority_score': 0.2,
+    }
+
+
+async def consumer(broker, subscription, received):
+    while True:
+        messages = await broker.get(subscription)
+        received[0] += len(messages)
+
+
+async def run(args):
+    broker = Broker(sse_message, coalesce={'rollup': merge_rollup_deltas},
+                    max_subscribers=args.subscribers + 1)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    received = [0]
+    subscriptions = [broker.subscribe(('post', 'alert', 'rollup')) for _ in range(args.subscribers)]
+    tasks = [asyncio.ensure_future(consumer(broker, subscription, received)) for subscription in subscriptions]
+    await asyncio.sleep(0.1)
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / args.subscribers
+    tracemalloc.stop()
+
+    # One post (plus its rollup delta) to every idle subscriber
+    latencies = []
+    for i in range(args.rounds):
+        received[0] = 0
+        post = sample_post(i)
+        start = time.perf_counter()
+        broker.publish('post', [post])
+        broker.publish('rollup', [rollup_deltas([post])])
+        while received[0] < 2 * args.subscribers:
+            await asyncio.sleep(0)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for subscription in subscriptions:
+        broker.unsubscribe(subscription)
+
+    # A client that stops reading during a bulk ingest
+    stalled = broker.subscribe(('post', 'rollup'))
+    posts = [sample_post(i) for i in range(args.bulk)]
+    start = time.perf_counter()
+    for i in range(0, len(posts), 1000):
+        chunk = posts[i:i + 1000]
+        broker.publish('post', chunk)
+        broker.publish('rollup', [rollup_deltas(chunk)])
+    publish_time = time.perf_counter() - start
+    queued, coalesced, dropped = len(stalled.events), len(stalled.coalesced), stalled.dropped
+    messages = await broker.get(stalled)
+    broker.unsubscribe(stalled)
+
+    print("\n📊 Results")
+    print(f"  idle subscribers              {args.subscribers:>10,}")
+    print(f"  memory per idle subscriber    {per_subscriber / 1024:10.2f} KiB (subscription + waiting task)")
+    print(f"  post + rollup to all, p50     {percentile(latencies, 50) * 1000:10.2f} ms")
+    print(f"  post + rollup to all, p99     {percentile(latencies, 99) * 1000:10.2f} ms")
+    print(f"  stalled client, {args.bulk:,} posts   {queued:>6} queued, {dropped:,} dropped, "
+          f"{coalesced} coalesced rollup, {len(messages)} messages on resume")
+    print(f"  publish rate (1 subscriber)   {args.bulk / publish_time:10,.0f} posts/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse live update fan-out benchmark')
+    parser.add_argument('--subscribers', type=int, default=10000)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--bulk', type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"🚀 Fanning out to {args.subscribers:,} subscribers...")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Response Cache Benchmark
+Writes a post, then fires a burst of simultaneous GET /api/dashboard (and
+analytics/health) requests and reports how many recomputations the
+burst caused (from /api/cache/responses) and its latency. Run it against a
+server with RESPONSE_CACHE_BACKEND=none to see the uncached baseline.
+
+Usage:
+    uvicorn main:app --port 8000 &
+    python benchmarks/bench_response_cache.py --concurrency 1000 --rounds 5
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from bench_storage import percentile
+
+ENDPOINTS = ['/api/dashboard', '/api/analytics', '/api/health']
+
+
+async def burst(client, path, concurrency):
+    async def one():
+        start = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one() for _ in range(concurrency)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=120) as client:
+        stats = (await client.get('/api/cache/responses')).json()
+        print(f"🚀 {args.concurrency} simultaneous requests per endpoint after each write "
+              f"(backend: {stats['backend']})")
+
+        for path in ENDPOINTS:
+            renders = []
+            walls = []
+            latencies = []
+            for round_number in range(args.rounds):
+                await client.post('/api/posts', json={
+                    'content': f"Response cache benchmark post {round_number} {time.time()}",
+                    'author': 'Benchmark',
+                })
+                before = (await client.get('/api/cache/responses')).json()
+                wall, round_latencies = await burst(client, path, args.concurrency)
+                after = (await client.get('/api/cache/responses')).json()
+                renders.append(after['misses'] - before['misses'])
+                walls.append(wall)
+                latencies.extend(round_latencies)
+            latencies.sort()
+
+            # With the cache disabled every request renders
+            render_note = (f"{sum(renders) / len(renders):.1f} renders/burst" if stats['enabled']
+                           else f"{args.concurrency} renders/burst")
+            print(f"  {path:<16} {render_note:>22}  burst {sum(walls) / len(walls) * 1000:8.1f} ms  "
+                  f"p50 {percentile(latencies, 50) * 1000:7.1f} ms  p99 {percentile(latencies, 99) * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse response cache benchmark')
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--concurrency', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
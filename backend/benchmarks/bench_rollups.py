@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Analytics Rollup Benchmark
+Times the full-table aggregates /api/analytics, /api/health and the dashboard
+used to run against the same figures read from the post_rollups table, and
+the insert cost the rollup triggers add.
+
+Usage: python benchmarks/bench_rollups.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_storage import INSERT_SQL, random_post, seed_database
+from rollups import create_rollups, read_categories, read_daily, read_totals, rebuild_rollups
+
+# What read_analytics, read_community_health and read_dashboard ran per request
+FULL_SCAN_QUERIES = [
+    "SELECT COUNT(*) FROM posts",
+    "SELECT sentiment_label, COUNT(*) FROM posts GROUP BY sentiment_label",
+    "SELECT AVG(sentiment_score) FROM posts",
+    "SELECT COUNT(*) FROM posts WHERE misinformation_risk > 0.5",
+    """SELECT DATE(timestamp) as date, COUNT(*), AVG(sentiment_score) FROM posts
+       WHERE timestamp >= date('now', '-7 days') GROUP BY DATE(timestamp) ORDER BY date""",
+    "SELECT category, COUNT(*) as count, AVG(sentiment_score) FROM posts GROUP BY category ORDER BY count DESC",
+]
+
+
+def full_scan(cursor):
+    for query in FULL_SCAN_QUERIES:
+        cursor.execute(query)
+        cursor.fetchall()
+
+
+def from_rollups(cursor):
+    read_totals(cursor)
+    read_daily(cursor, '0000-00-00')
+    read_categories(cursor)
+
+
+def best_of(fn, cursor, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(cursor)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def insert_rate(conn, rows):
+    start = time.perf_counter()
+    conn.executemany(INSERT_SQL, (random_post(i) for i in range(rows)))
+    conn.commit()
+    return rows / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse analytics rollup benchmark')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--insert-rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        print(f"🌱 Seeding {args.rows:,} posts...")
+        seed_database(path, args.rows)
+        conn = sqlite3.connect(path)
+        cursor = conn.cursor()
+        # Spread posts over a year so the rollups have realistic cardinality
+        cursor.execute("UPDATE posts SET timestamp = datetime('now', '-' || (id % 365) || ' days')")
+        conn.commit()
+
+        plain_insert = insert_rate(conn, args.insert_rows)
+        scan_time = best_of(full_scan, cursor, args.repeat)
+
+        start = time.perf_counter()
+        create_rollups(cursor)
+        rollup_rows = rebuild_rollups(cursor)
+        conn.commit()
+        rebuild_time = time.perf_counter() - start
+
+        rollup_time = best_of(from_rollups, cursor, args.repeat)
+        trigger_insert = insert_rate(conn, args.insert_rows)
+        conn.close()
+
+    print("\n📊 Results")
+    print(f"  analytics figures, full scans   {scan_time * 1000:10.2f} ms")
+    print(f"  analytics figures, rollups      {rollup_time * 1000:10.2f} ms  "
+          f"({scan_time / rollup_time:.0f}x, {rollup_rows:,} rollup rows)")
+    print(f"  rebuild-rollups                 {rebuild_time:10.2f} s")
+    print(f"  inserts without triggers        {plain_insert:10.0f} rows/sec")
+    print(f"  inserts with rollup triggers    {trigger_insert:10.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
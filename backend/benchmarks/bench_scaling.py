@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Multi-Worker Scaling Benchmark
+Starts the API under gunicorn (gunicorn.conf.py) with 1, 2, ... N workers on
+a fresh database, drives it with closed-loop httpx clients in separate
+processes, and reports requests/sec, latency and speedup over one worker.
+The load mixes POST /api/analyze with unique content (CPU-bound scoring) and
+GET /api/posts pages (SQLite reads and JSON), with the response cache off so
+every request does its work.
+
+Scaling is bounded by the cores actually available, and the client
+processes share them with the workers: on a machine with fewer cores than
+--max-workers plus --client-processes the curve flattens early.
+
+Usage: python benchmarks/bench_scaling.py [--max-workers 4] [--duration 10]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_storage import percentile
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+WORDS = ['pool', 'park', 'noise', 'parking', 'trash', 'great', 'terrible', 'urgent',
+         'neighbors', 'lights', 'water', 'community', 'meeting', 'broken', 'thanks']
+
+
+async def drive(url, connections, duration, analyze_share, seed):
+    latencies = []
+    pick = random.Random(seed)
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+
+        async def loop(slot):
+            sent = 0
+            while time.perf_counter() < deadline:
+                sent += 1
+                start = time.perf_counter()
+                if pick.random() < analyze_share:
+                    # Unique text so the analysis cache never answers
+                    words = ' '.join(WORDS[(seed + slot + sent + i) % len(WORDS)] for i in range(12))
+                    response = await client.post('/api/analyze', json={
+                        'content': f"{words} {seed}-{slot}-{sent}", 'author': 'Benchmark',
+                    })
+                else:
+                    response = await client.get('/api/posts', params={'limit': 50, 'offset': sent % 200})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(loop(slot) for slot in range(connections)))
+    return latencies
+
+
+def client_process(url, connections, duration, analyze_share, seed, results):
+    results.put(asyncio.run(drive(url, connections, duration, analyze_share, seed)))
+
+
+def start_server(workers, port, workdir):
+    env = dict(os.environ,
+               PYTHONPATH=BACKEND,
+               WEB_CONCURRENCY=str(workers),
+               BIND=f'127.0.0.1:{port}',
+               DATABASE_URL=os.path.join(workdir, 'bench_scaling.db'),
+               RESPONSE_CACHE_BACKEND='none')
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', os.path.join(BACKEND, 'gunicorn.conf.py'), 'main:app'],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_ready(url, workers, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            # Hit it a few times so every worker has finished starting up
+            if all(httpx.get(f'{url}/api/health', timeout=5).status_code == 200 for _ in range(workers * 2)):
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server did not become ready within {timeout}s")
+
+
+def measure(url, args):
+    results = multiprocessing.Queue()
+    clients = [
+        multiprocessing.Process(target=client_process, args=(
+            url, args.connections, args.duration, args.analyze_share, seed, results))
+        for seed in range(args.client_processes)
+    ]
+    start = time.perf_counter()
+    for client in clients:
+        client.start()
+    latencies = []
+    for _ in clients:
+        latencies.extend(results.get())
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return len(latencies) / elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse multi-worker scaling benchmark')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--duration', type=float, default=10, help='seconds of load per worker count')
+    parser.add_argument('--connections', type=int, default=16, help='concurrent requests per client process')
+    parser.add_argument('--client-processes', type=int, default=2)
+    parser.add_argument('--analyze-share', type=float, default=0.5, help='fraction of requests that are /api/analyze')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    url = f'http://127.0.0.1:{args.port}'
+    counts = sorted({1, *range(2, args.max_workers + 1, 2), args.max_workers})
+    print(f"🚀 Scaling from 1 to {args.max_workers} workers on {os.cpu_count()} cores "
+          f"({args.client_processes}x{args.connections} connections, {args.duration:.0f}s each, "
+          f"{args.analyze_share:.0%} /api/analyze)")
+
+    rows = []
+    for workers in counts:
+        workdir = tempfile.mkdtemp(prefix='bench_scaling_')
+        server = start_server(workers, args.port, workdir)
+        try:
+            wait_ready(url, workers)
+            rate, latencies = measure(url, args)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+            shutil.rmtree(workdir, ignore_errors=True)
+        rows.append((workers, rate, percentile(latencies, 50), percentile(latencies, 99)))
+        print(f"  {workers} worker(s): {rate:,.0f} req/s")
+
+    baseline = rows[0][1]
+    print("\n📊 Throughput by worker count")
+    print(f"  {'workers':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'speedup':>8} {'per worker':>11}")
+    for workers, rate, p50, p99 in rows:
+        print(f"  {workers:>7} {rate:>9,.0f} {p50 * 1000:>8.1f} {p99 * 1000:>8.1f} "
+              f"{rate / baseline:>7.2f}x {rate / baseline / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Sentiment Engine Benchmark
+Scores NextDoor-style posts on one core with the current per-text VADER path
+and with LexiconEngine.score_batch at several batch sizes, then runs the
+whole analyze_batch (sentiment, misinformation and priority) with each
+engine at the worker chunk size. Results are docs/sec per core.
+
+Usage: python benchmarks/bench_sentiment.py [--posts 20000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data_collection'))
+
+import analysis
+from executors import ANALYSIS_CHUNK_SIZE
+from sentiment import LexiconEngine, VaderEngine
+
+
+def best_rate(fn, texts, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(texts)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def in_batches(score, size):
+    def run(texts):
+        for i in range(0, len(texts), size):
+            score(texts[i:i + size])
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse sentiment engine benchmark')
+    parser.add_argument('--posts', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(7)
+    from nextdoor_generator import NextDoorGenerator
+    with contextlib.redirect_stdout(io.StringIO()):
+        texts = [post['content'] for post in NextDoorGenerator().generate_dataset(args.posts)]
+    print(f"🚀 Scoring {len(texts):,} NextDoor-style posts on one core...")
+
+    vader = VaderEngine()
+    lexicon = LexiconEngine()
+    # Warm the token cache the way a long-running worker would have
+    lexicon.score_batch(texts)
+
+    baseline = best_rate(lambda batch: [vader.analyzer.polarity_scores(text) for text in batch], texts, args.repeat)
+    print("\n📊 Sentiment only (docs/sec per core)")
+    print(f"  {'VADER, one text at a time (current)':<40} {baseline:>10,.0f}")
+    for size in (1, 16, 64, ANALYSIS_CHUNK_SIZE, 4096):
+        rate = best_rate(in_batches(lexicon.score_batch, size), texts, args.repeat)
+        print(f"  {f'lexicon, batches of {size}':<40} {rate:>10,.0f}  {rate / baseline:5.1f}x")
+
+    print(f"\n📊 analyze_batch in chunks of {ANALYSIS_CHUNK_SIZE} (docs/sec per core)")
+    rates = {}
+    for engine in (vader, lexicon):
+        analysis.sentiment_engine = engine
+        rates[engine.name] = best_rate(in_batches(analysis.analyze_batch, ANALYSIS_CHUNK_SIZE), texts, args.repeat)
+        print(f"  {engine.name:<40} {rates[engine.name]:>10,.0f}  {rates[engine.name] / rates['vader']:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
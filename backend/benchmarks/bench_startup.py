@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures, in fresh interpreters, how long `import main` takes and how long a
+new uvicorn process takes to answer its first request (GET /api/health) and
+its first analysis (POST /api/analyze), against both a new and an existing
+database. Point --app-dir at another checkout to compare revisions, e.g.
+
+    git worktree add /tmp/before HEAD~1
+    python benchmarks/bench_startup.py --app-dir /tmp/before/backend
+
+Usage: python benchmarks/bench_startup.py [--repeat 5]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+IMPORT_SCRIPT = '''
+import sys, time
+sys.path.insert(0, sys.argv[1])
+start = time.perf_counter()
+import main
+print(time.perf_counter() - start)
+'''
+
+
+def environment(workdir):
+    return dict(os.environ, DATABASE_URL=os.path.join(workdir, 'bench_startup.db'))
+
+
+def import_time(app_dir, workdir):
+    output = subprocess.run(
+        [sys.executable, '-c', IMPORT_SCRIPT, os.path.abspath(app_dir)],
+        cwd=workdir, env=environment(workdir), capture_output=True, text=True, check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def first_requests(app_dir, workdir, port):
+    """Seconds from spawning the server to its first health response and first analysis"""
+    # One client made up front: building one per poll costs more than the
+    # startup being measured
+    client = httpx.Client(base_url=f'http://127.0.0.1:{port}', timeout=30)
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--app-dir', os.path.abspath(app_dir),
+         '--port', str(port), '--log-level', 'warning'],
+        cwd=workdir, env=environment(workdir), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+            try:
+                if client.get('/api/health').status_code == 200:
+                    break
+            except httpx.HTTPError:
+                time.sleep(0.01)
+        ready = time.perf_counter() - start
+        client.post('/api/analyze', json={'content': 'The park lights are broken again'}).raise_for_status()
+        return ready, time.perf_counter() - start
+    finally:
+        client.close()
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse startup benchmark')
+    parser.add_argument('--app-dir', default=BACKEND, help='backend directory to measure')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--port', type=int, default=8766)
+    args = parser.parse_args()
+
+    print(f"🚀 Starting {os.path.abspath(args.app_dir)} {args.repeat} times per case...")
+    results = {}
+    for database in ('new', 'existing'):
+        samples = {'import main': [], 'first response': [], 'first analysis': []}
+        workdir = tempfile.mkdtemp(prefix='bench_startup_')
+        try:
+            if database == 'existing':
+                # Let one server create (and, before seeding moved out, seed) the database
+                first_requests(args.app_dir, workdir, args.port)
+            for _ in range(args.repeat):
+                if database == 'new':
+                    shutil.rmtree(workdir)
+                    os.mkdir(workdir)
+                samples['import main'].append(import_time(args.app_dir, workdir))
+                if database == 'new':
+                    shutil.rmtree(workdir)
+                    os.mkdir(workdir)
+                ready, analyzed = first_requests(args.app_dir, workdir, args.port)
+                samples['first response'].append(ready)
+                samples['first analysis'].append(analyzed)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        results[database] = {name: statistics.median(values) for name, values in samples.items()}
+
+    print(f"\n📊 Median seconds over {args.repeat} runs")
+    print(f"  {'':<16} {'new database':>14} {'existing database':>18}")
+    for name in ('import main', 'first response', 'first analysis'):
+        print(f"  {name:<16} {results['new'][name]:>14.3f} {results['existing'][name]:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
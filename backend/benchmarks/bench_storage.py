@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Storage Layer Benchmark
+Compares per-request sqlite3.connect() against the pooled WAL storage layer
+under concurrent clients and reports p50/p99 latency for each.
+
+Usage: python benchmarks/bench_storage.py [--clients 200] [--requests 20] [--rows 50000]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from storage import Storage, StorageBusyError
+
+CATEGORIES = ['general', 'maintenance', 'security', 'amenities', 'noise']
+LABELS = ['positive', 'negative', 'neutral']
+
+# Index-backed reads so the numbers reflect connection and statement overhead
+# rather than full-table scans.
+READ_QUERIES = [
+    ("SELECT * FROM posts WHERE id = ?", (1,)),
+    ("""SELECT id, content, author, timestamp, sentiment_score, sentiment_label,
+               misinformation_risk, category, priority_score
+        FROM posts ORDER BY id DESC LIMIT ? OFFSET ?""", (20, 0)),
+]
+
+INSERT_SQL = '''
+    INSERT INTO posts (content, author, sentiment_score, sentiment_label,
+                       misinformation_risk, category, priority_score)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def seed_database(path: str, rows: int):
+    """Create the posts table and fill it with synthetic rows"""
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content TEXT NOT NULL,
+            author TEXT NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            sentiment_score REAL,
+            sentiment_label TEXT,
+            misinformation_risk REAL,
+            category TEXT,
+            priority_score REAL
+        )
+    ''')
+    conn.executemany(INSERT_SQL, (random_post(i) for i in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def random_post(i: int):
+    return (
+        f"Benchmark post {i} about the community garden and parking",
+        f"user{i % 500}",
+        random.uniform(-1, 1),
+        random.choice(LABELS),
+        random.random(),
+        random.choice(CATEGORIES),
+        random.random(),
+    )
+
+
+class PerRequestConnections:
+    """The original access pattern: a fresh connection for every request"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @contextmanager
+    def read(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def write(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def run_request(backend, write: bool, i: int) -> float:
+    start = time.perf_counter()
+    if write:
+        with backend.write() as conn:
+            conn.execute(INSERT_SQL, random_post(i))
+    else:
+        with backend.read() as conn:
+            for sql, params in READ_QUERIES:
+                conn.execute(sql, params).fetchall()
+    return time.perf_counter() - start
+
+
+def run_load(backend, clients: int, requests_per_client: int, write_ratio: float):
+    """Drive the backend from `clients` threads and collect latencies"""
+    total = clients * requests_per_client
+    plan = [random.random() < write_ratio for _ in range(total)]
+    latencies = []
+    errors = 0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        futures = [executor.submit(run_request, backend, write, i) for i, write in enumerate(plan)]
+        for future in futures:
+            try:
+                latencies.append(future.result())
+            except (sqlite3.OperationalError, StorageBusyError):
+                errors += 1
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': total,
+        'errors': errors,
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'mean_ms': statistics.mean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def print_result(name, result):
+    print(f"  {name:<24} p50={result['p50_ms']:8.2f} ms  p99={result['p99_ms']:8.2f} ms  "
+          f"mean={result['mean_ms']:8.2f} ms  {result['throughput']:8.0f} req/s  "
+          f"errors={result['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse storage benchmark')
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=20, help='Requests per client')
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--write-ratio', type=float, default=0.1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"🚀 Storage benchmark: {args.clients} clients x {args.requests} requests, "
+              f"{args.rows:,} rows, {args.write_ratio:.0%} writes")
+
+        before_path = os.path.join(tmp, 'before.db')
+        seed_database(before_path, args.rows)
+        before = run_load(PerRequestConnections(before_path), args.clients, args.requests, args.write_ratio)
+
+        after_path = os.path.join(tmp, 'after.db')
+        seed_database(after_path, args.rows)
+        storage = Storage(after_path)
+        after = run_load(storage, args.clients, args.requests, args.write_ratio)
+        storage.close()
+
+    print("\n📊 Results")
+    print_result('per-request connect', before)
+    print_result('pooled WAL storage', after)
+
+
+if __name__ == "__main__":
+    main()
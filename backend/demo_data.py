@@ -0,0 +1,89 @@
+"""
+Demo data for CommunityPulse
+Twenty realistic community posts, analyzed and stored with timestamps spread
+over the last week. Seeded on request with `python manage.py seed-demo`,
+never by the API server itself.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from analysis import analyze_sentiment, calculate_priority_score, detect_misinformation
+from migrations import migrate, migration_lock
+from storage import storage
+
+
+def generate_sample_data() -> int:
+    """Generate realistic sample data for demonstration
+
+    Only seeds an empty posts table; returns the number of posts added.
+    """
+    sample_posts = [
+        "The new pool hours are great! Everyone seems to be enjoying the extended time.",
+        "URGENT: There's a conspiracy about the water quality! They're hiding something from us!",
+        "The maintenance team did an excellent job fixing the elevator quickly.",
+        "Can we please address the noise complaints? Some residents are being very loud late at night.",
+        "The community garden is looking beautiful this spring. Great work everyone!",
+        "FAKE NEWS: The management is lying about the rent increase! Don't believe their propaganda!",
+        "The new security system is working well. I feel much safer now.",
+        "There's a suspicious person hanging around the parking lot. Should we report this?",
+        "The holiday decorations look amazing! Thank you to everyone who helped.",
+        "The garbage collection schedule changed without notice. This is very inconvenient.",
+        "The fitness center equipment is in excellent condition. Great job maintaining it!",
+        "EMERGENCY: The fire alarm system is broken! This is a safety hazard!",
+        "The community events this month were fantastic. Really brought everyone together.",
+        "The parking situation is getting worse. We need more spaces.",
+        "The landscaping team does such a beautiful job. The flowers are gorgeous!",
+        "CONSPIRACY: They're putting chemicals in the air vents to control us!",
+        "The package delivery system is working perfectly. Very convenient.",
+        "There's a leak in the basement that needs immediate attention.",
+        "The community newsletter is very informative. Keep up the good work!",
+        "The WiFi speed has improved significantly. Thank you for the upgrade!"
+    ]
+    
+    sample_authors = ["Sarah M.", "John D.", "Maria L.", "David K.", "Lisa R.", "Mike T.", "Emma W.", "Alex P.", "Rachel S.", "Tom B.", "Jennifer H.", "Robert C.", "Amanda F.", "Michael S.", "Jessica L.", "Christopher M.", "Nicole R.", "Daniel P.", "Ashley T.", "Kevin B."]
+    
+    # Under the migration lock so it cannot race a server starting up
+    with migration_lock(), storage.write() as conn:
+        migrate(conn)
+        cursor = conn.cursor()
+        
+        # Check if we already have data
+        cursor.execute("SELECT COUNT(*) FROM posts")
+        if cursor.fetchone()[0] > 0:
+            return 0
+        
+        for i, post in enumerate(sample_posts):
+            # Generate timestamp within last 7 days
+            days_ago = random.randint(0, 7)
+            hours_ago = random.randint(0, 23)
+            timestamp = datetime.now() - timedelta(days=days_ago, hours=hours_ago)
+            
+            # Analyze sentiment
+            sentiment_result = analyze_sentiment(post)
+            
+            # Detect misinformation
+            misinformation_risk = detect_misinformation(post)
+            
+            # Calculate priority
+            priority_score = calculate_priority_score(
+                sentiment_result['score'], 
+                misinformation_risk, 
+                len(post)
+            )
+            
+            cursor.execute('''
+                INSERT INTO posts (content, author, timestamp, sentiment_score, sentiment_label, 
+                                 misinformation_risk, category, priority_score)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                post, 
+                sample_authors[i % len(sample_authors)],
+                timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+                sentiment_result['score'],
+                sentiment_result['label'],
+                misinformation_risk,
+                random.choice(['general', 'maintenance', 'security', 'amenities', 'noise']),
+                priority_score
+            ))
+        return len(sample_posts)
@@ -0,0 +1,210 @@
+"""
+Off-loop execution for the CommunityPulse API
+Blocking SQLite calls run on a bounded thread pool and CPU-bound analysis on
+a process pool, so route handlers never stall the event loop.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from collections import deque
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Union
+
+from metrics import METRICS_ENABLED, collect_stages, observe_stage, record_stages
+from storage import storage
+
+# One thread per pooled reader plus the writer, so a DB task never waits on
+# the connection pool once it has a thread.
+DB_THREADS = int(os.getenv('DB_EXECUTOR_THREADS', str(storage.pool_size + 1)))
+ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', str(os.cpu_count() or 1)))
+# In-flight analysis tasks allowed per worker before callers start waiting
+ANALYSIS_QUEUE_DEPTH = int(os.getenv('ANALYSIS_QUEUE_DEPTH', '4'))
+ANALYSIS_TIMEOUT = float(os.getenv('ANALYSIS_TIMEOUT', '5'))
+# Items sent to a worker per task by map_analysis
+ANALYSIS_CHUNK_SIZE = int(os.getenv('ANALYSIS_CHUNK_SIZE', '256'))
+START_METHOD = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class OverloadedError(RuntimeError):
+    """Raised when the analysis pool stays saturated past ANALYSIS_TIMEOUT"""
+
+
+def _with_reader(fn: Callable, *args):
+    with storage.read() as conn:
+        return fn(conn.cursor(), *args)
+
+
+def _with_snapshot(fn: Callable, *args):
+    with storage.snapshot() as conn:
+        return fn(conn.cursor(), *args)
+
+
+def _warm_worker():
+    """Load the VADER lexicon once per worker instead of on the first task
+
+    Forked workers inherit the engine the server built at startup; spawned
+    ones build their own here.
+    """
+    import analysis
+    analysis.get_sentiment_engine()
+
+
+async def ordered_pipeline(batches: Union[Iterable, AsyncIterator], fn: Callable,
+                           max_in_flight: int) -> AsyncIterator:
+    """Yield `await fn(batch)` for each batch, in input order
+
+    Up to `max_in_flight` batches are processed concurrently, and no new
+    batch is pulled from `batches` until one finishes, so a streamed source
+    is consumed at the pace results are produced. If a batch fails or the
+    consumer stops early, the batches still in flight are cancelled.
+    """
+    pending = deque()
+
+    async def drain():
+        while len(pending) >= max_in_flight:
+            yield await pending.popleft()
+
+    try:
+        if hasattr(batches, '__aiter__'):
+            async for batch in batches:
+                pending.append(asyncio.ensure_future(fn(batch)))
+                async for result in drain():
+                    yield result
+        else:
+            for batch in batches:
+                pending.append(asyncio.ensure_future(fn(batch)))
+                async for result in drain():
+                    yield result
+
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            if not future.done():
+                future.cancel()
+            elif not future.cancelled():
+                # Retrieved so a failure nobody awaits is not logged as unhandled
+                future.exception()
+
+
+class Executors:
+    def __init__(self, db_threads: int = DB_THREADS, analysis_workers: int = ANALYSIS_WORKERS,
+                 queue_depth: int = ANALYSIS_QUEUE_DEPTH, timeout: float = ANALYSIS_TIMEOUT):
+        self.db_threads = db_threads
+        self.analysis_workers = analysis_workers
+        self.max_pending = max(1, analysis_workers) * queue_depth
+        self.timeout = timeout
+
+        self._db_pool: Optional[ThreadPoolExecutor] = None
+        self._analysis_pool: Optional[ProcessPoolExecutor] = None
+        self._analysis_slots: Optional[asyncio.Semaphore] = None
+        self.analysis_in_flight = 0
+
+    @property
+    def max_in_flight(self) -> int:
+        """Batches a streaming pipeline keeps in flight: enough to keep every
+        worker busy while the previous batch is written or sent"""
+        return max(1, self.analysis_workers) * 2
+
+    @property
+    def db_pool(self) -> ThreadPoolExecutor:
+        if self._db_pool is None:
+            self._db_pool = ThreadPoolExecutor(
+                max_workers=self.db_threads, thread_name_prefix='db'
+            )
+        return self._db_pool
+
+    @property
+    def analysis_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self._analysis_pool is None and self.analysis_workers > 0:
+            # fork shares the already loaded lexicon copy-on-write. With fork
+            # the executor starts every worker on first submit, which start()
+            # triggers before any DB threads exist.
+            self._analysis_pool = ProcessPoolExecutor(
+                max_workers=self.analysis_workers,
+                mp_context=multiprocessing.get_context(START_METHOD),
+                initializer=_warm_worker,
+            )
+        return self._analysis_pool
+
+    def start(self):
+        """Start the analysis workers up front instead of on the first request"""
+        if self.analysis_pool is not None:
+            self.analysis_pool.submit(_warm_worker).result()
+
+    async def run_db(self, fn: Callable, *args, **kwargs):
+        """Run a blocking storage call on the DB thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.db_pool, partial(fn, *args, **kwargs))
+
+    async def run_read(self, fn: Callable, *args):
+        """Run `fn(cursor, *args)` on the DB thread pool with a pooled reader"""
+        return await self.run_db(_with_reader, fn, *args)
+
+    async def run_snapshot(self, fn: Callable, *args):
+        """Like run_read, but every query `fn` runs sees the same snapshot"""
+        return await self.run_db(_with_snapshot, fn, *args)
+
+    async def run_analysis(self, fn: Callable, *args):
+        """Run CPU-bound analysis in a worker process
+
+        At most `max_pending` tasks are queued on the pool; further callers
+        wait for a slot and get OverloadedError if none frees up in time.
+        """
+        if self._analysis_slots is None:
+            self._analysis_slots = asyncio.Semaphore(self.max_pending)
+
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._analysis_slots.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise OverloadedError("Analysis workers are saturated, retry later")
+
+        self.analysis_in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            # analysis_pool is None when ANALYSIS_WORKERS=0: fall back to threads
+            pool = self.analysis_pool or self.db_pool
+            if not METRICS_ENABLED:
+                return await loop.run_in_executor(pool, fn, *args)
+
+            queued = time.perf_counter()
+            observe_stage('analysis_queue', queued - start)
+            # The worker's stage timings come back with the result
+            result, timings = await loop.run_in_executor(pool, collect_stages, fn, *args)
+            observe_stage('analysis_task', time.perf_counter() - queued)
+            record_stages(timings)
+            return result
+        finally:
+            self.analysis_in_flight -= 1
+            self._analysis_slots.release()
+
+    async def map_analysis(self, fn: Callable, items: List, chunk_size: int = ANALYSIS_CHUNK_SIZE) -> List:
+        """Split `items` into chunks, run `fn(chunk)` across the workers and
+        return the concatenated results in input order"""
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        results = await asyncio.gather(*(self.run_analysis(fn, chunk) for chunk in chunks))
+        return [result for chunk_results in results for result in chunk_results]
+
+    def stats(self) -> dict:
+        return {
+            'analysis_workers': self.analysis_workers,
+            'analysis_in_flight': self.analysis_in_flight,
+            'analysis_max_pending': self.max_pending,
+            'db_threads': self.db_threads,
+        }
+
+    def shutdown(self):
+        if self._analysis_pool is not None:
+            self._analysis_pool.shutdown(cancel_futures=True)
+            self._analysis_pool = None
+        if self._db_pool is not None:
+            self._db_pool.shutdown(wait=True)
+            self._db_pool = None
+        self._analysis_slots = None
+
+
+executors = Executors()
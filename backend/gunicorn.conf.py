@@ -0,0 +1,52 @@
+"""
+Gunicorn settings for running CommunityPulse on several cores
+The master imports the app once (preload_app), warms the sentiment lexicon
+and keyword matchers, then forks WEB_CONCURRENCY uvicorn workers that share
+those pages copy-on-write. Each worker's lifespan migrates the database under
+a lock file, so only the first one to start applies migrations. Workers share
+state through the SQLite database: its write version keeps every worker's
+response cache and alert queue current, and the stream relay forwards live
+updates between them.
+
+Usage: gunicorn -c gunicorn.conf.py main:app
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', str(multiprocessing.cpu_count())))
+worker_class = 'uvicorn.workers.UvicornWorker'
+preload_app = True
+
+# Bulk ingest streams can run for a while between heartbeats
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = 5
+
+# Read by the app on import, so they must be set before the preload. Every
+# web worker already has a core, so each gets one analysis process rather
+# than one per core.
+os.environ.setdefault('ANALYSIS_WORKERS', '1')
+if workers > 1:
+    os.environ.setdefault('STREAM_RELAY', '1')
+
+
+def when_ready(server):
+    """Runs in the master after the preload, before the first fork"""
+    import analysis
+    analysis.warm_up()
+
+    # Everything loaded so far lives as long as the workers do. Freezing it
+    # keeps the collector from touching (and so copying) the shared pages.
+    gc.collect()
+    gc.freeze()
+
+
+def pre_fork(server, worker):
+    # SQLite connections must not be used across a fork. Importing the app
+    # opens none, but close anything a hook or plugin opened in the master
+    # so each worker starts with its own.
+    from storage import storage
+    storage.close()
@@ -0,0 +1,87 @@
+"""
+Shared keyword matcher for misinformation signals
+Used by the API's risk scoring and by the data collection pipeline. Keyword
+families are loaded from keywords.json (or MISINFORMATION_KEYWORDS_FILE).
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple
+
+KEYWORDS_FILE = os.getenv(
+    'MISINFORMATION_KEYWORDS_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'keywords.json')
+)
+
+_ASCII_UPPER = b'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+class TextScan(NamedTuple):
+    """Everything the scorers need from one scan of a text"""
+    length: int
+    caps: int
+    exclamations: int
+    hits: Dict[str, Dict[str, int]]
+
+    @property
+    def caps_ratio(self) -> float:
+        return self.caps / self.length if self.length else 0
+
+    def distinct(self, family: str) -> int:
+        """Number of different keywords of a family found in the text"""
+        return len(self.hits[family])
+
+    def occurrences(self, family: str) -> int:
+        """Total non-overlapping occurrences of a family's keywords"""
+        return sum(self.hits[family].values())
+
+
+class KeywordMatcher:
+    """Case-insensitive substring matcher over several keyword families
+
+    Keywords shared between families are looked up once. Matching keeps the
+    plain substring semantics of the original scorers ('now' also matches
+    'know'), so risk scores do not change.
+    """
+
+    def __init__(self, families: Dict[str, Iterable[str]]):
+        self.families = {name: tuple(dict.fromkeys(k.lower() for k in words))
+                         for name, words in families.items()}
+        self.keywords = tuple(dict.fromkeys(k for words in self.families.values() for k in words))
+        self._owners = {k: [name for name, words in self.families.items() if k in words]
+                        for k in self.keywords}
+        # Shared by every scan that finds nothing, which is most of them
+        self._no_hits = {name: {} for name in self.families}
+
+    def scan(self, text: str) -> TextScan:
+        text_lower = text.lower()
+        found = [k for k in self.keywords if k in text_lower]
+        hits = self._no_hits
+        if found:
+            hits = {name: {} for name in self.families}
+            for keyword in found:
+                count = text_lower.count(keyword)
+                for name in self._owners[keyword]:
+                    hits[name][keyword] = count
+
+        # Deleting A-Z from the encoded bytes is much cheaper than a
+        # per-character isupper() loop; non-ASCII text needs the full check
+        if text.isascii():
+            caps = len(text) - len(text.encode('ascii').translate(None, _ASCII_UPPER))
+        else:
+            caps = sum(map(str.isupper, text))
+
+        return TextScan(len(text), caps, text.count('!'), hits)
+
+
+def load_keyword_config(path: str = KEYWORDS_FILE) -> Dict[str, Dict[str, list]]:
+    """Read the keyword profiles ({profile: {family: [keywords]}})"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def get_matcher(profile: str, path: str = KEYWORDS_FILE) -> KeywordMatcher:
+    """Compiled matcher for one profile of the keyword config"""
+    return KeywordMatcher(load_keyword_config(path)[profile])
@@ -1,84 +1,106 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import APIRouter, FastAPI, HTTPException, Depends, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, TypeAdapter, ValidationError, field_validator
+from typing import Callable, List, NamedTuple, Optional, Tuple
+from contextlib import asynccontextmanager, contextmanager
+import base64
+import os
 import sqlite3
 import json
 import datetime
-from datetime import datetime, timedelta
-import random
-import nltk
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from datetime import datetime, timedelta, timezone
 import re
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+from alerts import TopAlerts, read_alert, read_alert_page, read_alerts_for_posts, read_top_alerts
+from analysis import calculate_priority_score, analyze_batch, detect_misinformation, scoring_fingerprint, warm_up
+from analysis_cache import AnalysisCache, FLUSH_SIZE, content_key
+from executors import executors, ordered_pipeline, OverloadedError, ANALYSIS_CHUNK_SIZE
+from metrics import METRICS_ENABLED, REGISTRY, CallbackMetric, Counter, MetricsMiddleware, stage
+from migrations import migrate, migration_lock
+from ndjson import NDJSON_MEDIA_TYPE, NDJSONStreamingResponse, dumps_line, is_ndjson, iter_batches, iter_ndjson
+from pubsub import Broker, BrokerFullError
+from relay import STREAM_RELAY, PostRelay
+from response_cache import ResponseCache, SingleFlight, make_backend
+from rollups import merge_rollup_deltas, read_categories, read_daily, read_totals, rollup_deltas
+from storage import storage
+from write_version import read_write_version
 
-app = FastAPI(
-    title="CommunityPulse API",
-    description="AI-powered community intelligence platform",
-    version="1.0.0"
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Every endpoint, mounted on the app by create_app()
+router = APIRouter()
 
 # Security
 security = HTTPBearer()
 
-# Initialize sentiment analyzer
-sentiment_analyzer = SentimentIntensityAnalyzer()
+# Analysis results for content seen before, dropped when scoring changes
+analysis_cache = AnalysisCache(scoring_fingerprint())
+
+# Live update fan-out for /api/stream
+def sse_message(event: str, data) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+# Rollup deltas are merged per subscriber instead of queued one by one
+broker = Broker(sse_message, coalesce={'rollup': merge_rollup_deltas})
+
+# Rendered read endpoint bodies, keyed by the database write version
+response_cache = ResponseCache(make_backend())
+version_reads = SingleFlight()
+
+# Highest-ranked open alerts, served by /api/alerts without a query
+top_alerts = TopAlerts()
+alert_reloads = SingleFlight()
+
+# Posts stored by other worker processes, relayed to this worker's subscribers
+relay = PostRelay()
+
+# Metrics served by /metrics (see metrics.py); rate() of the ingest counters is posts/sec
+posts_ingested = Counter('posts_ingested_total', 'Posts stored, by endpoint', ('endpoint',))
+ingest_errors = Counter('ingest_errors_total', 'Posts rejected or not stored, by endpoint', ('endpoint',))
+
+def cache_samples(field: str) -> Callable[[], dict]:
+    return lambda: {('analysis',): analysis_cache.stats()[field], ('response',): response_cache.stats()[field]}
 
-# Database setup
+# Scrape-time views of state the components already count, so they cost nothing per request
+CallbackMetric('cache_hits_total', 'Cache hits', cache_samples('hits'), 'counter', ('cache',))
+CallbackMetric('cache_misses_total', 'Cache misses', cache_samples('misses'), 'counter', ('cache',))
+CallbackMetric('cache_hit_ratio', 'Hits over lookups since the worker started', cache_samples('hit_ratio'), 'gauge', ('cache',))
+CallbackMetric('cache_entries', 'Entries held by the cache', cache_samples('size'), 'gauge', ('cache',))
+CallbackMetric('response_cache_coalesced_total', 'Response renders shared by concurrent requests',
+               lambda: response_cache.stats()['coalesced'], 'counter')
+CallbackMetric('db_pool_connections', 'Reader pool connections: open, idle and the pool size',
+               lambda: {(state,): storage.stats()[key] for state, key in
+                        (('open', 'readers_open'), ('idle', 'readers_idle'), ('max', 'pool_size'))},
+               'gauge', ('state',))
+CallbackMetric('analysis_in_flight', 'Analysis tasks running or queued on the worker pool',
+               lambda: executors.analysis_in_flight)
+CallbackMetric('analysis_workers', 'Analysis worker processes (0 runs analysis on threads)',
+               lambda: executors.analysis_workers)
+CallbackMetric('stream_subscribers', 'Open /api/stream connections', lambda: broker.stats()['subscribers'])
+CallbackMetric('stream_events_total', 'Live update events published and dropped for slow subscribers',
+               lambda: {('published',): broker.stats()['published'], ('dropped',): broker.stats()['dropped']},
+               'counter', ('outcome',))
+CallbackMetric('stream_relayed_posts_total', 'Posts from other workers relayed to this worker\'s subscribers',
+               lambda: relay.relayed, 'counter')
+
+# Database setup (run by the lifespan, never on import)
 def init_db():
-    conn = sqlite3.connect('community_pulse.db')
-    cursor = conn.cursor()
-    
-    # Create posts table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS posts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            content TEXT NOT NULL,
-            author TEXT NOT NULL,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            sentiment_score REAL,
-            sentiment_label TEXT,
-            misinformation_risk REAL,
-            category TEXT,
-            priority_score REAL
-        )
-    ''')
-    
-    # Create analytics table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS analytics (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date DATE,
-            total_posts INTEGER,
-            avg_sentiment REAL,
-            positive_posts INTEGER,
-            negative_posts INTEGER,
-            neutral_posts INTEGER,
-            misinformation_alerts INTEGER,
-            community_health_score REAL
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    # Tables, rollups and indexes are created by schema migrations. Worker
+    # processes starting together take turns, so each migration runs once.
+    with migration_lock(), storage.write() as conn:
+        migrate(conn)
+
+def to_db_timestamp(value: datetime) -> str:
+    """Format a time the way posts.timestamp stores it: UTC, to the second
 
-# Initialize database
-init_db()
+    CURRENT_TIMESTAMP is UTC, so values with an offset are converted first.
+    Naive values are taken to be UTC already.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime('%Y-%m-%d %H:%M:%S')
 
 # Pydantic models
 class PostCreate(BaseModel):
@@ -86,6 +108,27 @@ class PostCreate(BaseModel):
     author: str
     category: Optional[str] = "general"
 
+class BulkPostCreate(PostCreate):
+    # Original post time for history backfills, defaults to the insert time
+    timestamp: Optional[str] = None
+    
+    @field_validator('timestamp')
+    @classmethod
+    def normalize_timestamp(cls, value):
+        if value is None:
+            return value
+        return to_db_timestamp(datetime.fromisoformat(value))
+
+class BulkIngestError(BaseModel):
+    index: int
+    error: str
+
+class BulkIngestResponse(BaseModel):
+    inserted: int
+    failed: int
+    ids: List[Optional[int]]
+    errors: List[BulkIngestError]
+
 class PostResponse(BaseModel):
     id: int
     content: str
@@ -106,6 +149,8 @@ class AnalyticsResponse(BaseModel):
     misinformation_alerts: int
     community_health_score: float
     recent_trends: dict
+    # Posts with a sentiment score, which avg_sentiment is averaged over
+    scored_posts: int
 
 class AlertResponse(BaseModel):
     id: int
@@ -114,12 +159,14 @@ class AlertResponse(BaseModel):
     severity: str
     description: str
     timestamp: str
+    acknowledged_at: Optional[str] = None
 
 class DashboardResponse(BaseModel):
-    analytics: AnalyticsResponse
-    recent_posts: List[PostResponse]
-    alerts: List[AlertResponse]
-    top_issues: List[dict]
+    # Sections left out of a `fields=` request are omitted
+    analytics: Optional[AnalyticsResponse] = None
+    recent_posts: Optional[List[PostResponse]] = None
+    alerts: Optional[List[AlertResponse]] = None
+    top_issues: Optional[List[dict]] = None
 
 class AnalyzeRequest(BaseModel):
     content: str
@@ -134,6 +181,29 @@ class AnalyzeResponse(BaseModel):
     priority_score: float
     analysis_timestamp: str
 
+analyze_batch_adapter = TypeAdapter(List[AnalyzeRequest])
+
+# Largest JSON array accepted by the batch endpoints; NDJSON is unbounded
+MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', '10000'))
+
+# Largest page /api/posts will return
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', '1000'))
+
+# Alerts /api/alerts returns by default
+ALERTS_LIMIT = 10
+
+# Events a client can subscribe to on /api/stream
+STREAM_TOPICS = ('post', 'alert', 'rollup')
+
+# Posts written per executemany transaction by /api/posts/bulk
+INGEST_CHUNK_SIZE = int(os.getenv('INGEST_CHUNK_SIZE', '1000'))
+
+BULK_INSERT_SQL = '''
+    INSERT INTO posts (content, author, timestamp, sentiment_score, sentiment_label, 
+                     misinformation_risk, category, priority_score)
+    VALUES (?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?, ?, ?, ?, ?)
+'''
+
 class HealthResponse(BaseModel):
     community_health_score: float
     total_posts: int
@@ -158,185 +228,736 @@ class SentimentAnalysisResponse(BaseModel):
     neutral_confidence: float
     analysis_timestamp: str
 
-# AI Analysis Functions
-def analyze_sentiment(text: str) -> dict:
-    """Analyze sentiment of text using VADER"""
-    scores = sentiment_analyzer.polarity_scores(text)
+class ResponseCacheStatsResponse(BaseModel):
+    enabled: bool
+    backend: str
+    hits: int
+    misses: int
+    coalesced: int
+    hit_ratio: float
+    errors: int
+    size: int
+    ttl_seconds: int
+
+class CacheStatsResponse(BaseModel):
+    enabled: bool
+    hits: int
+    misses: int
+    hit_ratio: float
+    size: int
+    max_size: int
+    ttl_seconds: float
+    evictions: int
+    expirations: int
+    persistent: bool
+    fingerprint: str
+
+# Storage queries (run on the DB thread pool, never on the event loop)
+def row_to_post(row) -> PostResponse:
+    return PostResponse(
+        id=row[0],
+        content=row[1],
+        author=row[2],
+        timestamp=row[3],
+        sentiment_score=row[4],
+        sentiment_label=row[5],
+        misinformation_risk=row[6],
+        category=row[7],
+        priority_score=row[8]
+    )
+
+def read_community_health(cursor) -> HealthResponse:
+    # Totals come from the rollups rather than a scan of every post
+    total_posts, positive_posts, negative_posts, _, _, misinformation_alerts, _ = read_totals(cursor)
+    
+    if total_posts == 0:
+        return HealthResponse(
+            community_health_score=50.0,
+            total_posts=0,
+            positive_ratio=0.0,
+            negative_ratio=0.0,
+            misinformation_ratio=0.0,
+            health_status="No data available",
+            recommendations=["Start collecting community posts to get health insights"]
+        )
+    
+    positive_ratio = positive_posts / total_posts
+    negative_ratio = negative_posts / total_posts
+    
+    misinformation_ratio = misinformation_alerts / total_posts
+    
+    # Calculate community health score (0-100)
+    health_score = 50.0  # Base score
+    
+    # Adjust based on sentiment
+    health_score += (positive_ratio - negative_ratio) * 30
+    
+    # Penalize for misinformation
+    health_score -= misinformation_ratio * 20
+    
+    health_score = max(0, min(100, health_score))
+    
+    # Determine health status
+    if health_score >= 80:
+        health_status = "Excellent"
+        recommendations = [
+            "Maintain current community engagement strategies",
+            "Continue monitoring for any emerging issues",
+            "Consider expanding positive community initiatives"
+        ]
+    elif health_score >= 60:
+        health_status = "Good"
+        recommendations = [
+            "Address negative sentiment issues proactively",
+            "Increase positive community engagement activities",
+            "Monitor misinformation trends closely"
+        ]
+    elif health_score >= 40:
+        health_status = "Fair"
+        recommendations = [
+            "Implement immediate community improvement initiatives",
+            "Address high-priority concerns promptly",
+            "Consider community feedback sessions"
+        ]
+    else:
+        health_status = "Poor"
+        recommendations = [
+            "Urgent action required for community health",
+            "Implement comprehensive community improvement plan",
+            "Address all high-priority issues immediately",
+            "Consider external community management support"
+        ]
+    
+    return HealthResponse(
+        community_health_score=round(health_score, 1),
+        total_posts=total_posts,
+        positive_ratio=round(positive_ratio, 3),
+        negative_ratio=round(negative_ratio, 3),
+        misinformation_ratio=round(misinformation_ratio, 3),
+        health_status=health_status,
+        recommendations=recommendations
+    )
+
+class StoredPosts(NamedTuple):
+    """Ids of posts written in one transaction, the alerts they raised and the write version after"""
+    ids: List[int]
+    alerts: List[tuple]
+    version: int
+
+def record_alerts(stored: List[StoredPosts]):
+    """Apply this process's writes to the in-memory alert queue"""
+    for chunk in stored:
+        # The posts insert trigger bumps the write version once per post
+        top_alerts.apply(chunk.version - len(chunk.ids), chunk.version, added=chunk.alerts)
+
+@contextmanager
+def write_posts():
+    """storage.write() for inserting posts this worker publishes itself
+
+    Yields the connection and a function to call with the new post ids
+    before the transaction ends. They are recorded with the relay before
+    the commit makes the rows visible, so its reads on other DB threads
+    never mistake them for another worker's posts. If the transaction
+    fails they are forgotten again.
+    """
+    ids = []
+    
+    def stored_here(post_ids: List[int]):
+        ids.extend(post_ids)
+        relay.stored_here(post_ids)
+    
+    try:
+        with storage.write() as conn:
+            yield conn, stored_here
+    except BaseException:
+        relay.discard(ids)
+        raise
+
+def insert_post(post: PostCreate, analysis: dict) -> Tuple[PostResponse, StoredPosts]:
+    with write_posts() as (conn, stored_here):
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO posts (content, author, sentiment_score, sentiment_label, 
+                             misinformation_risk, category, priority_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            post.content,
+            post.author,
+            analysis['sentiment']['score'],
+            analysis['sentiment']['label'],
+            analysis['misinformation_risk'],
+            post.category,
+            analysis['priority_score']
+        ))
+        
+        post_id = cursor.lastrowid
+        stored_here([post_id])
+        
+        # Get the created post and any alert it raised
+        cursor.execute('SELECT * FROM posts WHERE id = ?', (post_id,))
+        created = row_to_post(cursor.fetchone())
+        alerts = read_alerts_for_posts(cursor, post_id, post_id)
+        return created, StoredPosts([post_id], alerts, read_write_version(cursor))
+
+def read_analytics(cursor) -> AnalyticsResponse:
+    # Totals, sentiment distribution and misinformation alerts from the rollups
+    (total_posts, positive_posts, negative_posts, neutral_posts, avg_sentiment, misinformation_alerts,
+     scored_posts) = read_totals(cursor)
+    avg_sentiment = avg_sentiment or 0.0
+    
+    # Calculate community health score (0-100)
+    health_score = 50.0  # Base score
+    
+    # Adjust based on sentiment
+    if total_posts > 0:
+        positive_ratio = positive_posts / total_posts
+        negative_ratio = negative_posts / total_posts
+        health_score += (positive_ratio - negative_ratio) * 30
+    
+    # Penalize for misinformation
+    if total_posts > 0:
+        misinformation_ratio = misinformation_alerts / total_posts
+        health_score -= misinformation_ratio * 20
+    
+    health_score = max(0, min(100, health_score))
+    
+    # Get recent trends (last 7 days)
+    week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+    trends = read_daily(cursor, week_ago)
+    recent_trends = {
+        'daily_posts': [{'date': row[0], 'count': row[1], 'avg_sentiment': row[2], 'scored_posts': row[3]}
+                        for row in trends]
+    }
+    
+    return AnalyticsResponse(
+        total_posts=total_posts,
+        avg_sentiment=round(avg_sentiment, 3),
+        positive_posts=positive_posts,
+        negative_posts=negative_posts,
+        neutral_posts=neutral_posts,
+        misinformation_alerts=misinformation_alerts,
+        community_health_score=round(health_score, 1),
+        recent_trends=recent_trends,
+        scored_posts=scored_posts
+    )
+
+def row_to_alert(row: tuple) -> AlertResponse:
+    # Columns as in alerts.ALERT_COLUMNS
+    return AlertResponse(
+        id=row[0],
+        post_id=row[1],
+        alert_type=row[2],
+        severity=row[3],
+        description=row[4],
+        timestamp=row[7],
+        acknowledged_at=row[8]
+    )
+
+def read_alerts(cursor) -> List[AlertResponse]:
+    # Highest-ranked open alerts, from the alerts table raised at insert time
+    return [row_to_alert(row) for row in read_top_alerts(cursor, ALERTS_LIMIT)]
+
+def read_top_alerts_snapshot(cursor) -> Tuple[int, List[tuple]]:
+    """The write version and the top of the alert queue as of that version"""
+    return read_write_version(cursor), read_top_alerts(cursor, top_alerts.size)
+
+async def current_top_alerts(limit: int) -> List[AlertResponse]:
+    """The `limit` highest-ranked open alerts, from memory while it is current"""
+    version = await current_write_version()
+    if not top_alerts.can_serve(version, limit):
+        # Another worker wrote, or alerts fell out of the heap: reload it
+        async def reload():
+            top_alerts.load(*await executors.run_snapshot(read_top_alerts_snapshot))
+        await alert_reloads.do('top_alerts', reload)
+    return [row_to_alert(row) for row in top_alerts.top(limit)]
+
+def acknowledge_alert(alert_id: int) -> Optional[Tuple[tuple, int]]:
+    """Mark an alert acknowledged; returns its row and the write version after, or None if it does not exist"""
+    with storage.write() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE alerts SET acknowledged_at = CURRENT_TIMESTAMP WHERE id = ? AND acknowledged_at IS NULL",
+            (alert_id,)
+        )
+        acknowledged = cursor.rowcount > 0
+        row = read_alert(cursor, alert_id)
+        if row is None:
+            return None
+        # Acknowledging an alert twice changes nothing and reports version None
+        return row, (read_write_version(cursor) if acknowledged else None)
+
+def encode_cursor(post: PostResponse, direction: str) -> str:
+    """Opaque page cursor pointing just past `post` in `direction` ('next' or 'prev')"""
+    raw = json.dumps([direction, post.timestamp, post.id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(value: str) -> Tuple[str, str, int]:
+    """(direction, timestamp, id) from a cursor made by encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+        direction, timestamp, post_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if direction not in ('next', 'prev') or not isinstance(timestamp, str) or not isinstance(post_id, int):
+        raise ValueError("Invalid cursor")
+    return direction, timestamp, post_id
+
+def post_filters(category: Optional[str] = None, sentiment_label: Optional[str] = None,
+                 author: Optional[str] = None, since: Optional[str] = None,
+                 until: Optional[str] = None) -> Tuple[List[str], list]:
+    """WHERE clauses and parameters for the /api/posts filters"""
+    clauses, params = [], []
+    for column, value in (('category', category), ('sentiment_label', sentiment_label), ('author', author)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if since is not None:
+        clauses.append("timestamp >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("timestamp < ?")
+        params.append(until)
+    return clauses, params
+
+def read_posts_page(cursor, limit: int, offset: int = 0, page: Optional[Tuple[str, str, int]] = None,
+                    **filters) -> Tuple[List[PostResponse], Optional[str], Optional[str]]:
+    """One page of posts, newest first, with (next, prev) cursors
+    
+    With a decoded cursor in `page` the query seeks straight to the boundary
+    post on the (timestamp, id) index instead of counting past `offset` rows,
+    so every page costs the same however deep it is.
+    """
+    clauses, params = post_filters(**filters)
+    order = "DESC"
+    if page is not None:
+        direction, timestamp, post_id = page
+        if direction == 'next':
+            clauses.append("(timestamp, id) < (?, ?)")
+        else:
+            # Walk backwards from the boundary, then flip the page round
+            clauses.append("(timestamp, id) > (?, ?)")
+            order = "ASC"
+        params.extend([timestamp, post_id])
+        offset = 0
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    
+    # One extra row tells us whether there is another page
+    cursor.execute(f"""
+        SELECT id, content, author, timestamp, sentiment_score, sentiment_label, 
+               misinformation_risk, category, priority_score
+        FROM posts 
+        {where}
+        ORDER BY timestamp {order}, id {order}
+        LIMIT ? OFFSET ?
+    """, (*params, limit + 1, offset))
     
-    if scores['compound'] >= 0.05:
-        label = 'positive'
-    elif scores['compound'] <= -0.05:
-        label = 'negative'
+    posts = [row_to_post(row) for row in cursor.fetchall()]
+    more = len(posts) > limit
+    posts = posts[:limit]
+    if order == "ASC":
+        posts.reverse()
+        has_next, has_prev = True, more
     else:
-        label = 'neutral'
+        has_next, has_prev = more, page is not None or offset > 0
     
+    next_cursor = encode_cursor(posts[-1], 'next') if posts and has_next else None
+    prev_cursor = encode_cursor(posts[0], 'prev') if posts and has_prev else None
+    return posts, next_cursor, prev_cursor
+
+def read_posts(cursor, limit: int, offset: int) -> List[PostResponse]:
+    return read_posts_page(cursor, limit, offset)[0]
+
+def read_top_issues(cursor) -> List[dict]:
+    # Get top issues by category
+    top_issues = []
+    for row in read_categories(cursor):
+        category, count, avg_sentiment = row
+        top_issues.append({
+            'category': category,
+            'count': count,
+            'avg_sentiment': round(avg_sentiment, 3) if avg_sentiment else 0.0
+        })
+    return top_issues
+
+# Dashboard sections, in response order
+DASHBOARD_SECTIONS = {
+    'analytics': read_analytics,
+    'recent_posts': lambda cursor: read_posts(cursor, 10, 0),
+    'alerts': read_alerts,
+    'top_issues': read_top_issues,
+}
+
+def read_dashboard(cursor, fields: Optional[List[str]] = None) -> Tuple[int, dict]:
+    """The requested dashboard sections and the write version they reflect
+    
+    Run it with executors.run_snapshot so every section and the version
+    come from the same snapshot of the database.
+    """
+    version = read_write_version(cursor)
+    sections = {name: DASHBOARD_SECTIONS[name](cursor) for name in (fields or DASHBOARD_SECTIONS)}
+    return version, sections
+
+def dashboard_etag(version: int, fields: List[str]) -> str:
+    # Trends cover the last 7 days, so the same data reads differently tomorrow
+    return f'"{version}-{datetime.now():%Y%m%d}-{"+".join(fields)}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+# Cached read endpoints
+def render_json(value) -> bytes:
+    """The body FastAPI would send for `value`"""
+    with stage('serialization'):
+        return JSONResponse(content=jsonable_encoder(value)).body
+
+async def current_write_version() -> int:
+    """The database write version; concurrent callers share one read"""
+    return await version_reads.do('write_version', lambda: executors.run_read(read_write_version))
+
+async def cached_read(key: str, read: Callable) -> Response:
+    """Serve `read(cursor)` from the response cache, rendering it once per write version"""
+    version = await current_write_version()
+    
+    async def render():
+        return render_json(await executors.run_read(read))
+    
+    # Trends cover the last 7 days, so the same data reads differently tomorrow
+    body = await response_cache.get_or_render(f"{key}|{datetime.now():%Y%m%d}", version, render)
+    return Response(content=body, media_type="application/json")
+
+# Cached analysis helpers
+def cached_analysis(text: str, entry: dict) -> dict:
+    """Rebuild a full analysis from a cached sentiment
+
+    Only sentiment is shared between texts that differ in whitespace. The
+    misinformation scan sees caps ratios and keyword phrases that spacing
+    changes, so it runs on the text itself, and priority uses its own length.
+    """
+    risk = detect_misinformation(text)
     return {
-        'score': scores['compound'],
-        'label': label,
-        'positive': scores['pos'],
-        'negative': scores['neg'],
-        'neutral': scores['neu']
+        'sentiment': entry['sentiment'],
+        'misinformation_risk': risk,
+        'priority_score': calculate_priority_score(entry['sentiment']['score'], risk, len(text))
     }
 
-def detect_misinformation(text: str) -> float:
-    """Simple misinformation detection based on keywords and patterns"""
-    risk_score = 0.0
+async def analyze_texts(texts: List[str]) -> List[dict]:
+    """Analyze texts in order, sending only content not seen before to the workers
+
+    Content repeated within the same call is analyzed once.
+    """
+    keys = [content_key(text) for text in texts]
+    results = [None] * len(texts)
+    missing = {}
+    for position, (text, key) in enumerate(zip(texts, keys)):
+        entry = analysis_cache.get(key)
+        if entry is not None:
+            results[position] = cached_analysis(text, entry)
+        else:
+            missing.setdefault(key, []).append(position)
     
-    # Keywords that might indicate misinformation
-    misinformation_keywords = [
-        'fake news', 'conspiracy', 'hoax', 'cover up', 'secret cure',
-        'government hiding', 'they don\'t want you to know', 'wake up',
-        'sheeple', 'mainstream media lies', 'alternative facts'
-    ]
+    if missing:
+        analyses = await executors.map_analysis(analyze_batch, [texts[positions[0]] for positions in missing.values()])
+        for (key, positions), analysis in zip(missing.items(), analyses):
+            entry = {'sentiment': analysis['sentiment']}
+            analysis_cache.put(key, entry)
+            results[positions[0]] = analysis
+            for position in positions[1:]:
+                results[position] = cached_analysis(texts[position], entry)
+        
+        if analysis_cache.pending >= FLUSH_SIZE:
+            await executors.run_db(analysis_cache.flush)
     
-    # Check for excessive caps (shouting)
-    caps_ratio = sum(1 for c in text if c.isupper()) / len(text) if text else 0
-    if caps_ratio > 0.3:
-        risk_score += 0.2
-    
-    # Check for misinformation keywords
-    text_lower = text.lower()
-    for keyword in misinformation_keywords:
-        if keyword in text_lower:
-            risk_score += 0.3
-    
-    # Check for excessive exclamation marks
-    exclamation_count = text.count('!')
-    if exclamation_count > 3:
-        risk_score += 0.1
-    
-    # Check for urgency indicators
-    urgency_words = ['urgent', 'immediate', 'now', 'quick', 'fast', 'emergency']
-    urgency_count = sum(1 for word in urgency_words if word in text_lower)
-    if urgency_count > 2:
-        risk_score += 0.1
-    
-    return min(risk_score, 1.0)
-
-def calculate_priority_score(sentiment_score: float, misinformation_risk: float, content_length: int) -> float:
-    """Calculate priority score for post ranking"""
-    # Base score from sentiment (negative posts are higher priority)
-    base_score = (1 - sentiment_score) * 0.4
-    
-    # Misinformation risk adds to priority
-    risk_score = misinformation_risk * 0.4
-    
-    # Length factor (longer posts might be more important)
-    length_score = min(content_length / 500, 1.0) * 0.2
-    
-    return base_score + risk_score + length_score
-
-# Generate sample data for demo
-def generate_sample_data():
-    """Generate realistic sample data for demonstration"""
-    sample_posts = [
-        "The new pool hours are great! Everyone seems to be enjoying the extended time.",
-        "URGENT: There's a conspiracy about the water quality! They're hiding something from us!",
-        "The maintenance team did an excellent job fixing the elevator quickly.",
-        "Can we please address the noise complaints? Some residents are being very loud late at night.",
-        "The community garden is looking beautiful this spring. Great work everyone!",
-        "FAKE NEWS: The management is lying about the rent increase! Don't believe their propaganda!",
-        "The new security system is working well. I feel much safer now.",
-        "There's a suspicious person hanging around the parking lot. Should we report this?",
-        "The holiday decorations look amazing! Thank you to everyone who helped.",
-        "The garbage collection schedule changed without notice. This is very inconvenient.",
-        "The fitness center equipment is in excellent condition. Great job maintaining it!",
-        "EMERGENCY: The fire alarm system is broken! This is a safety hazard!",
-        "The community events this month were fantastic. Really brought everyone together.",
-        "The parking situation is getting worse. We need more spaces.",
-        "The landscaping team does such a beautiful job. The flowers are gorgeous!",
-        "CONSPIRACY: They're putting chemicals in the air vents to control us!",
-        "The package delivery system is working perfectly. Very convenient.",
-        "There's a leak in the basement that needs immediate attention.",
-        "The community newsletter is very informative. Keep up the good work!",
-        "The WiFi speed has improved significantly. Thank you for the upgrade!"
+    return results
+
+# Batch analysis helpers
+def to_analyze_response(item: AnalyzeRequest, analysis: dict, timestamp: str) -> AnalyzeResponse:
+    return AnalyzeResponse(
+        content=item.content,
+        author=item.author,
+        sentiment_score=analysis['sentiment']['score'],
+        sentiment_label=analysis['sentiment']['label'],
+        misinformation_risk=analysis['misinformation_risk'],
+        priority_score=analysis['priority_score'],
+        analysis_timestamp=timestamp
+    )
+
+def describe_validation_error(error: ValidationError) -> str:
+    return '; '.join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'item'}: {err['msg']}"
+        for err in error.errors()
+    )
+
+async def analyze_ndjson_batch(batch: list) -> bytes:
+    """Analyze one chunk of parsed NDJSON lines into NDJSON output lines
+
+    Invalid lines become error lines carrying their input index, so the
+    output always has exactly one line per input line, in order.
+    """
+    lines = [None] * len(batch)
+    valid = []
+    for position, (index, value) in enumerate(batch):
+        if isinstance(value, ValueError):
+            lines[position] = dumps_line({'index': index, 'error': f"Invalid JSON: {value}"})
+            continue
+        try:
+            valid.append((position, AnalyzeRequest.model_validate(value)))
+        except ValidationError as e:
+            lines[position] = dumps_line({'index': index, 'error': describe_validation_error(e)})
+    
+    if valid:
+        try:
+            analyses = await analyze_texts([item.content for _, item in valid])
+        except Exception as e:
+            for position, _ in valid:
+                lines[position] = dumps_line({'index': batch[position][0], 'error': f"Error analyzing content: {str(e)}"})
+        else:
+            timestamp = datetime.now().isoformat()
+            for (position, item), analysis in zip(valid, analyses):
+                lines[position] = to_analyze_response(item, analysis, timestamp).model_dump_json().encode('utf-8') + b'\n'
+    
+    return b''.join(lines)
+
+async def stream_batch_analysis(request: Request):
+    """Analyze an NDJSON request body chunk by chunk while it is uploaded
+
+    A bounded number of chunks are in flight at once, so memory stays
+    constant however large the body is.
+    """
+    batches = iter_batches(iter_ndjson(request.stream()), ANALYSIS_CHUNK_SIZE)
+    async for lines in ordered_pipeline(batches, analyze_ndjson_batch, executors.max_in_flight):
+        yield lines
+
+# Live updates
+def broadcast_posts(posts: List[PostResponse], alerts: List[tuple]):
+    """Push stored posts, their alerts and rollup deltas to /api/stream subscribers"""
+    if not posts:
+        return
+    if broker.has_subscribers('post') or broker.has_subscribers('rollup'):
+        dumped = [post.model_dump() for post in posts]
+        broker.publish('post', dumped)
+        broker.publish('rollup', [rollup_deltas(dumped)])
+    if alerts and broker.has_subscribers('alert'):
+        broker.publish('alert', [row_to_alert(alert).model_dump() for alert in alerts])
+
+def publish_posts(posts: List[PostResponse], stored: List[StoredPosts]):
+    """Publish posts this worker just stored; write_posts() told the relay to skip them"""
+    broadcast_posts(posts, [alert for chunk in stored for alert in chunk.alerts])
+
+def relay_posts(rows: List[tuple], alerts: List[tuple]):
+    """Publish posts another worker stored"""
+    broadcast_posts([row_to_post(row) for row in rows], alerts)
+
+def has_stream_subscribers() -> bool:
+    return any(broker.has_subscribers(topic) for topic in STREAM_TOPICS)
+
+def read_last_post_id(cursor) -> int:
+    cursor.execute("SELECT IFNULL(MAX(id), 0) FROM posts")
+    return cursor.fetchone()[0]
+
+def read_posts_since(cursor, after_id: int, limit: int) -> Tuple[List[tuple], List[tuple]]:
+    """Posts with ids after `after_id` in id order, and the alerts they raised"""
+    cursor.execute("""
+        SELECT id, content, author, timestamp, sentiment_score, sentiment_label, 
+               misinformation_risk, category, priority_score
+        FROM posts
+        WHERE id > ?
+        ORDER BY id
+        LIMIT ?
+    """, (after_id, limit))
+    rows = cursor.fetchall()
+    alerts = read_alerts_for_posts(cursor, rows[0][0], rows[-1][0]) if rows else []
+    return rows, alerts
+
+async def sse_stream(request: Request, subscription):
+    """Server-sent events for one subscriber, with keepalives while idle"""
+    try:
+        # Reconnect after 5s if the connection drops
+        yield b"retry: 5000\n\n"
+        while not await request.is_disconnected():
+            messages = await broker.get(subscription)
+            yield b''.join(messages) if messages else b": keepalive\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+# Bulk ingest helpers
+def post_row(post: BulkPostCreate, analysis: dict) -> tuple:
+    return (
+        post.content,
+        post.author,
+        post.timestamp,
+        analysis['sentiment']['score'],
+        analysis['sentiment']['label'],
+        analysis['misinformation_risk'],
+        post.category,
+        analysis['priority_score']
+    )
+
+def insert_posts(rows: List[tuple]) -> StoredPosts:
+    """Insert rows with one executemany in one transaction and return their ids
+
+    The writer lock keeps other inserts out of the transaction, so the
+    AUTOINCREMENT ids are contiguous and end at last_insert_rowid().
+    """
+    with write_posts() as (conn, stored_here):
+        cursor = conn.cursor()
+        cursor.executemany(BULK_INSERT_SQL, rows)
+        last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        first_id = last_id - len(rows) + 1
+        stored_here(list(range(first_id, last_id + 1)))
+        # Alerts were raised by the insert trigger in the same transaction
+        alerts = read_alerts_for_posts(cursor, first_id, last_id)
+        return StoredPosts(list(range(first_id, last_id + 1)), alerts, read_write_version(cursor))
+
+def stored_posts(rows: List[tuple], ids: List[Optional[int]]) -> List[PostResponse]:
+    """PostResponses for the rows that were stored, without reading them back"""
+    # Rows without a timestamp got CURRENT_TIMESTAMP, which is UTC
+    now = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    return [
+        row_to_post((post_id, row[0], row[1], row[2] or now) + row[3:])
+        for row, post_id in zip(rows, ids) if post_id is not None
     ]
+
+def write_post_rows(rows: List[tuple]) -> Tuple[List[tuple], List[StoredPosts]]:
+    """Insert a chunk of rows, returning an (id, error) pair per row and the transactions that stored them
+
+    If the chunk transaction fails, it is retried row by row so one bad row
+    only fails itself.
+    """
+    try:
+        stored = insert_posts(rows)
+        return [(post_id, None) for post_id in stored.ids], [stored]
+    except sqlite3.Error:
+        pass
     
-    sample_authors = ["Sarah M.", "John D.", "Maria L.", "David K.", "Lisa R.", "Mike T.", "Emma W.", "Alex P.", "Rachel S.", "Tom B.", "Jennifer H.", "Robert C.", "Amanda F.", "Michael S.", "Jessica L.", "Christopher M.", "Nicole R.", "Daniel P.", "Ashley T.", "Kevin B."]
-    
-    conn = sqlite3.connect('community_pulse.db')
-    cursor = conn.cursor()
-    
-    # Check if we already have data
-    cursor.execute("SELECT COUNT(*) FROM posts")
-    if cursor.fetchone()[0] == 0:
-        for i, post in enumerate(sample_posts):
-            # Generate timestamp within last 7 days
-            days_ago = random.randint(0, 7)
-            hours_ago = random.randint(0, 23)
-            timestamp = datetime.now() - timedelta(days=days_ago, hours=hours_ago)
-            
-            # Analyze sentiment
-            sentiment_result = analyze_sentiment(post)
-            
-            # Detect misinformation
-            misinformation_risk = detect_misinformation(post)
-            
-            # Calculate priority
-            priority_score = calculate_priority_score(
-                sentiment_result['score'], 
-                misinformation_risk, 
-                len(post)
-            )
-            
-            cursor.execute('''
-                INSERT INTO posts (content, author, timestamp, sentiment_score, sentiment_label, 
-                                 misinformation_risk, category, priority_score)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                post, 
-                sample_authors[i % len(sample_authors)],
-                timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-                sentiment_result['score'],
-                sentiment_result['label'],
-                misinformation_risk,
-                random.choice(['general', 'maintenance', 'security', 'amenities', 'noise']),
-                priority_score
-            ))
-    
-    conn.commit()
-    conn.close()
-
-# Generate sample data on startup
-generate_sample_data()
+    outcomes = []
+    transactions = []
+    for row in rows:
+        try:
+            stored = insert_posts([row])
+            outcomes.append((stored.ids[0], None))
+            transactions.append(stored)
+        except sqlite3.Error as e:
+            outcomes.append((None, f"Error storing post: {str(e)}"))
+    return outcomes, transactions
+
+async def ingest_batch(batch: list) -> List[dict]:
+    """Validate, analyze and store one chunk of (index, value) items
+
+    Returns {'index', 'id'} or {'index', 'error'} for every item in order.
+    """
+    results = [None] * len(batch)
+    valid = []
+    for position, (index, value) in enumerate(batch):
+        if isinstance(value, ValueError):
+            results[position] = {'index': index, 'error': f"Invalid JSON: {value}"}
+            continue
+        try:
+            valid.append((position, BulkPostCreate.model_validate(value)))
+        except ValidationError as e:
+            results[position] = {'index': index, 'error': describe_validation_error(e)}
+    
+    if valid:
+        try:
+            analyses = await analyze_texts([post.content for _, post in valid])
+            rows = [post_row(post, analysis) for (_, post), analysis in zip(valid, analyses)]
+            outcomes, stored = await executors.run_db(write_post_rows, rows)
+        except Exception as e:
+            outcomes = [(None, f"Error processing post: {str(e)}")] * len(valid)
+        else:
+            record_alerts(stored)
+            publish_posts(stored_posts(rows, [post_id for post_id, _ in outcomes]), stored)
+        
+        for (position, _), (post_id, error) in zip(valid, outcomes):
+            index = batch[position][0]
+            results[position] = {'index': index, 'id': post_id} if error is None else {'index': index, 'error': error}
+    
+    stored_count = sum(1 for result in results if 'id' in result)
+    posts_ingested.labels('bulk').inc(stored_count)
+    ingest_errors.labels('bulk').inc(len(results) - stored_count)
+    return results
+
+async def stream_bulk_ingest(request: Request):
+    """Ingest an NDJSON request body chunk by chunk, one result line per post"""
+    batches = iter_batches(iter_ndjson(request.stream()), INGEST_CHUNK_SIZE)
+    async for results in ordered_pipeline(batches, ingest_batch, executors.max_in_flight):
+        yield b''.join(dumps_line(result) for result in results)
 
 # API Endpoints
-@app.post("/api/analyze", response_model=AnalyzeResponse)
+@router.post("/api/analyze", response_model=AnalyzeResponse)
 async def analyze_content(request: AnalyzeRequest):
     """Real-time content analysis without storing in database"""
     try:
-        # Analyze sentiment
-        sentiment_result = analyze_sentiment(request.content)
+        # Sentiment, misinformation and priority run in a worker process
+        # unless the same content was analyzed before
+        analysis = (await analyze_texts([request.content]))[0]
         
-        # Detect misinformation
-        misinformation_risk = detect_misinformation(request.content)
+        return to_analyze_response(request, analysis, datetime.now().isoformat())
         
-        # Calculate priority score
-        priority_score = calculate_priority_score(
-            sentiment_result['score'],
-            misinformation_risk,
-            len(request.content)
+    except OverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error analyzing content: {str(e)}")
+
+@router.post(
+    "/api/analyze/batch",
+    response_model=List[AnalyzeResponse],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": {"$ref": "#/components/schemas/AnalyzeRequest"}}
+                },
+                NDJSON_MEDIA_TYPE: {
+                    "schema": {"$ref": "#/components/schemas/AnalyzeRequest"}
+                }
+            }
+        }
+    }
+)
+async def analyze_content_batch(request: Request):
+    """Real-time analysis of many posts at once, results in input order
+
+    Accepts a JSON array of AnalyzeRequest objects (up to MAX_BATCH_SIZE), or
+    NDJSON with Content-Type: application/x-ndjson for batches too large to
+    buffer. NDJSON requests are streamed back as NDJSON, one line per input.
+    """
+    if is_ndjson(request.headers.get('content-type')):
+        return NDJSONStreamingResponse(stream_batch_analysis(request))
+    
+    try:
+        items = analyze_batch_adapter.validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(items)} exceeds {MAX_BATCH_SIZE} items, send NDJSON to stream larger batches"
         )
+    
+    try:
+        analyses = await analyze_texts([item.content for item in items])
         
-        return AnalyzeResponse(
-            content=request.content,
-            author=request.author,
-            sentiment_score=sentiment_result['score'],
-            sentiment_label=sentiment_result['label'],
-            misinformation_risk=misinformation_risk,
-            priority_score=priority_score,
-            analysis_timestamp=datetime.now().isoformat()
-        )
+        # One timestamp for the whole batch
+        timestamp = datetime.now().isoformat()
+        return [to_analyze_response(item, analysis, timestamp) for item, analysis in zip(items, analyses)]
         
+    except OverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error analyzing content: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error analyzing batch: {str(e)}")
 
-@app.post("/api/sentiment-analysis", response_model=SentimentAnalysisResponse)
+@router.post("/api/sentiment-analysis", response_model=SentimentAnalysisResponse)
 async def analyze_sentiment_with_confidence(request: SentimentAnalysisRequest):
     """Analyze community post sentiment with confidence scores"""
     try:
-        # Analyze sentiment using VADER
-        sentiment_result = analyze_sentiment(request.content)
+        # Analyze sentiment using VADER (or reuse the cached result)
+        sentiment_result = (await analyze_texts([request.content]))[0]['sentiment']
         
         # Calculate confidence scores based on VADER scores
         positive_confidence = sentiment_result['positive']
@@ -358,381 +979,328 @@ async def analyze_sentiment_with_confidence(request: SentimentAnalysisRequest):
             analysis_timestamp=datetime.now().isoformat()
         )
         
+    except OverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing sentiment: {str(e)}")
 
-@app.get("/api/health", response_model=HealthResponse)
+@router.get("/api/health", response_model=HealthResponse)
 async def get_community_health():
     """Get community health score and recommendations"""
     try:
-        conn = sqlite3.connect('community_pulse.db')
-        cursor = conn.cursor()
-        
-        # Get total posts
-        cursor.execute("SELECT COUNT(*) FROM posts")
-        total_posts = cursor.fetchone()[0]
-        
-        if total_posts == 0:
-            return HealthResponse(
-                community_health_score=50.0,
-                total_posts=0,
-                positive_ratio=0.0,
-                negative_ratio=0.0,
-                misinformation_ratio=0.0,
-                health_status="No data available",
-                recommendations=["Start collecting community posts to get health insights"]
-            )
-        
-        # Get sentiment distribution
-        cursor.execute("SELECT sentiment_label, COUNT(*) FROM posts GROUP BY sentiment_label")
-        sentiment_counts = dict(cursor.fetchall())
-        
-        positive_posts = sentiment_counts.get('positive', 0)
-        negative_posts = sentiment_counts.get('negative', 0)
-        
-        positive_ratio = positive_posts / total_posts
-        negative_ratio = negative_posts / total_posts
-        
-        # Get misinformation alerts
-        cursor.execute("SELECT COUNT(*) FROM posts WHERE misinformation_risk > 0.5")
-        misinformation_alerts = cursor.fetchone()[0]
-        misinformation_ratio = misinformation_alerts / total_posts
-        
-        # Calculate community health score (0-100)
-        health_score = 50.0  # Base score
-        
-        # Adjust based on sentiment
-        health_score += (positive_ratio - negative_ratio) * 30
-        
-        # Penalize for misinformation
-        health_score -= misinformation_ratio * 20
-        
-        health_score = max(0, min(100, health_score))
-        
-        # Determine health status
-        if health_score >= 80:
-            health_status = "Excellent"
-            recommendations = [
-                "Maintain current community engagement strategies",
-                "Continue monitoring for any emerging issues",
-                "Consider expanding positive community initiatives"
-            ]
-        elif health_score >= 60:
-            health_status = "Good"
-            recommendations = [
-                "Address negative sentiment issues proactively",
-                "Increase positive community engagement activities",
-                "Monitor misinformation trends closely"
-            ]
-        elif health_score >= 40:
-            health_status = "Fair"
-            recommendations = [
-                "Implement immediate community improvement initiatives",
-                "Address high-priority concerns promptly",
-                "Consider community feedback sessions"
-            ]
-        else:
-            health_status = "Poor"
-            recommendations = [
-                "Urgent action required for community health",
-                "Implement comprehensive community improvement plan",
-                "Address all high-priority issues immediately",
-                "Consider external community management support"
-            ]
-        
-        conn.close()
-        
-        return HealthResponse(
-            community_health_score=round(health_score, 1),
-            total_posts=total_posts,
-            positive_ratio=round(positive_ratio, 3),
-            negative_ratio=round(negative_ratio, 3),
-            misinformation_ratio=round(misinformation_ratio, 3),
-            health_status=health_status,
-            recommendations=recommendations
-        )
+        return await cached_read('health', read_community_health)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving community health: {str(e)}")
 
-@app.post("/api/posts", response_model=PostResponse)
+@router.post("/api/posts", response_model=PostResponse)
 async def create_post(post: PostCreate):
     """Submit a new community post for analysis"""
     try:
-        # Analyze sentiment
-        sentiment_result = analyze_sentiment(post.content)
-        
-        # Detect misinformation
-        misinformation_risk = detect_misinformation(post.content)
-        
-        # Calculate priority score
-        priority_score = calculate_priority_score(
-            sentiment_result['score'],
-            misinformation_risk,
-            len(post.content)
-        )
+        # Analyze sentiment, misinformation and priority
+        analysis = (await analyze_texts([post.content]))[0]
         
         # Store in database
-        conn = sqlite3.connect('community_pulse.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO posts (content, author, sentiment_score, sentiment_label, 
-                             misinformation_risk, category, priority_score)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            post.content,
-            post.author,
-            sentiment_result['score'],
-            sentiment_result['label'],
-            misinformation_risk,
-            post.category,
-            priority_score
-        ))
-        
-        post_id = cursor.lastrowid
-        
-        # Get the created post
-        cursor.execute('SELECT * FROM posts WHERE id = ?', (post_id,))
-        row = cursor.fetchone()
-        
-        conn.commit()
-        conn.close()
-        
-        return PostResponse(
-            id=row[0],
-            content=row[1],
-            author=row[2],
-            timestamp=row[3],
-            sentiment_score=row[4],
-            sentiment_label=row[5],
-            misinformation_risk=row[6],
-            category=row[7],
-            priority_score=row[8]
-        )
+        created, stored = await executors.run_db(insert_post, post, analysis)
+        record_alerts([stored])
+        publish_posts([created], [stored])
+        posts_ingested.labels('posts').inc()
+        return created
         
+    except OverloadedError as e:
+        ingest_errors.labels('posts').inc()
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
+        ingest_errors.labels('posts').inc()
         raise HTTPException(status_code=500, detail=f"Error processing post: {str(e)}")
 
-@app.get("/api/analytics", response_model=AnalyticsResponse)
+@router.post(
+    "/api/posts/bulk",
+    response_model=BulkIngestResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": BulkPostCreate.model_json_schema()}
+                },
+                NDJSON_MEDIA_TYPE: {
+                    "schema": BulkPostCreate.model_json_schema()
+                }
+            }
+        }
+    }
+)
+async def create_posts_bulk(request: Request):
+    """Submit many community posts at once for analysis and storage
+
+    Accepts a JSON array of posts (up to MAX_BATCH_SIZE) or an NDJSON stream
+    with Content-Type: application/x-ndjson. Posts are analyzed across the
+    worker pool and written in INGEST_CHUNK_SIZE executemany transactions.
+    Invalid or failing posts are reported by index without aborting the rest.
+    NDJSON requests get one NDJSON result line per input line.
+    """
+    if is_ndjson(request.headers.get('content-type')):
+        return NDJSONStreamingResponse(stream_bulk_ingest(request))
+    
+    try:
+        values = json.loads(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
+    
+    if not isinstance(values, list):
+        raise HTTPException(status_code=422, detail="Expected a JSON array of posts")
+    if len(values) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(values)} exceeds {MAX_BATCH_SIZE} posts, send NDJSON to stream larger batches"
+        )
+    
+    items = list(enumerate(values))
+    batches = [items[i:i + INGEST_CHUNK_SIZE] for i in range(0, len(items), INGEST_CHUNK_SIZE)]
+    
+    ids = [None] * len(values)
+    errors = []
+    async for results in ordered_pipeline(batches, ingest_batch, executors.max_in_flight):
+        for result in results:
+            if 'id' in result:
+                ids[result['index']] = result['id']
+            else:
+                errors.append(BulkIngestError(**result))
+    
+    return BulkIngestResponse(
+        inserted=len(values) - len(errors),
+        failed=len(errors),
+        ids=ids,
+        errors=errors
+    )
+
+@router.get("/api/analytics", response_model=AnalyticsResponse)
 async def get_analytics():
     """Get community health analytics"""
     try:
-        conn = sqlite3.connect('community_pulse.db')
-        cursor = conn.cursor()
-        
-        # Get total posts
-        cursor.execute("SELECT COUNT(*) FROM posts")
-        total_posts = cursor.fetchone()[0]
-        
-        # Get sentiment distribution
-        cursor.execute("SELECT sentiment_label, COUNT(*) FROM posts GROUP BY sentiment_label")
-        sentiment_counts = dict(cursor.fetchall())
-        
-        positive_posts = sentiment_counts.get('positive', 0)
-        negative_posts = sentiment_counts.get('negative', 0)
-        neutral_posts = sentiment_counts.get('neutral', 0)
-        
-        # Get average sentiment
-        cursor.execute("SELECT AVG(sentiment_score) FROM posts")
-        avg_sentiment = cursor.fetchone()[0] or 0.0
-        
-        # Get misinformation alerts
-        cursor.execute("SELECT COUNT(*) FROM posts WHERE misinformation_risk > 0.5")
-        misinformation_alerts = cursor.fetchone()[0]
-        
-        # Calculate community health score (0-100)
-        health_score = 50.0  # Base score
-        
-        # Adjust based on sentiment
-        if total_posts > 0:
-            positive_ratio = positive_posts / total_posts
-            negative_ratio = negative_posts / total_posts
-            health_score += (positive_ratio - negative_ratio) * 30
-        
-        # Penalize for misinformation
-        if total_posts > 0:
-            misinformation_ratio = misinformation_alerts / total_posts
-            health_score -= misinformation_ratio * 20
-        
-        health_score = max(0, min(100, health_score))
-        
-        # Get recent trends (last 7 days)
-        week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-        cursor.execute("""
-            SELECT DATE(timestamp) as date, COUNT(*), AVG(sentiment_score)
-            FROM posts 
-            WHERE timestamp >= ?
-            GROUP BY DATE(timestamp)
-            ORDER BY date
-        """, (week_ago,))
-        
-        trends = cursor.fetchall()
-        recent_trends = {
-            'daily_posts': [{'date': row[0], 'count': row[1], 'avg_sentiment': row[2]} for row in trends]
-        }
-        
-        conn.close()
-        
-        return AnalyticsResponse(
-            total_posts=total_posts,
-            avg_sentiment=round(avg_sentiment, 3),
-            positive_posts=positive_posts,
-            negative_posts=negative_posts,
-            neutral_posts=neutral_posts,
-            misinformation_alerts=misinformation_alerts,
-            community_health_score=round(health_score, 1),
-            recent_trends=recent_trends
-        )
+        return await cached_read('analytics', read_analytics)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving analytics: {str(e)}")
 
-@app.get("/api/alerts", response_model=List[AlertResponse])
-async def get_alerts():
-    """Get misinformation and high-priority alerts"""
+@router.get("/api/alerts", response_model=List[AlertResponse])
+async def get_alerts(limit: int = Query(ALERTS_LIMIT, ge=1, le=top_alerts.size)):
+    """Get the highest-ranked open misinformation and high-priority alerts
+    
+    Served from the in-memory alert queue, so the cost does not depend on
+    how many posts or alerts are stored.
+    """
     try:
-        conn = sqlite3.connect('community_pulse.db')
-        cursor = conn.cursor()
-        
-        # Get posts with high misinformation risk or high priority
-        cursor.execute("""
-            SELECT id, content, misinformation_risk, priority_score, timestamp
-            FROM posts 
-            WHERE misinformation_risk > 0.3 OR priority_score > 0.7
-            ORDER BY priority_score DESC, misinformation_risk DESC
-            LIMIT 10
-        """)
-        
-        alerts = []
-        for row in cursor.fetchall():
-            post_id, content, misinformation_risk, priority_score, timestamp = row
-            
-            if misinformation_risk > 0.5:
-                alert_type = "misinformation"
-                severity = "high" if misinformation_risk > 0.7 else "medium"
-                description = f"Potential misinformation detected in post by {content[:50]}..."
-            else:
-                alert_type = "high_priority"
-                severity = "high" if priority_score > 0.8 else "medium"
-                description = f"High priority community concern: {content[:50]}..."
-            
-            alerts.append(AlertResponse(
-                id=len(alerts) + 1,
-                post_id=post_id,
-                alert_type=alert_type,
-                severity=severity,
-                description=description,
-                timestamp=timestamp
-            ))
-        
-        conn.close()
-        return alerts
+        return await current_top_alerts(limit)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving alerts: {str(e)}")
 
-@app.get("/api/dashboard", response_model=DashboardResponse)
-async def get_dashboard():
-    """Get comprehensive dashboard data"""
+@router.get("/api/alerts/history", response_model=List[AlertResponse])
+async def get_alert_history(
+    response: Response,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = None,
+    acknowledged: Optional[bool] = None,
+    severity: Optional[str] = None,
+):
+    """Page through all alerts, newest first
+    
+    Pass the X-Next-Cursor header of a response back as `cursor` for the
+    next page. `acknowledged` and `severity` narrow the listing.
+    """
     try:
-        # Get analytics
-        analytics = await get_analytics()
-        
-        # Get recent posts
-        conn = sqlite3.connect('community_pulse.db')
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, content, author, timestamp, sentiment_score, sentiment_label, 
-                   misinformation_risk, category, priority_score
-            FROM posts 
-            ORDER BY timestamp DESC 
-            LIMIT 10
-        """)
-        
-        recent_posts = []
-        for row in cursor.fetchall():
-            recent_posts.append(PostResponse(
-                id=row[0],
-                content=row[1],
-                author=row[2],
-                timestamp=row[3],
-                sentiment_score=row[4],
-                sentiment_label=row[5],
-                misinformation_risk=row[6],
-                category=row[7],
-                priority_score=row[8]
-            ))
-        
-        # Get alerts
-        alerts = await get_alerts()
-        
-        # Get top issues by category
-        cursor.execute("""
-            SELECT category, COUNT(*) as count, AVG(sentiment_score) as avg_sentiment
-            FROM posts 
-            GROUP BY category 
-            ORDER BY count DESC
-        """)
-        
-        top_issues = []
-        for row in cursor.fetchall():
-            category, count, avg_sentiment = row
-            top_issues.append({
-                'category': category,
-                'count': count,
-                'avg_sentiment': round(avg_sentiment, 3) if avg_sentiment else 0.0
-            })
-        
-        conn.close()
-        
-        return DashboardResponse(
-            analytics=analytics,
-            recent_posts=recent_posts,
-            alerts=alerts,
-            top_issues=top_issues
+        rows = await executors.run_read(
+            lambda db_cursor: read_alert_page(db_cursor, limit + 1, cursor, acknowledged, severity)
         )
+        if len(rows) > limit:
+            rows = rows[:limit]
+            response.headers["X-Next-Cursor"] = str(rows[-1][0])
+        return [row_to_alert(row) for row in rows]
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error retrieving dashboard: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving alerts: {str(e)}")
 
-@app.get("/api/posts", response_model=List[PostResponse])
-async def get_posts(limit: int = 20, offset: int = 0):
-    """Get paginated list of posts"""
+@router.post("/api/alerts/{alert_id}/acknowledge", response_model=AlertResponse)
+async def acknowledge(alert_id: int):
+    """Acknowledge an alert, taking it out of /api/alerts; acknowledging twice is a no-op"""
     try:
-        conn = sqlite3.connect('community_pulse.db')
-        cursor = conn.cursor()
+        result = await executors.run_db(acknowledge_alert, alert_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error acknowledging alert: {str(e)}")
+    
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Alert {alert_id} not found")
+    row, version = result
+    if version is not None:
+        # The acknowledge trigger bumps the write version once
+        top_alerts.apply(version - 1, version, removed=[alert_id])
+    return row_to_alert(row)
+
+@router.get("/api/dashboard", response_model=DashboardResponse)
+async def get_dashboard(request: Request, fields: Optional[str] = None):
+    """Get comprehensive dashboard data
+    
+    `fields` is a comma separated list of sections to return (default: all).
+    Responses carry an ETag derived from the database write version; send it
+    back in If-None-Match to get a 304 while nothing has changed.
+    """
+    if fields:
+        requested = [name.strip() for name in fields.split(',') if name.strip()]
+        unknown = [name for name in requested if name not in DASHBOARD_SECTIONS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown dashboard fields: {', '.join(unknown)}. Valid fields: {', '.join(DASHBOARD_SECTIONS)}"
+            )
+        # Canonical order, so equivalent requests share an ETag
+        requested = [name for name in DASHBOARD_SECTIONS if name in requested]
+    else:
+        requested = list(DASHBOARD_SECTIONS)
+    
+    try:
+        # Revalidation reads one row instead of building the dashboard
+        version = await current_write_version()
+        etag = dashboard_etag(version, requested)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers=headers)
         
-        cursor.execute("""
-            SELECT id, content, author, timestamp, sentiment_score, sentiment_label, 
-                   misinformation_risk, category, priority_score
-            FROM posts 
-            ORDER BY timestamp DESC 
-            LIMIT ? OFFSET ?
-        """, (limit, offset))
+        async def render():
+            # Every section is read from one snapshot on one pooled connection
+            _, sections = await executors.run_snapshot(read_dashboard, requested)
+            return render_json(sections)
         
-        posts = []
-        for row in cursor.fetchall():
-            posts.append(PostResponse(
-                id=row[0],
-                content=row[1],
-                author=row[2],
-                timestamp=row[3],
-                sentiment_score=row[4],
-                sentiment_label=row[5],
-                misinformation_risk=row[6],
-                category=row[7],
-                priority_score=row[8]
-            ))
+        key = f"dashboard|{'+'.join(requested)}|{datetime.now():%Y%m%d}"
+        body = await response_cache.get_or_render(key, version, render)
+        return Response(content=body, media_type="application/json", headers=headers)
         
-        conn.close()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving dashboard: {str(e)}")
+
+@router.get("/api/posts", response_model=List[PostResponse])
+async def get_posts(
+    response: Response,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    sentiment_label: Optional[str] = None,
+    author: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """Get a page of posts, newest first
+    
+    Pass the X-Next-Cursor or X-Prev-Cursor header of a response back as
+    `cursor` to move between pages; offset paging is kept for old clients.
+    """
+    try:
+        page = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Stored timestamps are 'YYYY-MM-DD HH:MM:SS' UTC text
+    filters = dict(
+        category=category,
+        sentiment_label=sentiment_label,
+        author=author,
+        since=to_db_timestamp(since) if since else None,
+        until=to_db_timestamp(until) if until else None,
+    )
+    
+    try:
+        posts, next_cursor, prev_cursor = await executors.run_read(
+            lambda db_cursor: read_posts_page(db_cursor, limit, offset, page, **filters)
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        if prev_cursor:
+            response.headers["X-Prev-Cursor"] = prev_cursor
         return posts
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving posts: {str(e)}")
 
-@app.get("/")
+@router.get("/api/stream")
+async def stream_updates(request: Request, topics: Optional[str] = None):
+    """Server-sent events for posts as they are stored
+    
+    `topics` is a comma separated subset of post, alert and rollup (default:
+    all). post and alert events carry one PostResponse / AlertResponse each;
+    rollup events carry the per day and category deltas since the last one.
+    A `dropped` event with a count means the client fell behind and should
+    re-fetch instead of relying on the events it missed.
+    """
+    if topics:
+        requested = [topic.strip() for topic in topics.split(',') if topic.strip()]
+        unknown = [topic for topic in requested if topic not in STREAM_TOPICS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown stream topics: {', '.join(unknown)}. Valid topics: {', '.join(STREAM_TOPICS)}"
+            )
+    else:
+        requested = list(STREAM_TOPICS)
+    
+    try:
+        subscription = broker.subscribe(requested)
+    except BrokerFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return StreamingResponse(
+        sse_stream(request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/api/cache/stats", response_model=CacheStatsResponse)
+async def get_cache_stats():
+    """Hit/miss counters and occupancy of the analysis cache"""
+    return analysis_cache.stats()
+
+@router.get("/api/cache/responses", response_model=ResponseCacheStatsResponse)
+async def get_response_cache_stats():
+    """Hit/miss counters of the read endpoint response cache"""
+    return response_cache.stats()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the database and workers when the server starts, release them when it stops
+
+    Nothing runs on import, so importing this module is cheap and free of
+    side effects. Analysis workers fork before the DB thread pool starts.
+    """
+    init_db()
+    warm_up()
+    executors.start()
+    analysis_cache.load()
+    if STREAM_RELAY:
+        # Tail posts stored by the other workers when running several
+        relay.start(
+            current_write_version,
+            lambda: executors.run_read(read_last_post_id),
+            lambda after_id, limit: executors.run_snapshot(read_posts_since, after_id, limit),
+            relay_posts,
+            has_stream_subscribers,
+        )
+    try:
+        yield
+    finally:
+        await relay.stop()
+        executors.shutdown()
+        analysis_cache.close()
+        await response_cache.close()
+        storage.close()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Request, stage, pool, cache and ingest metrics of this worker in the Prometheus text format"""
+    return Response(content=REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@router.get("/")
 async def root():
     """Health check endpoint"""
     return {
@@ -740,16 +1308,53 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "POST /api/posts": "Submit community posts for analysis",
+            "POST /api/posts/bulk": "Bulk post ingest (JSON array or NDJSON)",
             "GET /api/posts": "Retrieve analyzed posts with sentiment scores",
             "POST /api/analyze": "Real-time content analysis",
+            "POST /api/analyze/batch": "Batch content analysis (JSON array or NDJSON)",
             "POST /api/sentiment-analysis": "Sentiment analysis with confidence scores",
             "GET /api/dashboard": "Community intelligence metrics",
             "GET /api/health": "Community health score",
             "GET /api/analytics": "Get community analytics",
-            "GET /api/alerts": "Get alerts"
+            "GET /api/alerts": "Get alerts",
+            "GET /api/alerts/history": "Page through all alerts",
+            "POST /api/alerts/{id}/acknowledge": "Acknowledge an alert",
+            "GET /api/stream": "Live post, alert and rollup updates (server-sent events)",
+            "GET /api/cache/stats": "Analysis cache hit/miss statistics",
+            "GET /api/cache/responses": "Read endpoint response cache statistics",
+            "GET /metrics": "Prometheus metrics"
         }
     }
 
+def create_app() -> FastAPI:
+    """Build the API application (`uvicorn main:create_app --factory`)"""
+    app = FastAPI(
+        title="CommunityPulse API",
+        description="AI-powered community intelligence platform",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        # Page cursors for /api/posts
+        expose_headers=["X-Next-Cursor", "X-Prev-Cursor"],
+    )
+
+    # Outermost, so request timings include the other middleware
+    if METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
+    app.include_router(router)
+    return app
+
+app = create_app()
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
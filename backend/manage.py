@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+CommunityPulse management commands
+Maintenance tasks that run against the database outside the API process.
+
+Usage:
+    python manage.py migrate
+    python manage.py rebuild-rollups
+    python manage.py seed-demo
+"""
+
+import argparse
+import time
+
+from demo_data import generate_sample_data
+from migrations import LATEST_VERSION, migrate, migration_lock
+from rollups import rebuild_rollups
+from storage import DATABASE_PATH, storage
+
+
+def migrate_command(args):
+    """Bring the database schema up to date"""
+    with migration_lock(), storage.write() as conn:
+        applied = migrate(conn)
+    if applied:
+        print(f"✅ Applied migrations {', '.join(map(str, applied))} to {DATABASE_PATH}")
+    else:
+        print(f"✅ {DATABASE_PATH} is already at schema version {LATEST_VERSION}")
+
+
+def rebuild_rollups_command(args):
+    """Recompute the per day and category rollups from the posts table"""
+    start = time.perf_counter()
+    with migration_lock(), storage.write() as conn:
+        migrate(conn)
+        cursor = conn.cursor()
+        rows = rebuild_rollups(cursor)
+        cursor.execute("SELECT IFNULL(SUM(posts), 0) FROM post_rollups")
+        posts = cursor.fetchone()[0]
+    print(f"✅ Rebuilt {rows:,} rollup rows covering {posts:,} posts in {time.perf_counter() - start:.2f} s")
+
+
+def seed_demo_command(args):
+    """Add the demo posts to an empty database"""
+    added = generate_sample_data()
+    if added:
+        print(f"✅ Seeded {added} demo posts into {DATABASE_PATH}")
+    else:
+        print(f"✅ {DATABASE_PATH} already has posts, leaving it as it is")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CommunityPulse management commands')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser(
+        'migrate', help='Apply pending schema migrations'
+    ).set_defaults(handler=migrate_command)
+    commands.add_parser(
+        'rebuild-rollups', help='Recompute analytics rollups from scratch'
+    ).set_defaults(handler=rebuild_rollups_command)
+    commands.add_parser(
+        'seed-demo', help='Add the demo posts to an empty database'
+    ).set_defaults(handler=seed_demo_command)
+
+    args = parser.parse_args()
+    try:
+        args.handler(args)
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+"""
+Metrics for the CommunityPulse API
+Counters, gauges and histograms rendered in the Prometheus text format by
+GET /metrics. Recording is a dict lookup and a few additions under an
+uncontended lock, so it stays on in production; METRICS_ENABLED=0 turns the
+request middleware, stage timers and SQL statement timing into no-ops.
+
+Metrics are kept per process. Under gunicorn each scrape of /metrics is
+answered by whichever worker accepts it, so scrape the workers individually
+or aggregate with sum()/rate() over the series rather than reading one
+sample as the whole server.
+"""
+
+import abc
+import os
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1').lower() not in ('0', 'false', 'no')
+
+PREFIX = 'communitypulse_'
+
+# Seconds; covers a cached read (~100 µs) up to a slow bulk request
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, 'Metric'] = {}
+
+    def register(self, metric: 'Metric'):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional['Metric']:
+        return self._metrics.get(PREFIX + name)
+
+    def render(self) -> bytes:
+        """Every metric in the Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            lines.extend(metric.render())
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+REGISTRY = Registry()
+
+
+class Metric(abc.ABC):
+    type = 'untyped'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), registry: Registry = REGISTRY):
+        self.name = PREFIX + name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    @abc.abstractmethod
+    def _new_child(self):
+        """A new series to record to"""
+
+    def labels(self, *values):
+        """The series for one combination of label values (cached)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @abc.abstractmethod
+    def render(self) -> List[str]:
+        """The sample lines of every series"""
+
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def render(self) -> List[str]:
+        return [f'{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}'
+                for values, child in list(self._children.items())]
+
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum', '_lock')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # One count per bucket plus +Inf, not cumulative until rendered
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS, registry: Registry = REGISTRY):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def render(self) -> List[str]:
+        lines = []
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class CallbackMetric(Metric):
+    """A gauge or counter whose samples are read from `collect` at scrape time
+
+    `collect` returns a number, or {label value tuple: number} when the
+    metric has labels. Used for state that other objects already count, so
+    recording it costs nothing.
+    """
+
+    def __init__(self, name: str, help: str, collect: Callable, type: str = 'gauge',
+                 labelnames: Sequence[str] = (), registry: Registry = REGISTRY):
+        self.type = type
+        self.collect = collect
+        super().__init__(name, help, labelnames, registry)
+
+    def _new_child(self):
+        raise TypeError(f"{self.name} is read from its callback and has no series to record to")
+
+    def render(self) -> List[str]:
+        samples = self.collect()
+        if not isinstance(samples, dict):
+            samples = {(): samples}
+        return [f'{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}'
+                for values, value in samples.items()]
+
+
+# Metrics recorded by this module
+REQUESTS = Counter('http_requests_total', 'HTTP requests by route and status',
+                   ('method', 'route', 'status'))
+REQUEST_SECONDS = Histogram('http_request_duration_seconds',
+                            'Time from receiving a request to sending the last byte of its response',
+                            ('method', 'route'))
+STAGE_SECONDS = Histogram('stage_duration_seconds',
+                          'Time spent in one call of an instrumented stage of request handling',
+                          ('stage',))
+STAGE_ITEMS = Counter('stage_items_total', 'Items (texts, rows) processed by each stage', ('stage',))
+STATEMENT_SECONDS = Histogram('db_statement_duration_seconds',
+                              'SQLite statement time by statement, split into execute and fetch',
+                              ('statement', 'phase'))
+
+
+# Stage timers
+_local = threading.local()
+
+
+_stage_series: Dict[str, tuple] = {}
+
+
+def observe_stage(stage: str, seconds: float, items: int = 1):
+    pending = getattr(_local, 'pending', None)
+    if pending is not None:
+        # Inside collect_stages: hand the timing back to the caller
+        pending.append((stage, seconds, items))
+        return
+    series = _stage_series.get(stage)
+    if series is None:
+        series = _stage_series.setdefault(stage, (STAGE_SECONDS.labels(stage), STAGE_ITEMS.labels(stage)))
+    series[0].observe(seconds)
+    series[1].inc(items)
+
+
+class stage:
+    """Time a block as one call of `stage`: `with stage('sentiment', len(texts)):`"""
+
+    __slots__ = ('name', 'items', 'start')
+
+    def __init__(self, name: str, items: int = 1):
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if METRICS_ENABLED:
+            observe_stage(self.name, time.perf_counter() - self.start, self.items)
+
+
+def collect_stages(fn: Callable, *args):
+    """Run `fn(*args)` and return (result, stage timings it recorded)
+
+    Analysis runs in worker processes whose metrics nobody scrapes, so the
+    executor runs tasks through this and records the timings in the server
+    process with record_stages().
+    """
+    _local.pending = []
+    try:
+        return fn(*args), _local.pending
+    finally:
+        _local.pending = None
+
+
+def record_stages(timings: Iterable[Tuple[str, float, int]]):
+    for name, seconds, items in timings:
+        observe_stage(name, seconds, items)
+
+
+# SQL statement timing
+_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE|TABLE|ON)\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?(?!OF\b)(\w+)',
+                    re.IGNORECASE)
+_statement_series: Dict[str, tuple] = {}
+
+
+def statement_name(sql: str) -> str:
+    """A low-cardinality label for a statement: its verb and first table"""
+    words = sql.split(None, 1)
+    verb = words[0].upper() if words else ''
+    table = _TABLE.search(sql)
+    return f'{verb} {table.group(1)}' if table else verb
+
+
+def _statement(sql: str) -> tuple:
+    """The (execute, fetch) histogram series for a statement text"""
+    series = _statement_series.get(sql)
+    if series is None:
+        name = statement_name(sql)
+        series = (STATEMENT_SECONDS.labels(name, 'execute'), STATEMENT_SECONDS.labels(name, 'fetch'))
+        # Statement texts are fixed in the code, so this stays small; the
+        # guard is for callers that inline values
+        if len(_statement_series) < 10000:
+            _statement_series[sql] = series
+    return series
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Records execute and fetch time per statement in STATEMENT_SECONDS"""
+
+    _fetch = None
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            executed, self._fetch = _statement(sql)
+            executed.observe(time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            executed, self._fetch = _statement(sql)
+            executed.observe(time.perf_counter() - start)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            if self._fetch is not None:
+                self._fetch.observe(time.perf_counter() - start)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            if self._fetch is not None:
+                self._fetch.observe(time.perf_counter() - start)
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3 connection whose cursors, and shortcut execute calls, are timed"""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+# Request metrics
+class MetricsMiddleware:
+    """ASGI middleware recording REQUESTS and REQUEST_SECONDS per route template
+
+    Routes are labelled by their template (/api/alerts/{alert_id}/acknowledge),
+    never the raw path, so the number of series stays fixed. Streaming
+    responses are timed until their last chunk, so /api/stream records
+    connection lifetimes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._paths: Optional[Dict[Callable, str]] = None
+
+    def _route(self, scope) -> str:
+        route = scope.get('route')
+        if route is not None:
+            return getattr(route, 'path', 'unmatched')
+        # Older Starlette only records the endpoint function
+        endpoint = scope.get('endpoint')
+        if endpoint is None:
+            return 'unmatched'
+        if self._paths is None:
+            self._paths = {getattr(r, 'endpoint', None): r.path for r in scope['app'].routes}
+        return self._paths.get(endpoint, 'unmatched')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            method = scope['method']
+            route = self._route(scope)
+            REQUEST_SECONDS.labels(method, route).observe(time.perf_counter() - start)
+            REQUESTS.labels(method, route, str(status)).inc()
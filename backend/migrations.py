@@ -0,0 +1,156 @@
+"""
+Schema migrations for the CommunityPulse database
+Each migration runs once, in order, inside the same transaction as the
+PRAGMA user_version bump that records it. Append new migrations to the end
+of MIGRATIONS; never edit one that has shipped.
+"""
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Callable, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single process migrates anyway
+    fcntl = None
+
+from alerts import create_alerts
+from rollups import create_rollups, rebuild_rollups
+from storage import DATABASE_PATH
+from write_version import create_write_version
+
+
+def _create_tables(cursor):
+    # Create posts table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content TEXT NOT NULL,
+            author TEXT NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            sentiment_score REAL,
+            sentiment_label TEXT,
+            misinformation_risk REAL,
+            category TEXT,
+            priority_score REAL
+        )
+    ''')
+
+    # Create analytics table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS analytics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date DATE,
+            total_posts INTEGER,
+            avg_sentiment REAL,
+            positive_posts INTEGER,
+            negative_posts INTEGER,
+            neutral_posts INTEGER,
+            misinformation_alerts INTEGER,
+            community_health_score REAL
+        )
+    ''')
+
+
+def _create_rollups(cursor):
+    # Per day and category rollups, kept current by triggers on posts
+    if create_rollups(cursor):
+        rebuild_rollups(cursor)
+
+
+def _create_post_indexes(cursor):
+    # Newest-first listings (/api/posts, dashboard recent posts)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_timestamp ON posts(timestamp)')
+    # Listings filtered to one category
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_category_timestamp ON posts(category, timestamp)')
+    # Ranking by priority
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_priority_score ON posts(priority_score)')
+    # Alerts: only risky posts are indexed, already in alert order
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_posts_risky
+        ON posts(priority_score DESC, misinformation_risk DESC)
+        WHERE misinformation_risk > 0.3 OR priority_score > 0.7
+    ''')
+
+
+def _create_post_filter_indexes(cursor):
+    # /api/posts filtered by author or sentiment; the rowid rides along in
+    # every index, so (timestamp, id) cursors seek on these too
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_author_timestamp ON posts(author, timestamp)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_sentiment_timestamp ON posts(sentiment_label, timestamp)')
+
+
+def _create_write_version(cursor):
+    # Counter bumped on every posts write, for ETags and response caches
+    create_write_version(cursor)
+
+
+def _create_alerts(cursor):
+    # Alerts raised by triggers on posts, backfilled from the existing posts
+    create_alerts(cursor)
+    # Alerts are no longer read from posts
+    cursor.execute('DROP INDEX IF EXISTS idx_posts_risky')
+
+
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, 'posts and analytics tables', _create_tables),
+    (2, 'per day and category rollups', _create_rollups),
+    (3, 'posts indexes for listings and alerts', _create_post_indexes),
+    (4, 'posts indexes for author and sentiment filters', _create_post_filter_indexes),
+    (5, 'write version counter', _create_write_version),
+    (6, 'alerts table', _create_alerts),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+@contextmanager
+def migration_lock(database_path: str = DATABASE_PATH):
+    """Hold an exclusive lock on a file next to the database while migrating
+
+    Worker processes that start together would otherwise all read the same
+    schema version and queue up to apply the same migrations. The lock is
+    released when the process exits, so a crashed migration cannot leave
+    it held.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    fd = os.open(f"{database_path}.migrate.lock", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def migrate(conn: sqlite3.Connection) -> List[int]:
+    """Apply pending migrations; returns the versions that were applied
+
+    Databases created before migrations existed report version 0; the early
+    migrations use IF NOT EXISTS so they adopt those in place.
+    """
+    applied = []
+    for version, _, apply in MIGRATIONS:
+        if version <= schema_version(conn):
+            continue
+
+        # DDL does not open a transaction implicitly, so start one to make
+        # the migration and its version bump atomic
+        if not conn.in_transaction:
+            conn.execute('BEGIN IMMEDIATE')
+        try:
+            apply(conn.cursor())
+            conn.execute(f'PRAGMA user_version = {version}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
@@ -0,0 +1,122 @@
+"""
+Newline-delimited JSON helpers for the streaming batch endpoints
+"""
+
+import json
+import os
+from typing import Any, AsyncIterator, List, Tuple
+
+from starlette.exceptions import HTTPException
+from starlette.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+NDJSON_MEDIA_TYPES = (NDJSON_MEDIA_TYPE, 'application/jsonl', 'application/ndjson')
+
+# Longest line buffered while waiting for its newline
+MAX_LINE_BYTES = int(os.getenv('MAX_NDJSON_LINE_BYTES', str(1024 * 1024)))
+
+
+def is_ndjson(content_type: str) -> bool:
+    """True when a Content-Type or Accept header asks for NDJSON"""
+    return any(media_type in (content_type or '') for media_type in NDJSON_MEDIA_TYPES)
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes],
+                      max_line_bytes: int = MAX_LINE_BYTES) -> AsyncIterator[Tuple[int, Any]]:
+    """Parse a byte stream into (line_index, value) pairs
+
+    Blank lines are skipped without consuming an index. Lines that fail to
+    parse yield the ValueError as the value so callers can report the item
+    and keep going. A line longer than `max_line_bytes` raises a 413
+    HTTPException, so a body without newlines is never buffered whole.
+    """
+    # Pieces of the line whose newline has not arrived yet; only new bytes are searched
+    pending: List[bytes] = []
+    pending_size = 0
+    index = 0
+    async for chunk in chunks:
+        start = 0
+        newline = chunk.find(b'\n')
+        while newline != -1:
+            _check_line_size(pending_size + newline - start, max_line_bytes)
+            pending.append(chunk[start:newline])
+            line = b''.join(pending)
+            pending, pending_size = [], 0
+            if line.strip():
+                yield index, _loads(line)
+                index += 1
+            start = newline + 1
+            newline = chunk.find(b'\n', start)
+        if start < len(chunk):
+            pending_size += len(chunk) - start
+            _check_line_size(pending_size, max_line_bytes)
+            pending.append(chunk[start:])
+
+    line = b''.join(pending)
+    if line.strip():
+        yield index, _loads(line)
+
+
+async def iter_batches(items: AsyncIterator, size: int) -> AsyncIterator[List]:
+    """Group an async iterator into lists of at most `size` items"""
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def dumps_line(value: Any) -> bytes:
+    return json.dumps(value, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def _check_line_size(size: int, max_line_bytes: int):
+    if size > max_line_bytes:
+        raise HTTPException(status_code=413, detail=f"NDJSON line exceeds {max_line_bytes} bytes")
+
+
+def _loads(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return e
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """Streams NDJSON while the request body is still being read
+
+    Starlette's StreamingResponse polls receive() for disconnects, which
+    would steal the body chunks the generator is still consuming, so this
+    variant only sends. The response starts with the first line, so an
+    HTTPException raised before then (such as a 413 for an overlong line)
+    is answered with its status; one raised later ends the stream with an
+    {"error": ...} line.
+    """
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope, receive, send):
+        started = False
+        try:
+            async for chunk in self.body_iterator:
+                if not started:
+                    await send({
+                        'type': 'http.response.start',
+                        'status': self.status_code,
+                        'headers': self.raw_headers,
+                    })
+                    started = True
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        except HTTPException as e:
+            if not started:
+                raise
+            await send({'type': 'http.response.body', 'body': dumps_line({'error': e.detail}), 'more_body': True})
+        if not started:
+            await send({
+                'type': 'http.response.start',
+                'status': self.status_code,
+                'headers': self.raw_headers,
+            })
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
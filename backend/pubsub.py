@@ -0,0 +1,179 @@
+"""
+In-process publish/subscribe for live updates
+Fans events out to every subscriber of a topic in this worker process. Each
+subscriber has a bounded queue: queued topics drop their oldest events when
+a slow client falls behind (the client is told how many it missed), and
+coalesced topics keep a single pending value per subscriber that new events
+are merged into. An idle subscriber costs a small deque and one pending
+future; waking it is a set_result call, and a single broker-wide timer wakes
+idle subscribers for keepalives instead of one timer per connection.
+
+Publish and subscribe from the event loop thread only.
+"""
+
+import asyncio
+import os
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Events buffered per subscriber before the oldest are dropped
+STREAM_QUEUE_SIZE = int(os.getenv('STREAM_QUEUE_SIZE', '256'))
+
+# Seconds between wakeups of idle subscribers (SSE keepalive comments)
+STREAM_KEEPALIVE = float(os.getenv('STREAM_KEEPALIVE', '15'))
+
+# Concurrent subscribers allowed per worker process
+MAX_STREAM_SUBSCRIBERS = int(os.getenv('MAX_STREAM_SUBSCRIBERS', '10000'))
+
+# Name of the event that reports dropped events to a subscriber
+DROPPED = 'dropped'
+
+
+def _wake(waiter: Optional[asyncio.Future]):
+    if waiter is not None and not waiter.done():
+        waiter.set_result(None)
+
+
+class BrokerFullError(RuntimeError):
+    """Raised when a worker already has MAX_STREAM_SUBSCRIBERS subscribers"""
+
+
+class Subscription:
+    __slots__ = ('topics', 'events', 'coalesced', 'dropped', '_waiter')
+
+    def __init__(self, topics: Iterable[str], max_queue: int):
+        self.topics = tuple(topics)
+        self.events = deque(maxlen=max_queue)
+        self.coalesced: Dict[str, object] = {}
+        self.dropped = 0
+        self._waiter: Optional[asyncio.Future] = None
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.events or self.coalesced or self.dropped)
+
+
+class Broker:
+    def __init__(self, encode: Callable[[str, object], bytes],
+                 coalesce: Optional[Dict[str, Callable]] = None,
+                 max_queue: int = STREAM_QUEUE_SIZE,
+                 max_subscribers: int = MAX_STREAM_SUBSCRIBERS,
+                 keepalive: float = STREAM_KEEPALIVE):
+        """`encode(topic, data)` renders one event for the wire; `coalesce`
+        maps topics to a `merge(pending, new)` function that must not mutate
+        its arguments (the same value is shared by every subscriber)."""
+        self.encode = encode
+        self.coalesce = dict(coalesce or {})
+        self.max_queue = max_queue
+        self.max_subscribers = max_subscribers
+        self.keepalive = keepalive
+
+        self._topics: Dict[str, set] = {}
+        self._subscriptions = set()
+        self._heartbeat: Optional[asyncio.TimerHandle] = None
+        # Last rendering of each coalesced topic, shared by subscribers that
+        # hold the same merged value
+        self._rendered: Dict[str, tuple] = {}
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        if len(self._subscriptions) >= self.max_subscribers:
+            raise BrokerFullError(
+                f"Too many live subscribers (limit {self.max_subscribers}), try again later"
+            )
+        subscription = Subscription(topics, self.max_queue)
+        for topic in subscription.topics:
+            self._topics.setdefault(topic, set()).add(subscription)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription not in self._subscriptions:
+            return
+        self._subscriptions.discard(subscription)
+        for topic in subscription.topics:
+            subscribers = self._topics[topic]
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._topics[topic]
+
+    def has_subscribers(self, topic: str) -> bool:
+        return topic in self._topics
+
+    def publish(self, topic: str, items: List[object]):
+        """Deliver `items` to every subscriber of `topic`, in order"""
+        subscribers = self._topics.get(topic)
+        if not subscribers or not items:
+            return
+        self.published += len(items)
+
+        merge = self.coalesce.get(topic)
+        if merge is not None:
+            # Merge the batch once, then into each subscriber's pending value
+            merged = items[0]
+            for item in items[1:]:
+                merged = merge(merged, item)
+            for subscription in subscribers:
+                pending = subscription.coalesced.get(topic)
+                subscription.coalesced[topic] = merged if pending is None else merge(pending, merged)
+                _wake(subscription._waiter)
+            return
+
+        # Encode once; every subscriber queues the same bytes
+        messages = [self.encode(topic, item) for item in items]
+        for subscription in subscribers:
+            overflow = len(subscription.events) + len(messages) - self.max_queue
+            if overflow > 0:
+                subscription.dropped += overflow
+                self.dropped += overflow
+            subscription.events.extend(messages)
+            _wake(subscription._waiter)
+
+    async def get(self, subscription: Subscription) -> List[bytes]:
+        """Wait for events; [] when woken by the keepalive timer instead
+
+        A dropped-events notice comes first, then queued events in publish
+        order, then one event per coalesced topic.
+        """
+        if not subscription.ready:
+            loop = asyncio.get_running_loop()
+            if self._heartbeat is None:
+                self._heartbeat = loop.call_later(self.keepalive, self._beat)
+            subscription._waiter = loop.create_future()
+            try:
+                await subscription._waiter
+            finally:
+                subscription._waiter = None
+            if not subscription.ready:
+                return []
+
+        messages = []
+        if subscription.dropped:
+            messages.append(self.encode(DROPPED, {'count': subscription.dropped}))
+            subscription.dropped = 0
+        messages.extend(subscription.events)
+        subscription.events.clear()
+        for topic, data in subscription.coalesced.items():
+            messages.append(self._render(topic, data))
+        subscription.coalesced.clear()
+        return messages
+
+    def _render(self, topic: str, data) -> bytes:
+        rendered = self._rendered.get(topic)
+        if rendered is None or rendered[0] is not data:
+            rendered = self._rendered[topic] = (data, self.encode(topic, data))
+        return rendered[1]
+
+    def _beat(self):
+        """Wake every idle subscriber so its stream can send a keepalive"""
+        self._heartbeat = None
+        for subscription in self._subscriptions:
+            _wake(subscription._waiter)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'subscribers': len(self._subscriptions),
+            'published': self.published,
+            'dropped': self.dropped,
+        }
@@ -0,0 +1,127 @@
+"""
+Cross-worker relay for live updates
+The pubsub broker only reaches subscribers in its own process. When several
+worker processes serve the API (see gunicorn.conf.py), each one tails the
+posts table for rows the other workers stored and publishes them to its own
+subscribers. Posts stored by this worker are published as they are written
+and skipped by the relay, so subscribers see every post exactly once.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Awaitable, Callable, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Set by gunicorn.conf.py when it starts more than one worker
+STREAM_RELAY = os.getenv('STREAM_RELAY', '0').lower() in ('1', 'true', 'yes')
+
+# Seconds between write version checks, the extra latency of relayed events
+STREAM_RELAY_INTERVAL = float(os.getenv('STREAM_RELAY_INTERVAL', '0.5'))
+
+# Posts read per query while catching up
+STREAM_RELAY_BATCH = int(os.getenv('STREAM_RELAY_BATCH', '1000'))
+
+
+class PostRelay:
+    def __init__(self, interval: float = STREAM_RELAY_INTERVAL, batch_size: int = STREAM_RELAY_BATCH):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.last_id: Optional[int] = None
+        self.relayed = 0
+
+        # Ids this worker stored and published itself that the relay has not passed yet.
+        # Writers add to it from DB threads, so it is guarded by a lock
+        self._local: Set[int] = set()
+        self._local_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def stored_here(self, ids: Iterable[int]):
+        """Record posts this worker stores and publishes itself
+
+        Called from the writer's DB thread inside the insert transaction,
+        before the commit makes the rows visible to the relay's reads.
+        """
+        if self._task is not None:
+            with self._local_lock:
+                self._local.update(ids)
+
+    def discard(self, ids: Iterable[int]):
+        """Forget ids recorded by a transaction that did not commit"""
+        with self._local_lock:
+            self._local.difference_update(ids)
+
+    def _advance(self, last_id: int):
+        self.last_id = last_id
+        with self._local_lock:
+            self._local = {post_id for post_id in self._local if post_id > last_id}
+
+    async def poll(self, read_since: Callable[[int, int], Awaitable[Tuple[List[tuple], List[tuple]]]],
+                   publish: Callable[[List[tuple], List[tuple]], None]):
+        """Publish posts stored by other workers since last_id"""
+        while True:
+            # Post ids are assigned inside the write transaction, and
+            # SQLite commits one writer at a time, so they appear in order
+            posts, alerts = await read_since(self.last_id, self.batch_size)
+            if not posts:
+                break
+            with self._local_lock:
+                foreign = [post for post in posts if post[0] not in self._local]
+            if foreign:
+                ids = {post[0] for post in foreign}
+                publish(foreign, [alert for alert in alerts if alert[1] in ids])
+                self.relayed += len(foreign)
+            self._advance(posts[-1][0])
+            if len(posts) < self.batch_size:
+                break
+
+    async def _run(self, current_version: Callable[[], Awaitable[int]],
+                   last_post_id: Callable[[], Awaitable[int]],
+                   read_since: Callable[[int, int], Awaitable[Tuple[List[tuple], List[tuple]]]],
+                   publish: Callable[[List[tuple], List[tuple]], None],
+                   wanted: Callable[[], bool]):
+        version = await current_version()
+        self._advance(await last_post_id())
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                latest = await current_version()
+                if latest == version:
+                    continue
+                version = latest
+
+                if not wanted():
+                    # Nobody here is listening: skip ahead instead of reading
+                    self._advance(await last_post_id())
+                    continue
+
+                await self.poll(read_since, publish)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep tailing: the next write version change retries from last_id
+                logger.warning("Stream relay failed to read new posts: %s", e)
+
+    def start(self, current_version, last_post_id, read_since, publish, wanted):
+        """Tail the posts table on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(current_version, last_post_id, read_since, publish, wanted)
+            )
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            with self._local_lock:
+                self._local.clear()
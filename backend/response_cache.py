@@ -0,0 +1,206 @@
+"""
+Response cache for read endpoints
+Rendered JSON bodies of /api/analytics, /api/health and /api/dashboard
+are cached under the endpoint, its parameters and the database write
+version, so every write makes the previous entries unreachable instead of
+having to find and delete them. Entries live in an
+in-process LRU or in Redis (shared by every worker), and concurrent misses
+for the same key are coalesced so a burst of requests after a write costs
+one recomputation per worker.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# memory, redis or none
+RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'memory').lower()
+# Entries kept by the in-process backend
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '1024'))
+# Seconds an entry is kept; superseded versions are never read again, this
+# only bounds how long they take up space
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '300'))
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+# Seconds to bypass an unreachable backend before trying it again
+RESPONSE_CACHE_RETRY = 5.0
+
+REDIS_KEY_PREFIX = 'communitypulse:response:'
+
+
+class MemoryBackend:
+    """LRU of rendered bodies in this worker process"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    async def set(self, key: str, body: bytes, ttl: int):
+        # Superseded versions fall off the end of the LRU, so no expiry here
+        self._entries[key] = body
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def close(self):
+        self._entries.clear()
+
+
+class RedisBackend:
+    """Bodies shared by every worker through Redis (or a compatible store)"""
+
+    name = 'redis'
+
+    def __init__(self, url: str = REDIS_URL):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis needs the redis package: pip install redis")
+        self.url = url
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(REDIS_KEY_PREFIX + key)
+
+    async def set(self, key: str, body: bytes, ttl: int):
+        await self._client.set(REDIS_KEY_PREFIX + key, body, ex=ttl or None)
+
+    def __len__(self):
+        return 0
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def make_backend(name: str = RESPONSE_CACHE_BACKEND):
+    if name in ('none', 'off', ''):
+        return None
+    if name == 'memory':
+        return MemoryBackend()
+    if name == 'redis':
+        return RedisBackend()
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {name}")
+
+
+class SingleFlight:
+    """Run one call per key at a time; concurrent callers share its result"""
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    def pending(self, key: str) -> bool:
+        return key in self._calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable]):
+        call = self._calls.get(key)
+        if call is not None:
+            self.coalesced += 1
+            # Shielded so one caller disconnecting does not cancel the others
+            return await asyncio.shield(call)
+
+        call = self._calls[key] = asyncio.ensure_future(fn())
+        call.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(call)
+
+
+class ResponseCache:
+    def __init__(self, backend=None, ttl: int = RESPONSE_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._down_until = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def get_or_render(self, key: str, version: int, render: Callable[[], Awaitable[bytes]]) -> bytes:
+        """The cached body for `key` at `version`, rendering it on a miss
+
+        Misses for the same key and version share a single render call.
+        """
+        if self.backend is None:
+            return await render()
+        versioned = f'{key}@{version}'
+        if not self._flight.pending(versioned):
+            body = await self._read(versioned)
+            if body is not None:
+                self.hits += 1
+                return body
+        # Looks the key up again inside the flight, in case another request
+        # stored it while this one was reading
+        return await self._flight.do(versioned, lambda: self._lookup(versioned, render))
+
+    async def _read(self, key: str) -> Optional[bytes]:
+        if time.monotonic() < self._down_until:
+            return None
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            self._failed('read', e)
+            return None
+
+    async def _write(self, key: str, body: bytes):
+        if time.monotonic() < self._down_until:
+            return
+        try:
+            await self.backend.set(key, body, self.ttl)
+        except Exception as e:
+            self._failed('write', e)
+
+    def _failed(self, operation: str, error: Exception):
+        # A cache outage must not take the endpoints down with it: serve
+        # uncached and leave the backend alone for a few seconds
+        self.errors += 1
+        if time.monotonic() >= self._down_until:
+            logger.warning("Response cache %s failed, bypassing it for %.0fs: %s",
+                           operation, RESPONSE_CACHE_RETRY, error)
+        self._down_until = time.monotonic() + RESPONSE_CACHE_RETRY
+
+    async def _lookup(self, key: str, render: Callable[[], Awaitable[bytes]]) -> bytes:
+        body = await self._read(key)
+        if body is not None:
+            self.hits += 1
+            return body
+
+        self.misses += 1
+        body = await render()
+        await self._write(key, body)
+        return body
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'backend': self.backend.name if self.backend is not None else 'none',
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self._flight.coalesced,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'errors': self.errors,
+            'size': len(self.backend) if self.backend is not None else 0,
+            'ttl_seconds': self.ttl,
+        }
+
+    async def close(self):
+        if self.backend is not None:
+            await self.backend.close()
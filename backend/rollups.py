@@ -0,0 +1,182 @@
+"""
+Incrementally maintained post rollups
+One row per (day, category) with the counts and sums the analytics, health
+and dashboard endpoints need. Triggers on the posts table keep it current on
+every insert, update and delete, so reads cost O(days x categories) instead
+of a scan over every post.
+"""
+
+from typing import List, Optional, Tuple
+
+# Posts without a parseable timestamp or a category roll up under ''
+_ADD_NEW = '''
+        INSERT INTO post_rollups VALUES (
+            IFNULL(DATE(NEW.timestamp), ''), IFNULL(NEW.category, ''), 1,
+            NEW.sentiment_label IS 'positive', NEW.sentiment_label IS 'negative',
+            NEW.sentiment_label IS 'neutral', IFNULL(NEW.sentiment_score, 0),
+            NEW.sentiment_score IS NOT NULL, IFNULL(NEW.misinformation_risk > 0.5, 0)
+        )
+        ON CONFLICT (day, category) DO UPDATE SET
+            posts = posts + 1,
+            positive_posts = positive_posts + excluded.positive_posts,
+            negative_posts = negative_posts + excluded.negative_posts,
+            neutral_posts = neutral_posts + excluded.neutral_posts,
+            sentiment_sum = sentiment_sum + excluded.sentiment_sum,
+            sentiment_count = sentiment_count + excluded.sentiment_count,
+            misinformation_alerts = misinformation_alerts + excluded.misinformation_alerts;
+'''
+
+_REMOVE_OLD = '''
+        UPDATE post_rollups SET
+            posts = posts - 1,
+            positive_posts = positive_posts - (OLD.sentiment_label IS 'positive'),
+            negative_posts = negative_posts - (OLD.sentiment_label IS 'negative'),
+            neutral_posts = neutral_posts - (OLD.sentiment_label IS 'neutral'),
+            sentiment_sum = sentiment_sum - IFNULL(OLD.sentiment_score, 0),
+            sentiment_count = sentiment_count - (OLD.sentiment_score IS NOT NULL),
+            misinformation_alerts = misinformation_alerts - IFNULL(OLD.misinformation_risk > 0.5, 0)
+        WHERE day = IFNULL(DATE(OLD.timestamp), '') AND category = IFNULL(OLD.category, '');
+        DELETE FROM post_rollups
+        WHERE day = IFNULL(DATE(OLD.timestamp), '') AND category = IFNULL(OLD.category, '') AND posts <= 0;
+'''
+
+ROLLUP_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS post_rollups (
+        day TEXT NOT NULL,
+        category TEXT NOT NULL,
+        posts INTEGER NOT NULL DEFAULT 0,
+        positive_posts INTEGER NOT NULL DEFAULT 0,
+        negative_posts INTEGER NOT NULL DEFAULT 0,
+        neutral_posts INTEGER NOT NULL DEFAULT 0,
+        sentiment_sum REAL NOT NULL DEFAULT 0,
+        sentiment_count INTEGER NOT NULL DEFAULT 0,
+        misinformation_alerts INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, category)
+    ) WITHOUT ROWID
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS post_rollups_insert AFTER INSERT ON posts
+    BEGIN{_ADD_NEW}    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS post_rollups_delete AFTER DELETE ON posts
+    BEGIN{_REMOVE_OLD}    END
+    ''',
+    # An update moves the post out of its old rollup and into the new one
+    f'''
+    CREATE TRIGGER IF NOT EXISTS post_rollups_update
+    AFTER UPDATE OF timestamp, category, sentiment_score, sentiment_label, misinformation_risk ON posts
+    BEGIN{_REMOVE_OLD}{_ADD_NEW}    END
+    ''',
+]
+
+REBUILD_SQL = '''
+    INSERT INTO post_rollups
+    SELECT IFNULL(DATE(timestamp), ''), IFNULL(category, ''), COUNT(*),
+           TOTAL(sentiment_label IS 'positive'), TOTAL(sentiment_label IS 'negative'),
+           TOTAL(sentiment_label IS 'neutral'), TOTAL(sentiment_score),
+           COUNT(sentiment_score), TOTAL(IFNULL(misinformation_risk > 0.5, 0))
+    FROM posts
+    GROUP BY 1, 2
+'''
+
+
+def create_rollups(cursor) -> bool:
+    """Create the rollup table and triggers; True if the table is new"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'post_rollups'")
+    existed = cursor.fetchone() is not None
+    for statement in ROLLUP_SCHEMA:
+        cursor.execute(statement)
+    return not existed
+
+
+def rebuild_rollups(cursor) -> int:
+    """Recompute every rollup row from the posts table; returns the row count"""
+    cursor.execute("DELETE FROM post_rollups")
+    cursor.execute(REBUILD_SQL)
+    cursor.execute("SELECT COUNT(*) FROM post_rollups")
+    return cursor.fetchone()[0]
+
+
+def read_totals(cursor) -> Tuple[int, int, int, int, Optional[float], int, int]:
+    """(total, positive, negative, neutral, avg_sentiment, misinformation_alerts, scored)
+
+    avg_sentiment is over the `scored` posts that have a sentiment score.
+    """
+    cursor.execute('''
+        SELECT IFNULL(SUM(posts), 0), IFNULL(SUM(positive_posts), 0),
+               IFNULL(SUM(negative_posts), 0), IFNULL(SUM(neutral_posts), 0),
+               TOTAL(sentiment_sum) / NULLIF(SUM(sentiment_count), 0),
+               IFNULL(SUM(misinformation_alerts), 0), IFNULL(SUM(sentiment_count), 0)
+        FROM post_rollups
+    ''')
+    return cursor.fetchone()
+
+
+def read_daily(cursor, since: str) -> List[tuple]:
+    """(date, posts, avg_sentiment, scored) per day on or after `since`"""
+    cursor.execute('''
+        SELECT day, SUM(posts), TOTAL(sentiment_sum) / NULLIF(SUM(sentiment_count), 0),
+               SUM(sentiment_count)
+        FROM post_rollups
+        WHERE day >= ?
+        GROUP BY day
+        ORDER BY day
+    ''', (since,))
+    return cursor.fetchall()
+
+
+def read_categories(cursor) -> List[tuple]:
+    """(category, posts, avg_sentiment) per category, busiest first"""
+    cursor.execute('''
+        SELECT NULLIF(category, ''), SUM(posts) AS count,
+               TOTAL(sentiment_sum) / NULLIF(SUM(sentiment_count), 0)
+        FROM post_rollups
+        GROUP BY category
+        ORDER BY count DESC
+    ''')
+    return cursor.fetchall()
+
+
+ROLLUP_COUNTS = ('posts', 'positive_posts', 'negative_posts', 'neutral_posts',
+                 'sentiment_sum', 'sentiment_count', 'misinformation_alerts')
+
+
+def rollup_deltas(posts: List[dict]) -> List[dict]:
+    """What inserting `posts` adds to post_rollups, one dict per (day, category)
+
+    Mirrors the insert trigger, for pushing live updates without re-reading
+    the table. Timestamps are 'YYYY-MM-DD HH:MM:SS' text.
+    """
+    deltas = {}
+    for post in posts:
+        timestamp = post.get('timestamp') or ''
+        key = (timestamp[:10], post.get('category') or '')
+        delta = deltas.get(key)
+        if delta is None:
+            delta = deltas[key] = dict(day=key[0], category=key[1], **dict.fromkeys(ROLLUP_COUNTS, 0))
+        label = post.get('sentiment_label')
+        score = post.get('sentiment_score')
+        delta['posts'] += 1
+        delta['positive_posts'] += label == 'positive'
+        delta['negative_posts'] += label == 'negative'
+        delta['neutral_posts'] += label == 'neutral'
+        if score is not None:
+            delta['sentiment_sum'] += score
+            delta['sentiment_count'] += 1
+        delta['misinformation_alerts'] += (post.get('misinformation_risk') or 0) > 0.5
+    return list(deltas.values())
+
+
+def merge_rollup_deltas(first: List[dict], second: List[dict]) -> List[dict]:
+    """Sum two lists of rollup deltas into a new list (inputs are not modified)"""
+    merged = {(delta['day'], delta['category']): dict(delta) for delta in first}
+    for delta in second:
+        key = (delta['day'], delta['category'])
+        if key in merged:
+            for name in ROLLUP_COUNTS:
+                merged[key][name] += delta[name]
+        else:
+            merged[key] = dict(delta)
+    return list(merged.values())
@@ -0,0 +1,354 @@
+"""
+Sentiment engines
+Every engine scores a batch of texts with score_batch(texts) and returns
+VADER's polarity dicts ({'neg', 'neu', 'pos', 'compound'}) in order.
+VaderEngine runs vaderSentiment one text at a time. LexiconEngine compiles
+the same lexicon and rules into token-indexed NumPy arrays and scores a whole
+batch with array operations; see test_sentiment_parity.py for how close it
+stays to VADER. SENTIMENT_ENGINE picks the engine (vader or lexicon).
+"""
+
+import abc
+import os
+import string
+from typing import Dict, List
+
+import numpy as np
+
+SENTIMENT_ENGINE = os.getenv('SENTIMENT_ENGINE', 'lexicon').lower()
+
+# Distinct raw tokens LexiconEngine remembers the ids of
+TOKEN_CACHE_SIZE = 200000
+# Below this many texts the fixed cost of the array passes outweighs them,
+# so LexiconEngine hands the batch to VADER (with identical results)
+MIN_ARRAY_BATCH = 16
+
+# Words the rules compare against by name
+_RULE_WORDS = ('no', 'or', 'nor', 'but', 'least', 'at', 'very', 'kind', 'of',
+               'never', 'so', 'this', 'without', 'doubt')
+
+
+def _vader():
+    """vaderSentiment, imported when the first engine is built rather than
+    when this module is"""
+    from vaderSentiment import vaderSentiment
+    return vaderSentiment
+
+
+class SentimentEngine(abc.ABC):
+    """Scores texts with VADER's polarity dicts"""
+
+    name = 'base'
+
+    @abc.abstractmethod
+    def score_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """VADER polarity dicts for `texts`, in order"""
+
+    def warm_up(self):
+        """Build anything filled in lazily, before worker processes fork"""
+
+
+class VaderEngine(SentimentEngine):
+    """vaderSentiment's SentimentIntensityAnalyzer, one text at a time"""
+
+    name = 'vader'
+
+    def __init__(self):
+        self.analyzer = _vader().SentimentIntensityAnalyzer()
+
+    def score_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        return [self.analyzer.polarity_scores(text) for text in texts]
+
+
+def _strip_punctuation(token: str) -> str:
+    # As SentiText: keep tokens that strip to two characters or fewer
+    # (mostly emoticons) as they are
+    stripped = token.strip(string.punctuation)
+    return token if len(stripped) <= 2 else stripped
+
+
+class _TokenCodes(dict):
+    """Raw token -> word id * 2 + ALL CAPS flag, filled in on first sight"""
+
+    def __init__(self, vocabulary: Dict[str, int]):
+        super().__init__()
+        self.vocabulary = vocabulary
+
+    def __missing__(self, token: str) -> int:
+        word = _strip_punctuation(token)
+        lowered = word.lower()
+        word_id = self.vocabulary.get(lowered) or (1 if "n't" in lowered else 0)
+        code = self[token] = word_id * 2 + word.isupper()
+        return code
+
+
+class LexiconEngine(SentimentEngine):
+    """VADER's rules applied to a whole batch with NumPy
+
+    Tokens are mapped through a dict to ids indexing per-word arrays
+    (valence, booster scalar, negation); the mapping of each raw token is
+    remembered, so splitting the texts is the only per-word Python work. All
+    tokens of the batch are laid out in one flat array, so the rules that
+    look up to three words back or two words ahead become shifted array
+    lookups and the per-text sums are bincounts.
+    """
+
+    name = 'lexicon'
+
+    def __init__(self):
+        vader = _vader()
+        boosters, negate, special_cases = vader.BOOSTER_DICT, vader.NEGATE, vader.SPECIAL_CASES
+        self.c_incr, self.n_scalar = vader.C_INCR, vader.N_SCALAR
+        self._but_check = vader.SentimentIntensityAnalyzer._but_check
+        self.analyzer = analyzer = vader.SentimentIntensityAnalyzer()
+        self.emojis = analyzer.emojis
+
+        # Id 0 is any word the rules ignore; id 1 any other word containing
+        # "n't", which VADER treats as a negation
+        words = ['', "n't"]
+        words.extend(dict.fromkeys([
+            *analyzer.lexicon, *boosters, *negate, *_RULE_WORDS,
+            *(word for phrase in [*special_cases, *boosters] for word in phrase.split()),
+        ]))
+        self.vocabulary = {word: i for i, word in enumerate(words) if i > 1}
+        size = len(words)
+
+        self.valence = np.zeros(size)
+        self.in_lexicon = np.zeros(size, dtype=bool)
+        for word, valence in analyzer.lexicon.items():
+            self.valence[self.vocabulary[word]] = valence
+            self.in_lexicon[self.vocabulary[word]] = True
+        self.booster = np.zeros(size)
+        for word, scalar in boosters.items():
+            if ' ' not in word:
+                self.booster[self.vocabulary[word]] = scalar
+        self.is_booster = self.booster != 0
+        self.negation = np.array([word in negate or "n't" in word for word in words])
+        self.rule = {word: self.vocabulary[word] for word in _RULE_WORDS}
+
+        self._codes = _TokenCodes(self.vocabulary)
+
+        # Multi-word phrases as integer keys over consecutive ids
+        self._size = size
+        self.special = self._phrase_table({p: v for p, v in special_cases.items() if ' ' in p})
+        self.booster_phrases = self._phrase_table({p: v for p, v in boosters.items() if ' ' in p})
+
+    def warm_up(self):
+        # Token codes for the lexicon words as they are usually written
+        for word in self.vocabulary:
+            for form in (word, word.capitalize(), word.upper()):
+                self._codes[form]
+
+    def _phrase_table(self, phrases: Dict[str, float]) -> Dict[int, tuple]:
+        """{phrase length: (sorted keys, values)}"""
+        tables = {}
+        for phrase, value in phrases.items():
+            ids = [self.vocabulary[word] for word in phrase.split()]
+            tables.setdefault(len(ids), []).append((self._key(ids), value))
+        return {
+            length: (np.array([key for key, _ in sorted(entries)], dtype=np.int64),
+                     np.array([value for _, value in sorted(entries)]))
+            for length, entries in tables.items()
+        }
+
+    def _key(self, ids):
+        key = 0
+        for word_id in ids:
+            key = key * self._size + np.asarray(word_id, dtype=np.int64)
+        return key
+
+    def _lookup(self, table: Dict[int, tuple], ids: List[np.ndarray]):
+        """(found, value) per token for the phrase spelled by `ids`"""
+        keys, values = table.get(len(ids), (np.zeros(0, dtype=np.int64), np.zeros(0)))
+        key = self._key(ids)
+        if not len(keys):
+            return np.zeros(key.shape, dtype=bool), np.zeros(key.shape)
+        position = np.minimum(np.searchsorted(keys, key), len(keys) - 1)
+        return keys[position] == key, values[position]
+
+    def _replace_emojis(self, text: str) -> str:
+        # Emojis become their descriptions, as in polarity_scores
+        replaced = []
+        previous_space = True
+        for char in text:
+            description = self.emojis.get(char)
+            if description is not None:
+                if not previous_space:
+                    replaced.append(' ')
+                replaced.append(description)
+                previous_space = False
+            else:
+                replaced.append(char)
+                previous_space = char == ' '
+        return ''.join(replaced)
+
+    def score_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        if len(texts) < MIN_ARRAY_BATCH:
+            return [self.analyzer.polarity_scores(text) for text in texts]
+        if len(self._codes) > TOKEN_CACHE_SIZE:
+            self._codes.clear()
+        code = self._codes.__getitem__
+        words = []
+        codes = []
+        lengths = np.zeros(len(texts), dtype=np.int64)
+        punctuation = np.zeros(len(texts))
+        for i, text in enumerate(texts):
+            if not text.isascii():
+                text = self._replace_emojis(text)
+            split = text.split()
+            words.extend(split)
+            codes.extend(map(code, split))
+            lengths[i] = len(split)
+            # Emphasis from up to 4 exclamation marks and 2+ question marks
+            questions = text.count('?')
+            punctuation[i] = (min(text.count('!'), 4) * 0.292
+                              + (0 if questions <= 1 else questions * 0.18 if questions <= 3 else 0.96))
+
+        codes = np.array(codes, dtype=np.int64)
+        ids = codes >> 1
+        upper = (codes & 1).astype(bool)
+
+        n = len(ids)
+        doc = np.repeat(np.arange(len(texts)), lengths)
+        starts = np.cumsum(lengths) - lengths
+        pos = np.arange(n) - starts[doc]
+        last = pos == lengths[doc] - 1
+
+        # Some but not all words in ALL CAPS
+        uppers = np.bincount(doc, weights=upper, minlength=len(texts))
+        cap_diff = ((lengths - uppers > 0) & (uppers > 0))[doc]
+
+        def shift(values, k):
+            """values[i - k] for every token, zero where it falls in another text"""
+            shifted = np.zeros_like(values)
+            if k > 0:
+                shifted[k:] = values[:max(n - k, 0)]
+                return np.where(pos >= k, shifted, 0)
+            shifted[:max(n + k, 0)] = values[-k:]
+            return np.where(pos - k < lengths[doc], shifted, 0)
+
+        prev = {k: shift(ids, k) for k in (1, 2, 3)}
+        next1, next2 = shift(ids, -1), shift(ids, -2)
+        upper_prev = {k: shift(upper, k).astype(bool) for k in (1, 2, 3)}
+        rule = self.rule
+        c_incr, n_scalar = self.c_incr, self.n_scalar
+        is_ = lambda word_ids, word: word_ids == rule[word]
+
+        # Lexicon valence, including "no" as a negation of the next word
+        base = self.valence[ids]
+        valence = base.copy()
+        valence[is_(ids, 'no') & ~last & self.in_lexicon[next1]] = 0.0
+        no_before = (is_(prev[1], 'no') | is_(prev[2], 'no')
+                     | (is_(prev[3], 'no') & (is_(prev[1], 'or') | is_(prev[1], 'nor'))))
+        valence = np.where(no_before, base * n_scalar, valence)
+        emphasized = upper & cap_diff
+        valence = np.where(emphasized, np.where(valence > 0, valence + c_incr, valence - c_incr), valence)
+
+        # Boosters, negations and idioms up to three words back
+        for k in (1, 2, 3):
+            word = prev[k]
+            active = (pos >= k) & ~self.in_lexicon[word]
+            scalar = np.where(valence < 0, -self.booster[word], self.booster[word])
+            caps = self.is_booster[word] & upper_prev[k] & cap_diff
+            scalar = np.where(caps, np.where(valence > 0, scalar + c_incr, scalar - c_incr), scalar)
+            scalar = scalar * (1.0, 0.95, 0.9)[k - 1]
+            valence = np.where(active, valence + scalar, valence)
+
+            negated = self.negation[word]
+            if k == 1:
+                valence = np.where(active & negated, valence * n_scalar, valence)
+            elif k == 2:
+                never_so = is_(prev[2], 'never') & (is_(prev[1], 'so') | is_(prev[1], 'this'))
+                without_doubt = is_(prev[2], 'without') & is_(prev[1], 'doubt')
+                valence = np.where(active & never_so, valence * 1.25,
+                                   np.where(active & ~without_doubt & negated, valence * n_scalar, valence))
+            else:
+                never_so = ((is_(prev[3], 'never') & (is_(prev[2], 'so') | is_(prev[2], 'this')))
+                            | is_(prev[1], 'so') | is_(prev[1], 'this'))
+                without_doubt = is_(prev[3], 'without') & (is_(prev[2], 'doubt') | is_(prev[1], 'doubt'))
+                valence = np.where(active & never_so, valence * 1.25,
+                                   np.where(active & ~without_doubt & negated, valence * n_scalar, valence))
+                valence = self._idioms(valence, active, prev, ids, next1, next2)
+
+        # "least" negates the next word unless it follows "at" or "very"
+        least = is_(prev[1], 'least') & ~self.in_lexicon[prev[1]]
+        least_negates = (least & (pos > 1) & ~is_(prev[2], 'at') & ~is_(prev[2], 'very')) | (least & (pos == 1))
+        valence = np.where(least_negates, valence * n_scalar, valence)
+
+        # Only lexicon words score; boosters and "kind of" are modifiers
+        scored = self.in_lexicon[ids] & ~self.is_booster[ids] & ~(is_(ids, 'kind') & is_(next1, 'of') & ~last)
+        sentiments = np.where(scored, valence, 0.0)
+
+        # Words before the first "but" count half and words after it 1.5
+        # times. VADER finds each word's score with list.index(), so repeated
+        # scores can land on the wrong word; its own check is replayed on the
+        # (few) texts with a "but" to keep that behaviour
+        for i in np.unique(doc[is_(ids, 'but')]):
+            start, end = starts[i], starts[i] + lengths[i]
+            tokens = [_strip_punctuation(word) for word in words[start:end]]
+            sentiments[start:end] = self._but_check(tokens, list(sentiments[start:end]))
+
+        return self._scores(sentiments, doc, lengths, punctuation)
+
+    def _idioms(self, valence, active, prev, ids, next1, next2):
+        """VADER's special-case phrases around each word, and booster phrases before it"""
+        special = self.special
+        replaced = np.zeros(len(ids), dtype=bool)
+        result = valence.copy()
+        # The first matching phrase ending at or before the word wins
+        for words in ([prev[1], ids], [prev[2], prev[1], ids], [prev[2], prev[1]],
+                      [prev[3], prev[2], prev[1]], [prev[3], prev[2]]):
+            found, value = self._lookup(special, words)
+            found &= ~replaced
+            result = np.where(found, value, result)
+            replaced |= found
+        # ...unless a phrase starting at the word matches
+        for words in ([ids, next1], [ids, next1, next2]):
+            found, value = self._lookup(special, words)
+            found &= next1 != 0 if len(words) == 2 else (next1 != 0) & (next2 != 0)
+            result = np.where(found, value, result)
+        for words in ([prev[3], prev[2], prev[1]], [prev[3], prev[2]], [prev[2], prev[1]]):
+            found, value = self._lookup(self.booster_phrases, words)
+            result = np.where(found, result + value, result)
+        return np.where(active, result, valence)
+
+    @staticmethod
+    def _scores(sentiments, doc, lengths, punctuation) -> List[Dict[str, float]]:
+        count = len(lengths)
+        total = np.bincount(doc, weights=sentiments, minlength=count)
+        total = total + np.sign(total) * punctuation
+        compound = np.clip(total / np.sqrt(total * total + 15), -1.0, 1.0)
+
+        positive = np.bincount(doc, weights=np.where(sentiments > 0, sentiments + 1, 0.0), minlength=count)
+        negative = np.bincount(doc, weights=np.where(sentiments < 0, sentiments - 1, 0.0), minlength=count)
+        neutral = np.bincount(doc, weights=(sentiments == 0).astype(float), minlength=count)
+        positive, negative = (np.where(positive > -negative, positive + punctuation, positive),
+                              np.where(positive < -negative, negative - punctuation, negative))
+        magnitude = positive - negative + neutral
+        safe = np.where(magnitude > 0, magnitude, 1.0)
+
+        # Rounded as Python floats, like VADER
+        empty = {'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0}
+        return [
+            {'neg': round(neg, 3), 'neu': round(neu, 3), 'pos': round(pos, 3), 'compound': round(compound, 4)}
+            if length else dict(empty)
+            for length, neg, neu, pos, compound in zip(
+                lengths.tolist(),
+                np.abs(negative / safe).tolist(),
+                np.abs(neutral / safe).tolist(),
+                np.abs(positive / safe).tolist(),
+                compound.tolist(),
+            )
+        ]
+
+ENGINES = {
+    VaderEngine.name: VaderEngine,
+    LexiconEngine.name: LexiconEngine,
+}
+
+
+def make_engine(name: str = SENTIMENT_ENGINE) -> SentimentEngine:
+    try:
+        return ENGINES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown SENTIMENT_ENGINE: {name}")
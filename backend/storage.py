@@ -0,0 +1,177 @@
+"""
+SQLite storage layer for the CommunityPulse API
+Shares one writer connection and a bounded pool of reader connections
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from metrics import METRICS_ENABLED, TimedConnection, observe_stage
+
+
+def _database_path(url: str) -> str:
+    """Accept either a plain file path or a sqlite:/// URL"""
+    prefix = 'sqlite:///'
+    return url[len(prefix):] if url.startswith(prefix) else url
+
+
+DATABASE_PATH = _database_path(os.getenv('DATABASE_URL', 'community_pulse.db'))
+READER_POOL_SIZE = int(os.getenv('DB_READER_POOL_SIZE', '8'))
+POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+
+# Applied to every connection. journal_mode is persistent in the database
+# file, the rest are per-connection settings.
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -64000,          # 64 MB page cache (negative = KiB)
+    'mmap_size': 268435456,        # 256 MB memory-mapped I/O
+    'temp_store': 'MEMORY',
+}
+
+# Compiled statements are cached per connection keyed by SQL text, so keeping
+# connections open lets every endpoint reuse its prepared statements.
+STATEMENT_CACHE_SIZE = 256
+
+
+class StorageBusyError(RuntimeError):
+    """Raised when no reader connection becomes available in time"""
+
+
+class Storage:
+    def __init__(self, path: str = DATABASE_PATH, pool_size: int = READER_POOL_SIZE,
+                 timeout: float = POOL_TIMEOUT, pragmas: Optional[Dict] = None):
+        self.path = path
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.pragmas = dict(PRAGMAS if pragmas is None else pragmas)
+
+        self._readers = queue.LifoQueue(maxsize=pool_size)
+        self._reader_count = 0
+        self._pool_lock = threading.Lock()
+
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection with the tuned pragmas applied"""
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.pragmas.get('busy_timeout', 5000) / 1000,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            # Times every statement for /metrics
+            factory=TimedConnection if METRICS_ENABLED else sqlite3.Connection,
+        )
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._pool_lock:
+            if self._reader_count < self.pool_size:
+                self._reader_count += 1
+                try:
+                    return self._connect(read_only=True)
+                except Exception:
+                    self._reader_count -= 1
+                    raise
+
+        try:
+            return self._readers.get(timeout=self.timeout)
+        except queue.Empty:
+            raise StorageBusyError(
+                f"No database connection available after {self.timeout}s"
+            )
+
+    def _release_reader(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        self._readers.put_nowait(conn)
+
+    @contextmanager
+    def read(self):
+        """Borrow a read-only connection from the pool"""
+        start = time.perf_counter()
+        conn = self._acquire_reader()
+        if METRICS_ENABLED:
+            # Opening a connection or waiting for a free one
+            observe_stage('db_connect', time.perf_counter() - start)
+        try:
+            yield conn
+        finally:
+            self._release_reader(conn)
+
+    @contextmanager
+    def snapshot(self):
+        """Borrow a reader inside one read transaction
+
+        Under WAL every query on the connection sees the database as of the
+        first one, however many writes commit in between.
+        """
+        with self.read() as conn:
+            conn.execute("BEGIN")
+            yield conn
+
+    @contextmanager
+    def write(self):
+        """Use the writer connection inside a transaction
+
+        Writes are serialized in-process so requests queue on a lock instead
+        of spinning on SQLite's busy handler.
+        """
+        start = time.perf_counter()
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            conn = self._writer
+            if METRICS_ENABLED:
+                observe_stage('db_write_lock', time.perf_counter() - start)
+            try:
+                yield conn
+                start = time.perf_counter()
+                conn.commit()
+                if METRICS_ENABLED:
+                    observe_stage('db_commit', time.perf_counter() - start)
+            except Exception:
+                conn.rollback()
+                raise
+
+    def stats(self) -> Dict[str, int]:
+        """Current pool occupancy"""
+        return {
+            'pool_size': self.pool_size,
+            'readers_open': self._reader_count,
+            'readers_idle': self._readers.qsize(),
+        }
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+        with self._pool_lock:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._reader_count = 0
+
+
+storage = Storage()
@@ -57,6 +57,68 @@ def test_analyze_content():
         print(f"❌ Content analysis error: {e}")
         return False
 
+def test_analyze_batch():
+    """Test the batch content analysis endpoint"""
+    print("\n🔍 Testing batch content analysis endpoint...")
+    batch = [
+        {"content": "The new community garden is wonderful!", "author": "Happy Resident"},
+        {"content": "URGENT: They don't want you to know about the water!!!!"},
+        {"content": "Has anyone seen the new parking signs?"}
+    ]
+    
+    try:
+        response = requests.post(f"{BASE_URL}/api/analyze/batch", json=batch)
+        
+        if response.status_code != 200:
+            print(f"❌ Batch analysis failed - Status: {response.status_code}")
+            return False
+        
+        results = response.json()
+        if [r['content'] for r in results] != [item['content'] for item in batch]:
+            print("❌ Batch analysis returned results out of order")
+            return False
+        
+        # NDJSON bodies stream back one line per input line
+        body = "\n".join(json.dumps(item) for item in batch)
+        response = requests.post(
+            f"{BASE_URL}/api/analyze/batch",
+            data=body.encode('utf-8'),
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        lines = [json.loads(line) for line in response.text.splitlines() if line]
+        if response.status_code != 200 or len(lines) != len(batch):
+            print(f"❌ NDJSON batch analysis failed - Status: {response.status_code}")
+            return False
+        
+        print(f"✅ Batch analysis passed")
+        print(f"   Analyzed {len(results)} posts (JSON) and {len(lines)} posts (NDJSON)")
+        return True
+    except Exception as e:
+        print(f"❌ Batch analysis error: {e}")
+        return False
+
+def test_ndjson_line_limit():
+    """Test that an NDJSON line past the size limit is rejected instead of buffered"""
+    print("\n🔍 Testing NDJSON line size limit...")
+    # One line of just over 1 MiB (the default MAX_NDJSON_LINE_BYTES) and no newline
+    body = json.dumps({"content": "x" * (1024 * 1024)}).encode('utf-8')
+    
+    try:
+        response = requests.post(
+            f"{BASE_URL}/api/analyze/batch",
+            data=body,
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        if response.status_code != 413:
+            print(f"❌ Overlong NDJSON line was not rejected - Status: {response.status_code}")
+            return False
+        print(f"✅ NDJSON line size limit passed")
+        print(f"   {len(body)} byte line: {response.json()['detail']}")
+        return True
+    except Exception as e:
+        print(f"❌ NDJSON line size limit error: {e}")
+        return False
+
 def test_create_post():
     """Test creating a new post"""
     print("\n🔍 Testing post creation...")
@@ -86,6 +148,134 @@ def test_create_post():
         print(f"❌ Post creation error: {e}")
         return None
 
+def test_bulk_ingest():
+    """Test bulk post ingest with a partially invalid batch"""
+    print("\n🔍 Testing bulk post ingest...")
+    posts = [
+        {"content": "The playground repairs look great!", "author": "Bulk Tester", "category": "amenities"},
+        {"author": "Missing Content"},
+        {"content": "Noise from the construction site started at 6am again.", "author": "Bulk Tester",
+         "category": "noise", "timestamp": "2024-01-05T06:15:00"}
+    ]
+    
+    try:
+        response = requests.post(f"{BASE_URL}/api/posts/bulk", json=posts)
+        
+        if response.status_code == 200:
+            data = response.json()
+            if data['inserted'] != 2 or data['failed'] != 1 or data['ids'][1] is not None:
+                print(f"❌ Bulk ingest reported unexpected results: {data}")
+                return False
+            print(f"✅ Bulk ingest passed")
+            print(f"   Inserted: {data['inserted']}, Failed: {data['failed']}")
+            print(f"   Assigned IDs: {data['ids']}")
+            return True
+        else:
+            print(f"❌ Bulk ingest failed - Status: {response.status_code}")
+            return False
+    except Exception as e:
+        print(f"❌ Bulk ingest error: {e}")
+        return False
+
+def test_bulk_ingest_timezone():
+    """Test that bulk timestamps with a UTC offset are stored in UTC"""
+    print("\n🔍 Testing bulk ingest with a UTC offset...")
+    author = f"Offset Tester {time.time_ns()}"
+    posts = [{"content": "Street sweeping moved to Friday mornings.", "author": author,
+              "timestamp": "2024-01-05T06:15:00+02:00"}]
+    
+    try:
+        response = requests.post(f"{BASE_URL}/api/posts/bulk", json=posts)
+        if response.status_code != 200 or response.json()['inserted'] != 1:
+            print(f"❌ Bulk ingest with an offset failed - Status: {response.status_code}")
+            return False
+        
+        stored = requests.get(f"{BASE_URL}/api/posts", params={"author": author}).json()
+        if [post['timestamp'] for post in stored] != ["2024-01-05 04:15:00"]:
+            print(f"❌ Offset timestamp was not converted to UTC: {[post['timestamp'] for post in stored]}")
+            return False
+        print(f"✅ Bulk ingest with a UTC offset passed")
+        print(f"   2024-01-05T06:15:00+02:00 stored as {stored[0]['timestamp']}")
+        return True
+    except Exception as e:
+        print(f"❌ Bulk ingest with a UTC offset error: {e}")
+        return False
+
+def test_posts_filter_timezone():
+    """Test that since/until filters with a UTC offset are compared in UTC"""
+    print("\n🔍 Testing posts time filters with a UTC offset...")
+    author = f"Filter Tester {time.time_ns()}"
+    posts = [{"content": "Recycling pickup is delayed a day this week.", "author": author,
+              "timestamp": "2024-01-05T04:15:00"}]
+    
+    try:
+        requests.post(f"{BASE_URL}/api/posts/bulk", json=posts)
+        count = lambda **params: len(requests.get(f"{BASE_URL}/api/posts", params={"author": author, **params}).json())
+        # 06:15+02:00 is the post's own time, 04:15 UTC
+        found = (count(since="2024-01-05T06:15:00+02:00"), count(since="2024-01-05T06:15:01+02:00"),
+                 count(until="2024-01-05T06:15:01+02:00"), count(until="2024-01-05T06:15:00+02:00"))
+        if found != (1, 0, 1, 0):
+            print(f"❌ Offset filters were not compared in UTC: {found}")
+            return False
+        print(f"✅ Posts time filters with a UTC offset passed")
+        return True
+    except Exception as e:
+        print(f"❌ Posts time filters with a UTC offset error: {e}")
+        return False
+
+def test_analysis_cache():
+    """Test that repeated content is served from the analysis cache"""
+    print("\n🔍 Testing analysis cache...")
+    content = "Chain message: the community center is closing for good next week!"
+    
+    try:
+        before = requests.get(f"{BASE_URL}/api/cache/stats").json()
+        first = requests.post(f"{BASE_URL}/api/analyze", json={"content": content, "author": "Cache Tester"}).json()
+        second = requests.post(f"{BASE_URL}/api/analyze", json={"content": f"  {content}\n", "author": "Cache Tester"}).json()
+        after = requests.get(f"{BASE_URL}/api/cache/stats").json()
+        
+        if not after['enabled']:
+            print("✅ Analysis cache is disabled (ANALYSIS_CACHE_SIZE=0), skipping")
+            return True
+        if second['sentiment_score'] != first['sentiment_score'] or after['hits'] <= before['hits']:
+            print(f"❌ Repeated content was not served from the cache: {after}")
+            return False
+        print(f"✅ Analysis cache passed")
+        print(f"   Hits: {after['hits']}, Misses: {after['misses']}, Hit ratio: {after['hit_ratio']:.2f}")
+        return True
+    except Exception as e:
+        print(f"❌ Analysis cache error: {e}")
+        return False
+
+def test_analysis_cache_whitespace_risk():
+    """Test that whitespace variants sharing a cache entry keep their own misinformation risk"""
+    print("\n🔍 Testing analysis cache with whitespace variants...")
+    from analysis import detect_misinformation
+    variants = [
+        ["WAKE up NOW", "WAKE" + " " * 20 + "up\nNOW"],
+        ["the cover up is real", "the cover\nup is real"],
+    ]
+    
+    try:
+        for texts in variants:
+            expected = [detect_misinformation(text) for text in texts]
+            # Both orders, one text per request and both in one batch
+            for ordered in (texts, texts[::-1]):
+                risks = [requests.post(f"{BASE_URL}/api/analyze", json={"content": text, "author": "Cache Tester"}).json()['misinformation_risk']
+                         for text in ordered]
+                if risks != [detect_misinformation(text) for text in ordered]:
+                    print(f"❌ Cached risk differs from the uncached risk for {ordered!r}: {risks}")
+                    return False
+            batch = requests.post(f"{BASE_URL}/api/analyze/batch", json=[{"content": text} for text in texts]).json()
+            if [result['misinformation_risk'] for result in batch] != expected:
+                print(f"❌ Batch risk differs from the uncached risk for {texts!r}: {batch}")
+                return False
+        print(f"✅ Analysis cache whitespace variants passed")
+        return True
+    except Exception as e:
+        print(f"❌ Analysis cache whitespace variants error: {e}")
+        return False
+
 def test_get_posts():
     """Test retrieving posts"""
     print("\n🔍 Testing posts retrieval...")
@@ -106,6 +296,81 @@ def test_get_posts():
         print(f"❌ Posts retrieval error: {e}")
         return False
 
+def test_posts_cursor_pagination():
+    """Test walking posts with cursors and filters"""
+    print("\n🔍 Testing posts cursor pagination...")
+    try:
+        first = requests.get(f"{BASE_URL}/api/posts?limit=2")
+        next_cursor = first.headers.get("X-Next-Cursor")
+        if first.status_code != 200 or not next_cursor:
+            print(f"❌ Cursor pagination failed - no next cursor (status {first.status_code})")
+            return False
+        
+        second = requests.get(f"{BASE_URL}/api/posts", params={"limit": 2, "cursor": next_cursor})
+        prev_cursor = second.headers.get("X-Prev-Cursor")
+        back = requests.get(f"{BASE_URL}/api/posts", params={"limit": 2, "cursor": prev_cursor})
+        first_ids = [post["id"] for post in first.json()]
+        second_ids = [post["id"] for post in second.json()]
+        
+        if set(first_ids) & set(second_ids):
+            print(f"❌ Cursor pagination failed - pages overlap: {first_ids} / {second_ids}")
+            return False
+        if [post["id"] for post in back.json()] != first_ids:
+            print(f"❌ Cursor pagination failed - previous page differs from the first page")
+            return False
+        
+        filtered = requests.get(f"{BASE_URL}/api/posts", params={"limit": 50, "sentiment_label": "positive"})
+        if any(post["sentiment_label"] != "positive" for post in filtered.json()):
+            print(f"❌ Cursor pagination failed - sentiment filter not applied")
+            return False
+        
+        invalid = requests.get(f"{BASE_URL}/api/posts", params={"cursor": "not-a-cursor"})
+        if invalid.status_code != 400:
+            print(f"❌ Cursor pagination failed - invalid cursor returned {invalid.status_code}")
+            return False
+        
+        print(f"✅ Cursor pagination passed")
+        print(f"   Pages: {first_ids} -> {second_ids}")
+        return True
+    except Exception as e:
+        print(f"❌ Cursor pagination error: {e}")
+        return False
+
+def test_live_stream():
+    """Test server-sent post, alert and rollup events"""
+    print("\n🔍 Testing live update stream...")
+    try:
+        stream = requests.get(f"{BASE_URL}/api/stream", stream=True, timeout=(5, 10))
+        if stream.status_code != 200:
+            print(f"❌ Live stream failed - Status: {stream.status_code}")
+            return False
+        
+        content = "URGENT!!! Wake up, they are hiding the truth about the water supply conspiracy!!!"
+        requests.post(f"{BASE_URL}/api/posts", json={"content": content, "author": "Stream Test"})
+        
+        seen = {}
+        event = None
+        for line in stream.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: ") and event:
+                seen[event] = json.loads(line[len("data: "):])
+            if {"post", "alert", "rollup"} <= set(seen):
+                break
+        stream.close()
+        
+        if seen["post"]["content"] != content or seen["alert"]["post_id"] != seen["post"]["id"]:
+            print(f"❌ Live stream failed - unexpected events: {seen}")
+            return False
+        
+        print(f"✅ Live stream passed")
+        print(f"   Events: post #{seen['post']['id']}, {seen['alert']['alert_type']} alert, "
+              f"{len(seen['rollup'])} rollup delta(s)")
+        return True
+    except Exception as e:
+        print(f"❌ Live stream error: {e}")
+        return False
+
 def test_community_health():
     """Test community health endpoint"""
     print("\n🔍 Testing community health endpoint...")
@@ -135,6 +400,12 @@ def test_analytics():
         
         if response.status_code == 200:
             data = response.json()
+            # avg_sentiment is averaged over the scored posts, which live clients weight it by
+            daily = data['recent_trends']['daily_posts']
+            if not 0 <= data['scored_posts'] <= data['total_posts'] or \
+                    any(not 0 <= day['scored_posts'] <= day['count'] for day in daily):
+                print(f"❌ Analytics scored post counts out of range: {data}")
+                return False
             print(f"✅ Analytics passed")
             print(f"   Total Posts: {data['total_posts']}")
             print(f"   Avg Sentiment: {data['avg_sentiment']:.2f}")
@@ -167,6 +438,56 @@ def test_alerts():
         print(f"❌ Alerts error: {e}")
         return False
 
+def test_alert_queue():
+    """Test acknowledging alerts and paging through alert history"""
+    print("\n🔍 Testing alert queue...")
+    try:
+        alerts = requests.get(f"{BASE_URL}/api/alerts").json()
+        if not alerts:
+            print("❌ Alert queue failed - no open alerts to acknowledge")
+            return False
+        
+        # Alert ids are stable, so a second read returns the same ids
+        if [alert['id'] for alert in requests.get(f"{BASE_URL}/api/alerts").json()] != [alert['id'] for alert in alerts]:
+            print("❌ Alert queue failed - alert ids changed between reads")
+            return False
+        
+        top = alerts[0]
+        response = requests.post(f"{BASE_URL}/api/alerts/{top['id']}/acknowledge")
+        if response.status_code != 200 or not response.json().get('acknowledged_at'):
+            print(f"❌ Alert queue failed - acknowledge returned {response.status_code}")
+            return False
+        if top['id'] in [alert['id'] for alert in requests.get(f"{BASE_URL}/api/alerts").json()]:
+            print("❌ Alert queue failed - acknowledged alert still open")
+            return False
+        
+        missing = requests.post(f"{BASE_URL}/api/alerts/999999999/acknowledge")
+        if missing.status_code != 404:
+            print(f"❌ Alert queue failed - unknown alert returned {missing.status_code}")
+            return False
+        
+        first = requests.get(f"{BASE_URL}/api/alerts/history", params={"limit": 2})
+        next_cursor = first.headers.get("X-Next-Cursor")
+        ids = [alert['id'] for alert in first.json()]
+        if next_cursor:
+            second = requests.get(f"{BASE_URL}/api/alerts/history", params={"limit": 2, "cursor": next_cursor})
+            ids += [alert['id'] for alert in second.json()]
+        if ids != sorted(ids, reverse=True) or len(set(ids)) != len(ids):
+            print(f"❌ Alert queue failed - history pages out of order: {ids}")
+            return False
+        
+        acknowledged = requests.get(f"{BASE_URL}/api/alerts/history", params={"acknowledged": "true"}).json()
+        if top['id'] not in [alert['id'] for alert in acknowledged]:
+            print("❌ Alert queue failed - acknowledged alert missing from history")
+            return False
+        
+        print(f"✅ Alert queue passed")
+        print(f"   Acknowledged alert {top['id']} ({top['alert_type']} - {top['severity']})")
+        return True
+    except Exception as e:
+        print(f"❌ Alert queue error: {e}")
+        return False
+
 def test_dashboard():
     """Test dashboard endpoint"""
     print("\n🔍 Testing dashboard endpoint...")
@@ -188,6 +509,73 @@ def test_dashboard():
         print(f"❌ Dashboard error: {e}")
         return False
 
+def test_response_cache():
+    """Test that read endpoints are cached until the next write"""
+    print("\n🔍 Testing response cache...")
+    try:
+        stats = lambda: requests.get(f"{BASE_URL}/api/cache/responses").json()
+        
+        first = requests.get(f"{BASE_URL}/api/analytics").json()
+        before = stats()
+        if not before["enabled"]:
+            print(f"✅ Response cache passed (disabled)")
+            return True
+        repeat = requests.get(f"{BASE_URL}/api/analytics").json()
+        after_repeat = stats()
+        if repeat != first or after_repeat["hits"] != before["hits"] + 1:
+            print(f"❌ Response cache failed - repeat request was not a hit")
+            return False
+        
+        # A write bumps the version, so the next read is rendered fresh
+        requests.post(f"{BASE_URL}/api/posts", json={"content": "Response cache test post", "author": "Test User"})
+        fresh = requests.get(f"{BASE_URL}/api/analytics").json()
+        if fresh["total_posts"] != first["total_posts"] + 1 or stats()["misses"] != after_repeat["misses"] + 1:
+            print(f"❌ Response cache failed - stale analytics after a write")
+            return False
+        
+        print(f"✅ Response cache passed")
+        print(f"   Backend: {before['backend']}, hit ratio: {stats()['hit_ratio']}")
+        return True
+    except Exception as e:
+        print(f"❌ Response cache error: {e}")
+        return False
+
+def test_dashboard_etag():
+    """Test dashboard field selection and ETag revalidation"""
+    print("\n🔍 Testing dashboard fields and ETag...")
+    try:
+        response = requests.get(f"{BASE_URL}/api/dashboard", params={"fields": "analytics,alerts"})
+        etag = response.headers.get("ETag")
+        if response.status_code != 200 or sorted(response.json()) != ["alerts", "analytics"] or not etag:
+            print(f"❌ Dashboard ETag failed - unexpected fields response (status {response.status_code})")
+            return False
+        
+        unchanged = requests.get(f"{BASE_URL}/api/dashboard", params={"fields": "analytics,alerts"},
+                                 headers={"If-None-Match": etag})
+        if unchanged.status_code != 304:
+            print(f"❌ Dashboard ETag failed - expected 304, got {unchanged.status_code}")
+            return False
+        
+        # A new post changes the write version and so the ETag
+        requests.post(f"{BASE_URL}/api/posts", json={"content": "Dashboard ETag test post", "author": "Test User"})
+        changed = requests.get(f"{BASE_URL}/api/dashboard", params={"fields": "analytics,alerts"},
+                               headers={"If-None-Match": etag})
+        if changed.status_code != 200 or changed.headers.get("ETag") == etag:
+            print(f"❌ Dashboard ETag failed - stale ETag after a write (status {changed.status_code})")
+            return False
+        
+        invalid = requests.get(f"{BASE_URL}/api/dashboard", params={"fields": "analytics,weather"})
+        if invalid.status_code != 400:
+            print(f"❌ Dashboard ETag failed - unknown field returned {invalid.status_code}")
+            return False
+        
+        print(f"✅ Dashboard fields and ETag passed")
+        print(f"   ETag: {etag} -> {changed.headers.get('ETag')}")
+        return True
+    except Exception as e:
+        print(f"❌ Dashboard ETag error: {e}")
+        return False
+
 def main():
     """Run all API tests"""
     print("🚀 CommunityPulse API Test Suite")
@@ -200,12 +588,24 @@ def main():
     tests = [
         ("Health Check", test_health_check),
         ("Content Analysis", test_analyze_content),
+        ("Batch Analysis", test_analyze_batch),
+        ("NDJSON Line Limit", test_ndjson_line_limit),
         ("Post Creation", test_create_post),
+        ("Bulk Ingest", test_bulk_ingest),
+        ("Bulk Ingest UTC Offset", test_bulk_ingest_timezone),
+        ("Posts Filter UTC Offset", test_posts_filter_timezone),
+        ("Analysis Cache", test_analysis_cache),
+        ("Analysis Cache Whitespace", test_analysis_cache_whitespace_risk),
         ("Posts Retrieval", test_get_posts),
+        ("Cursor Pagination", test_posts_cursor_pagination),
+        ("Live Stream", test_live_stream),
         ("Community Health", test_community_health),
         ("Analytics", test_analytics),
         ("Alerts", test_alerts),
+        ("Alert Queue", test_alert_queue),
         ("Dashboard", test_dashboard),
+        ("Dashboard ETag", test_dashboard_etag),
+        ("Response Cache", test_response_cache),
     ]
     
     passed = 0
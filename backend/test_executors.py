@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Executor Pipeline Test for CommunityPulse
+Checks that ordered_pipeline yields results in input order and cancels the
+batches still in flight when a batch fails or the consumer stops early.
+
+Run with pytest or directly: python test_executors.py
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from executors import ordered_pipeline
+
+
+async def pipeline_scenario():
+    started, cancelled = [], []
+
+    async def process(batch):
+        started.append(batch)
+        try:
+            # Later batches take longer, so the first result arrives while the rest run
+            await asyncio.sleep(0.01 if batch == 'fail' else batch * 0.02)
+            if batch == 'fail':
+                raise ValueError(batch)
+            return batch * 10
+        except asyncio.CancelledError:
+            cancelled.append(batch)
+            raise
+
+    assert [result async for result in ordered_pipeline(range(5), process, 2)] == [0, 10, 20, 30, 40]
+
+    # The consumer stops after the first result: the batches behind it are cancelled
+    started.clear()
+    results = ordered_pipeline(range(5), process, 3)
+    assert await results.__anext__() == 0
+    await results.aclose()
+    await asyncio.sleep(0.1)
+    assert started == [0, 1, 2] and cancelled == [1, 2]
+
+    # A failing batch cancels the ones queued after it
+    started.clear()
+    cancelled.clear()
+    try:
+        async for _ in ordered_pipeline(['fail', 1, 2], process, 3):
+            pass
+        assert False, "the failure must propagate"
+    except ValueError:
+        pass
+    await asyncio.sleep(0.1)
+    assert cancelled == [1, 2]
+
+
+def test_pipeline_cancels_in_flight():
+    asyncio.run(pipeline_scenario())
+
+
+def main():
+    test_pipeline_cancels_in_flight()
+    print("✅ test_pipeline_cancels_in_flight")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Metrics Test for CommunityPulse
+Checks that /metrics output is valid Prometheus text (cumulative histogram
+buckets, escaped labels), that requests are labelled by route template
+rather than raw path, and that SQL statements get low-cardinality names.
+
+Run with pytest or directly: python test_metrics.py
+"""
+
+import os
+import re
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import metrics
+from metrics import CallbackMetric, Counter, Histogram, MetricsMiddleware, Registry, TimedConnection, statement_name
+
+# name{labels} value, the only non-comment line the text format allows
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_]\w*="([^"\\]|\\.)*",?)*\})? \S+$')
+
+
+def samples(text):
+    return {line.rsplit(' ', 1)[0]: float(line.rsplit(' ', 1)[1])
+            for line in text.splitlines() if not line.startswith('#')}
+
+
+def test_render_format():
+    registry = Registry()
+    counter = Counter('events_total', 'Events', ('kind',), registry=registry)
+    histogram = Histogram('wait_seconds', 'Waits', buckets=(0.1, 1.0), registry=registry)
+    counter.labels('say "hi"\n').inc(2)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    text = registry.render().decode()
+    for line in text.splitlines():
+        assert line.startswith('# HELP ') or line.startswith('# TYPE ') or SAMPLE.match(line), line
+
+    values = samples(text)
+    assert values['communitypulse_events_total{kind="say \\"hi\\"\\n"}'] == 2
+    # Buckets are cumulative and le="0.1" includes 0.1 itself
+    assert values['communitypulse_wait_seconds_bucket{le="0.1"}'] == 2
+    assert values['communitypulse_wait_seconds_bucket{le="1.0"}'] == 3
+    assert values['communitypulse_wait_seconds_bucket{le="+Inf"}'] == 4
+    assert values['communitypulse_wait_seconds_count'] == 4
+    assert values['communitypulse_wait_seconds_sum'] == 3.65
+
+
+def test_callback_metric():
+    registry = Registry()
+    queued = CallbackMetric('queued', 'Queued items', lambda: {('a',): 3}, labelnames=('queue',),
+                            registry=registry)
+    assert samples(registry.render().decode())['communitypulse_queued{queue="a"}'] == 3
+    # Its samples come from the callback, so there is no series to record to
+    try:
+        queued.labels('a')
+        assert False, "labels() on a callback metric must raise"
+    except TypeError:
+        pass
+
+
+def test_route_templates():
+    app = FastAPI()
+
+    @app.post('/api/alerts/{alert_id}/acknowledge')
+    def acknowledge(alert_id: int):
+        return {'alert_id': alert_id}
+
+    app.add_middleware(MetricsMiddleware)
+    client = TestClient(app)
+    for alert_id in (1, 2, 3):
+        client.post(f'/api/alerts/{alert_id}/acknowledge')
+    client.get('/not/a/route')
+
+    values = samples(metrics.REGISTRY.render().decode())
+    assert values['communitypulse_http_requests_total{method="POST",'
+                  'route="/api/alerts/{alert_id}/acknowledge",status="200"}'] >= 3
+    assert values['communitypulse_http_requests_total{method="GET",route="unmatched",status="404"}'] >= 1
+    assert not any('/api/alerts/1/' in key for key in values)
+
+
+def test_statement_names():
+    assert statement_name('SELECT * FROM posts WHERE id = ?') == 'SELECT posts'
+    assert statement_name('INSERT INTO alerts (post_id) VALUES (?)') == 'INSERT alerts'
+    assert statement_name('CREATE TABLE IF NOT EXISTS post_rollups (day TEXT)') == 'CREATE post_rollups'
+    assert statement_name('CREATE INDEX IF NOT EXISTS idx_posts_day ON posts(day)') == 'CREATE posts'
+    assert statement_name('CREATE TRIGGER t AFTER UPDATE OF sentiment_score ON posts BEGIN') == 'CREATE posts'
+    assert statement_name('PRAGMA journal_mode=WAL') == 'PRAGMA'
+
+
+def test_timed_connection():
+    conn = sqlite3.connect(':memory:', factory=TimedConnection)
+    conn.execute('CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)')
+    conn.executemany('INSERT INTO notes (body) VALUES (?)', [('a',), ('b',)])
+    assert conn.execute('SELECT body FROM notes ORDER BY id').fetchall() == [('a',), ('b',)]
+
+    values = samples(metrics.REGISTRY.render().decode())
+    prefix = 'communitypulse_db_statement_duration_seconds_count'
+    assert values[f'{prefix}{{statement="INSERT notes",phase="execute"}}'] >= 1
+    assert values[f'{prefix}{{statement="SELECT notes",phase="fetch"}}'] >= 1
+
+
+def main():
+    tests = [test_render_format, test_callback_metric, test_route_templates, test_statement_names,
+             test_timed_connection]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Query Plan Regression Test for CommunityPulse
+Seeds a 1M-post database with a recursive CTE, runs every endpoint's storage
+queries under EXPLAIN QUERY PLAN and fails if any of them scans the posts
+table or sorts posts or alerts without an index.
+
+Run with pytest or directly: python test_query_plans.py
+QUERY_PLAN_ROWS overrides the number of seeded posts.
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+ROWS = int(os.getenv('QUERY_PLAN_ROWS', '1000000'))
+
+SEED_SQL = '''
+    WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+    INSERT INTO posts (content, author, timestamp, sentiment_score, sentiment_label,
+                       misinformation_risk, category, priority_score)
+    SELECT 'Seeded community post ' || n,
+           'user' || (n % 500),
+           datetime('now', '-' || (n % 365) || ' days', '-' || (n % 86400) || ' seconds'),
+           ((abs(random()) % 2001) - 1000) / 1000.0,
+           CASE n % 3 WHEN 0 THEN 'positive' WHEN 1 THEN 'negative' ELSE 'neutral' END,
+           CASE WHEN n % 50 = 0 THEN (abs(random()) % 1000) / 1000.0 ELSE 0.0 END,
+           CASE n % 5 WHEN 0 THEN 'general' WHEN 1 THEN 'maintenance' WHEN 2 THEN 'security'
+                      WHEN 3 THEN 'amenities' ELSE 'noise' END,
+           (abs(random()) % 900) / 1000.0
+    FROM seq
+'''
+
+# "SCAN posts" on its own is a full table scan; "SCAN posts USING INDEX" walks
+# an index in order and stops at the LIMIT
+FULL_SCAN = re.compile(r'^SCAN posts$')
+
+
+class PlanRecorder:
+    """Cursor wrapper that records the query plan of every statement it runs"""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.plans = []
+
+    def execute(self, sql, params=()):
+        plan = [row[3] for row in self.cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()]
+        self.plans.append((' '.join(sql.split()), plan))
+        self.cursor.execute(sql, params)
+        return self
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+
+_main = None
+
+
+def load_app():
+    """Import main against a freshly seeded database (once per process)"""
+    global _main
+    if _main is None:
+        path = os.path.join(tempfile.mkdtemp(), 'query_plans.db')
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from migrations import migrate
+
+        conn = sqlite3.connect(path)
+        migrate(conn)
+        conn.execute(SEED_SQL, (ROWS,))
+        conn.commit()
+        conn.close()
+
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+        import main
+        _main = main
+    return _main
+
+
+def endpoint_reads(main):
+    return [
+        ('GET /api/posts', lambda cursor: main.read_posts(cursor, 20, 0)),
+        ('GET /api/posts?offset', lambda cursor: main.read_posts(cursor, 20, 1000)),
+        ('GET /api/posts?cursor=next',
+         lambda cursor: main.read_posts_page(cursor, 20, page=('next', '2025-06-01 00:00:00', 500000))),
+        ('GET /api/posts?cursor=prev',
+         lambda cursor: main.read_posts_page(cursor, 20, page=('prev', '2025-06-01 00:00:00', 500000))),
+        ('GET /api/posts?category&cursor',
+         lambda cursor: main.read_posts_page(cursor, 20, page=('next', '2025-06-01 00:00:00', 500000),
+                                             category='security')),
+        ('GET /api/posts?author&since',
+         lambda cursor: main.read_posts_page(cursor, 20, author='user7', since='2025-01-01 00:00:00')),
+        ('GET /api/posts?sentiment_label&until',
+         lambda cursor: main.read_posts_page(cursor, 20, sentiment_label='negative', until='2025-06-01 00:00:00')),
+        ('GET /api/posts?since&until',
+         lambda cursor: main.read_posts_page(cursor, 20, since='2025-01-01 00:00:00', until='2025-02-01 00:00:00')),
+        ('GET /api/alerts', main.read_alerts),
+        ('GET /api/alerts (queue reload)', main.read_top_alerts_snapshot),
+        ('GET /api/alerts/history', lambda cursor: main.read_alert_page(cursor, 21)),
+        ('GET /api/alerts/history?cursor', lambda cursor: main.read_alert_page(cursor, 21, 50000)),
+        ('GET /api/alerts/history?acknowledged',
+         lambda cursor: main.read_alert_page(cursor, 21, 50000, acknowledged=True)),
+        ('POST /api/posts (raised alerts)', lambda cursor: main.read_alerts_for_posts(cursor, 1000, 2000)),
+        ('GET /api/analytics', main.read_analytics),
+        ('GET /api/health', main.read_community_health),
+        ('GET /api/dashboard', main.read_dashboard),
+    ]
+
+
+def plan_problems(plans):
+    problems = []
+    for sql, plan in plans:
+        # "SCAN alerts" walks the primary key newest first and stops at the
+        # LIMIT, so only sorting is checked for alerts
+        for table in ('posts', 'alerts'):
+            if f' {table} ' not in f' {sql} ':
+                continue
+            if table == 'posts' and any(FULL_SCAN.match(step) for step in plan):
+                problems.append(f'full scan of posts: {sql}')
+            if any(step.startswith('USE TEMP B-TREE') for step in plan):
+                problems.append(f'{table} sorted without an index: {sql}')
+    return problems
+
+
+def test_endpoint_queries_use_indexes():
+    """No endpoint query may scan the posts table or sort posts or alerts"""
+    main = load_app()
+    problems = []
+    with main.storage.read() as conn:
+        for name, read in endpoint_reads(main):
+            recorder = PlanRecorder(conn.cursor())
+            read(recorder)
+            problems.extend(f'{name}: {problem}' for problem in plan_problems(recorder.plans))
+    assert not problems, '\n'.join(problems)
+
+
+def test_schema_is_current():
+    """A fresh database is migrated to the latest schema version"""
+    main = load_app()
+    from migrations import LATEST_VERSION, schema_version
+    with main.storage.read() as conn:
+        assert schema_version(conn) == LATEST_VERSION
+
+
+def main():
+    print(f"🧪 Query plan regression test ({ROWS:,} posts)")
+    app = load_app()
+    failed = False
+    with app.storage.read() as conn:
+        for name, read in endpoint_reads(app):
+            recorder = PlanRecorder(conn.cursor())
+            read(recorder)
+            problems = plan_problems(recorder.plans)
+            print(f"{'❌' if problems else '✅'} {name}")
+            for sql, plan in recorder.plans:
+                print(f"   {sql[:90]}")
+                for step in plan:
+                    print(f"      {step}")
+            for problem in problems:
+                print(f"   ⚠️  {problem}")
+            failed = failed or bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
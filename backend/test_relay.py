@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Stream Relay Test for CommunityPulse
+Interleaves this worker's post writes with relay polls: the relay reads the
+posts table on another thread as soon as a write commits, before the event
+loop has published the posts itself, and must still treat them as local.
+Posts committed by another process are relayed exactly once.
+
+Run with pytest or directly: python test_relay.py
+Uses the query plan test's database (QUERY_PLAN_ROWS overrides its size).
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from relay import PostRelay
+from test_query_plans import load_app
+
+ANALYSIS = {'sentiment': {'score': -0.4, 'label': 'negative'}, 'misinformation_risk': 0.0, 'priority_score': 0.5}
+
+
+async def interleaved_write(main, write):
+    """Run `write` on a DB thread and poll the relay after it commits but before it returns
+
+    Returns the ids the relay published and the ids `write` stored.
+    """
+    loop = asyncio.get_running_loop()
+    relayed = []
+
+    async def read_since(after_id, limit):
+        with main.storage.read() as conn:
+            return main.read_posts_since(conn.cursor(), after_id, limit)
+
+    def publish(rows, alerts):
+        relayed.extend(row[0] for row in rows)
+
+    def write_then_poll():
+        stored = write()
+        asyncio.run_coroutine_threadsafe(main.relay.poll(read_since, publish), loop).result()
+        return stored
+
+    stored = await loop.run_in_executor(None, write_then_poll)
+    return relayed, stored
+
+
+async def unchanged_version():
+    return 0
+
+
+async def relay_scenario(main):
+    # A relay that only polls when the test asks it to
+    main.relay = PostRelay(interval=3600)
+    main.relay.start(unchanged_version, lambda: main.executors.run_read(main.read_last_post_id),
+                     None, None, lambda: True)
+    while main.relay.last_id is None:
+        await asyncio.sleep(0.01)
+    try:
+        post = main.BulkPostCreate(content='Relay test: the gate code changed again', author='Relay Tester')
+        relayed, stored = await interleaved_write(main, lambda: main.insert_posts([main.post_row(post, ANALYSIS)] * 3))
+        assert relayed == [] and len(stored.ids) == 3
+
+        single = main.PostCreate(content='Relay test: single post', author='Relay Tester')
+        relayed, (created, _) = await interleaved_write(main, lambda: main.insert_post(single, ANALYSIS))
+        assert relayed == []
+
+        # Another worker's post is relayed once; this worker's ids are no longer tracked
+        def foreign_write():
+            conn = sqlite3.connect(main.storage.path)
+            with conn:
+                conn.execute(main.BULK_INSERT_SQL, main.post_row(post, ANALYSIS))
+            foreign_id = conn.execute('SELECT MAX(id) FROM posts').fetchone()[0]
+            conn.close()
+            return foreign_id
+
+        relayed, foreign_id = await interleaved_write(main, foreign_write)
+        assert relayed == [foreign_id] and foreign_id > created.id
+        assert not main.relay._local
+
+        # Ids of a transaction that rolls back are forgotten
+        try:
+            with main.write_posts() as (conn, stored_here):
+                stored_here([foreign_id + 1])
+                raise sqlite3.OperationalError('rolled back')
+        except sqlite3.OperationalError:
+            pass
+        assert not main.relay._local
+    finally:
+        await main.relay.stop()
+
+
+def test_local_writes_not_relayed():
+    """Posts written here are never relayed, even when the relay reads them before they are published"""
+    asyncio.run(relay_scenario(load_app()))
+
+
+def main():
+    test_local_writes_not_relayed()
+    print("✅ test_local_writes_not_relayed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
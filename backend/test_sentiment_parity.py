@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Sentiment Engine Parity Test for CommunityPulse
+Scores the NextDoor corpus (data_collection's NextDoorGenerator, seeded) and
+VADER's own example sentences with VaderEngine and LexiconEngine and fails if
+any compound score differs by more than COMPOUND_TOLERANCE, any pos/neg/neu
+proportion by more than PROPORTION_TOLERANCE, or any label changes.
+
+Run with pytest or directly: python test_sentiment_parity.py
+PARITY_POSTS overrides the number of generated posts.
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data_collection'))
+
+from analysis import sentiment_result
+from sentiment import LexiconEngine, SentimentEngine, VaderEngine
+
+POSTS = int(os.getenv('PARITY_POSTS', '5000'))
+
+# One unit in the last place VADER rounds to
+COMPOUND_TOLERANCE = 0.0001
+PROPORTION_TOLERANCE = 0.001
+
+# VADER's examples, covering negation, boosters, caps, "but", emoticons and emojis
+VADER_EXAMPLES = [
+    "VADER is smart, handsome, and funny.",
+    "VADER is smart, handsome, and funny!",
+    "VADER is very smart, handsome, and funny.",
+    "VADER is VERY SMART, handsome, and FUNNY.",
+    "VADER is VERY SMART, handsome, and FUNNY!!!",
+    "VADER is VERY SMART, uber handsome, and FRIGGIN FUNNY!!!",
+    "VADER is not smart, handsome, nor funny.",
+    "The book was good.",
+    "At least it isn't a horrible book.",
+    "The book was only kind of good.",
+    "The plot was good, but the characters are uncompelling and the dialog is not great.",
+    "Today SUX!",
+    "Today only kinda sux! But I'll get by, lol",
+    "Make sure you :) or :D today!",
+    "Catch utf-8 emoji such as 💘 and 💋 and 😁",
+    "Not bad at all",
+    "",
+]
+
+
+def corpus():
+    random.seed(2024)
+    from nextdoor_generator import NextDoorGenerator
+    with contextlib.redirect_stdout(io.StringIO()):
+        posts = NextDoorGenerator().generate_dataset(POSTS)
+    return VADER_EXAMPLES + [post['content'] for post in posts]
+
+
+def parity_problems(texts, expected, actual):
+    problems = []
+    for text, vader, lexicon in zip(texts, expected, actual):
+        compound = abs(vader['compound'] - lexicon['compound'])
+        proportions = max(abs(vader[key] - lexicon[key]) for key in ('pos', 'neg', 'neu'))
+        if compound > COMPOUND_TOLERANCE or proportions > PROPORTION_TOLERANCE:
+            problems.append(f'{text!r}: vader {vader} lexicon {lexicon}')
+        elif sentiment_result(vader)['label'] != sentiment_result(lexicon)['label']:
+            problems.append(f'{text!r}: label changed ({vader} vs {lexicon})')
+    return problems
+
+
+def test_lexicon_engine_matches_vader():
+    """LexiconEngine scores the NextDoor corpus like VADER"""
+    texts = corpus()
+    problems = parity_problems(texts, VaderEngine().score_batch(texts), LexiconEngine().score_batch(texts))
+    assert not problems, '\n'.join(problems[:20])
+
+
+def test_lexicon_engine_batch_independent():
+    """A text scores the same alone, in a small batch and in a large one"""
+    texts = corpus()[:300]
+    engine = LexiconEngine()
+    batched = engine.score_batch(texts)
+    assert [engine.score_batch([text])[0] for text in texts[:50]] == batched[:50]
+    assert engine.score_batch(texts[:20]) == batched[:20]
+
+
+def test_engine_requires_score_batch():
+    """An engine without score_batch cannot be built"""
+    class Incomplete(SentimentEngine):
+        name = 'incomplete'
+
+    try:
+        Incomplete()
+        assert False, "an engine without score_batch must not be instantiable"
+    except TypeError:
+        pass
+
+
+def main():
+    texts = corpus()
+    print(f"🧪 Sentiment engine parity on {len(texts):,} texts "
+          f"(compound ±{COMPOUND_TOLERANCE}, pos/neg/neu ±{PROPORTION_TOLERANCE})")
+    expected = VaderEngine().score_batch(texts)
+    actual = LexiconEngine().score_batch(texts)
+    largest = max(abs(vader['compound'] - lexicon['compound']) for vader, lexicon in zip(expected, actual))
+    problems = parity_problems(texts, expected, actual)
+    for problem in problems[:20]:
+        print(f"❌ {problem}")
+    print(f"{'❌' if problems else '✅'} {len(texts) - len(problems):,}/{len(texts):,} within tolerance, "
+          f"largest compound difference {largest:.4f}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
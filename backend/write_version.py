@@ -0,0 +1,35 @@
+"""
+Database write version
+A single counter that triggers bump on every insert, update and delete of a
+post. Anything derived from the posts table (dashboard ETags, cached
+responses) can compare one integer to tell whether it is still current.
+"""
+
+WRITE_VERSION_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS write_version (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        version INTEGER NOT NULL
+    )
+    ''',
+    "INSERT OR IGNORE INTO write_version VALUES (0, 0)",
+] + [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS write_version_{event.lower()} AFTER {event} ON posts
+    BEGIN
+        UPDATE write_version SET version = version + 1 WHERE id = 0;
+    END
+    '''
+    for event in ('INSERT', 'UPDATE', 'DELETE')
+]
+
+
+def create_write_version(cursor):
+    """Create the counter row and the triggers that bump it"""
+    for statement in WRITE_VERSION_SCHEMA:
+        cursor.execute(statement)
+
+
+def read_write_version(cursor) -> int:
+    cursor.execute("SELECT version FROM write_version WHERE id = 0")
+    return cursor.fetchone()[0]
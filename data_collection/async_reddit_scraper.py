@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Concurrent Reddit Data Scraper
+Collects the same posts and comments as RedditScraper, but on one pooled
+httpx client with requests from several subreddits in flight at once. A
+token bucket paces requests to the configured rate and to the rate-limit
+headers Reddit sends back, and failed requests are retried with jittered
+exponential backoff, so a run takes about as long as the rate limit allows
+instead of the sum of fixed sleeps.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from reddit_scraper import RedditScraper
+
+# Reddit allows unauthenticated clients about one request a second
+REQUESTS_PER_SECOND = 1.0
+BURST = 5
+
+# Subreddits collected at once, and connections kept in the pool
+MAX_CONCURRENCY = 4
+MAX_CONNECTIONS = 8
+
+# Posts per subreddit whose comments are fetched
+COMMENT_POSTS = 5
+
+# Retries after the first attempt; backoff doubles from BACKOFF_BASE up to
+# BACKOFF_CAP seconds and each delay is drawn uniformly below that ("full jitter")
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def header_float(headers: httpx.Headers, name: str) -> Optional[float]:
+    try:
+        return float(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Paces requests to `rate` per second with bursts of up to `capacity`
+
+    release() also tracks the server's quota from the rate-limit headers of
+    each response: the requests remaining in the current window, less those
+    still in flight, and when the window resets. Once the quota is used up
+    no tokens are handed out until the reset, when it is refilled to the
+    window's limit (used + remaining). After pause(), no tokens are handed
+    out until the given time has passed.
+    """
+
+    def __init__(self, rate: float = REQUESTS_PER_SECOND, capacity: float = BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.in_flight = 0
+
+        # Unknown (None) until the server sends rate-limit headers
+        self.quota: Optional[float] = None
+        self.window_limit: Optional[float] = None
+        self.window_end = 0.0
+        self.window_seconds = 0.0
+        self.lock = asyncio.Lock()
+
+    def refill(self, now: float):
+        # Nothing accrues while paused, so a pause is not followed by a burst
+        elapsed = max(0.0, now - max(self.updated, self.paused_until))
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+        if self.quota is not None and now >= self.window_end:
+            self.quota = self.window_limit
+            while self.window_end <= now and self.window_seconds:
+                self.window_end += self.window_seconds
+
+    async def acquire(self):
+        """Wait for a token; waiters are served in arrival order"""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.refill(now)
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                elif self.quota is not None and self.quota < 1:
+                    await asyncio.sleep(max(self.window_end - now, 1e-3))
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    if self.quota is not None:
+                        self.quota -= 1
+                    self.in_flight += 1
+                    return
+                else:
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for `seconds`, e.g. for a Retry-After header"""
+        now = time.monotonic()
+        self.refill(now)
+        self.tokens = 0
+        self.paused_until = max(self.paused_until, now + seconds)
+
+    def release(self, headers: Optional[httpx.Headers] = None):
+        """Finish a request, following its X-Ratelimit-Remaining, -Used and -Reset headers"""
+        self.in_flight -= 1
+        if headers is None:
+            return
+        remaining = header_float(headers, 'x-ratelimit-remaining')
+        reset = header_float(headers, 'x-ratelimit-reset')
+        if remaining is None or reset is None:
+            return
+        used = header_float(headers, 'x-ratelimit-used')
+        # Requests still in flight may not have been counted yet
+        available = remaining - self.in_flight
+        window_end = time.monotonic() + reset
+        if self.quota is None or window_end > self.window_end + self.window_seconds / 2:
+            self.quota = available
+            self.window_end = window_end
+        else:
+            # Same window: responses can arrive out of order, so never raise the
+            # quota, and keep the later estimate of the reset
+            self.quota = min(self.quota, available)
+            self.window_end = max(self.window_end, window_end)
+        self.window_limit = remaining + used if used is not None else None
+        self.window_seconds = max(self.window_seconds, reset)
+
+
+class AsyncRedditScraper(RedditScraper):
+    def __init__(self, base_url: Optional[str] = None, rate: float = REQUESTS_PER_SECOND,
+                 burst: float = BURST, max_concurrency: int = MAX_CONCURRENCY,
+                 max_retries: int = MAX_RETRIES):
+        super().__init__()
+        if base_url:
+            self.base_url = base_url
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+
+        # Requests sent, including retries, in the last collect_data run
+        self.requests = 0
+        self.retries = 0
+
+    async def fetch_json(self, client: httpx.AsyncClient, bucket: TokenBucket, url: str,
+                         params: Dict[str, Any]) -> Any:
+        """GET a JSON document, retrying transport errors, 429s and 5xx responses"""
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            self.requests += 1
+            response = None
+            try:
+                response = await client.get(url, params=params)
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+            finally:
+                # Also on cancellation and other errors, or the slot is never freed
+                bucket.release(response.headers if response is not None else None)
+            if response is not None:
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    response.raise_for_status()
+                    return response.json()
+                retry_after = header_float(response.headers, 'retry-after')
+                if retry_after:
+                    bucket.pause(retry_after)
+            self.retries += 1
+            await asyncio.sleep(random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)))
+
+    async def get_subreddit_posts_async(self, client: httpx.AsyncClient, bucket: TokenBucket,
+                                        subreddit: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Fetch posts from a subreddit"""
+        try:
+            data = await self.fetch_json(client, bucket, f"/r/{subreddit}/hot.json", {'limit': limit})
+            return self.parse_posts(data, subreddit)
+        except Exception as e:
+            print(f"Error fetching from r/{subreddit}: {e}")
+            return []
+
+    async def get_comments_async(self, client: httpx.AsyncClient, bucket: TokenBucket,
+                                 post_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Fetch comments from a post"""
+        try:
+            data = await self.fetch_json(client, bucket, f"/comments/{post_id}.json", {'limit': limit})
+            return self.parse_comments(data, post_id)
+        except Exception as e:
+            print(f"Error fetching comments for {post_id}: {e}")
+            return []
+
+    async def collect_subreddit(self, client: httpx.AsyncClient, bucket: TokenBucket,
+                                semaphore: asyncio.Semaphore, subreddit: str, posts_per_subreddit: int,
+                                comments_per_post: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """A subreddit's posts, then the comments of its first posts fetched together"""
+        async with semaphore:
+            posts = await self.get_subreddit_posts_async(client, bucket, subreddit, posts_per_subreddit)
+            print(f"📊 r/{subreddit}: found {len(posts)} posts")
+
+            results = await asyncio.gather(*(
+                self.get_comments_async(client, bucket, post['id'], comments_per_post)
+                for post in posts[:COMMENT_POSTS]
+            ))
+            comments = [comment for post_comments in results for comment in post_comments]
+            print(f"  r/{subreddit}: found {len(comments)} comments on {len(results)} posts")
+            return posts, comments
+
+    async def collect_data_async(self, posts_per_subreddit: int = 50, comments_per_post: int = 20):
+        """Collect posts and comments from all subreddits, several at a time"""
+        print("🚀 Starting concurrent Reddit data collection...")
+        print(f"Targeting {len(self.subreddits)} subreddits, {self.max_concurrency} at a time, "
+              f"at up to {self.rate:g} requests/s")
+
+        self.requests = self.retries = 0
+        bucket = TokenBucket(self.rate, self.burst)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+        async with httpx.AsyncClient(base_url=self.base_url, headers=self.headers, timeout=10,
+                                     limits=limits) as client:
+            results = await asyncio.gather(*(
+                self.collect_subreddit(client, bucket, semaphore, subreddit, posts_per_subreddit,
+                                       comments_per_post)
+                for subreddit in self.subreddits
+            ))
+
+        # Subreddit order, as RedditScraper collects them
+        all_posts = [post for posts, _ in results for post in posts]
+        all_comments = [comment for _, comments in results for comment in comments]
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        if all_posts:
+            self.save_to_csv(all_posts, f"reddit_posts_{timestamp}.csv")
+
+        if all_comments:
+            self.save_to_csv(all_comments, f"reddit_comments_{timestamp}.csv")
+
+        print(f"\n✅ Data collection complete!")
+        print(f"  Total posts: {len(all_posts)}")
+        print(f"  Total comments: {len(all_comments)}")
+        print(f"  Requests: {self.requests} ({self.retries} retries)")
+
+        return all_posts, all_comments
+
+    def collect_data(self, posts_per_subreddit: int = 50, comments_per_post: int = 20):
+        """Collect posts and comments from all subreddits, several at a time"""
+        return asyncio.run(self.collect_data_async(posts_per_subreddit, comments_per_post))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent Reddit data collection')
+    parser.add_argument('--rate', type=float, default=REQUESTS_PER_SECOND, help='requests per second')
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENCY, help='subreddits at a time')
+    parser.add_argument('--posts', type=int, default=50, help='posts per subreddit')
+    parser.add_argument('--comments', type=int, default=20, help='comments per post')
+    args = parser.parse_args()
+
+    scraper = AsyncRedditScraper(rate=args.rate, max_concurrency=args.concurrency)
+    posts, comments = scraper.collect_data(args.posts, args.comments)
+
+    if posts:
+        print("\n📝 Sample Post:")
+        sample_post = posts[0]
+        print(f"  Title: {sample_post['title']}")
+        print(f"  Content: {sample_post['content'][:200]}...")
+        print(f"  Subreddit: r/{sample_post['subreddit']}")
+        print(f"  Score: {sample_post['score']}")
+
+
+if __name__ == "__main__":
+    main()
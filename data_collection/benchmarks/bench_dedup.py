@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Deduplication Benchmark
+Runs the Deduplicator over growing sets of cleaned NextDoor posts, as
+generated (mostly exact repeats of a few thousand posts) and made distinct
+with a few random words each, and reports throughput and how many kept
+signatures each post is compared with, against every kept post for an
+all-pairs search. On a smaller sample it also runs the same greedy dedup
+with exact shingle Jaccard similarity against every kept post, the
+quadratic baseline, and reports how often the two agree.
+
+Usage: python benchmarks/bench_dedup.py [--sizes 10000,40000,160000] [--exact-size 3000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from data_processor import DataProcessor
+from dedup import DEDUP_THRESHOLD, SHINGLE_SIZE, Deduplicator, normalize
+from nextdoor_generator import NextDoorGenerator
+
+
+def generate(count, seed, distinct=False):
+    """Cleaned content of `count` generated posts, each with four random words if distinct"""
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        posts = NextDoorGenerator().generate_dataset(count)
+    processor = DataProcessor()
+    texts = [processor.clean_text(post['content']) for post in posts]
+    if distinct:
+        words = [''.join(random.choices('abcdefghijklmnopqrstuvwxyz', k=6)) for _ in range(5000)]
+        texts = [f"{text} {' '.join(random.choices(words, k=4))}" for text in texts]
+    return texts
+
+
+def exact_keep(texts):
+    """Greedy dedup comparing each post with every kept post by exact Jaccard similarity"""
+    kept, seen, keep = [], set(), []
+    for text in texts:
+        text = normalize(text)
+        padded = text.ljust(SHINGLE_SIZE, '\0')
+        shingles = {padded[i:i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1)}
+        duplicate = text in seen or any(
+            len(shingles & other) / len(shingles | other) >= DEDUP_THRESHOLD for other in kept)
+        seen.add(text)
+        if not duplicate:
+            kept.append(shingles)
+        keep.append(not duplicate)
+    return keep
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Deduplicator throughput and accuracy benchmark')
+    parser.add_argument('--sizes', default='10000,40000,160000', help='comma separated post counts')
+    parser.add_argument('--exact-size', type=int, default=3000, help='posts for the exact comparison')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    print(f"🚀 Deduplicating {', '.join(f'{size:,}' for size in sizes)} generated posts")
+    print(f"\n📊 Throughput")
+    print(f"  {'corpus':<10} {'posts':>9} {'kept':>8} {'exact':>8} {'near':>8} {'seconds':>8} "
+          f"{'posts/s':>9} {'compared/post':>14}")
+    for distinct in (False, True):
+        for size in sizes:
+            texts = generate(size, seed=size, distinct=distinct)
+            deduplicator = Deduplicator()
+            start = time.perf_counter()
+            keep = deduplicator.filter(texts)
+            elapsed = time.perf_counter() - start
+            print(f"  {'distinct' if distinct else 'generated':<10} {size:>9,} {keep.sum():>8,} "
+                  f"{deduplicator.exact_dropped:>8,} {deduplicator.near_dropped:>8,} {elapsed:>8.2f} "
+                  f"{size / elapsed:>9,.0f} {deduplicator.comparisons / size:>14.2f}")
+
+    texts = generate(args.exact_size, seed=1)
+    start = time.perf_counter()
+    expected = exact_keep(texts)
+    exact_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    keep = Deduplicator().filter(texts).tolist()
+    elapsed = time.perf_counter() - start
+    agree = sum(a == b for a, b in zip(keep, expected))
+    missed = sum(kept and not wanted for kept, wanted in zip(keep, expected))
+    extra = sum(wanted and not kept for kept, wanted in zip(keep, expected))
+    print(f"\n📊 MinHash/LSH against exact all-pairs Jaccard ({args.exact_size:,} posts)")
+    print(f"  Exact: {exact_elapsed:.2f}s, keeps {sum(expected):,}")
+    print(f"  LSH:   {elapsed:.2f}s, keeps {sum(keep):,}")
+    print(f"  Same decision for {agree / len(texts):.1%} of posts "
+          f"({missed} duplicates kept, {extra} distinct posts dropped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Feature Extraction Benchmark
+Times DataProcessor's per-row path (clean_text, extract_features and
+detect_misinformation_indicators for each record) against the column-wise
+path over the same frame, stage by stage and for whole NextDoor chunks,
+and reports rows/sec. The input is test_processed_20250812_221903.csv
+repeated --scale times; both paths are checked to give the same frame.
+
+Usage: python benchmarks/bench_features.py [--scale 1000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+DATA_COLLECTION = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DATA_COLLECTION)
+
+from data_processor import DataProcessor
+
+SAMPLE = os.path.join(DATA_COLLECTION, 'test_processed_20250812_221903.csv')
+
+
+def best(fn, repeat):
+    """Fastest of `repeat` runs of fn(), in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DataProcessor feature extraction benchmark')
+    parser.add_argument('--scale', type=int, default=1000, help='times to repeat the sample rows')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement, best is kept')
+    args = parser.parse_args()
+
+    sample = pd.read_csv(SAMPLE)
+    df = pd.DataFrame({
+        'content': pd.concat([sample['content']] * args.scale, ignore_index=True),
+        'author': pd.concat([sample['author']] * args.scale, ignore_index=True),
+        'category': pd.concat([sample['category']] * args.scale, ignore_index=True),
+        'sentiment': pd.concat([sample['sentiment']] * args.scale, ignore_index=True),
+    })
+    rows = DataProcessor(vectorized=False)
+    columns = DataProcessor()
+
+    expected = pd.DataFrame(rows.process_rows(df, rows.nextdoor_record))
+    pd.testing.assert_frame_equal(columns.process_frame('nextdoor', df), expected)
+    cleaned = expected['content']
+
+    print(f"🚀 Extracting features from {len(df):,} rows "
+          f"({len(sample)} sample rows x {args.scale:,}, best of {args.repeat})")
+    stages = [
+        ('clean_text',
+         lambda: [rows.clean_text(text) for text in df['content']],
+         lambda: columns.clean_text_series(df['content'])),
+        ('extract_features',
+         lambda: [rows.extract_features(text) for text in cleaned],
+         lambda: columns.extract_features_frame(cleaned)),
+        ('misinformation',
+         lambda: [rows.detect_misinformation_indicators(text) for text in cleaned],
+         lambda: columns.misinformation_indicators_frame(cleaned)),
+        ('whole chunk',
+         lambda: pd.DataFrame(rows.process_rows(df, rows.nextdoor_record)),
+         lambda: columns.process_frame('nextdoor', df)),
+    ]
+
+    print("\n📊 Rows per second")
+    print(f"  {'stage':<18} {'per-row':>12} {'vectorized':>12} {'speedup':>8}")
+    for name, per_row, vectorized in stages:
+        row_time = best(per_row, args.repeat)
+        column_time = best(vectorized, args.repeat)
+        print(f"  {name:<18} {len(df) / row_time:>12,.0f} {len(df) / column_time:>12,.0f} "
+              f"{row_time / column_time:>7.1f}x")
+    print("✅ Vectorized output matches the per-row output")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Output Format Benchmark
+Processes the same NextDoor NDJSON corpus into CSV and Parquet outputs and
+compares them: file size, write time, and load time with read_dataset for
+every column and for the columns a training job uses (content, sentiment
+and the misinformation label).
+
+Usage: python benchmarks/bench_formats.py [--size-mb 50] [--repeat 3]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_streaming import write_corpus
+from data_processor import STREAM_CHUNK_SIZE, DataProcessor, read_dataset
+
+TRAINING_COLUMNS = ['content', 'sentiment', 'misinformation_risk']
+
+
+def best(fn, repeat):
+    """Fastest of `repeat` runs of fn(), in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DataProcessor output format benchmark')
+    parser.add_argument('--size-mb', type=float, default=50, help='NextDoor NDJSON corpus size')
+    parser.add_argument('--chunk-size', type=int, default=STREAM_CHUNK_SIZE)
+    parser.add_argument('--repeat', type=int, default=3, help='loads per measurement, best is kept')
+    args = parser.parse_args()
+
+    previous = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix='bench_formats_')
+    os.chdir(workdir)
+    try:
+        os.makedirs('data/nextdoor')
+        write_corpus('data/nextdoor/corpus.ndjson', args.size_mb * 1024 ** 2, seed=1)
+        processor = DataProcessor()
+
+        print(f"🚀 Writing a {args.size_mb:g} MB NDJSON corpus as CSV and Parquet "
+              f"(best of {args.repeat} loads)")
+        results = []
+        for output_format in ('csv', 'parquet'):
+            start = time.perf_counter()
+            analysis, processed_path, training_path = processor.process_streaming(
+                output_format, args.chunk_size, output_format)
+            written = time.perf_counter() - start
+            results.append((
+                output_format, analysis.total_posts, written,
+                os.path.getsize(processed_path), os.path.getsize(training_path),
+                best(lambda: read_dataset(processed_path), args.repeat),
+                best(lambda: read_dataset(training_path, TRAINING_COLUMNS), args.repeat),
+            ))
+            print(f"  {output_format:<8} {analysis.total_posts:>10,} rows written in {written:.1f}s")
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n📊 Size and load time")
+    print(f"  {'format':<8} {'processed MB':>13} {'training MB':>12} {'load all s':>11} {'load training s':>16}")
+    for output_format, rows, written, processed, training, load_all, load_training in results:
+        print(f"  {output_format:<8} {processed / 1024 ** 2:>13.1f} {training / 1024 ** 2:>12.1f} "
+              f"{load_all:>11.2f} {load_training:>16.2f}")
+    csv, parquet = results
+    print(f"  Parquet is {parquet[3] / csv[3]:.0%} of the processed CSV's size, loads all columns "
+          f"{csv[5] / parquet[5]:.1f}x and the training columns {csv[6] / parquet[6]:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Parallel Processing Scaling Benchmark
+Writes a NextDoor NDJSON corpus plus Reddit post and comment CSVs, then
+processes it with the single-process streaming pipeline and with
+--workers 1..N, and reports rows/sec, speedup over one worker and
+parallel efficiency. The NDJSON file is split into byte-range shards, so
+speedup should track the worker count up to the number of cores.
+
+Usage: python benchmarks/bench_parallel.py [--size-mb 100] [--max-workers 8]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_streaming import write_corpus
+from data_processor import STREAM_CHUNK_SIZE, DataProcessor
+
+
+def write_reddit(rows, seed):
+    """Reddit post and comment CSVs of `rows` rows each, in data/reddit"""
+    from nextdoor_generator import NextDoorGenerator
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        contents = [post['content'] for post in NextDoorGenerator().generate_dataset(2000)]
+    pd.DataFrame({
+        'id': range(rows), 'title': 'Title', 'author': [f'user{i}' for i in range(rows)], 'subreddit': 'HOA',
+        'content': [f"{random.choice(contents)} http://example.com/{i} #hoa" for i in range(rows)],
+        'score': [random.randint(-10, 50) for _ in range(rows)], 'upvote_ratio': 0.9, 'num_comments': 3,
+        'created_utc': 1700000000, 'url': 'https://reddit.com/r/HOA'
+    }).to_csv('data/reddit/reddit_posts_bench.csv', index=False)
+    pd.DataFrame({
+        'id': range(rows), 'parent_id': 'p', 'author': [f'commenter{i}' for i in range(rows)],
+        'content': [random.choice(contents) for _ in range(rows)],
+        'score': [random.randint(-5, 10) for _ in range(rows)], 'created_utc': 1700000000
+    }).to_csv('data/reddit/reddit_comments_bench.csv', index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DataProcessor parallel scaling benchmark')
+    parser.add_argument('--size-mb', type=float, default=100, help='NextDoor NDJSON corpus size')
+    parser.add_argument('--reddit-rows', type=int, default=20000, help='rows per Reddit CSV')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=STREAM_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    previous = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix='bench_parallel_')
+    os.chdir(workdir)
+    try:
+        os.makedirs('data/nextdoor')
+        os.makedirs('data/reddit')
+        write_corpus('data/nextdoor/corpus.ndjson', args.size_mb * 1024 ** 2, seed=1)
+        write_reddit(args.reddit_rows, seed=1)
+        processor = DataProcessor()
+
+        print(f"🚀 Processing a {args.size_mb:g} MB NDJSON corpus and 2x{args.reddit_rows:,} Reddit rows "
+              f"with 1 to {args.max_workers} workers ({os.cpu_count()} cores)")
+        runs = []
+        for workers in [None] + list(range(1, args.max_workers + 1)):
+            start = time.perf_counter()
+            if workers is None:
+                analysis, processed_path, training_path = processor.process_streaming('bench', args.chunk_size)
+            else:
+                analysis, processed_path, training_path = processor.process_parallel('bench', workers, args.chunk_size)
+            elapsed = time.perf_counter() - start
+            for path in (processed_path, training_path):
+                shutil.rmtree(path) if os.path.isdir(path) else os.remove(path)
+            runs.append((workers, analysis.total_posts, elapsed))
+            label = 'streaming' if workers is None else f'{workers} workers'
+            print(f"  {label:<12} {analysis.total_posts:>10,} rows {elapsed:>8.1f}s")
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    one_worker = runs[1][2]
+    print("\n📊 Scaling")
+    print(f"  {'mode':<12} {'rows/s':>9} {'speedup':>8} {'efficiency':>11}")
+    for workers, rows, elapsed in runs:
+        if workers is None:
+            print(f"  {'streaming':<12} {rows / elapsed:>9,.0f}")
+            continue
+        speedup = one_worker / elapsed
+        print(f"  {f'{workers} workers':<12} {rows / elapsed:>9,.0f} {speedup:>7.2f}x {speedup / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
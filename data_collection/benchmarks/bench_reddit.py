@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Reddit Collection Benchmark
+Serves the recorded Reddit responses from a local replay server with a
+fixed per-request latency, under as many subreddit names as asked for, and
+times RedditScraper (one request at a time with fixed sleeps) against
+AsyncRedditScraper at the same one request per second. The floor is the
+time the rate limit alone requires: every request after the first burst
+waits for a token.
+
+Usage: python benchmarks/bench_reddit.py [--subreddits 6] [--latency 0.3] [--rate 1]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from async_reddit_scraper import BURST, AsyncRedditScraper
+from reddit_scraper import RedditScraper
+from test_async_reddit_scraper import SUBREDDITS, load_recorded, replay_server
+
+
+def timed(scraper, subreddits, base_url):
+    """Seconds, posts and comments of one collect_data run"""
+    scraper.subreddits = subreddits
+    scraper.base_url = base_url
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        posts, comments = scraper.collect_data(posts_per_subreddit=30, comments_per_post=10)
+    return time.perf_counter() - start, len(posts), len(comments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sequential and concurrent Reddit collection benchmark')
+    parser.add_argument('--subreddits', type=int, default=6, help='subreddits to collect')
+    parser.add_argument('--latency', type=float, default=0.3, help='seconds per response')
+    parser.add_argument('--rate', type=float, default=1.0, help='requests per second for the async collector')
+    args = parser.parse_args()
+
+    recorded = load_recorded()
+    responses = {path: body for path, body in recorded.items() if path.startswith('/comments/')}
+    subreddits = [f"{SUBREDDITS[i % len(SUBREDDITS)]}{i}" for i in range(args.subreddits)]
+    for i, subreddit in enumerate(subreddits):
+        responses[f"/r/{subreddit}/hot.json"] = recorded[f"/r/{SUBREDDITS[i % len(SUBREDDITS)]}/hot.json"]
+
+    previous = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix='bench_reddit_')
+    os.chdir(workdir)
+    try:
+        print(f"🚀 Collecting {args.subreddits} subreddits from a replay server "
+              f"with {args.latency:g}s latency")
+        results = []
+        for name, scraper in (('sequential', RedditScraper()), ('async', AsyncRedditScraper(rate=args.rate))):
+            with replay_server(responses, latency=args.latency) as server:
+                elapsed, posts, comments = timed(scraper, subreddits, server.url)
+                results.append((name, elapsed, posts, comments, len(server.log)))
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    requests = results[-1][4]
+    floor = max(0, requests - BURST) / args.rate
+    print(f"\n📊 Wall time")
+    print(f"  {'collector':<11} {'seconds':>8} {'posts':>6} {'comments':>9} {'requests':>9}")
+    for name, elapsed, posts, comments, sent in results:
+        print(f"  {name:<11} {elapsed:>8.1f} {posts:>6} {comments:>9} {sent:>9}")
+    print(f"  Rate-limit floor at {args.rate:g} requests/s: {floor:.1f}s; "
+          f"async is {results[0][1] / results[1][1]:.1f}x faster than sequential")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Streaming Pipeline Memory Benchmark
+Writes NextDoor NDJSON corpora of increasing size, processes each in a fresh
+process with the batch pipeline (load everything, then process) and with
+--stream, and reports peak RSS and rows/sec. Streaming peak RSS should stay
+flat as the corpus grows; the run fails if it exceeds --rss-cap-mb.
+
+Batch mode holds the whole corpus several times over (records, raw frame,
+processed rows, processed frame), so it is only run up to --batch-max-gb.
+
+Usage: python benchmarks/bench_streaming.py [--sizes-gb 0.05,0.2,1] [--rss-cap-mb 512]
+       python benchmarks/bench_streaming.py --sizes-gb 10 --batch-max-gb 0
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+DATA_COLLECTION = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DATA_COLLECTION)
+
+PROCESS_SCRIPT = '''
+import sys
+sys.path.insert(0, sys.argv[1])
+from data_processor import DataProcessor
+processor = DataProcessor()
+if sys.argv[2] == 'stream':
+    analysis, _, _ = processor.process_streaming('bench', int(sys.argv[3]))
+    rows = analysis.total_posts
+else:
+    df = processor.process_nextdoor_data(processor.load_nextdoor_data())
+    processor.save_processed_data(df, 'processed_data_bench.csv')
+    processor.create_training_dataset(df, 'training_dataset_bench.csv')
+    processor.analyze_data(df)
+    rows = len(df)
+print(rows)
+'''
+
+
+def write_corpus(path, size_bytes, seed):
+    """Append generated posts to `path` as NDJSON until it holds size_bytes"""
+    from nextdoor_generator import NextDoorGenerator
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        posts = NextDoorGenerator().generate_dataset(20000)
+    lines = [json.dumps(post, ensure_ascii=False) + '\n' for post in posts]
+    written = os.path.getsize(path) if os.path.exists(path) else 0
+    with open(path, 'a', encoding='utf-8') as f:
+        while written < size_bytes:
+            block = ''.join(lines)
+            f.write(block)
+            written += len(block.encode('utf-8'))
+    return written
+
+
+def run(mode, workdir, chunk_size):
+    """Process the corpus in a child process; returns (rows, seconds, peak RSS MB)"""
+    shutil.rmtree(os.path.join(workdir, 'data', 'processed'), ignore_errors=True)
+    start = time.perf_counter()
+    child = subprocess.Popen(
+        [sys.executable, '-c', PROCESS_SCRIPT, os.path.abspath(DATA_COLLECTION), mode, str(chunk_size)],
+        cwd=workdir, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    output = child.stdout.read()
+    # wait4 reports the peak RSS of this child alone (kilobytes on Linux)
+    _, status, usage = os.wait4(child.pid, 0)
+    elapsed = time.perf_counter() - start
+    if status != 0:
+        raise RuntimeError(f"{mode} processing failed with status {status}")
+    return int(output.strip().splitlines()[-1]), elapsed, usage.ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DataProcessor streaming memory benchmark')
+    parser.add_argument('--sizes-gb', default='0.05,0.2,1', help='comma separated corpus sizes')
+    parser.add_argument('--batch-max-gb', type=float, default=0.2, help='largest corpus to run in batch mode')
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--rss-cap-mb', type=float, default=512, help='streaming peak RSS must stay under this')
+    parser.add_argument('--workdir', help='keep the corpus here instead of a temporary directory')
+    args = parser.parse_args()
+
+    sizes = sorted(float(size) for size in args.sizes_gb.split(','))
+    workdir = args.workdir or tempfile.mkdtemp(prefix='bench_streaming_')
+    os.makedirs(os.path.join(workdir, 'data', 'nextdoor'), exist_ok=True)
+    corpus = os.path.join(workdir, 'data', 'nextdoor', 'corpus.ndjson')
+    if os.path.exists(corpus):
+        os.remove(corpus)
+
+    print(f"🚀 Processing NextDoor corpora of {', '.join(f'{size:g}' for size in sizes)} GB "
+          f"(chunks of {args.chunk_size:,} rows, RSS cap {args.rss_cap_mb:,.0f} MB)")
+    rows = []
+    try:
+        # Grow one corpus file, so each size includes the previous one
+        for size in sizes:
+            written = write_corpus(corpus, size * 1024 ** 3, seed=1)
+            for mode in ('batch', 'stream'):
+                if mode == 'batch' and size > args.batch_max_gb:
+                    continue
+                processed, elapsed, rss = run(mode, workdir, args.chunk_size)
+                rows.append((size, written, mode, processed, elapsed, rss))
+                print(f"  {size:g} GB {mode:<6} {processed:>12,} rows {elapsed:>8.1f}s  peak RSS {rss:,.0f} MB")
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n📊 Peak RSS by corpus size")
+    print(f"  {'corpus':>10} {'mode':<7} {'rows':>12} {'rows/s':>9} {'peak RSS MB':>12}")
+    for size, written, mode, processed, elapsed, rss in rows:
+        print(f"  {written / 1024 ** 3:>8.2f}GB {mode:<7} {processed:>12,} {processed / elapsed:>9,.0f} {rss:>12,.0f}")
+
+    peak = max(rss for *_, mode, _, _, rss in rows if mode == 'stream')
+    if peak > args.rss_cap_mb:
+        print(f"❌ Streaming peak RSS {peak:,.0f} MB is over the {args.rss_cap_mb:,.0f} MB cap")
+        return 1
+    print(f"✅ Streaming peak RSS {peak:,.0f} MB stayed under the {args.rss_cap_mb:,.0f} MB cap")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -26,7 +26,7 @@ def print_banner():
 def check_dependencies():
     """Check if required dependencies are installed"""
     required_packages = [
-        'requests', 'pandas', 'numpy', 'matplotlib', 'seaborn'
+        'requests', 'httpx', 'pandas', 'numpy', 'matplotlib', 'seaborn'
     ]
     
     missing_packages = []
@@ -45,14 +45,18 @@ def check_dependencies():
     print("✅ All required dependencies are installed")
     return True
 
-def run_reddit_scraper():
+def run_reddit_scraper(sequential=False):
     """Run the Reddit scraper"""
     print("\n🔴 Collecting Reddit data...")
     
     try:
-        from reddit_scraper import RedditScraper
+        if sequential:
+            from reddit_scraper import RedditScraper
+            scraper = RedditScraper()
+        else:
+            from async_reddit_scraper import AsyncRedditScraper
+            scraper = AsyncRedditScraper()
         
-        scraper = RedditScraper()
         posts, comments = scraper.collect_data(posts_per_subreddit=30, comments_per_post=10)
         
         if posts or comments:
@@ -91,14 +95,28 @@ def run_nextdoor_generator():
         print(f"❌ NextDoor generation failed: {e}")
         return False
 
-def run_data_processor():
+def run_data_processor(stream=False, chunk_size=None, workers=None, output_format='csv', incremental=False,
+                       dedup=False):
     """Run the data processor"""
     print("\n⚙️  Processing and analyzing data...")
     
     try:
-        from data_processor import DataProcessor
+        from data_processor import (DataProcessor, STREAM_CHUNK_SIZE, print_duplicates, run_incremental,
+                                    run_parallel, run_streaming)
+        
+        processor = DataProcessor(dedup=dedup)
+        
+        if incremental:
+            # Only files added or changed since the last run, into data/processed/store
+            return run_incremental(processor, chunk_size or STREAM_CHUNK_SIZE, output_format, workers)
+        
+        if workers:
+            # Input shards streamed on a process pool, one part file per shard
+            return run_parallel(processor, workers, chunk_size or STREAM_CHUNK_SIZE, output_format)
         
-        processor = DataProcessor()
+        if stream:
+            # Bounded chunks end to end, for corpora larger than memory
+            return run_streaming(processor, chunk_size or STREAM_CHUNK_SIZE, output_format)
         
         # Load and process data
         posts_df, comments_df = processor.load_reddit_data()
@@ -127,8 +145,9 @@ def run_data_processor():
             print("❌ No data to process!")
             return False
         
-        combined_df = processor.combine_data(all_data)
+        combined_df = processor.deduplicate(processor.combine_data(all_data))
         print(f"  Combined dataset: {len(combined_df)} total posts")
+        print_duplicates(processor)
         
         # Analyze data
         analysis = processor.analyze_data(combined_df)
@@ -139,10 +158,10 @@ def run_data_processor():
         processor.generate_analysis_report(analysis, report_file)
         
         # Save processed data
-        processor.save_processed_data(combined_df, f"processed_data_{timestamp}.csv")
+        processor.save_processed_data(combined_df, f"processed_data_{timestamp}.{output_format}")
         
         # Create training dataset
-        training_data = processor.create_training_dataset(combined_df, f"training_dataset_{timestamp}.csv")
+        training_data = processor.create_training_dataset(combined_df, f"training_dataset_{timestamp}.{output_format}")
         
         print(f"✅ Data processing complete!")
         print(f"  Total processed posts: {len(combined_df):,}")
@@ -163,8 +182,21 @@ def main():
     parser.add_argument('--process-only', action='store_true', help='Only process existing data')
     parser.add_argument('--skip-reddit', action='store_true', help='Skip Reddit collection')
     parser.add_argument('--skip-nextdoor', action='store_true', help='Skip NextDoor generation')
+    parser.add_argument('--sequential-reddit', action='store_true',
+                        help='Collect Reddit one request at a time instead of concurrently')
+    parser.add_argument('--stream', action='store_true', help='Process data in bounded chunks with constant memory')
+    parser.add_argument('--chunk-size', type=int, help='Rows per chunk with --stream or --workers (default: 10000)')
+    parser.add_argument('--workers', type=int, help='Process input files on N worker processes, one part file per shard')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                        help='Processed and training dataset format (parquet needs pyarrow)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only process input files added or changed since the last run')
+    parser.add_argument('--dedup', action='store_true',
+                        help='Drop exact and near-duplicate posts (not with --workers)')
     
     args = parser.parse_args()
+    if args.dedup and args.workers:
+        parser.error('--dedup cannot be combined with --workers')
     
     print_banner()
     
@@ -200,7 +232,7 @@ def main():
     
     # Step 1: Collect Reddit data
     if run_reddit:
-        if run_reddit_scraper():
+        if run_reddit_scraper(args.sequential_reddit):
             success_count += 1
         else:
             print("⚠️  Reddit collection failed, continuing with other steps...")
@@ -214,7 +246,8 @@ def main():
     
     # Step 3: Process and analyze data
     if run_processing:
-        if run_data_processor():
+        if run_data_processor(args.stream, args.chunk_size, args.workers, args.format, args.incremental,
+                              args.dedup):
             success_count += 1
         else:
             print("❌ Data processing failed")
@@ -9,18 +9,468 @@ import json
 import csv
 import re
 import os
+import argparse
+import contextlib
+import hashlib
+import multiprocessing
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Tuple
+from itertools import islice
+from typing import List, Dict, Any, Iterator, NamedTuple, Optional, Tuple
 import numpy as np
 from collections import Counter
-import matplotlib.pyplot as plt
-import seaborn as sns
+import sys
 
-class DataProcessor:
+# The keyword matcher is shared with the backend's risk scoring
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from keyword_matcher import get_matcher
+
+from dedup import Deduplicator
+
+# Rows per chunk in streaming mode; peak memory grows with this, not the corpus
+STREAM_CHUNK_SIZE = 10000
+
+# Columns that are float in a combined dataset even when one chunk only has
+# integer values (upvote_ratio is 0 for everything but Reddit posts)
+FLOAT_COLUMNS = ['upvote_ratio', 'avg_word_length', 'caps_ratio']
+
+# Read size for JSON input files
+JSON_READ_SIZE = 1 << 20
+
+# Processed store for --incremental, under data/processed
+STORE_DIR = 'store'
+MANIFEST_VERSION = 1
+
+# With --workers, NDJSON files are split into byte ranges so there are about
+# this many shards per worker (a slow last shard then idles the pool less),
+# but never into ranges smaller than MIN_SHARD_BYTES
+SHARDS_PER_WORKER = 4
+MIN_SHARD_BYTES = 1 << 20
+
+START_METHOD = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Output file formats; the extension of an output path picks its writer
+OUTPUT_FORMATS = ('csv', 'parquet')
+PARQUET_COMPRESSION = 'zstd'
+
+# Parquet column types (pyarrow type names). Low-cardinality text is
+# dictionary encoded and read back as pandas categoricals; timestamps are
+# text because Reddit gives epoch seconds and NextDoor ISO dates.
+PROCESSED_TYPES = {
+    'content': 'string', 'original_content': 'string', 'author': 'string',
+    'category': 'dictionary', 'sentiment': 'dictionary', 'timestamp': 'string',
+    'score': 'int64', 'upvote_ratio': 'float64', 'num_comments': 'int64',
+    'subreddit': 'dictionary', 'url': 'string',
+    'length': 'int32', 'word_count': 'int32', 'avg_word_length': 'float64',
+    'exclamation_count': 'int32', 'question_count': 'int32', 'caps_ratio': 'float64',
+    'urgency_words': 'int32', 'conspiracy_words': 'int32', 'authority_challenge': 'int32',
+    'excessive_caps': 'int8', 'exclamation_overuse': 'int8', 'source': 'dictionary'
+}
+TRAINING_TYPES = {
+    'content': 'string', 'sentiment': 'dictionary', 'category': 'dictionary',
+    'urgency_words': 'int32', 'conspiracy_words': 'int32', 'authority_challenge': 'int32',
+    'excessive_caps': 'int8', 'exclamation_overuse': 'int8', 'length': 'int32', 'word_count': 'int32',
+    'misinformation_risk': 'int8'
+}
+
+
+class Shard(NamedTuple):
+    """A unit of parallel work: a whole input file, or a byte range of an NDJSON file"""
+    kind: str
+    path: str
+    start: int = 0
+    end: Optional[int] = None
+    
+    @property
+    def size(self) -> int:
+        return (self.end if self.end is not None else os.path.getsize(self.path)) - self.start
+
+
+def is_json_array(filepath: str) -> bool:
+    """Whether a JSON input file holds one array rather than NDJSON lines"""
+    with open(filepath, 'rb') as f:
+        while True:
+            block = f.read(JSON_READ_SIZE)
+            if not block:
+                return False
+            block = block.lstrip()
+            if block:
+                return block.startswith(b'[')
+
+
+def iter_ndjson_range(filepath: str, start: int, end: int) -> Iterator[Dict[str, Any]]:
+    """Yield the objects of the NDJSON lines that start within [start, end) of a file
+
+    Adjacent ranges together yield every line exactly once, wherever the
+    range boundaries fall.
+    """
+    with open(filepath, 'rb') as f:
+        if start > 0:
+            # The line running through `start` belongs to the previous range
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_json_records(filepath: str) -> Iterator[Dict[str, Any]]:
+    """Yield the objects of a JSON array file, or of an NDJSON file, one at a time
+
+    Reads JSON_READ_SIZE bytes at a time, so a multi-gigabyte array is never
+    held in memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        buffer = ''
+        while not buffer:
+            more = f.read(JSON_READ_SIZE)
+            if not more:
+                return
+            buffer = more.lstrip()
+        if not buffer.startswith('['):
+            # NDJSON: one object per line
+            f.seek(0)
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        position = 1
+        eof = False
+        while True:
+            # Skip whitespace and the separators between array items
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position < len(buffer) and buffer[position] == ']':
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+                # An item ending exactly at the buffer end may be cut short
+                complete = end < len(buffer) or eof
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            if complete:
+                yield record
+                position = end
+                continue
+            more = f.read(JSON_READ_SIZE)
+            eof = not more
+            buffer = buffer[position:] + more
+            position = 0
+
+
+class AnalysisAccumulator:
+    """The totals behind DataProcessor.analyze_data, built up chunk by chunk
+
+    Holds only counts and sums, so its size does not depend on the corpus.
+    result() gives the same dict as analyze_data over all the chunks.
+    """
+    
     def __init__(self):
+        self.total_posts = 0
+        self.sentiments = Counter()
+        self.categories = Counter()
+        self.sources = Counter()
+        self.length_sum = 0
+        self.word_count_sum = 0
+        self.indicators = Counter()
+    
+    def update(self, df: pd.DataFrame):
+        """Add one chunk of processed rows"""
+        self.total_posts += len(df)
+        self.sentiments.update({key: int(count) for key, count in df['sentiment'].value_counts().items()})
+        self.categories.update({key: int(count) for key, count in df['category'].value_counts().items()})
+        self.sources.update({key: int(count) for key, count in df['source'].value_counts().items()})
+        self.length_sum += int(df['length'].sum())
+        self.word_count_sum += int(df['word_count'].sum())
+        self.indicators.update({
+            'high_urgency': int((df['urgency_words'] > 2).sum()),
+            'conspiracy_mentions': int((df['conspiracy_words'] > 0).sum()),
+            'authority_challenges': int((df['authority_challenge'] > 0).sum()),
+            'excessive_caps': int((df['excessive_caps'] > 0).sum()),
+            'exclamation_overuse': int((df['exclamation_overuse'] > 0).sum())
+        })
+    
+    def merge(self, other: 'AnalysisAccumulator'):
+        """Add the totals of another accumulator"""
+        self.total_posts += other.total_posts
+        self.sentiments.update(other.sentiments)
+        self.categories.update(other.categories)
+        self.sources.update(other.sources)
+        self.length_sum += other.length_sum
+        self.word_count_sum += other.word_count_sum
+        self.indicators.update(other.indicators)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """The totals as JSON-serializable data, for from_dict"""
+        return {
+            'total_posts': self.total_posts,
+            'sentiments': dict(self.sentiments),
+            'categories': dict(self.categories),
+            'sources': dict(self.sources),
+            'length_sum': self.length_sum,
+            'word_count_sum': self.word_count_sum,
+            'indicators': dict(self.indicators)
+        }
+    
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'AnalysisAccumulator':
+        accumulator = cls()
+        accumulator.total_posts = state['total_posts']
+        accumulator.sentiments = Counter(state['sentiments'])
+        accumulator.categories = Counter(state['categories'])
+        accumulator.sources = Counter(state['sources'])
+        accumulator.length_sum = state['length_sum']
+        accumulator.word_count_sum = state['word_count_sum']
+        accumulator.indicators = Counter(state['indicators'])
+        return accumulator
+    
+    def result(self) -> Dict[str, Any]:
+        total = self.total_posts
+        return {
+            'total_posts': total,
+            'sentiment_distribution': dict(self.sentiments.most_common()),
+            'category_distribution': dict(self.categories.most_common(10)),
+            'source_distribution': dict(self.sources.most_common()),
+            'avg_length': self.length_sum / total if total else 0.0,
+            'avg_word_count': self.word_count_sum / total if total else 0.0,
+            'misinformation_indicators': {
+                name: self.indicators[name] for name in (
+                    'high_urgency', 'conspiracy_mentions', 'authority_challenges',
+                    'excessive_caps', 'exclamation_overuse'
+                )
+            }
+        }
+
+
+def parquet_modules():
+    """pyarrow and pyarrow.parquet, needed only for Parquet output"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet output needs the pyarrow package: pip install pyarrow")
+    return pyarrow, pyarrow.parquet
+
+
+def arrow_schema(types: Dict[str, str]):
+    pa, _ = parquet_modules()
+    return pa.schema([
+        (name, pa.dictionary(pa.int32(), pa.string()) if kind == 'dictionary' else getattr(pa, kind)())
+        for name, kind in types.items()
+    ])
+
+
+def arrow_table(df: pd.DataFrame, types: Dict[str, str]):
+    """The columns of `types` from a processed frame as an Arrow table of those types"""
+    pa, _ = parquet_modules()
+    arrays = []
+    for name, kind in types.items():
+        values = df[name]
+        if kind in ('string', 'dictionary'):
+            if values.dtype == object or not pd.api.types.is_string_dtype(values):
+                # Mixed columns (timestamp) are written as their CSV text
+                values = [None if not isinstance(value, str) and pd.isna(value) else str(value)
+                          for value in values]
+            array = pa.array(values, from_pandas=True).cast(pa.string())
+            arrays.append(array.dictionary_encode() if kind == 'dictionary' else array)
+        else:
+            # A safe cast, so an out-of-range or fractional value raises
+            arrays.append(pa.array(values.to_numpy(), from_pandas=True).cast(getattr(pa, kind)()))
+    return pa.Table.from_arrays(arrays, schema=arrow_schema(types))
+
+
+@contextlib.contextmanager
+def dataset_writer(path: str, types: Dict[str, str]):
+    """Yield a function that appends a frame to a CSV or Parquet file at `path`
+
+    CSV gets a header before the first rows; Parquet gets one row group per
+    frame, typed and compressed.
+    """
+    if path.endswith('.parquet'):
+        _, pq = parquet_modules()
+        with pq.ParquetWriter(path, arrow_schema(types), compression=PARQUET_COMPRESSION) as writer:
+            yield lambda df: writer.write_table(arrow_table(df, types))
+        return
+    
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        header = True
+
+        def write(df: pd.DataFrame):
+            nonlocal header
+            df.to_csv(f, header=header, index=False)
+            header = False
+
+        yield write
+
+
+def read_dataset(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load a processed or training dataset, reading only `columns` if given
+
+    `path` is a CSV or Parquet file, or a directory of part files from
+    --workers (concatenated in name order). Parquet files are memory mapped
+    and only the requested columns are decoded.
+    """
+    if os.path.isdir(path):
+        paths = [os.path.join(path, name) for name in sorted(os.listdir(path))
+                 if name.endswith(('.csv', '.parquet'))]
+    else:
+        paths = [path]
+    
+    if paths and all(filepath.endswith('.parquet') for filepath in paths):
+        pa, pq = parquet_modules()
+        tables = [pq.read_table(filepath, columns=columns, memory_map=True) for filepath in paths]
+        return pa.concat_tables(tables).to_pandas()
+    
+    frames = [pd.read_csv(filepath, usecols=columns) for filepath in paths]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def file_digest(filepath: str) -> str:
+    """SHA-256 of a file's contents, read in blocks"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(JSON_READ_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ProcessedStore:
+    """Processed and training datasets built up across --incremental runs
+
+    processed/ and training/ under `root` hold part files, and manifest.json
+    records every input file processed so far: its size, mtime and SHA-256,
+    its input and processed row counts, its part files and its analysis
+    totals. A file whose size and mtime are unchanged is skipped without
+    being read; one whose contents changed has its parts replaced.
+    """
+    
+    def __init__(self, root: str, output_format: str = 'csv', dedup: bool = False):
+        self.root = root
+        self.manifest_path = os.path.join(root, 'manifest.json')
+        # Deduplicator index of the content in the store, with --dedup
+        self.dedup_index_path = os.path.join(root, 'dedup_index.npz')
+        self.processed_dir = os.path.join(root, 'processed')
+        self.training_dir = os.path.join(root, 'training')
+        os.makedirs(self.processed_dir, exist_ok=True)
+        os.makedirs(self.training_dir, exist_ok=True)
+        
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+            if self.manifest['format'] != output_format:
+                raise ValueError(f"{root} holds {self.manifest['format']} parts, not {output_format}")
+            if self.manifest.get('dedup', False) != dedup:
+                raise ValueError(f"{root} was built {'with' if not dedup else 'without'} --dedup")
+        else:
+            self.manifest = {'version': MANIFEST_VERSION, 'format': output_format, 'dedup': dedup,
+                             'next_part': 0, 'files': {}}
+        self.format = output_format
+        self.remove_orphans()
+    
+    @property
+    def files(self) -> Dict[str, Dict[str, Any]]:
+        return self.manifest['files']
+    
+    def remove_orphans(self):
+        """Delete part files the manifest does not list, left by an interrupted run"""
+        listed = {part for entry in self.files.values() for part in entry['parts']}
+        for directory in (self.processed_dir, self.training_dir):
+            for name in os.listdir(directory):
+                if name not in listed:
+                    os.remove(os.path.join(directory, name))
+    
+    def changes(self, filepaths: List[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """The input files to (re)process, with their new fingerprints, and the files gone since the last run
+
+        A file whose size and mtime match the manifest is taken as unchanged.
+        One that was only touched (same SHA-256) has its mtime updated and is
+        not reprocessed.
+        """
+        changed = {}
+        for filepath in filepaths:
+            stat = os.stat(filepath)
+            entry = self.files.get(filepath)
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                continue
+            fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_digest(filepath)}
+            if entry and entry['sha256'] == fingerprint['sha256']:
+                entry.update(fingerprint)
+                continue
+            changed[filepath] = fingerprint
+        
+        present = set(filepaths)
+        removed = [filepath for filepath in self.files if filepath not in present]
+        return changed, removed
+    
+    def allocate_parts(self, count: int) -> List[Tuple[str, str, str]]:
+        """(name, processed path, training path) for `count` new part files"""
+        first = self.manifest['next_part']
+        self.manifest['next_part'] += count
+        parts = []
+        for number in range(first, first + count):
+            name = f"part-{number:06d}.{self.format}"
+            parts.append((name, os.path.join(self.processed_dir, name), os.path.join(self.training_dir, name)))
+        return parts
+    
+    def record(self, filepath: str, kind: str, fingerprint: Dict[str, Any], input_rows: int,
+               parts: List[str], analysis: AnalysisAccumulator) -> List[str]:
+        """Set a file's manifest entry; returns the part files it replaces"""
+        previous = self.files.get(filepath, {}).get('parts', [])
+        self.files[filepath] = dict(
+            fingerprint, kind=kind, input_rows=input_rows, processed_rows=analysis.total_posts,
+            parts=parts, analysis=analysis.to_dict()
+        )
+        return previous
+    
+    def forget(self, filepath: str) -> List[str]:
+        """Drop a file's manifest entry; returns its part files"""
+        return self.files.pop(filepath)['parts']
+    
+    def save(self):
+        """Write the manifest atomically"""
+        temporary = self.manifest_path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(temporary, self.manifest_path)
+    
+    def delete_parts(self, names: List[str]):
+        for name in names:
+            for directory in (self.processed_dir, self.training_dir):
+                path = os.path.join(directory, name)
+                if os.path.exists(path):
+                    os.remove(path)
+    
+    def analysis(self) -> AnalysisAccumulator:
+        """Analysis of the whole store, merged from the per-file totals"""
+        analysis = AnalysisAccumulator()
+        for entry in self.files.values():
+            analysis.merge(AnalysisAccumulator.from_dict(entry['analysis']))
+        return analysis
+
+
+class DataProcessor:
+    def __init__(self, vectorized: bool = True, dedup: bool = False):
         self.data_dir = 'data'
         self.processed_dir = 'data/processed'
         
+        # Column-wise processing; False runs the *_record methods row by row
+        self.vectorized = vectorized
+        
+        # Drops exact and near-duplicate posts as they are processed; the
+        # index lasts for this processor, or is kept in the store with
+        # process_incremental
+        self.deduplicator = Deduplicator() if dedup else None
+        
         # Create directories
         os.makedirs(self.processed_dir, exist_ok=True)
         os.makedirs('data/analysis', exist_ok=True)
@@ -31,6 +481,9 @@ class DataProcessor:
         self.hashtag_pattern = re.compile(r'#\w+')
         self.extra_whitespace = re.compile(r'\s+')
         
+        # Urgency, conspiracy and authority challenge keywords (backend/keywords.json)
+        self.keyword_matcher = get_matcher('indicators')
+        
     def load_reddit_data(self) -> pd.DataFrame:
         """Load Reddit data from CSV files"""
         reddit_dir = os.path.join(self.data_dir, 'reddit')
@@ -38,19 +491,10 @@ class DataProcessor:
             print("No Reddit data found. Run reddit_scraper.py first.")
             return pd.DataFrame()
         
-        posts_data = []
-        comments_data = []
-        
         # Load all CSV files
-        for filename in os.listdir(reddit_dir):
-            if filename.endswith('.csv'):
-                filepath = os.path.join(reddit_dir, filename)
-                df = pd.read_csv(filepath)
-                
-                if 'parent_id' in df.columns:
-                    comments_data.append(df)
-                else:
-                    posts_data.append(df)
+        posts_files, comments_files = self.reddit_files()
+        posts_data = [pd.read_csv(filepath) for filepath in posts_files]
+        comments_data = [pd.read_csv(filepath) for filepath in comments_files]
         
         # Combine data
         if posts_data:
@@ -74,15 +518,89 @@ class DataProcessor:
         
         data = []
         
-        # Load all JSON files
-        for filename in os.listdir(nextdoor_dir):
-            if filename.endswith('.json'):
-                filepath = os.path.join(nextdoor_dir, filename)
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data.extend(json.load(f))
+        # Load all JSON and NDJSON files
+        for filepath in self.nextdoor_files():
+            data.extend(iter_json_records(filepath))
         
         return pd.DataFrame(data)
     
+    def reddit_files(self) -> Tuple[List[str], List[str]]:
+        """Paths of the Reddit post and comment CSV files, told apart by their header"""
+        reddit_dir = os.path.join(self.data_dir, 'reddit')
+        posts_files = []
+        comments_files = []
+        if not os.path.exists(reddit_dir):
+            return posts_files, comments_files
+        
+        for filename in os.listdir(reddit_dir):
+            if filename.endswith('.csv'):
+                filepath = os.path.join(reddit_dir, filename)
+                columns = pd.read_csv(filepath, nrows=0).columns
+                if 'parent_id' in columns:
+                    comments_files.append(filepath)
+                else:
+                    posts_files.append(filepath)
+        
+        return posts_files, comments_files
+    
+    def nextdoor_files(self) -> List[str]:
+        """Paths of the NextDoor JSON and NDJSON files"""
+        nextdoor_dir = os.path.join(self.data_dir, 'nextdoor')
+        if not os.path.exists(nextdoor_dir):
+            return []
+        return [
+            os.path.join(nextdoor_dir, filename) for filename in os.listdir(nextdoor_dir)
+            if filename.endswith(('.json', '.ndjson', '.jsonl'))
+        ]
+    
+    def plan_shards(self, shard_bytes: Optional[int] = None) -> List[Shard]:
+        """Every input file as shards, in the order the batch loaders concatenate them
+
+        NDJSON files larger than shard_bytes are split into byte ranges of
+        about that size; Reddit CSVs (whose quoted fields may span lines) and
+        JSON arrays are always one shard. Without shard_bytes, one shard per file.
+        """
+        posts_files, comments_files = self.reddit_files()
+        shards = [Shard('reddit_posts', filepath) for filepath in posts_files]
+        shards.extend(Shard('reddit_comments', filepath) for filepath in comments_files)
+        
+        for filepath in self.nextdoor_files():
+            size = os.path.getsize(filepath)
+            if shard_bytes is None or size <= shard_bytes or is_json_array(filepath):
+                shards.append(Shard('nextdoor', filepath))
+                continue
+            for start in range(0, size, shard_bytes):
+                shards.append(Shard('nextdoor', filepath, start, min(start + shard_bytes, size)))
+        
+        return shards
+    
+    def iter_shard_chunks(self, shard: Shard, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """Yield DataFrame chunks of at most chunk_size raw rows from one shard"""
+        if shard.kind != 'nextdoor':
+            yield from pd.read_csv(shard.path, chunksize=chunk_size)
+            return
+        
+        if shard.end is None:
+            records = iter_json_records(shard.path)
+        else:
+            records = iter_ndjson_range(shard.path, shard.start, shard.end)
+        while True:
+            batch = list(islice(records, chunk_size))
+            if not batch:
+                break
+            yield pd.DataFrame(batch)
+    
+    def iter_input_chunks(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """Yield (kind, DataFrame) chunks of at most chunk_size raw rows from every input file
+
+        kind is 'reddit_posts', 'reddit_comments' or 'nextdoor'. Files come in
+        the order the batch loaders concatenate them, so streamed output rows
+        are in the same order as batch output rows.
+        """
+        for shard in self.plan_shards():
+            for chunk in self.iter_shard_chunks(shard, chunk_size):
+                yield shard.kind, chunk
+    
     def clean_text(self, text: str) -> str:
         """Clean and normalize text"""
         if pd.isna(text) or not isinstance(text, str):
@@ -133,177 +651,458 @@ class DataProcessor:
             'exclamation_overuse': 0
         }
         
-        urgency_words = ['urgent', 'emergency', 'breaking', 'critical', 'immediate', 'now', 'quick']
-        conspiracy_words = ['conspiracy', 'cover-up', 'hidden', 'secret', 'they don\'t want you to know', 'wake up']
-        authority_challenge = ['government', 'authorities', 'mainstream media', 'official', 'establishment']
+        scan = self.keyword_matcher.scan(text)
         
-        text_lower = text.lower()
-        
-        # Count urgency words
-        for word in urgency_words:
-            indicators['urgency_words'] += text_lower.count(word)
-        
-        # Count conspiracy words
-        for word in conspiracy_words:
-            indicators['conspiracy_words'] += text_lower.count(word)
-        
-        # Count authority challenge words
-        for word in authority_challenge:
-            indicators['authority_challenge'] += text_lower.count(word)
+        # Count urgency, conspiracy and authority challenge words
+        indicators['urgency_words'] = scan.occurrences('urgency_words')
+        indicators['conspiracy_words'] = scan.occurrences('conspiracy_words')
+        indicators['authority_challenge'] = scan.occurrences('authority_challenge')
         
         # Check for excessive caps
-        if len(text) > 0:
-            caps_ratio = sum(1 for c in text if c.isupper()) / len(text)
-            indicators['excessive_caps'] = 1 if caps_ratio > 0.3 else 0
+        if scan.length > 0:
+            indicators['excessive_caps'] = 1 if scan.caps_ratio > 0.3 else 0
         
         # Check for excessive exclamation marks
-        exclamation_ratio = text.count('!') / len(text) if len(text) > 0 else 0
+        exclamation_ratio = scan.exclamations / scan.length if scan.length > 0 else 0
         indicators['exclamation_overuse'] = 1 if exclamation_ratio > 0.05 else 0
         
         return indicators
     
-    def process_reddit_data(self, posts_df: pd.DataFrame, comments_df: pd.DataFrame) -> pd.DataFrame:
-        """Process Reddit data for training"""
+    def clean_text_series(self, texts: pd.Series) -> pd.Series:
+        """clean_text over a whole column"""
+        # Object dtype keeps Python's re semantics for every .str call (the
+        # Arrow string dtype would use RE2, whose \s is ASCII only)
+        is_text = texts.map(lambda value: isinstance(value, str)).astype(bool)
+        cleaned = texts.astype(object).where(is_text, '')
+        
+        cleaned = cleaned.str.lower()
+        cleaned = cleaned.str.replace(self.url_pattern, '', regex=True)
+        cleaned = cleaned.str.replace(self.mention_pattern, '', regex=True)
+        cleaned = cleaned.str.replace(self.hashtag_pattern, '', regex=True)
+        cleaned = cleaned.str.replace(self.extra_whitespace, ' ', regex=True)
+        return cleaned.str.strip()
+    
+    def count_chars(self, texts: pd.Series, ascii_class: str, predicate) -> pd.Series:
+        """Characters per text matching a str predicate (isupper, isdigit)
+
+        ASCII texts are counted with a regex character class; the rest, where
+        the predicate also matches non-ASCII characters, one by one.
+        """
+        counts = texts.str.count(ascii_class)
+        non_ascii = ~texts.map(str.isascii).astype(bool)
+        if non_ascii.any():
+            counts[non_ascii] = texts[non_ascii].map(lambda text: sum(map(predicate, text)))
+        return counts
+    
+    def extract_features_frame(self, texts: pd.Series) -> pd.DataFrame:
+        """extract_features for a column of cleaned texts, one row per text"""
+        texts = texts.astype(object)
+        length = texts.str.len()
+        # Maximal non-whitespace runs are exactly the words of str.split(),
+        # and their total length is every non-whitespace character
+        word_count = texts.str.count(r'\S+')
+        word_chars = length - texts.str.count(r'\s')
+        has_words = word_count > 0
+        
+        return pd.DataFrame({
+            'length': length,
+            'word_count': word_count,
+            'avg_word_length': np.where(has_words, word_chars / word_count.where(has_words, 1), 0),
+            'exclamation_count': texts.str.count('!'),
+            'question_count': texts.str.count(r'\?'),
+            'caps_ratio': np.where(length > 0, self.count_chars(texts, '[A-Z]', str.isupper) / length.where(length > 0, 1), 0),
+            'digit_count': self.count_chars(texts, '[0-9]', str.isdigit),
+            'url_count': texts.str.count(self.url_pattern.pattern),
+            'mention_count': texts.str.count(self.mention_pattern.pattern),
+            'hashtag_count': texts.str.count(self.hashtag_pattern.pattern)
+        }, index=texts.index)
+    
+    def misinformation_indicators_frame(self, texts: pd.Series) -> pd.DataFrame:
+        """detect_misinformation_indicators for a column of texts, one row per text"""
+        texts = texts.astype(object)
+        lower = texts.str.lower()
+        indicators = {}
+        
+        # Keyword occurrences, counted like KeywordMatcher.scan: each keyword's
+        # non-overlapping matches, only in the texts that contain it
+        for family in ('urgency_words', 'conspiracy_words', 'authority_challenge'):
+            total = pd.Series(0, index=texts.index)
+            for keyword in self.keyword_matcher.families[family]:
+                found = lower.str.contains(keyword, regex=False).astype(bool)
+                if found.any():
+                    total[found] += lower[found].str.count(re.escape(keyword))
+            indicators[family] = total
+        
+        length = texts.str.len()
+        nonempty = length > 0
+        safe_length = length.where(nonempty, 1)
+        caps_ratio = self.count_chars(texts, '[A-Z]', str.isupper) / safe_length
+        exclamation_ratio = texts.str.count('!') / safe_length
+        indicators['excessive_caps'] = (nonempty & (caps_ratio > 0.3)).astype(int)
+        indicators['exclamation_overuse'] = (nonempty & (exclamation_ratio > 0.05)).astype(int)
+        
+        return pd.DataFrame(indicators, index=texts.index)
+    
+    def text_columns(self, cleaned_content: str) -> Dict[str, Any]:
+        """Feature and misinformation indicator columns of a processed row"""
+        features = self.extract_features(cleaned_content)
+        misinformation_indicators = self.detect_misinformation_indicators(cleaned_content)
+        
+        return {
+            'length': features['length'],
+            'word_count': features['word_count'],
+            'avg_word_length': features['avg_word_length'],
+            'exclamation_count': features['exclamation_count'],
+            'question_count': features['question_count'],
+            'caps_ratio': features['caps_ratio'],
+            'urgency_words': misinformation_indicators['urgency_words'],
+            'conspiracy_words': misinformation_indicators['conspiracy_words'],
+            'authority_challenge': misinformation_indicators['authority_challenge'],
+            'excessive_caps': misinformation_indicators['excessive_caps'],
+            'exclamation_overuse': misinformation_indicators['exclamation_overuse']
+        }
+    
+    def reddit_post_record(self, post: pd.Series) -> Optional[Dict[str, Any]]:
+        """Processed row for a Reddit post, or None if it is skipped"""
+        if pd.isna(post.get('content', '')) or not post.get('content'):
+            return None
+        
+        cleaned_content = self.clean_text(post['content'])
+        if len(cleaned_content) < 10:  # Skip very short posts
+            return None
+        
+        # Determine sentiment based on score
+        score = post.get('score', 0)
+        if score > 10:
+            sentiment = 'positive'
+        elif score < -5:
+            sentiment = 'negative'
+        else:
+            sentiment = 'neutral'
+        
+        return {
+            'content': cleaned_content,
+            'original_content': post.get('content', ''),
+            'author': post.get('author', 'Anonymous'),
+            'category': 'reddit_post',
+            'sentiment': sentiment,
+            'timestamp': post.get('created_utc', ''),
+            'score': score,
+            'upvote_ratio': post.get('upvote_ratio', 0),
+            'num_comments': post.get('num_comments', 0),
+            'subreddit': post.get('subreddit', ''),
+            'url': post.get('url', ''),
+            **self.text_columns(cleaned_content),
+            'source': 'reddit'
+        }
+    
+    def reddit_comment_record(self, comment: pd.Series) -> Optional[Dict[str, Any]]:
+        """Processed row for a Reddit comment, or None if it is skipped"""
+        if pd.isna(comment.get('content', '')) or not comment.get('content'):
+            return None
+        
+        cleaned_content = self.clean_text(comment['content'])
+        if len(cleaned_content) < 5:  # Skip very short comments
+            return None
+        
+        # Determine sentiment based on score
+        score = comment.get('score', 0)
+        if score > 5:
+            sentiment = 'positive'
+        elif score < -2:
+            sentiment = 'negative'
+        else:
+            sentiment = 'neutral'
+        
+        return {
+            'content': cleaned_content,
+            'original_content': comment.get('content', ''),
+            'author': comment.get('author', 'Anonymous'),
+            'category': 'reddit_comment',
+            'sentiment': sentiment,
+            'timestamp': comment.get('created_utc', ''),
+            'score': score,
+            'upvote_ratio': 0,
+            'num_comments': 0,
+            'subreddit': '',
+            'url': '',
+            **self.text_columns(cleaned_content),
+            'source': 'reddit'
+        }
+    
+    def nextdoor_record(self, post: pd.Series) -> Optional[Dict[str, Any]]:
+        """Processed row for a NextDoor post, or None if it is skipped"""
+        if pd.isna(post.get('content', '')) or not post.get('content'):
+            return None
+        
+        cleaned_content = self.clean_text(post['content'])
+        if len(cleaned_content) < 10:
+            return None
+        
+        return {
+            'content': cleaned_content,
+            'original_content': post.get('content', ''),
+            'author': post.get('author', 'Anonymous'),
+            'category': post.get('category', 'general'),
+            'sentiment': post.get('sentiment', 'neutral'),
+            'timestamp': post.get('timestamp', ''),
+            'score': post.get('likes', 0),
+            'upvote_ratio': 0,
+            'num_comments': post.get('comments', 0),
+            'subreddit': '',
+            'url': '',
+            **self.text_columns(cleaned_content),
+            'source': 'nextdoor'
+        }
+    
+    def process_rows(self, df: pd.DataFrame, record) -> List[Dict[str, Any]]:
+        """Apply a *_record method to every row, dropping the skipped ones"""
         processed_data = []
+        for _, row in df.iterrows():
+            processed = record(row)
+            if processed is not None:
+                processed_data.append(processed)
+        return processed_data
+    
+    def process_frame(self, kind: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Column-wise equivalent of process_rows(df, <kind> record method)
+
+        Same rows, columns and values as the per-row path, computed with
+        pandas string methods and NumPy over the whole chunk.
+        """
+        if df.empty or 'content' not in df.columns:
+            return pd.DataFrame()
         
-        # Process posts
-        for _, post in posts_df.iterrows():
-            if pd.isna(post.get('content', '')) or not post.get('content'):
-                continue
-            
-            cleaned_content = self.clean_text(post['content'])
-            if len(cleaned_content) < 10:  # Skip very short posts
-                continue
-            
-            features = self.extract_features(cleaned_content)
-            misinformation_indicators = self.detect_misinformation_indicators(cleaned_content)
-            
-            # Determine sentiment based on score
-            score = post.get('score', 0)
-            if score > 10:
-                sentiment = 'positive'
-            elif score < -5:
-                sentiment = 'negative'
-            else:
-                sentiment = 'neutral'
-            
-            processed_data.append({
-                'content': cleaned_content,
-                'original_content': post.get('content', ''),
-                'author': post.get('author', 'Anonymous'),
-                'category': 'reddit_post',
-                'sentiment': sentiment,
-                'timestamp': post.get('created_utc', ''),
-                'score': score,
-                'upvote_ratio': post.get('upvote_ratio', 0),
-                'num_comments': post.get('num_comments', 0),
-                'subreddit': post.get('subreddit', ''),
-                'url': post.get('url', ''),
-                'length': features['length'],
-                'word_count': features['word_count'],
-                'avg_word_length': features['avg_word_length'],
-                'exclamation_count': features['exclamation_count'],
-                'question_count': features['question_count'],
-                'caps_ratio': features['caps_ratio'],
-                'urgency_words': misinformation_indicators['urgency_words'],
-                'conspiracy_words': misinformation_indicators['conspiracy_words'],
-                'authority_challenge': misinformation_indicators['authority_challenge'],
-                'excessive_caps': misinformation_indicators['excessive_caps'],
-                'exclamation_overuse': misinformation_indicators['exclamation_overuse'],
-                'source': 'reddit'
-            })
-        
-        # Process comments
-        for _, comment in comments_df.iterrows():
-            if pd.isna(comment.get('content', '')) or not comment.get('content'):
-                continue
-            
-            cleaned_content = self.clean_text(comment['content'])
-            if len(cleaned_content) < 5:  # Skip very short comments
-                continue
-            
-            features = self.extract_features(cleaned_content)
-            misinformation_indicators = self.detect_misinformation_indicators(cleaned_content)
-            
-            # Determine sentiment based on score
-            score = comment.get('score', 0)
-            if score > 5:
-                sentiment = 'positive'
-            elif score < -2:
-                sentiment = 'negative'
-            else:
-                sentiment = 'neutral'
-            
-            processed_data.append({
-                'content': cleaned_content,
-                'original_content': comment.get('content', ''),
-                'author': comment.get('author', 'Anonymous'),
-                'category': 'reddit_comment',
-                'sentiment': sentiment,
-                'timestamp': comment.get('created_utc', ''),
-                'score': score,
+        # Missing, non-text and empty content all clean to '', so the length
+        # check also drops what the record methods skip up front
+        cleaned = self.clean_text_series(df['content'])
+        keep = cleaned.str.len() >= (5 if kind == 'reddit_comments' else 10)
+        if not keep.any():
+            return pd.DataFrame()
+        rows = df[keep]
+        cleaned = cleaned[keep]
+        
+        def column(name, default):
+            # Series.get semantics: the column if it exists, else the default
+            return rows[name] if name in rows.columns else default
+        
+        if kind == 'nextdoor':
+            columns = {
+                'content': cleaned,
+                'original_content': column('content', ''),
+                'author': column('author', 'Anonymous'),
+                'category': column('category', 'general'),
+                'sentiment': column('sentiment', 'neutral'),
+                'timestamp': column('timestamp', ''),
+                'score': column('likes', 0),
                 'upvote_ratio': 0,
-                'num_comments': 0,
+                'num_comments': column('comments', 0),
                 'subreddit': '',
-                'url': '',
-                'length': features['length'],
-                'word_count': features['word_count'],
-                'avg_word_length': features['avg_word_length'],
-                'exclamation_count': features['exclamation_count'],
-                'question_count': features['question_count'],
-                'caps_ratio': features['caps_ratio'],
-                'urgency_words': misinformation_indicators['urgency_words'],
-                'conspiracy_words': misinformation_indicators['conspiracy_words'],
-                'authority_challenge': misinformation_indicators['authority_challenge'],
-                'excessive_caps': misinformation_indicators['excessive_caps'],
-                'exclamation_overuse': misinformation_indicators['exclamation_overuse'],
-                'source': 'reddit'
-            })
+                'url': ''
+            }
+        else:
+            posts = kind == 'reddit_posts'
+            score = column('score', 0)
+            positive, negative = (10, -5) if posts else (5, -2)
+            sentiment = np.select([score > positive, score < negative], ['positive', 'negative'], 'neutral')
+            columns = {
+                'content': cleaned,
+                'original_content': column('content', ''),
+                'author': column('author', 'Anonymous'),
+                'category': 'reddit_post' if posts else 'reddit_comment',
+                'sentiment': pd.Series(sentiment, index=rows.index),
+                'timestamp': column('created_utc', ''),
+                'score': score,
+                'upvote_ratio': column('upvote_ratio', 0) if posts else 0,
+                'num_comments': column('num_comments', 0) if posts else 0,
+                'subreddit': column('subreddit', '') if posts else '',
+                'url': column('url', '') if posts else ''
+            }
+        
+        features = self.extract_features_frame(cleaned)
+        indicators = self.misinformation_indicators_frame(cleaned)
+        for name in ('length', 'word_count', 'avg_word_length', 'exclamation_count', 'question_count', 'caps_ratio'):
+            columns[name] = features[name]
+        for name in indicators.columns:
+            columns[name] = indicators[name]
+        columns['source'] = 'nextdoor' if kind == 'nextdoor' else 'reddit'
         
+        # Types inferred per column, as for the per-row DataFrame of dicts
+        # (object columns of text become the string dtype)
+        columns = {name: values.infer_objects() if isinstance(values, pd.Series) else values
+                   for name, values in columns.items()}
+        return pd.DataFrame(columns).reset_index(drop=True)
+    
+    def process_reddit_data(self, posts_df: pd.DataFrame, comments_df: pd.DataFrame) -> pd.DataFrame:
+        """Process Reddit data for training"""
+        if self.vectorized:
+            frames = [self.process_frame('reddit_posts', posts_df), self.process_frame('reddit_comments', comments_df)]
+            frames = [frame for frame in frames if not frame.empty]
+            return self.combine_data(frames) if frames else pd.DataFrame()
+        processed_data = self.process_rows(posts_df, self.reddit_post_record)
+        processed_data.extend(self.process_rows(comments_df, self.reddit_comment_record))
         return pd.DataFrame(processed_data)
     
     def process_nextdoor_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Process NextDoor data for training"""
-        processed_data = []
+        if self.vectorized:
+            return self.process_frame('nextdoor', df)
+        return pd.DataFrame(self.process_rows(df, self.nextdoor_record))
+    
+    def process_chunk(self, kind: str, chunk: pd.DataFrame, owner: Optional[str] = None) -> pd.DataFrame:
+        """Process one chunk from iter_input_chunks; `owner` is its input file, for deduplication"""
+        if self.vectorized:
+            processed = self.process_frame(kind, chunk)
+        else:
+            record = {
+                'reddit_posts': self.reddit_post_record,
+                'reddit_comments': self.reddit_comment_record,
+                'nextdoor': self.nextdoor_record
+            }[kind]
+            processed = pd.DataFrame(self.process_rows(chunk, record))
+        if not processed.empty:
+            # Same column types as the combined batch dataset
+            processed[FLOAT_COLUMNS] = processed[FLOAT_COLUMNS].astype(float)
+        return self.deduplicate(processed, owner)
+    
+    def deduplicate(self, df: pd.DataFrame, owner: Optional[str] = None) -> pd.DataFrame:
+        """Processed rows whose content is not a duplicate of content seen before, with dedup on"""
+        if self.deduplicator is None or df.empty:
+            return df
+        keep = self.deduplicator.filter(df['content'], owner)
+        return df[keep].reset_index(drop=True)
+    
+    def iter_processed_chunks(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """Load, clean and extract features chunk by chunk, yielding processed chunks"""
+        for kind, chunk in self.iter_input_chunks(chunk_size):
+            processed = self.process_chunk(kind, chunk)
+            if not processed.empty:
+                yield processed
+    
+    def write_chunks(self, chunks: Iterator[pd.DataFrame], processed_path: str,
+                     training_path: str) -> AnalysisAccumulator:
+        """Append processed chunks to a processed and a training file, returning their analysis"""
+        analysis = AnalysisAccumulator()
+        with dataset_writer(processed_path, PROCESSED_TYPES) as write_processed, \
+                dataset_writer(training_path, TRAINING_TYPES) as write_training:
+            for chunk in chunks:
+                write_processed(chunk)
+                write_training(self.training_data(chunk))
+                analysis.update(chunk)
+        return analysis
+    
+    def combine_data(self, frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """Concatenate processed frames into one dataset"""
+        return pd.concat(frames, ignore_index=True)
+    
+    def process_streaming(self, timestamp: str, chunk_size: int = STREAM_CHUNK_SIZE,
+                          output_format: str = 'csv') -> Tuple[AnalysisAccumulator, str, str]:
+        """Process every input file in bounded chunks, appending to the output files
+
+        Writes processed_data_<timestamp>.<format> and
+        training_dataset_<timestamp>.<format> a chunk at a time, and
+        accumulates the analysis as it goes, so memory stays flat however
+        large the corpus is. Returns the analysis and the two file paths.
+        """
+        processed_path = os.path.join(self.processed_dir, f"processed_data_{timestamp}.{output_format}")
+        training_path = os.path.join(self.processed_dir, f"training_dataset_{timestamp}.{output_format}")
+        analysis = self.write_chunks(self.iter_processed_chunks(chunk_size), processed_path, training_path)
+        return analysis, processed_path, training_path
+    
+    def process_parallel(self, timestamp: str, workers: int, chunk_size: int = STREAM_CHUNK_SIZE,
+                         output_format: str = 'csv') -> Tuple[AnalysisAccumulator, str, str]:
+        """Process the input shards on a pool of worker processes
+
+        Each shard is streamed by one worker into its own part-NNNNN.<format> under
+        processed_data_<timestamp>/ and training_dataset_<timestamp>/; the
+        parts, in name order, hold the rows of the streaming outputs in the
+        same order. The workers' analyses are merged, so no output is read
+        back. Returns the analysis and the two part directories.
+        """
+        if self.deduplicator is not None:
+            raise ValueError("Deduplication keeps one index in one process; it cannot run with workers")
+        processed_dir = os.path.join(self.processed_dir, f"processed_data_{timestamp}")
+        training_dir = os.path.join(self.processed_dir, f"training_dataset_{timestamp}")
+        os.makedirs(processed_dir, exist_ok=True)
+        os.makedirs(training_dir, exist_ok=True)
         
-        for _, post in df.iterrows():
-            if pd.isna(post.get('content', '')) or not post.get('content'):
-                continue
-            
-            cleaned_content = self.clean_text(post['content'])
-            if len(cleaned_content) < 10:
-                continue
-            
-            features = self.extract_features(cleaned_content)
-            misinformation_indicators = self.detect_misinformation_indicators(cleaned_content)
-            
-            processed_data.append({
-                'content': cleaned_content,
-                'original_content': post.get('content', ''),
-                'author': post.get('author', 'Anonymous'),
-                'category': post.get('category', 'general'),
-                'sentiment': post.get('sentiment', 'neutral'),
-                'timestamp': post.get('timestamp', ''),
-                'score': post.get('likes', 0),
-                'upvote_ratio': 0,
-                'num_comments': post.get('comments', 0),
-                'subreddit': '',
-                'url': '',
-                'length': features['length'],
-                'word_count': features['word_count'],
-                'avg_word_length': features['avg_word_length'],
-                'exclamation_count': features['exclamation_count'],
-                'question_count': features['question_count'],
-                'caps_ratio': features['caps_ratio'],
-                'urgency_words': misinformation_indicators['urgency_words'],
-                'conspiracy_words': misinformation_indicators['conspiracy_words'],
-                'authority_challenge': misinformation_indicators['authority_challenge'],
-                'excessive_caps': misinformation_indicators['excessive_caps'],
-                'exclamation_overuse': misinformation_indicators['exclamation_overuse'],
-                'source': 'nextdoor'
-            })
+        whole_files = self.plan_shards()
+        input_bytes = sum(shard.size for shard in whole_files)
+        shards = self.plan_shards(max(MIN_SHARD_BYTES, input_bytes // (workers * SHARDS_PER_WORKER)))
+        tasks = [
+            (shard, os.path.join(processed_dir, f"part-{index:05d}.{output_format}"),
+             os.path.join(training_dir, f"part-{index:05d}.{output_format}"), chunk_size, self.vectorized, None)
+            for index, shard in enumerate(shards)
+        ]
         
-        return pd.DataFrame(processed_data)
+        analysis = AnalysisAccumulator()
+        for shard_analysis, _ in run_shard_tasks(tasks, workers):
+            analysis.merge(shard_analysis)
+        return analysis, processed_dir, training_dir
+    
+    def process_incremental(self, chunk_size: int = STREAM_CHUNK_SIZE, output_format: str = 'csv',
+                            workers: Optional[int] = None) -> Tuple[ProcessedStore, Dict[str, List[str]]]:
+        """Bring the processed store up to date with the input files
+
+        Only new and changed input files are read and processed (on a pool
+        of `workers` processes if given); their parts are added to the store
+        and the parts of changed and deleted files are removed. The store's
+        analysis is the merged per-file totals, so unchanged files are never
+        re-read. Returns the store and the paths that were added, changed
+        and removed.
+        
+        With dedup on, the Deduplicator index is kept in the store, so posts
+        are also dropped as duplicates of posts from earlier runs. Content
+        of changed and deleted files is taken out of the index first.
+        """
+        dedup = self.deduplicator is not None
+        if dedup and workers:
+            raise ValueError("Deduplication keeps one index in one process; it cannot run with workers")
+        store = ProcessedStore(os.path.join(self.processed_dir, STORE_DIR), output_format, dedup)
+        whole_files = self.plan_shards()
+        changed, removed = store.changes([shard.path for shard in whole_files])
+        
+        if dedup:
+            self.deduplicator = Deduplicator.load(store.dedup_index_path)
+            # Added files too: an interrupted run may have indexed them already
+            for filepath in list(changed) + removed:
+                self.deduplicator.remove_owner(filepath)
+        
+        shards = [shard for shard in whole_files if shard.path in changed]
+        if workers:
+            input_bytes = sum(shard.size for shard in shards)
+            shard_bytes = max(MIN_SHARD_BYTES, input_bytes // (workers * SHARDS_PER_WORKER))
+            shards = [shard for shard in self.plan_shards(shard_bytes) if shard.path in changed]
+        parts = store.allocate_parts(len(shards))
+        tasks = [(shard, processed_path, training_path, chunk_size, self.vectorized, self.deduplicator)
+                 for shard, (_, processed_path, training_path) in zip(shards, parts)]
+        results = run_shard_tasks(tasks, workers)
+        
+        summary = {'added': [], 'changed': [], 'removed': removed}
+        superseded = []
+        for filepath, fingerprint in changed.items():
+            summary['changed' if filepath in store.files else 'added'].append(filepath)
+            analysis = AnalysisAccumulator()
+            input_rows = 0
+            file_parts = []
+            for shard, (name, _, _), (shard_analysis, shard_rows) in zip(shards, parts, results):
+                if shard.path == filepath:
+                    analysis.merge(shard_analysis)
+                    input_rows += shard_rows
+                    if shard_analysis.total_posts:
+                        file_parts.append(name)
+            kind = next(shard.kind for shard in shards if shard.path == filepath)
+            superseded.extend(store.record(filepath, kind, fingerprint, input_rows, file_parts, analysis))
+        for filepath in removed:
+            superseded.extend(store.forget(filepath))
+        
+        # The manifest goes first: a crash after it leaves stale parts that
+        # the next run removes as orphans, never a manifest naming lost parts
+        if dedup:
+            self.deduplicator.save(store.dedup_index_path)
+        store.save()
+        store.delete_parts(superseded)
+        return store, summary
     
     def analyze_data(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Analyze the processed data"""
@@ -380,13 +1179,17 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         print(f"Analysis report saved to {output_file}")
     
     def save_processed_data(self, df: pd.DataFrame, filename: str):
-        """Save processed data to CSV"""
+        """Save processed data to CSV, or to Parquet if filename ends in .parquet"""
         filepath = os.path.join(self.processed_dir, filename)
-        df.to_csv(filepath, index=False, encoding='utf-8')
+        if filepath.endswith('.parquet'):
+            with dataset_writer(filepath, PROCESSED_TYPES) as write:
+                write(df)
+        else:
+            df.to_csv(filepath, index=False, encoding='utf-8')
         print(f"Processed data saved to {filepath}")
     
-    def create_training_dataset(self, df: pd.DataFrame, output_file: str):
-        """Create a training dataset for the CommunityPulse models"""
+    def training_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Training columns of processed rows, with the misinformation label"""
         # Select relevant columns for training
         training_data = df[['content', 'sentiment', 'category', 'urgency_words', 
                            'conspiracy_words', 'authority_challenge', 'excessive_caps', 
@@ -401,15 +1204,174 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             (training_data['exclamation_overuse'] > 0)
         ).astype(int)
         
+        return training_data
+    
+    def create_training_dataset(self, df: pd.DataFrame, output_file: str):
+        """Create a training dataset for the CommunityPulse models"""
+        training_data = self.training_data(df)
+        
         # Save training dataset
         filepath = os.path.join(self.processed_dir, output_file)
-        training_data.to_csv(filepath, index=False, encoding='utf-8')
+        if filepath.endswith('.parquet'):
+            with dataset_writer(filepath, TRAINING_TYPES) as write:
+                write(training_data)
+        else:
+            training_data.to_csv(filepath, index=False, encoding='utf-8')
         print(f"Training dataset saved to {filepath}")
         
         return training_data
 
+def process_shard(task: Tuple[Shard, str, str, int, bool, Optional[Deduplicator]]) -> Tuple[AnalysisAccumulator, int]:
+    """Stream one shard into its part files; returns their analysis and the shard's input row count
+
+    A Deduplicator is only passed for inline runs, never to pool workers.
+    """
+    shard, processed_path, training_path, chunk_size, vectorized, deduplicator = task
+    processor = DataProcessor(vectorized)
+    processor.deduplicator = deduplicator
+    input_rows = 0
+    
+    def processed_chunks():
+        nonlocal input_rows
+        for chunk in processor.iter_shard_chunks(shard, chunk_size):
+            input_rows += len(chunk)
+            processed = processor.process_chunk(shard.kind, chunk, shard.path)
+            if not processed.empty:
+                yield processed
+    
+    analysis = processor.write_chunks(processed_chunks(), processed_path, training_path)
+    if analysis.total_posts == 0:
+        # No part files for shards whose rows were all filtered out
+        os.remove(processed_path)
+        os.remove(training_path)
+    return analysis, input_rows
+
+def run_shard_tasks(tasks: List[Tuple[Shard, str, str, int, bool, Optional[Deduplicator]]],
+                    workers: Optional[int]) -> List[Tuple[AnalysisAccumulator, int]]:
+    """process_shard for every task, on a pool of `workers` processes or inline without one
+
+    Results are in task order.
+    """
+    if not workers or not tasks:
+        return [process_shard(task) for task in tasks]
+    
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)),
+                             mp_context=multiprocessing.get_context(START_METHOD)) as executor:
+        # Largest shards first so the pool drains evenly
+        futures = {}
+        for index in sorted(range(len(tasks)), key=lambda index: -tasks[index][0].size):
+            futures[index] = executor.submit(process_shard, tasks[index])
+        return [futures[index].result() for index in range(len(tasks))]
+
+def print_duplicates(processor: DataProcessor):
+    """Print how many duplicate posts this run dropped, with dedup on"""
+    deduplicator = processor.deduplicator
+    if deduplicator is not None:
+        print(f"  Duplicates dropped: {deduplicator.exact_dropped:,} exact, "
+              f"{deduplicator.near_dropped:,} near-duplicate")
+
+def run_streaming(processor: DataProcessor, chunk_size: int, output_format: str = 'csv') -> bool:
+    """Process every input file in chunks of chunk_size rows and write the outputs"""
+    print(f"🚀 Streaming community data in chunks of {chunk_size:,} rows...")
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    analysis, processed_path, training_path = processor.process_streaming(timestamp, chunk_size, output_format)
+    if analysis.total_posts == 0:
+        os.remove(processed_path)
+        os.remove(training_path)
+        print("❌ No data found to process!")
+        return False
+    
+    report_file = f"data/analysis/analysis_report_{timestamp}.md"
+    processor.generate_analysis_report(analysis.result(), report_file)
+    
+    print(f"\n🎉 Data processing complete!")
+    print(f"  Total processed posts: {analysis.total_posts:,}")
+    print_duplicates(processor)
+    print(f"  Processed data: {processed_path}")
+    print(f"  Training dataset: {training_path}")
+    print(f"  Analysis report: {report_file}")
+    return True
+
+def run_incremental(processor: DataProcessor, chunk_size: int, output_format: str = 'csv',
+                    workers: Optional[int] = None) -> bool:
+    """Process new and changed input files into the processed store and report on all of it"""
+    print("🚀 Updating the processed store with new and changed input files...")
+    
+    store, summary = processor.process_incremental(chunk_size, output_format, workers)
+    for change in ('added', 'changed', 'removed'):
+        print(f"  {change.capitalize()}: {len(summary[change])} files")
+    print(f"  Unchanged: {len(store.files) - len(summary['added']) - len(summary['changed'])} files")
+    
+    analysis = store.analysis()
+    if analysis.total_posts == 0:
+        print("❌ No data found to process!")
+        return False
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_file = f"data/analysis/analysis_report_{timestamp}.md"
+    processor.generate_analysis_report(analysis.result(), report_file)
+    
+    print(f"\n🎉 Data processing complete!")
+    print(f"  Total processed posts: {analysis.total_posts:,}")
+    print_duplicates(processor)
+    print(f"  Processed data parts: {store.processed_dir}")
+    print(f"  Training dataset parts: {store.training_dir}")
+    print(f"  Analysis report: {report_file}")
+    return True
+
+def run_parallel(processor: DataProcessor, workers: int, chunk_size: int, output_format: str = 'csv') -> bool:
+    """Process the input shards on `workers` processes and write the part files"""
+    print(f"🚀 Processing community data on {workers} worker processes...")
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    analysis, processed_dir, training_dir = processor.process_parallel(timestamp, workers, chunk_size, output_format)
+    if analysis.total_posts == 0:
+        shutil.rmtree(processed_dir)
+        shutil.rmtree(training_dir)
+        print("❌ No data found to process!")
+        return False
+    
+    report_file = f"data/analysis/analysis_report_{timestamp}.md"
+    processor.generate_analysis_report(analysis.result(), report_file)
+    
+    print(f"\n🎉 Data processing complete!")
+    print(f"  Total processed posts: {analysis.total_posts:,}")
+    print(f"  Processed data parts: {processed_dir}")
+    print(f"  Training dataset parts: {training_dir}")
+    print(f"  Analysis report: {report_file}")
+    return True
+
 def main():
-    processor = DataProcessor()
+    parser = argparse.ArgumentParser(description='Process collected community data')
+    parser.add_argument('--stream', action='store_true',
+                        help='Process in bounded chunks with constant memory, appending to the outputs')
+    parser.add_argument('--chunk-size', type=int, default=STREAM_CHUNK_SIZE, help='Rows per chunk with --stream or --workers')
+    parser.add_argument('--workers', type=int,
+                        help='Process input shards on this many processes, writing one part file per shard')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv',
+                        help='Output file format; parquet is typed, dictionary encoded and compressed')
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'Only process new or changed input files, updating data/processed/{STORE_DIR}')
+    parser.add_argument('--dedup', action='store_true',
+                        help='Drop exact and near-duplicate posts (kept across runs with --incremental)')
+    args = parser.parse_args()
+    if args.dedup and args.workers:
+        parser.error('--dedup cannot be combined with --workers')
+    
+    processor = DataProcessor(dedup=args.dedup)
+    
+    if args.incremental:
+        run_incremental(processor, args.chunk_size, args.format, args.workers)
+        return
+    
+    if args.workers:
+        run_parallel(processor, args.workers, args.chunk_size, args.format)
+        return
+    
+    if args.stream:
+        run_streaming(processor, args.chunk_size, args.format)
+        return
     
     print("🚀 Processing community data...")
     
@@ -442,8 +1404,9 @@ def main():
         print("❌ No data found to process!")
         return
     
-    combined_df = pd.concat(all_data, ignore_index=True)
+    combined_df = processor.deduplicate(processor.combine_data(all_data))
     print(f"\n✅ Combined dataset: {len(combined_df)} total posts")
+    print_duplicates(processor)
     
     # Analyze data
     print("\n📈 Analyzing data...")
@@ -455,10 +1418,10 @@ def main():
     processor.generate_analysis_report(analysis, report_file)
     
     # Save processed data
-    processor.save_processed_data(combined_df, f"processed_data_{timestamp}.csv")
+    processor.save_processed_data(combined_df, f"processed_data_{timestamp}.{args.format}")
     
     # Create training dataset
-    training_data = processor.create_training_dataset(combined_df, f"training_dataset_{timestamp}.csv")
+    training_data = processor.create_training_dataset(combined_df, f"training_dataset_{timestamp}.{args.format}")
     
     print(f"\n🎉 Data processing complete!")
     print(f"  Total processed posts: {len(combined_df):,}")
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Content Deduplication for CommunityPulse
+Drops exact duplicates by a hash of normalized content, and near-duplicates
+(generated posts from the same template, lightly edited reposts) by MinHash
+signatures over character shingles, bucketed with locality-sensitive hashing
+so each post is only compared with the few posts that share a band.
+"""
+
+import hashlib
+import os
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Posts at or above this estimated Jaccard similarity are near-duplicates
+DEDUP_THRESHOLD = 0.8
+
+# 64 MinHash values in 8 bands of 8: a pair with Jaccard similarity s shares
+# at least one band with probability 1 - (1 - s^8)^8, about 0.98 at 0.8 and
+# 0.02 at 0.3, so true near-duplicates are almost always compared
+NUM_PERM = 64
+BANDS = 8
+
+# Characters per shingle; posts are short, so word shingles would be too few
+SHINGLE_SIZE = 5
+
+# Shingles hashed per block, which bounds the temporary arrays to ~16 MB
+SHINGLE_BATCH = 1 << 18
+
+PUNCTUATION = re.compile(r'[^\w\s]')
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize(text: str) -> str:
+    """Lowercase, without punctuation, single-spaced"""
+    return WHITESPACE.sub(' ', PUNCTUATION.sub('', text.lower())).strip()
+
+
+def digest(normalized: str) -> int:
+    """64-bit hash of normalized content, for exact duplicates"""
+    return int.from_bytes(hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class Deduplicator:
+    """Exact and near-duplicate filter with an index of everything kept so far
+
+    Every kept post and its exact hash are recorded under an owner (the
+    input file it came from), so an input that is reprocessed or deleted can
+    be taken out of the index with remove_owner. save() and load() persist
+    the index between runs.
+    """
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, num_perm: int = NUM_PERM,
+                 bands: int = BANDS, shingle_size: int = SHINGLE_SIZE, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+
+        # Multiply-shift hashing: (a * x + b) >> 32 with odd a, one pair per permutation
+        rng = np.random.default_rng(seed)
+        self.mult = rng.integers(1, 1 << 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.offset = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+        self.powers = np.array([pow(1099511628211, shingle_size - 1 - i, 1 << 64) for i in range(shingle_size)],
+                               dtype=np.uint64)
+
+        self.owners: List[str] = []
+        self.owner_ids: Dict[str, int] = {}
+        self.exact: Dict[int, int] = {}
+        self.signatures: List[np.ndarray] = []
+        self.signature_owners: List[int] = []
+        self.buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+
+        # Posts dropped, and signatures compared, since construction or load
+        self.exact_dropped = 0
+        self.near_dropped = 0
+        self.comparisons = 0
+
+    def owner_id(self, owner: Optional[str]) -> int:
+        owner = owner or ''
+        if owner not in self.owner_ids:
+            self.owner_ids[owner] = len(self.owners)
+            self.owners.append(owner)
+        return self.owner_ids[owner]
+
+    def minhash(self, texts: List[str]) -> np.ndarray:
+        """MinHash signatures (len(texts) x num_perm, uint32) of normalized texts
+
+        Shingles of every text in a batch are hashed together: a rolling
+        polynomial hash over one concatenated byte array, then each
+        permutation's minimum per text with np.minimum.reduceat. Permutations
+        are applied one at a time in place, which keeps the temporary arrays
+        small and contiguous.
+        """
+        k = self.shingle_size
+        # Texts shorter than a shingle are padded to make one
+        encoded = [text.encode('utf-8').ljust(k, b'\0') for text in texts]
+        result = np.empty((len(encoded), self.num_perm), dtype=np.uint32)
+
+        start = 0
+        while start < len(encoded):
+            # A batch of texts with at most SHINGLE_BATCH shingles (or one long text)
+            stop, shingles = start, 0
+            while stop < len(encoded) and (stop == start or shingles + len(encoded[stop]) <= SHINGLE_BATCH):
+                shingles += len(encoded[stop]) - k + 1
+                stop += 1
+            batch = encoded[start:stop]
+
+            lengths = np.fromiter(map(len, batch), dtype=np.int64, count=len(batch))
+            counts = lengths - k + 1
+            text_starts = np.cumsum(lengths) - lengths
+            shingle_starts = np.cumsum(counts) - counts
+            # Byte offset of every shingle that lies within a single text
+            positions = (np.arange(counts.sum()) - np.repeat(shingle_starts, counts)
+                         + np.repeat(text_starts, counts))
+            windows = sliding_window_view(np.frombuffer(b''.join(batch), dtype=np.uint8), k)[positions]
+            hashes = windows.astype(np.uint64) @ self.powers
+
+            values = np.empty_like(hashes)
+            for perm in range(self.num_perm):
+                np.multiply(hashes, self.mult[perm], out=values)
+                np.add(values, self.offset[perm], out=values)
+                np.right_shift(values, np.uint64(32), out=values)
+                result[start:stop, perm] = np.minimum.reduceat(values, shingle_starts)
+            start = stop
+        return result
+
+    def band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def add(self, signature: np.ndarray, owner: int):
+        index = len(self.signatures)
+        self.signatures.append(signature)
+        self.signature_owners.append(owner)
+        for key in self.band_keys(signature):
+            self.buckets[key].append(index)
+
+    def filter(self, texts: Iterable[str], owner: Optional[str] = None) -> np.ndarray:
+        """Boolean mask of the texts to keep; kept texts join the index
+
+        A text is dropped if its normalized content was seen before, or if
+        its estimated Jaccard similarity to a kept text (earlier in `texts`
+        or from an earlier call) reaches the threshold.
+        """
+        texts = [normalize(text) for text in texts]
+        owner = self.owner_id(owner)
+        keep = np.zeros(len(texts), dtype=bool)
+
+        candidates = []
+        for index, text in enumerate(texts):
+            text_digest = digest(text)
+            if text_digest in self.exact:
+                self.exact_dropped += 1
+                continue
+            self.exact[text_digest] = owner
+            candidates.append(index)
+
+        signatures = self.minhash([texts[index] for index in candidates])
+        for index, signature in zip(candidates, signatures):
+            similar = {match for key in self.band_keys(signature) for match in self.buckets.get(key, ())}
+            if similar:
+                self.comparisons += len(similar)
+                matches = np.stack([self.signatures[match] for match in similar])
+                if (matches == signature).mean(axis=1).max() >= self.threshold:
+                    self.near_dropped += 1
+                    continue
+            self.add(signature, owner)
+            keep[index] = True
+        return keep
+
+    def remove_owner(self, owner: str):
+        """Forget the content recorded under `owner`, so it no longer causes drops"""
+        owner = self.owner_ids.get(owner)
+        if owner is None:
+            return
+        self.exact = {digest: holder for digest, holder in self.exact.items() if holder != owner}
+        kept = [(signature, holder) for signature, holder in zip(self.signatures, self.signature_owners)
+                if holder != owner]
+        self.signatures, self.signature_owners = [], []
+        self.buckets = defaultdict(list)
+        for signature, holder in kept:
+            self.add(signature, holder)
+
+    def params(self) -> np.ndarray:
+        return np.array([self.threshold, self.num_perm, self.bands, self.shingle_size, self.seed])
+
+    def save(self, path: str):
+        """Write the index to an .npz file, atomically"""
+        temporary = path + '.tmp.npz'
+        np.savez(
+            temporary,
+            params=self.params(),
+            owners=np.array(self.owners, dtype=str),
+            exact_digests=np.fromiter(self.exact.keys(), dtype=np.uint64, count=len(self.exact)),
+            exact_owners=np.fromiter(self.exact.values(), dtype=np.int64, count=len(self.exact)),
+            signatures=(np.stack(self.signatures) if self.signatures
+                        else np.empty((0, self.num_perm), dtype=np.uint32)),
+            signature_owners=np.array(self.signature_owners, dtype=np.int64)
+        )
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'Deduplicator':
+        """The index saved at `path`, or an empty one if there is none yet"""
+        deduplicator = cls(**kwargs)
+        if not os.path.exists(path):
+            return deduplicator
+        with np.load(path) as saved:
+            if not np.array_equal(saved['params'], deduplicator.params()):
+                raise ValueError(f"{path} was built with different dedup settings")
+            deduplicator.owners = saved['owners'].tolist()
+            deduplicator.owner_ids = {owner: index for index, owner in enumerate(deduplicator.owners)}
+            deduplicator.exact = dict(zip(saved['exact_digests'].tolist(), saved['exact_owners'].tolist()))
+            for signature, owner in zip(saved['signatures'], saved['signature_owners'].tolist()):
+                deduplicator.add(signature, owner)
+        return deduplicator
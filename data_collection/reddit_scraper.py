@@ -39,33 +39,36 @@ class RedditScraper:
             response = requests.get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
-            posts = []
-            
-            for post in data['data']['children']:
-                post_data = post['data']
-                
-                # Filter for text posts and self posts
-                if post_data.get('is_self', False) and post_data.get('selftext'):
-                    posts.append({
-                        'id': post_data['id'],
-                        'title': post_data['title'],
-                        'content': post_data['selftext'],
-                        'author': post_data['author'],
-                        'subreddit': subreddit,
-                        'score': post_data['score'],
-                        'upvote_ratio': post_data['upvote_ratio'],
-                        'num_comments': post_data['num_comments'],
-                        'created_utc': post_data['created_utc'],
-                        'url': f"https://reddit.com{post_data['permalink']}"
-                    })
-            
-            return posts
+            return self.parse_posts(response.json(), subreddit)
             
         except Exception as e:
             print(f"Error fetching from r/{subreddit}: {e}")
             return []
     
+    def parse_posts(self, data: Dict[str, Any], subreddit: str) -> List[Dict[str, Any]]:
+        """Text posts from a subreddit listing response"""
+        posts = []
+        
+        for post in data['data']['children']:
+            post_data = post['data']
+            
+            # Filter for text posts and self posts
+            if post_data.get('is_self', False) and post_data.get('selftext'):
+                posts.append({
+                    'id': post_data['id'],
+                    'title': post_data['title'],
+                    'content': post_data['selftext'],
+                    'author': post_data['author'],
+                    'subreddit': subreddit,
+                    'score': post_data['score'],
+                    'upvote_ratio': post_data['upvote_ratio'],
+                    'num_comments': post_data['num_comments'],
+                    'created_utc': post_data['created_utc'],
+                    'url': f"https://reddit.com{post_data['permalink']}"
+                })
+        
+        return posts
+    
     def get_comments(self, post_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Fetch comments from a post"""
         url = f"{self.base_url}/comments/{post_id}.json?limit={limit}"
@@ -74,31 +77,34 @@ class RedditScraper:
             response = requests.get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
-            comments = []
-            
-            if len(data) > 1:  # Comments are in the second element
-                comment_data = data[1]['data']['children']
-                
-                for comment in comment_data:
-                    if comment['kind'] == 't1':  # Regular comment
-                        comment_body = comment['data']
-                        if comment_body.get('body') and len(comment_body['body']) > 10:
-                            comments.append({
-                                'id': comment_body['id'],
-                                'content': comment_body['body'],
-                                'author': comment_body['author'],
-                                'score': comment_body['score'],
-                                'created_utc': comment_body['created_utc'],
-                                'parent_id': post_id
-                            })
-            
-            return comments
+            return self.parse_comments(response.json(), post_id)
             
         except Exception as e:
             print(f"Error fetching comments for {post_id}: {e}")
             return []
     
+    def parse_comments(self, data: List[Dict[str, Any]], post_id: str) -> List[Dict[str, Any]]:
+        """Top-level comments from a post's comments response"""
+        comments = []
+        
+        if len(data) > 1:  # Comments are in the second element
+            comment_data = data[1]['data']['children']
+            
+            for comment in comment_data:
+                if comment['kind'] == 't1':  # Regular comment
+                    comment_body = comment['data']
+                    if comment_body.get('body') and len(comment_body['body']) > 10:
+                        comments.append({
+                            'id': comment_body['id'],
+                            'content': comment_body['body'],
+                            'author': comment_body['author'],
+                            'score': comment_body['score'],
+                            'created_utc': comment_body['created_utc'],
+                            'parent_id': post_id
+                        })
+        
+        return comments
+    
     def save_to_csv(self, data: List[Dict[str, Any]], filename: str):
         """Save data to CSV file"""
         if not data:
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Async Reddit Scraper Test for CommunityPulse
+Runs the scrapers against a local server that replays recorded Reddit JSON
+(fixtures/reddit_responses.json) and checks that the async collector
+returns what RedditScraper returns, retries transient failures, paces
+requests to its token bucket and follows the server's rate-limit headers.
+
+Run with pytest or directly: python test_async_reddit_scraper.py
+"""
+
+import asyncio
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import pandas as pd
+
+from async_reddit_scraper import AsyncRedditScraper, TokenBucket
+from reddit_scraper import RedditScraper
+
+RECORDED = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'reddit_responses.json')
+SUBREDDITS = ['HOA', 'neighbors', 'apartmentliving']
+
+
+def load_recorded():
+    """Recorded response bodies by request path"""
+    with open(RECORDED, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        path = urlsplit(self.path).path
+        time.sleep(server.latency)
+        headers = {}
+        with server.lock:
+            now = time.monotonic()
+            failures = server.failures.get(path)
+            if failures:
+                status, headers = failures.pop(0)
+            elif path not in server.responses:
+                status = 404
+            else:
+                status = 200
+            if server.window:
+                limit, seconds = server.window
+                if now >= server.window_end:
+                    server.window_end, server.window_used = now + seconds, 0
+                server.window_used += 1
+                if server.window_used > limit:
+                    status = 429
+                headers = {**headers,
+                           'X-Ratelimit-Used': str(server.window_used),
+                           'X-Ratelimit-Remaining': str(max(0, limit - server.window_used)),
+                           'X-Ratelimit-Reset': f"{server.window_end - now:.3f}"}
+            server.log.append((now, path, status))
+
+        body = json.dumps(server.responses[path] if status == 200 else {'error': status}).encode('utf-8')
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def replay_server(responses, latency=0.0, failures=None, window=None):
+    """A local server replaying `responses` by path, after `latency` seconds
+
+    failures maps a path to (status, headers) pairs served before its
+    recorded response. window = (limit, seconds) sends X-Ratelimit headers
+    and answers 429 past `limit` requests per window. Requests are logged
+    in server.log as (time, path, status).
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ReplayHandler)
+    server.daemon_threads = True
+    server.responses = responses
+    server.latency = latency
+    server.failures = {path: list(served) for path, served in (failures or {}).items()}
+    server.window = window
+    server.window_end, server.window_used = 0.0, 0
+    server.lock = threading.Lock()
+    server.log = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextlib.contextmanager
+def working_directory():
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            yield workdir
+        finally:
+            os.chdir(previous)
+
+
+def collect(server, **kwargs):
+    scraper = AsyncRedditScraper(server.url, **kwargs)
+    scraper.subreddits = SUBREDDITS
+    posts, comments = scraper.collect_data(posts_per_subreddit=30, comments_per_post=10)
+    return scraper, posts, comments
+
+
+def test_matches_sync_scraper():
+    with working_directory(), replay_server(load_recorded()) as server:
+        sync = RedditScraper()
+        sync.base_url = server.url
+        expected_posts, expected_comments = [], []
+        for subreddit in SUBREDDITS:
+            posts = sync.get_subreddit_posts(subreddit, 30)
+            expected_posts.extend(posts)
+            for post in posts[:5]:
+                expected_comments.extend(sync.get_comments(post['id'], 10))
+        # Link posts, empty posts, short comments and "more" stubs are skipped
+        assert (len(expected_posts), len(expected_comments)) == (7, 12)
+
+        scraper, posts, comments = collect(server, rate=1000, burst=1000)
+        assert posts == expected_posts
+        assert comments == expected_comments
+        assert (scraper.requests, scraper.retries) == (10, 0)
+        assert len(pd.read_csv(glob.glob('data/reddit/reddit_posts_*.csv')[0])) == 7
+        assert len(pd.read_csv(glob.glob('data/reddit/reddit_comments_*.csv')[0])) == 12
+
+
+def test_retries_transient_failures():
+    failures = {
+        '/r/HOA/hot.json': [(503, {})],
+        '/comments/nbr2b1.json': [(429, {'Retry-After': '0.3'})],
+        # More failures than retries: this post's comments are given up on
+        '/comments/apt3c2.json': [(500, {})] * 2,
+    }
+    with working_directory(), replay_server(load_recorded(), failures=failures) as server:
+        scraper, posts, comments = collect(server, rate=1000, burst=1000, max_retries=1)
+        assert len(posts) == 7
+        assert len(comments) == 10 and not any(comment['parent_id'] == 'apt3c2' for comment in comments)
+        assert (scraper.requests, scraper.retries) == (13, 3)
+
+        # Nothing is sent while a Retry-After is pending, apart from requests already in flight
+        limited = next(when for when, path, status in server.log if status == 429)
+        retried = [when for when, path, _ in server.log if path == '/comments/nbr2b1.json'][1]
+        assert retried >= limited + 0.3
+        assert all(when < limited + 0.05 for when, _, _ in server.log if limited < when < limited + 0.3)
+
+
+def test_token_bucket_pace():
+    with working_directory(), replay_server(load_recorded()) as server:
+        rate, burst = 20, 2
+        start = time.monotonic()
+        collect(server, rate=rate, burst=burst)
+        times = sorted(when for when, _, _ in server.log)
+        assert len(times) == 10
+        # The i-th request waits for the burst, then one token per 1 / rate seconds
+        for i, when in enumerate(times):
+            assert when - start >= (i + 1 - burst) / rate - 0.01
+        assert times[-1] - start < 2 * (len(times) - burst) / rate
+
+
+def test_follows_rate_limit_headers():
+    # The server allows 3 requests per 0.4 s window; the client's own rate would allow them all at once
+    with working_directory(), replay_server(load_recorded(), latency=0.01, window=(3, 0.4)) as server:
+        scraper, posts, comments = collect(server, rate=1000, burst=3)
+        assert (len(posts), len(comments)) == (7, 12)
+        assert [status for _, _, status in server.log] == [200] * 10
+        assert scraper.retries == 0
+        # Ten requests need four windows
+        assert server.log[-1][0] - server.log[0][0] >= 3 * 0.4 - 0.05
+
+
+async def abandoned_requests(url):
+    """Cancel one request and send one with an invalid URL; the bucket's in-flight count after each"""
+    scraper = AsyncRedditScraper(url)
+    bucket = TokenBucket(1000, 1000)
+    in_flight = []
+    async with httpx.AsyncClient(base_url=url) as client:
+        task = asyncio.create_task(scraper.fetch_json(client, bucket, '/r/HOA/hot.json', {}))
+        while not bucket.in_flight:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        in_flight.append(bucket.in_flight)
+
+        with contextlib.suppress(httpx.InvalidURL):
+            await scraper.fetch_json(client, bucket, '/r/HOA\x00/hot.json', {})
+        in_flight.append(bucket.in_flight)
+    return in_flight
+
+
+def test_abandoned_requests_release_bucket():
+    with replay_server(load_recorded(), latency=0.5) as server:
+        assert asyncio.run(abandoned_requests(server.url)) == [0, 0]
+
+
+def main():
+    tests = [test_matches_sync_scraper, test_retries_transient_failures, test_token_bucket_pace,
+             test_follows_rate_limit_headers, test_abandoned_requests_release_bucket]
+    for test in tests:
+        with contextlib.redirect_stdout(io.StringIO()):
+            test()
+        print(f"✅ {test.__name__}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
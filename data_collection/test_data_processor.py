@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+DataProcessor Pipeline Test for CommunityPulse
+Builds a small corpus (NextDoor JSON and NDJSON, Reddit post and comment
+CSVs) in a temporary directory and checks that the streaming pipeline
+and the parallel pipeline's part files write exactly what the batch
+pipeline writes and report the same analysis, that Parquet outputs load
+back unchanged, that incremental runs keep the processed store equal to a
+full run, and that column-wise processing matches the per-row reference.
+
+Run with pytest or directly: python test_data_processor.py
+"""
+
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+import data_processor
+from data_processor import DataProcessor, iter_json_records, read_dataset
+from nextdoor_generator import NextDoorGenerator
+
+
+@contextlib.contextmanager
+def corpus_directory(posts: int = 1200):
+    """A temporary working directory holding a seeded corpus under data/"""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            os.makedirs('data/reddit')
+            os.makedirs('data/nextdoor')
+            random.seed(7)
+            with contextlib.redirect_stdout(io.StringIO()):
+                generated = NextDoorGenerator().generate_dataset(posts)
+            half = len(generated) // 2
+            with open('data/nextdoor/posts.json', 'w', encoding='utf-8') as f:
+                json.dump(generated[:half], f, indent=2)
+            with open('data/nextdoor/posts.ndjson', 'w', encoding='utf-8') as f:
+                for post in generated[half:]:
+                    f.write(json.dumps(post) + '\n')
+
+            contents = [post['content'] for post in generated]
+            pd.DataFrame([{
+                'id': i, 'title': 'Title', 'author': f'user{i}', 'subreddit': 'HOA',
+                # Some empty and some with URLs, mentions and hashtags
+                'content': '' if i % 9 == 0 else f"{random.choice(contents)} http://example.com/{i} @user{i} #hoa",
+                'score': random.randint(-10, 50), 'upvote_ratio': 0.9, 'num_comments': 3,
+                'created_utc': 1700000000 + i, 'url': f'https://reddit.com/{i}'
+            } for i in range(posts // 2)]).to_csv('data/reddit/reddit_posts_1.csv', index=False)
+            pd.DataFrame([{
+                'id': i, 'parent_id': 'p', 'author': f'commenter{i}',
+                # Includes comments short enough to be skipped
+                'content': random.choice(contents)[:random.randint(2, 80)],
+                'score': random.randint(-5, 10), 'created_utc': 1700000000 + i
+            } for i in range(posts // 2)]).to_csv('data/reddit/reddit_comments_1.csv', index=False)
+            yield workdir
+        finally:
+            os.chdir(previous)
+
+
+def batch_dataset(processor: DataProcessor) -> pd.DataFrame:
+    posts_df, comments_df = processor.load_reddit_data()
+    return processor.combine_data([
+        processor.process_reddit_data(posts_df, comments_df),
+        processor.process_nextdoor_data(processor.load_nextdoor_data())
+    ])
+
+
+def read(path: str) -> str:
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_streaming_matches_batch():
+    """Streamed outputs are byte-identical to batch outputs, whatever the chunk size"""
+    with corpus_directory():
+        processor = DataProcessor()
+        df = batch_dataset(processor)
+        processor.save_processed_data(df, 'batch.csv')
+        processor.create_training_dataset(df, 'batch_training.csv')
+        expected = processor.analyze_data(df)
+
+        for chunk_size in (61, 250, 100000):
+            analysis, processed_path, training_path = processor.process_streaming(f'chunks{chunk_size}', chunk_size)
+            assert read(processed_path) == read('data/processed/batch.csv')
+            assert read(training_path) == read('data/processed/batch_training.csv')
+            result = analysis.result()
+            assert result['total_posts'] == expected['total_posts'] == len(df)
+            for key in ('sentiment_distribution', 'source_distribution', 'category_distribution',
+                        'misinformation_indicators'):
+                assert result[key] == expected[key]
+            assert abs(result['avg_length'] - expected['avg_length']) < 1e-9
+            assert abs(result['avg_word_count'] - expected['avg_word_count']) < 1e-9
+
+
+def test_parallel_matches_batch():
+    """Part files, in order, hold the batch rows, and the merged analysis is the batch analysis"""
+    with corpus_directory():
+        processor = DataProcessor()
+        df = batch_dataset(processor)
+        processor.save_processed_data(df, 'batch.csv')
+        processor.create_training_dataset(df, 'batch_training.csv')
+        expected = processor.analyze_data(df)
+
+        min_shard_bytes = data_processor.MIN_SHARD_BYTES
+        try:
+            # Small enough that the NDJSON file is split into byte ranges
+            data_processor.MIN_SHARD_BYTES = 4096
+            assert len(processor.plan_shards(4096)) > len(processor.plan_shards()) + 2
+            for workers in (1, 3):
+                analysis, processed_dir, training_dir = processor.process_parallel(f'workers{workers}', workers, 100)
+                for part_dir, batch_path in ((processed_dir, 'data/processed/batch.csv'),
+                                             (training_dir, 'data/processed/batch_training.csv')):
+                    parts = [read(os.path.join(part_dir, name)) for name in sorted(os.listdir(part_dir))]
+                    # Every part has a header; drop all but the first
+                    merged = parts[0] + ''.join(part.split('\n', 1)[1] for part in parts[1:])
+                    assert merged == read(batch_path)
+                result = analysis.result()
+                assert result['total_posts'] == expected['total_posts']
+                for key in ('sentiment_distribution', 'source_distribution', 'category_distribution',
+                            'misinformation_indicators'):
+                    assert result[key] == expected[key]
+                assert abs(result['avg_length'] - expected['avg_length']) < 1e-9
+        finally:
+            data_processor.MIN_SHARD_BYTES = min_shard_bytes
+
+
+def test_parquet_round_trip():
+    """Parquet outputs load back as the processed values, typed, for any column subset"""
+    with corpus_directory():
+        processor = DataProcessor()
+        df = batch_dataset(processor)
+        # Epoch seconds and ISO dates share the column; Parquet stores them as text
+        df['timestamp'] = df['timestamp'].astype(str)
+        processor.save_processed_data(df, 'batch.parquet')
+        training = processor.create_training_dataset(df, 'batch_training.parquet')
+
+        loaded = read_dataset('data/processed/batch.parquet')
+        assert list(loaded.columns) == list(df.columns)
+        assert str(loaded['sentiment'].dtype) == 'category' and loaded['length'].dtype == 'int32'
+        categorical = {name: str for name in ('category', 'sentiment', 'subreddit', 'source')}
+        pd.testing.assert_frame_equal(loaded.astype(categorical), df, check_dtype=False)
+        pd.testing.assert_frame_equal(read_dataset('data/processed/batch_training.parquet').astype(
+            {'sentiment': str, 'category': str}), training, check_dtype=False)
+
+        subset = read_dataset('data/processed/batch.parquet', columns=['content', 'source'])
+        assert list(subset.columns) == ['content', 'source'] and len(subset) == len(df)
+
+        # Streamed and part-file outputs load back as the same rows
+        _, processed_path, _ = processor.process_streaming('stream', 250, 'parquet')
+        _, processed_dir, _ = processor.process_parallel('parts', 2, 250, 'parquet')
+        pd.testing.assert_frame_equal(read_dataset(processed_path).astype(categorical), df, check_dtype=False)
+        pd.testing.assert_frame_equal(read_dataset(processed_dir).astype(categorical), df, check_dtype=False)
+
+
+def test_incremental_store():
+    """Incremental runs only process new and changed files and keep the store equal to a full run"""
+    with corpus_directory():
+        processor = DataProcessor()
+
+        def check(summary, added=(), changed=(), removed=()):
+            assert (sorted(summary['added']), sorted(summary['changed']), sorted(summary['removed'])) == \
+                (sorted(added), sorted(changed), sorted(removed))
+            df = batch_dataset(processor)
+            stored = read_dataset(store.processed_dir)
+            assert sorted(stored['original_content']) == sorted(df['original_content'])
+            result, expected = store.analysis().result(), processor.analyze_data(df)
+            for key in ('total_posts', 'sentiment_distribution', 'source_distribution',
+                        'category_distribution', 'misinformation_indicators'):
+                assert result[key] == expected[key]
+            assert abs(result['avg_length'] - expected['avg_length']) < 1e-9
+
+        inputs = ['data/reddit/reddit_posts_1.csv', 'data/reddit/reddit_comments_1.csv',
+                  'data/nextdoor/posts.json', 'data/nextdoor/posts.ndjson']
+        store, summary = processor.process_incremental(chunk_size=100)
+        check(summary, added=inputs)
+        assert store.files['data/nextdoor/posts.ndjson']['input_rows'] == 600
+
+        # Nothing new, and a touched file is recognised by its hash
+        os.utime('data/nextdoor/posts.json', ns=(1, 1))
+        store, summary = processor.process_incremental(chunk_size=100)
+        check(summary)
+        assert store.files['data/nextdoor/posts.json']['mtime_ns'] == 1
+
+        with open('data/nextdoor/posts.ndjson', encoding='utf-8') as f:
+            post = json.loads(f.readline())
+        post['content'] = 'A brand new post about the park cleanup this weekend'
+        with open('data/nextdoor/new.ndjson', 'w', encoding='utf-8') as f:
+            f.write(json.dumps(post) + '\n')
+        posts = pd.read_csv('data/reddit/reddit_posts_1.csv')
+        posts[:100].to_csv('data/reddit/reddit_posts_1.csv', index=False)
+        os.remove('data/nextdoor/posts.json')
+        # A part left by an interrupted run is not part of the store
+        with open(os.path.join(store.processed_dir, 'part-999999.csv'), 'w') as f:
+            f.write('content\nstray\n')
+
+        store, summary = processor.process_incremental(chunk_size=100, workers=2)
+        check(summary, added=['data/nextdoor/new.ndjson'], changed=['data/reddit/reddit_posts_1.csv'],
+              removed=['data/nextdoor/posts.json'])
+        listed = {part for entry in store.files.values() for part in entry['parts']}
+        assert set(os.listdir(store.processed_dir)) == listed
+
+
+def test_vectorized_matches_rows():
+    """Column-wise processing gives the per-row records, value for value"""
+    texts = [
+        'URGENT!!! Ünïcödé ÀÉÎ café 42 ٣٤ ²³ wake up sheeple', float('nan'), 12345678901234, '', None,
+        '   \t\n  ', "Visit https://x.com/a?b=1 now @bob #tag THE TRUTH they don't want",
+        'Breaking news: cover-up exposed?? Is this real???', 'ǅungla ǈ ＡＢＣ full\u00a0width\u2003１２３',
+        'short', 'secret agenda, secret agenda... wake up!', 'A' * 20, 'ok spaced   text here!!'
+    ]
+    reddit = pd.DataFrame({'content': texts, 'score': [20, -10, 0, 1, 2, 3, 4, 5, 6, 7, 11, -6, 0],
+                           'author': 'someone', 'created_utc': 1700000000})
+    nextdoor = pd.DataFrame({'content': texts, 'likes': range(len(texts))})
+
+    rows = DataProcessor(vectorized=False)
+    records = {'reddit_posts': rows.reddit_post_record, 'reddit_comments': rows.reddit_comment_record,
+               'nextdoor': rows.nextdoor_record}
+    for kind, df in (('reddit_posts', reddit), ('reddit_comments', reddit), ('nextdoor', nextdoor)):
+        expected = pd.DataFrame(rows.process_rows(df, records[kind]))
+        pd.testing.assert_frame_equal(DataProcessor().process_frame(kind, df), expected)
+
+    with corpus_directory():
+        expected = batch_dataset(rows)
+        df = batch_dataset(DataProcessor())
+        pd.testing.assert_frame_equal(df, expected)
+        assert df.to_csv(index=False) == expected.to_csv(index=False)
+
+
+def test_json_records_across_reads():
+    """JSON arrays are parsed the same when items straddle read boundaries"""
+    records = [{'content': f'post {i} ' + 'x' * (i % 37), 'likes': i, 'nested': {'tags': ['a', ']', ',']}}
+               for i in range(300)]
+    with tempfile.TemporaryDirectory() as workdir:
+        compact = os.path.join(workdir, 'compact.json')
+        indented = os.path.join(workdir, 'indented.json')
+        lines = os.path.join(workdir, 'lines.ndjson')
+        with open(compact, 'w') as f:
+            json.dump(records, f)
+        with open(indented, 'w') as f:
+            json.dump(records, f, indent=2)
+        with open(lines, 'w') as f:
+            f.write(''.join(json.dumps(record) + '\n\n' for record in records))
+
+        read_size = data_processor.JSON_READ_SIZE
+        try:
+            for size in (7, 64, 1 << 20):
+                data_processor.JSON_READ_SIZE = size
+                for path in (compact, indented, lines):
+                    assert list(iter_json_records(path)) == records
+        finally:
+            data_processor.JSON_READ_SIZE = read_size
+
+
+def main():
+    tests = [test_streaming_matches_batch, test_parallel_matches_batch, test_parquet_round_trip,
+             test_incremental_store, test_vectorized_matches_rows, test_json_records_across_reads]
+    for test in tests:
+        with contextlib.redirect_stdout(io.StringIO()):
+            test()
+        print(f"✅ {test.__name__}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Deduplication Test for CommunityPulse
+Checks exact and near-duplicate detection, MinHash similarity estimates
+against true shingle Jaccard similarity, persistence of the index across
+runs, and the dedup stage in the batch, streaming and incremental
+pipelines.
+
+Run with pytest or directly: python test_dedup.py
+"""
+
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from data_processor import DataProcessor, read_dataset
+from dedup import Deduplicator, normalize
+from nextdoor_generator import NextDoorGenerator
+from test_data_processor import batch_dataset, corpus_directory, read
+
+POST = "the pool is closed again this weekend because of maintenance issues in the clubhouse building"
+
+
+def jaccard(a, b, k=5):
+    a = {a[i:i + k] for i in range(len(a) - k + 1)}
+    b = {b[i:i + k] for i in range(len(b) - k + 1)}
+    return len(a & b) / len(a | b)
+
+
+def test_exact_and_near_duplicates():
+    deduplicator = Deduplicator()
+    texts = [
+        POST,
+        POST.upper() + '!!!',                                  # exact after normalization
+        POST.replace('weekend', 'week end'),                   # near
+        POST.replace('closed', 'open'),                        # near
+        "has anyone seen a lost dog near the park on elm street last night",
+        "Has anyone seen a lost cat near the park on elm street last night?",  # near
+        "great turnout at the farmers market, thanks to all the volunteers",
+        "hi",
+    ]
+    keep = deduplicator.filter(texts)
+    assert keep.tolist() == [True, False, False, False, True, False, True, True]
+    assert (deduplicator.exact_dropped, deduplicator.near_dropped) == (1, 3)
+
+
+def test_minhash_estimates_jaccard():
+    random.seed(11)
+    with contextlib.redirect_stdout(io.StringIO()):
+        texts = sorted({normalize(post['content']) for post in NextDoorGenerator().generate_dataset(400)})
+    deduplicator = Deduplicator()
+    signatures = deduplicator.minhash(texts)
+    # The same text gives the same signature wherever it sits in a batch
+    assert np.array_equal(deduplicator.minhash(texts[::-1]), signatures[::-1])
+
+    errors = []
+    for _ in range(500):
+        i, j = random.sample(range(len(texts)), 2)
+        errors.append((signatures[i] == signatures[j]).mean() - jaccard(texts[i], texts[j]))
+    # 64 permutations: standard error at most 1/16
+    assert abs(np.mean(errors)) < 0.02
+    assert np.mean(np.abs(errors)) < 0.05
+
+
+def test_index_persists():
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'index.npz')
+        deduplicator = Deduplicator()
+        deduplicator.filter([POST, "has anyone seen a lost dog near the park on elm street last night"], 'a.json')
+        deduplicator.filter(["great turnout at the farmers market, thanks to all the volunteers"], 'b.json')
+        deduplicator.save(path)
+
+        loaded = Deduplicator.load(path)
+        assert not loaded.filter([POST.replace('closed', 'open')], 'c.json').any()
+        loaded.remove_owner('a.json')
+        assert loaded.filter([POST, "great turnout at the farmers market, thanks to all volunteers"],
+                             'c.json').tolist() == [True, False]
+
+        try:
+            Deduplicator.load(path, threshold=0.5)
+            assert False, "an index built with other settings must not load"
+        except ValueError:
+            pass
+
+
+def test_pipeline_dedup():
+    with corpus_directory():
+        # Streaming and batch drop the same rows
+        processor = DataProcessor(dedup=True)
+        df = processor.deduplicate(batch_dataset(processor))
+        dropped = processor.deduplicator.exact_dropped + processor.deduplicator.near_dropped
+        assert dropped > 0 and len(df) > 0
+        processor.save_processed_data(df, 'batch.csv')
+        analysis, processed_path, _ = DataProcessor(dedup=True).process_streaming('dedup', 250)
+        assert read(processed_path) == read('data/processed/batch.csv')
+        assert analysis.total_posts == len(df)
+
+        # Incremental runs drop posts already in the store
+        store, _ = DataProcessor(dedup=True).process_incremental(chunk_size=100)
+        assert store.analysis().total_posts == len(df)
+        with open('data/nextdoor/posts.ndjson', encoding='utf-8') as f:
+            reposts = f.readlines()[:50]
+        with open('data/nextdoor/reposts.ndjson', 'w', encoding='utf-8') as f:
+            f.writelines(reposts)
+        processor = DataProcessor(dedup=True)
+        store, summary = processor.process_incremental(chunk_size=100)
+        assert summary['added'] == ['data/nextdoor/reposts.ndjson']
+        assert store.files['data/nextdoor/reposts.ndjson']['processed_rows'] == 0
+        assert processor.deduplicator.exact_dropped == 50
+
+        # A changed file is not deduplicated against its own previous version
+        with open('data/nextdoor/posts.ndjson', 'a', encoding='utf-8') as f:
+            post = json.loads(reposts[0])
+            post['content'] = 'Completely different: the library now opens at seven on Sundays'
+            f.write(json.dumps(post) + '\n')
+        before = store.files['data/nextdoor/posts.ndjson']['processed_rows']
+        store, summary = DataProcessor(dedup=True).process_incremental(chunk_size=100)
+        assert summary['changed'] == ['data/nextdoor/posts.ndjson']
+        assert store.files['data/nextdoor/posts.ndjson']['processed_rows'] == before + 1
+        stored = read_dataset(store.processed_dir)
+        assert len(stored) == store.analysis().total_posts
+        assert stored['content'].map(normalize).is_unique
+
+
+def main():
+    tests = [test_exact_and_near_duplicates, test_minhash_estimates_jaccard, test_index_persists,
+             test_pipeline_dedup]
+    for test in tests:
+        with contextlib.redirect_stdout(io.StringIO()):
+            test()
+        print(f"✅ {test.__name__}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -34,9 +34,9 @@ source venv/bin/activate
 echo "Installing Python dependencies..."
 pip install -r requirements.txt
 
-# Download NLTK data
-echo "Downloading NLTK data..."
-python3 -c "import nltk; nltk.download('punkt')"
+# Create the database with the demo posts
+echo "Seeding demo data..."
+python3 manage.py seed-demo
 
 cd ..
 
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { AlertTriangle, Clock, Eye, Filter, X } from 'lucide-react';
 import axios from 'axios';
+import { useLiveUpdates } from '../live';
 
 const Alerts = () => {
   const [alerts, setAlerts] = useState([]);
@@ -11,6 +12,11 @@ const Alerts = () => {
     fetchAlerts();
   }, []);
 
+  useLiveUpdates({
+    alert: (alert) => setAlerts((current) => [alert, ...current.filter((a) => a.id !== alert.id)]),
+    dropped: () => fetchAlerts(),
+  });
+
   const fetchAlerts = async () => {
     try {
       const response = await axios.get('http://localhost:8000/api/alerts');
@@ -24,6 +30,15 @@ const Alerts = () => {
     }
   };
 
+  const acknowledgeAlert = async (alertId) => {
+    try {
+      await axios.post(`http://localhost:8000/api/alerts/${alertId}/acknowledge`);
+      setAlerts((current) => current.filter((alert) => alert.id !== alertId));
+    } catch (error) {
+      console.error('Error acknowledging alert:', error);
+    }
+  };
+
   const getMockAlerts = () => [
     {
       id: 1,
@@ -211,7 +226,11 @@ const Alerts = () => {
                     <button className="p-1 text-gray-400 hover:text-gray-600">
                       <Eye className="h-4 w-4" />
                     </button>
-                    <button className="p-1 text-gray-400 hover:text-gray-600">
+                    <button
+                      className="p-1 text-gray-400 hover:text-gray-600"
+                      title="Acknowledge"
+                      onClick={() => acknowledgeAlert(alert.id)}
+                    >
                       <X className="h-4 w-4" />
                     </button>
                   </div>
@@ -10,6 +10,7 @@ import {
   Eye
 } from 'lucide-react';
 import axios from 'axios';
+import { useLiveUpdates, applyRollupDeltas } from '../live';
 import { Line, Doughnut } from 'react-chartjs-2';
 import {
   Chart as ChartJS,
@@ -42,6 +43,23 @@ const Dashboard = () => {
     fetchDashboardData();
   }, []);
 
+  // Keep the dashboard current from pushed events instead of re-fetching it
+  useLiveUpdates({
+    post: (post) => setDashboardData((data) => data && ({
+      ...data,
+      recent_posts: [post, ...data.recent_posts.filter((p) => p.id !== post.id)].slice(0, 10),
+    })),
+    alert: (alert) => setDashboardData((data) => data && ({
+      ...data,
+      alerts: [alert, ...data.alerts.filter((a) => a.id !== alert.id)].slice(0, 10),
+    })),
+    rollup: (deltas) => setDashboardData((data) => data && ({
+      ...data,
+      analytics: applyRollupDeltas(data.analytics, deltas),
+    })),
+    dropped: () => fetchDashboardData(),
+  });
+
   const fetchDashboardData = async () => {
     try {
       const response = await axios.get('http://localhost:8000/api/dashboard');
@@ -64,15 +82,16 @@ const Dashboard = () => {
       neutral_posts: 557,
       misinformation_alerts: 12,
       community_health_score: 78.5,
+      scored_posts: 1247,
       recent_trends: {
         daily_posts: [
-          { date: '2024-01-01', count: 45, avg_sentiment: 0.3 },
-          { date: '2024-01-02', count: 52, avg_sentiment: 0.2 },
-          { date: '2024-01-03', count: 38, avg_sentiment: 0.4 },
-          { date: '2024-01-04', count: 61, avg_sentiment: 0.1 },
-          { date: '2024-01-05', count: 48, avg_sentiment: 0.3 },
-          { date: '2024-01-06', count: 55, avg_sentiment: 0.2 },
-          { date: '2024-01-07', count: 42, avg_sentiment: 0.25 },
+          { date: '2024-01-01', count: 45, avg_sentiment: 0.3, scored_posts: 45 },
+          { date: '2024-01-02', count: 52, avg_sentiment: 0.2, scored_posts: 52 },
+          { date: '2024-01-03', count: 38, avg_sentiment: 0.4, scored_posts: 38 },
+          { date: '2024-01-04', count: 61, avg_sentiment: 0.1, scored_posts: 61 },
+          { date: '2024-01-05', count: 48, avg_sentiment: 0.3, scored_posts: 48 },
+          { date: '2024-01-06', count: 55, avg_sentiment: 0.2, scored_posts: 55 },
+          { date: '2024-01-07', count: 42, avg_sentiment: 0.25, scored_posts: 42 },
         ]
       }
     },
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { MessageSquare, Send, AlertTriangle, TrendingUp, TrendingDown, Activity } from 'lucide-react';
 import axios from 'axios';
+import { useLiveUpdates } from '../live';
 
 const Posts = () => {
   const [posts, setPosts] = useState([]);
@@ -16,6 +17,12 @@ const Posts = () => {
     fetchPosts();
   }, []);
 
+  // New posts arrive over the live stream, including ones submitted here
+  useLiveUpdates({
+    post: (post) => setPosts((current) => [post, ...current.filter((p) => p.id !== post.id)]),
+    dropped: () => fetchPosts(),
+  });
+
   const fetchPosts = async () => {
     try {
       const response = await axios.get('http://localhost:8000/api/posts');
@@ -91,7 +98,7 @@ const Posts = () => {
     e.preventDefault();
     try {
       const response = await axios.post('http://localhost:8000/api/posts', newPost);
-      setPosts([response.data, ...posts]);
+      setPosts((current) => [response.data, ...current.filter((p) => p.id !== response.data.id)]);
       setNewPost({ content: '', author: '', category: 'general' });
       setShowForm(false);
     } catch (error) {
@@ -0,0 +1,83 @@
+import { useEffect, useRef } from 'react';
+
+const STREAM_URL = 'http://localhost:8000/api/stream';
+
+// Subscribe to server-sent post, alert and rollup events while mounted.
+// `handlers` maps event names ('post', 'alert', 'rollup', 'dropped') to
+// callbacks receiving the parsed event data. 'dropped' means the server
+// skipped events because we fell behind, so the component should re-fetch.
+export const useLiveUpdates = (handlers) => {
+  const handlersRef = useRef(handlers);
+  handlersRef.current = handlers;
+
+  const topics = Object.keys(handlers).filter((name) => name !== 'dropped').sort().join(',');
+
+  useEffect(() => {
+    const source = new EventSource(`${STREAM_URL}?topics=${topics}`);
+    const names = [...topics.split(','), 'dropped'];
+    names.forEach((name) => {
+      source.addEventListener(name, (event) => {
+        const handler = handlersRef.current[name];
+        if (handler) handler(JSON.parse(event.data));
+      });
+    });
+    return () => source.close();
+  }, [topics]);
+};
+
+// Days of daily_posts the analytics endpoints return: the last week and today
+const TREND_DAYS = 7;
+
+// The average of `avg` over `scored` posts with `deltas` added, and the new count
+const addSentiment = (avg, scored, deltas) => {
+  const count = deltas.reduce((total, delta) => total + delta.sentiment_count, 0);
+  const sentimentSum = deltas.reduce((total, delta) => total + delta.sentiment_sum, 0);
+  if (count === 0) return [avg, scored];
+  return [((avg ?? 0) * scored + sentimentSum) / (scored + count), scored + count];
+};
+
+// 'YYYY-MM-DD' of `day` minus `days`
+const daysBefore = (day, days) => {
+  const date = new Date(`${day}T00:00:00Z`);
+  date.setUTCDate(date.getUTCDate() - days);
+  return date.toISOString().slice(0, 10);
+};
+
+// Apply rollup deltas to an analytics summary without re-fetching it. Days
+// not in the summary yet, such as the first post after midnight, are added,
+// and days that fall out of the trend window are dropped.
+export const applyRollupDeltas = (analytics, deltas) => {
+  const sum = (field) => deltas.reduce((total, delta) => total + delta[field], 0);
+  const [avgSentiment, scoredPosts] = addSentiment(analytics.avg_sentiment, analytics.scored_posts, deltas);
+
+  const days = new Map(analytics.recent_trends.daily_posts.map((day) => [day.date, day]));
+  // Posts without a parseable timestamp roll up under day ''
+  deltas.filter((delta) => delta.day && !days.has(delta.day)).forEach((delta) => {
+    days.set(delta.day, { date: delta.day, count: 0, avg_sentiment: null, scored_posts: 0 });
+  });
+  const dates = [...days.keys()].sort();
+  const oldest = dates.length ? daysBefore(dates[dates.length - 1], TREND_DAYS) : '';
+  const dailyPosts = dates.filter((date) => date >= oldest).map((date) => {
+    const day = days.get(date);
+    const dayDeltas = deltas.filter((delta) => delta.day === date);
+    const [avg, scored] = addSentiment(day.avg_sentiment, day.scored_posts, dayDeltas);
+    return {
+      ...day,
+      count: day.count + dayDeltas.reduce((total, delta) => total + delta.posts, 0),
+      avg_sentiment: avg,
+      scored_posts: scored,
+    };
+  });
+
+  return {
+    ...analytics,
+    recent_trends: { ...analytics.recent_trends, daily_posts: dailyPosts },
+    scored_posts: scoredPosts,
+    total_posts: analytics.total_posts + sum('posts'),
+    positive_posts: analytics.positive_posts + sum('positive_posts'),
+    negative_posts: analytics.negative_posts + sum('negative_posts'),
+    neutral_posts: analytics.neutral_posts + sum('neutral_posts'),
+    misinformation_alerts: analytics.misinformation_alerts + sum('misinformation_alerts'),
+    avg_sentiment: Math.round(avgSentiment * 1000) / 1000,
+  };
+};
@@ -68,9 +68,9 @@ if not exist "venv\Lib\site-packages\fastapi" (
     pip install -r requirements.txt
 )
 
-REM Download NLTK data if needed
-echo 📦 Checking NLTK data...
-python -c "import nltk; nltk.download('punkt', quiet=True)" 2>nul
+REM Seed demo posts into a new database
+echo 📦 Seeding demo data...
+python manage.py seed-demo
 
 REM Start backend
 echo 🚀 Starting backend on http://localhost:8000
@@ -103,9 +103,9 @@ start_backend() {
         pip install -r requirements.txt
     fi
     
-    # Download NLTK data if needed
-    echo -e "${YELLOW}📦 Checking NLTK data...${NC}"
-    python3 -c "import nltk; nltk.download('punkt', quiet=True)" 2>/dev/null || true
+    # Seed demo posts into a new database
+    echo -e "${YELLOW}📦 Seeding demo data...${NC}"
+    python3 manage.py seed-demo
     
     # Start backend
     echo -e "${GREEN}🚀 Starting backend on http://localhost:8000${NC}"
@@ -181,20 +181,6 @@ def check_dependencies():
         print_status(f"Python dependency missing: {e}", "ERROR")
         return False
     
-    # Check if NLTK data is available
-    try:
-        import nltk
-        nltk.data.find('tokenizers/punkt')
-        print_status("NLTK data: OK", "SUCCESS")
-    except LookupError:
-        print_status("NLTK data missing - downloading...", "WARNING")
-        try:
-            nltk.download('punkt')
-            print_status("NLTK data downloaded", "SUCCESS")
-        except Exception as e:
-            print_status(f"NLTK data download failed: {e}", "ERROR")
-            return False
-    
     return True
 
 def main():